@@ -0,0 +1,269 @@
+"""Latency benchmark for ``ReconciliationEngine.scan`` on a large project.
+
+Builds a git repository with thousands of ``agent/t*`` branches and packet
+files plus a few worktrees, and a state.db with done tasks that lack a sync
+mapping. Then times three ways of scanning it:
+
+* the original sequential scan (kept below as ``reference_scan``): each
+  check probes the repo with ``rev-parse``, spawns its own git listing and
+  re-reads the backend, and ``missing_sync_mapping`` issues one
+  ``get_sync_mapping`` query per done task per provider;
+* ``scan()``: one shared snapshot, checks run concurrently;
+* ``scan()`` with a watermark, rescanning a project nothing has touched.
+
+Checks that all three report identical discrepancies and prints the median
+latency of each.
+
+    cd plugins/fakoli-state/bin
+    uv run python ../benchmarks/bench_scan.py [--branches 3000] [--packets 3000] [--repeat 15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bin" / "src"))
+
+from fakoli_state.clock import FrozenClock  # noqa: E402
+from fakoli_state.state.models import EventDraft  # noqa: E402
+from fakoli_state.state.sqlite import SqliteBackend  # noqa: E402
+from fakoli_state.sync import reconciliation  # noqa: E402
+from fakoli_state.sync.reconciliation import (  # noqa: E402
+    Discrepancy,
+    ReconciliationEngine,
+)
+
+_T0 = datetime(2026, 5, 25, 12, 0, 0, tzinfo=UTC)
+_PROVIDERS = ["github_issues"]
+
+
+# ---------------------------------------------------------------------------
+# Reference: the original sequential scan
+# ---------------------------------------------------------------------------
+
+
+def _git_stdout(cwd: Path, argv: list[str]) -> str | None:
+    try:
+        r = subprocess.run(
+            argv, cwd=str(cwd), capture_output=True, text=True,
+            timeout=reconciliation._GIT_TIMEOUT_SECONDS,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    return r.stdout if r.returncode == 0 else None
+
+
+def _reference_git(cwd: Path, *, worktrees: bool) -> reconciliation._GitSnapshot:
+    """One check's git reads: a ``rev-parse`` probe, then its own listing."""
+    if _git_stdout(cwd, ["git", "rev-parse", "--git-dir"]) is None:
+        return reconciliation._GitSnapshot()
+    if worktrees:
+        out = _git_stdout(cwd, ["git", "worktree", "list", "--porcelain"]) or ""
+        return reconciliation._GitSnapshot(
+            is_repo=True, worktrees=tuple(reconciliation._parse_worktree_porcelain(out)),
+        )
+    out = _git_stdout(cwd, ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/"])
+    branches = tuple(line.strip() for line in (out or "").splitlines() if line.strip())
+    return reconciliation._GitSnapshot(is_repo=True, branches=branches)
+
+
+def reference_scan(engine: ReconciliationEngine) -> list[Discrepancy]:
+    """Run the six checks one after another, each reading its own sources."""
+    backend, root = engine._backend, engine._state_dir
+    empty = reconciliation._ScanSnapshot(now=engine._clock.now())
+    found: list[Discrepancy] = []
+
+    found += engine._scan_orphan_branches(dataclasses.replace(
+        empty, git=_reference_git(root, worktrees=False), tasks=tuple(backend.list_tasks()),
+    ))
+    packets_dir = root / ".fakoli-state" / "packets"
+    packets = None
+    if packets_dir.exists():
+        packets = tuple(
+            entry for entry in sorted(packets_dir.iterdir())
+            if entry.is_file() and entry.suffix == ".md"
+        )
+    found += engine._scan_orphan_packets(dataclasses.replace(
+        empty, packets=packets, tasks=tuple(backend.list_tasks()),
+    ))
+    found += engine._scan_orphan_worktrees(dataclasses.replace(
+        empty, git=_reference_git(root, worktrees=True), tasks=tuple(backend.list_tasks()),
+        active_claims=tuple(backend.list_active_claims()),
+    ))
+    found += engine._scan_stale_claims(dataclasses.replace(
+        empty, active_claims=tuple(backend.list_active_claims()),
+    ))
+    done = tuple(backend.list_tasks(status="done"))
+    mappings = []
+    for task in done:
+        for provider_id in engine._configured_providers:
+            mapping = backend.get_sync_mapping(task.id, external_system=provider_id)
+            if mapping is not None:
+                mappings.append(mapping)
+    found += engine._scan_missing_sync_mappings(dataclasses.replace(
+        empty, tasks=done, sync_mappings=tuple(mappings),
+    ))
+    found += engine._scan_drift_sync_state(dataclasses.replace(
+        empty, sync_mappings=tuple(backend.list_sync_mappings()),
+    ))
+    found.sort(key=lambda d: (str(d.kind), d.target_id))
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Fixture
+# ---------------------------------------------------------------------------
+
+
+def _git(cwd: Path, *args: str, stdin: str | None = None) -> str:
+    r = subprocess.run(
+        ["git", *args], cwd=str(cwd), input=stdin, capture_output=True, text=True, check=True,
+    )
+    return r.stdout.strip()
+
+
+def _event(action: str, payload: dict[str, Any], kind: str, target: str) -> EventDraft:
+    return EventDraft(
+        timestamp=_T0, actor="bench", action=action,
+        target_kind=kind, target_id=target, payload_json=payload,
+    )
+
+
+def _task(task_id: str, status: str) -> dict[str, Any]:
+    return {
+        "id": task_id, "feature_id": "F001", "title": task_id, "description": "",
+        "status": status, "priority": "medium", "dependencies": [], "conflict_groups": [],
+        "scores": {}, "acceptance_criteria": ["ok"], "implementation_notes": [],
+        "verification": {"commands": ["pytest"], "manual_steps": [], "required_evidence": []},
+        "likely_files": [], "parent_task_id": None,
+        "created_at": _T0.isoformat(), "updated_at": _T0.isoformat(),
+    }
+
+
+def build_project(root: Path, *, tasks: int, branches: int, packets: int, worktrees: int) -> None:
+    """A repo whose branches, packets and worktrees mostly point at unknown tasks."""
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "config", "user.email", "bench@example.com")
+    _git(root, "config", "user.name", "bench")
+    _git(root, "commit", "--allow-empty", "-q", "-m", "init")
+    head = _git(root, "rev-parse", "HEAD")
+    # Branch t<n> for n <= tasks names a known task; the rest are orphans.
+    refs = "".join(
+        f"create refs/heads/agent/t{n:05d}-work {head}\n" for n in range(1, branches + 1)
+    )
+    _git(root, "update-ref", "--stdin", stdin=refs)
+    for n in range(branches - worktrees + 1, branches + 1):
+        _git(root, "worktree", "add", "-q", str(root.parent / f"wt-{n}"), f"agent/t{n:05d}-work")
+
+    state = root / ".fakoli-state"
+    (state / "packets").mkdir(parents=True)
+    for n in range(1, packets + 1):
+        (state / "packets" / f"T{n + tasks:05d}.md").write_text("packet\n", encoding="utf-8")
+    (state / "events.jsonl").touch()
+    backend = SqliteBackend(
+        db_path=str(state / "state.db"), events_path=str(state / "events.jsonl"),
+        clock=FrozenClock(_T0),
+    )
+    backend.initialize()
+    try:
+        backend.append(_event("project.created", {
+            "id": "bench", "name": "bench", "description": "",
+            "created_at": _T0.isoformat(), "updated_at": _T0.isoformat(),
+        }, "project", "bench"))
+        backend.append(_event("state.initialized", {}, "project", "bench"))
+        backend.append(_event("feature.created", {
+            "id": "F001", "title": "F", "description": "", "status": "proposed",
+            "requirements": [], "tasks": [],
+        }, "feature", "F001"))
+        for n in range(1, tasks + 1):
+            task_id = f"T{n:05d}"
+            status = "done" if n % 2 else "ready"
+            backend.append(_event("task.created", _task(task_id, status), "task", task_id))
+    finally:
+        backend.close()
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _engine(
+    root: Path, watermark: Path | None = None,
+) -> tuple[ReconciliationEngine, SqliteBackend]:
+    state = root / ".fakoli-state"
+    backend = SqliteBackend(
+        db_path=str(state / "state.db"), events_path=str(state / "events.jsonl"),
+        clock=FrozenClock(_T0),
+    )
+    backend.initialize()
+    engine = ReconciliationEngine(
+        backend, state_dir=root, clock=FrozenClock(_T0),
+        configured_providers=_PROVIDERS, watermark_path=watermark,
+    )
+    return engine, backend
+
+
+def _median_ms(fn: Any, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--branches", type=int, default=3000)
+    parser.add_argument("--packets", type=int, default=3000)
+    parser.add_argument("--worktrees", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        root.mkdir()
+        build_project(
+            root, tasks=args.tasks, branches=args.branches,
+            packets=args.packets, worktrees=args.worktrees,
+        )
+        engine, backend = _engine(root)
+        marked, marked_backend = _engine(root, Path(tmp) / "reconcile-state.json")
+        try:
+            expected = reference_scan(engine)
+            marked.scan()  # writes the watermark the quiet rescans reuse
+            runs = {
+                "scan()": engine.scan().discrepancies,
+                "scan() watermarked": marked.scan().discrepancies,
+            }
+            print(f"{args.branches} branches, {args.packets} packets, {args.worktrees} worktrees, "
+                  f"{args.tasks} tasks; {len(expected)} discrepancies")
+            mismatched = [label for label, found in runs.items() if found != expected]
+            if mismatched:
+                print(f"DISCREPANCY MISMATCH: {', '.join(mismatched)}")
+                return 1
+            ref = _median_ms(lambda: reference_scan(engine), args.repeat)
+            print(f"{'':<20} {'median ms':>10}")
+            print(f"{'sequential':<20} {ref:>10.1f}")
+            for label, fn in (("scan()", engine.scan), ("scan() watermarked", marked.scan)):
+                t = _median_ms(fn, args.repeat)
+                print(f"{label:<20} {t:>10.1f}   ({ref / t:.1f}x)")
+        finally:
+            backend.close()
+            marked_backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
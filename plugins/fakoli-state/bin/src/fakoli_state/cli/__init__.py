@@ -10,6 +10,7 @@ import typer
 
 from fakoli_state import __version__
 from fakoli_state.cli.claim import claim, next, release, renew
+from fakoli_state.cli.compact import compact_events
 from fakoli_state.cli.hooks import hook_app
 from fakoli_state.cli.init_status import init, status
 from fakoli_state.cli.migrate import migrate_events
@@ -83,6 +84,7 @@ app.command()(submit)
 app.command()(apply)
 app.command()(replay)
 app.command("migrate-events")(migrate_events)
+app.command("compact-events")(compact_events)
 
 # ---------------------------------------------------------------------------
 # Module entry point
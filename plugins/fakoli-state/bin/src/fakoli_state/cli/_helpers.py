@@ -56,11 +56,12 @@ def _open_backend(state_dir: Path) -> SqliteBackend:
         An initialized SqliteBackend ready for queries and mutations.
     """
     from fakoli_state.clock import SystemClock
-    from fakoli_state.config import read_events_storage
+    from fakoli_state.config import read_events_segmentation, read_events_storage
     from fakoli_state.state.sqlite import SqliteBackend as _SqliteBackend
 
     db_path = str(state_dir / "state.db")
     events_path = str(state_dir / "events.jsonl")
+    max_events, max_mb = read_events_segmentation(state_dir / "config.yaml")
     backend = _SqliteBackend(
         db_path=db_path,
         events_path=events_path,
@@ -69,6 +70,8 @@ def _open_backend(state_dir: Path) -> SqliteBackend:
         # replay strategy, so it must be resolved BEFORE the backend opens —
         # not by whichever command happens to read config.yaml later.
         events_storage=read_events_storage(state_dir / "config.yaml"),
+        segment_max_events=max_events,
+        segment_max_bytes=max_mb * 1024 * 1024 if max_mb is not None else None,
     )
     backend.initialize()
     return backend
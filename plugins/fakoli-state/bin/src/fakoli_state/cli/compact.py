@@ -0,0 +1,53 @@
+"""compact-events command — seal the open log segment and checkpoint the projection."""
+
+from __future__ import annotations
+
+import typer
+
+from fakoli_state.cli._helpers import (
+    _open_backend,
+    _require_state_dir,
+    _resolve_state_dir,
+)
+
+
+def compact_events() -> None:
+    """Seal events.jsonl and fold sealed segments into a projection checkpoint.
+
+    Moves every event in the open segment into a gzip-compressed sealed
+    segment under .fakoli-state/segments/, then writes segments/checkpoint.db:
+    the projection after replaying all sealed history. Later replays restore
+    the checkpoint and apply only what came after it. Sealed segments are
+    kept, so `replay --full` still rebuilds from the first event.
+
+    events_storage: local only — a git-backed log is committed whole.
+    """
+    from fakoli_state.config import read_events_storage
+    from fakoli_state.state.segments import SegmentStore
+
+    state_dir = _resolve_state_dir(None)
+    _require_state_dir(state_dir)
+
+    if read_events_storage(state_dir / "config.yaml") == "git":
+        typer.echo(
+            "Error: compact-events applies to events_storage: local only — a "
+            "git-backed events.jsonl is committed and merged as one file.",
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+    backend = _open_backend(state_dir)
+    try:
+        checkpoint = backend.compact_events()
+    finally:
+        backend.close()
+
+    if checkpoint is None:
+        typer.echo("Nothing to compact — the event log is empty.")
+        return
+
+    manifest = SegmentStore(state_dir / "events.jsonl").load_manifest()
+    total = sum(s.event_count for s in manifest.segments)
+    typer.echo(f"Sealed segments : {len(manifest.segments)} ({total} events)")
+    typer.echo(f"Checkpoint      : through E{checkpoint.through_seq:06d}")
+    typer.echo(f"Written to      : {state_dir / 'segments'}")
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import datetime
 import json
+import shutil
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -100,6 +101,13 @@ def init(
         events_file = state_dir / "events.jsonl"
         if events_file.exists():
             events_file.unlink()
+        # Sealed segments and the compaction checkpoint belong to the old log;
+        # left behind, replay would restore the old project from them.
+        from fakoli_state.state.segments import SEGMENTS_DIRNAME
+
+        segments_dir = state_dir / SEGMENTS_DIRNAME
+        if segments_dir.exists():
+            shutil.rmtree(segments_dir)
 
     # Resolve project name and id.
     project_name = name if name else cwd.name
@@ -302,23 +310,25 @@ def status(
 
 
 def _read_initialized_at(state_dir: Path) -> str:
-    """Return the ISO timestamp from the first events.jsonl entry.
+    """Return the ISO timestamp of the first event in the log.
 
-    Falls back to the mtime of state.db, then to 'unknown'.
+    Reads through sealed segments, so the answer survives a seal or
+    ``compact-events``. Falls back to the mtime of state.db, then to 'unknown'.
     """
+    from fakoli_state.state.segments import SEGMENTS_DIRNAME, iter_log_lines
+
     events_path = state_dir / "events.jsonl"
-    if events_path.exists():
+    if events_path.exists() or (state_dir / SEGMENTS_DIRNAME).exists():
         try:
-            with events_path.open(encoding="utf-8") as fh:
-                for raw_line in fh:
-                    line = raw_line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    ts = data.get("timestamp", "")
-                    if ts:
-                        return str(ts)
-        except (OSError, json.JSONDecodeError, KeyError):
+            for raw_line in iter_log_lines(events_path):
+                line = raw_line.strip()
+                if not line:
+                    continue
+                data = json.loads(line)
+                ts = data.get("timestamp", "")
+                if ts:
+                    return str(ts)
+        except (OSError, ValueError, KeyError):
             pass
 
     db_path = state_dir / "state.db"
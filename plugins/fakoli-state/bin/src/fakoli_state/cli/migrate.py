@@ -36,7 +36,9 @@ _GITIGNORE_GUIDANCE = """\
   - REMOVE any ignore rule for `.fakoli-state/events.jsonl` — the log is now
     repo state and must be COMMITTED, together with `.fakoli-state/.gitattributes`.
   - KEEP ignoring `.fakoli-state/state.db*` (disposable projection, rebuilt by
-    replay) and `.fakoli-state/audit.jsonl` (machine-local audit trail).
+    replay), `.fakoli-state/audit.jsonl` (machine-local audit trail) and
+    `.fakoli-state/telemetry/` (machine-local sync audit segments) and
+    `.fakoli-state/reconcile-state.json` (machine-local reconciliation cache).
   - Consider ignoring `.fakoli-state/*.bak` and `.fakoli-state/id_mapping.json`
     if you do not want migration artifacts in the repo."""
 
@@ -67,6 +69,7 @@ def migrate_events(
     """
     from fakoli_state.state.hashing import hash_event_id
     from fakoli_state.state.models import Event
+    from fakoli_state.state.segments import SegmentStore, iter_log_lines
 
     if to != "git":
         typer.echo(
@@ -126,9 +129,12 @@ def migrate_events(
     # file order IS causal order and replay's (lamport, ts, id) sort
     # reproduces it exactly.
     # ------------------------------------------------------------------
-    old_lines: list[str] = []
-    if events_path.exists():
-        old_lines = events_path.read_text(encoding="utf-8").splitlines()
+    # Sealed segments (local-mode segmentation) are part of the log: read
+    # them first, then the open segment. Git mode never seals, so the
+    # rewritten log is a single file again.
+    segments = SegmentStore(events_path)
+    sealed = bool(segments.load_manifest().segments)
+    old_lines: list[str] = list(iter_log_lines(events_path))
 
     new_lines: list[str] = []
     id_mapping: dict[str, str] = {}
@@ -191,6 +197,8 @@ def migrate_events(
     typer.echo(f"                    {mapping_path}")
     typer.echo(f"                    {gitattributes_path} ({_GITATTRIBUTES_LINE})")
     typer.echo(f"Backup            : {backup_path}")
+    if sealed:
+        typer.echo(f"Sealed segments   : {segments.directory} (folded in, then removed)")
     typer.echo("Config change     : events_storage: git")
     typer.echo(_GITIGNORE_GUIDANCE)
 
@@ -210,7 +218,13 @@ def migrate_events(
     # config flip → projection rebuild. The config flip comes AFTER the log
     # rewrite so a crash in between leaves a local-mode config pointing at a
     # restorable backup, never a git-mode config over a sequence-id log.
-    if events_path.exists():
+    if sealed:
+        # The open segment alone is not the full log — back up the
+        # concatenated history so the backup restores on its own.
+        backup_path.write_text(
+            "".join(line + "\n" for line in old_lines), encoding="utf-8"
+        )
+    elif events_path.exists():
         shutil.copy2(events_path, backup_path)
     tmp_path = events_path.with_suffix(".jsonl.tmp")
     tmp_path.write_text(
@@ -218,6 +232,10 @@ def migrate_events(
         encoding="utf-8",
     )
     tmp_path.replace(events_path)
+    if sealed:
+        # Every sealed event now lives in the rewritten log (and the backup);
+        # the segments and checkpoint carry local ids git mode cannot use.
+        shutil.rmtree(segments.directory)
 
     mapping_path.write_text(
         json.dumps(id_mapping, indent=2, sort_keys=True) + "\n",
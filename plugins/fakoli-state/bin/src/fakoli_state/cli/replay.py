@@ -21,6 +21,14 @@ def replay(
         "--into",
         help="Path for the scratch SQLite database to build. Must not be the live state.db.",
     ),
+    full: bool = typer.Option(  # noqa: B008
+        False,
+        "--full",
+        help=(
+            "Replay every sealed segment from the first event, ignoring the "
+            "compaction checkpoint (see `compact-events`)."
+        ),
+    ),
 ) -> None:
     """Reconstruct canonical state into a scratch database from an events log.
 
@@ -29,6 +37,10 @@ def replay(
 
     The command refuses to target the project's live state.db to prevent
     accidental data loss (replay deletes its target first).
+
+    Sealed segments beside --from-events (segments/manifest.json) are
+    replayed before it; a usable compaction checkpoint is restored first
+    unless --full is given.
     """
     from fakoli_state.clock import SystemClock
     from fakoli_state.config import read_events_storage
@@ -94,7 +106,7 @@ def replay(
         backend.initialize()
 
         # Delegate entirely to the existing engine — no replay logic here.
-        backend.replay_from_empty(str(from_events_abs))
+        backend.replay_from_empty(str(from_events_abs), use_checkpoint=not full)
 
     typer.echo(f"Replayed events from {from_events_abs}")
     typer.echo(f"Canonical state written to {into_abs}")
@@ -11,6 +11,7 @@ Layout
                                      (``--push`` / ``--pull`` / ``--task``)
 ``fakoli-state sync github --health``probe provider reachability + auth
 ``fakoli-state sync github --watch`` long-running poll loop
+``fakoli-state sync audit``          sync.* audit records (both stores)
 
 Design notes
 ------------
@@ -19,10 +20,13 @@ Design notes
 * The ``github`` alias is registered as its own ``@sync_app.command`` so it
   shows up in ``--help`` and so Typer's resolver picks it over the generic
   ``provider`` subcommand without a precedence dance.
-* Every sync mutation emits a ``sync.*`` audit event into events.jsonl /
-  state.db via the SyncAuditPayload no-op handler added in Wave 3 to
-  state/sqlite.py.  Actual SyncMapping persistence flows through
-  ``backend.apply_sync_mapping(...)`` which emits ``sync_mapping.upserted``.
+* Every sync step emits a ``sync.*`` audit record into the buffered
+  telemetry channel (``sync/telemetry.py``, ``<state_dir>/telemetry/``),
+  NOT events.jsonl: those records never mutate the projection, so keeping
+  them out of the canonical log spares replay and git convergence. Only
+  state-changing events stay canonical — SyncMapping persistence flows
+  through ``backend.apply_sync_mapping(...)`` (``sync_mapping.upserted``)
+  and remote-applied rewrites through ``task.synced_from_remote``.
 * No real network calls happen in tests — every test injects a
   RecordedSyncProvider (or a custom subclass) via monkeypatching
   ``PROVIDER_REGISTRY`` so the ``provider_id`` resolves to the test double.
@@ -55,6 +59,7 @@ if TYPE_CHECKING:
         ProviderHealth,
         SyncProvider,
     )
+    from fakoli_state.sync.telemetry import SyncTelemetryLog
 
 __all__ = ["sync_app"]
 
@@ -111,6 +116,14 @@ def sync_default(
         "--yes",
         help="Skip the confirmation prompt before applying fixes.",
     ),
+    full: bool = typer.Option(  # noqa: B008
+        False,
+        "--full",
+        help=(
+            "Ignore the stored scan watermark and re-check everything "
+            "(the watermark is rewritten from this pass)."
+        ),
+    ),
     cwd: Path | None = typer.Option(  # noqa: B008
         None,
         "--cwd",
@@ -124,6 +137,10 @@ def sync_default(
     `--fix` flag additionally applies each suggested fix; combine with
     `--yes` in CI / non-interactive contexts.
 
+    Scans are incremental: .fakoli-state/reconcile-state.json records what
+    the last scan saw, and only checks whose inputs changed since are re-run.
+    `--full` forces a complete pass.
+
     Named subcommands (`github`, `provider`) take over when invoked — this
     body only runs when the user types `fakoli-state sync` with no
     subcommand.
@@ -136,7 +153,7 @@ def sync_default(
     _require_state_dir(state_dir)
     backend = _open_backend(state_dir)
     try:
-        report = _run_reconciliation(backend, state_dir)
+        report = _run_reconciliation(backend, state_dir, full=full)
         _print_reconciliation_report(report)
 
         if not fix:
@@ -287,6 +304,42 @@ def sync_provider(
     )
 
 
+# ---------------------------------------------------------------------------
+# `sync audit` — forensic query over both audit stores
+# ---------------------------------------------------------------------------
+
+
+@sync_app.command("audit")
+def sync_audit(
+    action: str | None = typer.Option(  # noqa: B008
+        None,
+        "--action",
+        help="Exact action, or a prefix ending in '.' / '*' (e.g. sync.pull.*).",
+    ),
+    task: str | None = typer.Option(  # noqa: B008
+        None, "--task", help="Only records targeting this task id."
+    ),
+    cwd: Path | None = typer.Option(  # noqa: B008
+        None,
+        "--cwd",
+        help="Project directory. Defaults to the current working directory.",
+        hidden=True,
+    ),
+) -> None:
+    """Print sync.* audit records as JSONL, oldest first.
+
+    Spans both stores: legacy rows in events.jsonl and the telemetry
+    segments under .fakoli-state/telemetry/ (compressed ones included), so
+    `jq` pipelines keep working after the split.
+    """
+    from fakoli_state.sync.telemetry import query_sync_audit
+
+    state_dir = _resolve_state_dir(cwd)
+    _require_state_dir(state_dir)
+    for record in query_sync_audit(state_dir, action=action, target_id=task):
+        typer.echo(_to_json(record))
+
+
 # ---------------------------------------------------------------------------
 # Provider dispatch — shared between `github` alias and `provider` generic
 # ---------------------------------------------------------------------------
@@ -335,6 +388,7 @@ def _sync_provider_dispatch(
     # Now (and only now) the state dir is required for actual sync ops.
     _require_state_dir(state_dir)
     backend = _open_backend(state_dir)
+    telemetry = _open_telemetry(state_dir)
     try:
         if watch:
             _run_watch_loop(
@@ -347,6 +401,7 @@ def _sync_provider_dispatch(
                 task=task,
                 yes=yes,
                 interval=interval,
+                telemetry=telemetry,
             )
         else:
             _run_sync_once(
@@ -358,8 +413,10 @@ def _sync_provider_dispatch(
                 fix=fix,
                 task=task,
                 yes=yes,
+                telemetry=telemetry,
             )
     finally:
+        _flush_telemetry(telemetry)
         # Providers may hold an ``httpx.Client`` (or other transport pool);
         # in --watch mode the dispatch lives for hours, so explicit
         # cleanup avoids the unclosed-transport warning that fires on
@@ -434,6 +491,7 @@ def _run_sync_once(
     fix: bool,
     task: str | None,
     yes: bool,
+    telemetry: SyncTelemetryLog | None = None,
 ) -> None:
     """Execute one push+pull cycle through ``provider``.
 
@@ -443,13 +501,49 @@ def _run_sync_once(
     ``--task T001`` scopes to a single task; otherwise every task gets a
     sync attempt. ``--fix`` swaps the conflict path to a forced pull
     (remote_wins on every conflict).
+
+    ``telemetry`` is the shared channel a ``--watch`` loop reuses across
+    iterations; when omitted the pass opens its own. Either way the buffer
+    is flushed when the pass ends — including on ``typer.Exit`` — so every
+    batch's records are on disk before the next poll.
     """
+    if telemetry is None:
+        telemetry = _open_telemetry(state_dir)
+    try:
+        _run_sync_pass(
+            backend=backend,
+            state_dir=state_dir,
+            provider=provider,
+            push=push,
+            pull=pull,
+            fix=fix,
+            task=task,
+            yes=yes,
+            telemetry=telemetry,
+        )
+    finally:
+        _flush_telemetry(telemetry)
+
+
+def _run_sync_pass(
+    *,
+    backend: SqliteBackend,
+    state_dir: Path,
+    provider: SyncProvider,
+    push: bool,
+    pull: bool,
+    fix: bool,
+    task: str | None,
+    yes: bool,
+    telemetry: SyncTelemetryLog,
+) -> None:
+    """Body of :func:`_run_sync_once`; the caller owns the telemetry flush."""
     # Default: do both. If only --push or --pull is set, do that side only.
     do_push = push or not pull
     do_pull = pull or not push
 
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.batch.started",
         payload={
             "provider_id": provider.provider_id,
@@ -466,7 +560,7 @@ def _run_sync_once(
     if not tasks:
         typer.echo("Nothing to sync (no matching tasks).")
         _emit_audit(
-            backend,
+            telemetry,
             action="sync.batch.completed",
             payload={
                 "provider_id": provider.provider_id,
@@ -491,6 +585,7 @@ def _run_sync_once(
                 provider=provider,
                 task=t,
                 results=push_results,
+                telemetry=telemetry,
             )
         if do_pull:
             _pull_one_task(
@@ -501,6 +596,7 @@ def _run_sync_once(
                 results=pull_results,
                 fix=fix,
                 yes=yes,
+                telemetry=telemetry,
             )
 
     typer.echo(
@@ -509,7 +605,7 @@ def _run_sync_once(
     )
 
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.batch.completed",
         payload={
             "provider_id": provider.provider_id,
@@ -556,6 +652,7 @@ def _push_one_task(
     provider: SyncProvider,
     task: Task,
     results: dict[str, int],
+    telemetry: SyncTelemetryLog,
 ) -> None:
     """Push a single task via ``provider``. Updates ``results`` in place.
 
@@ -575,7 +672,7 @@ def _push_one_task(
         )
 
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.push.started",
         payload={
             "provider_id": provider.provider_id,
@@ -592,7 +689,7 @@ def _push_one_task(
     except Exception as exc:  # noqa: BLE001 — best-effort wrapping loop
         results["failed"] += 1
         _emit_audit(
-            backend,
+            telemetry,
             action="sync.push.failed",
             payload={
                 "provider_id": provider.provider_id,
@@ -621,7 +718,7 @@ def _push_one_task(
 
     results["pushed"] += 1
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.push.completed",
         payload={
             "provider_id": provider.provider_id,
@@ -691,6 +788,7 @@ def _pull_one_task(
     results: dict[str, int],
     fix: bool,
     yes: bool,
+    telemetry: SyncTelemetryLog,
 ) -> None:
     """Pull the remote payload for ``task`` via ``provider``.
 
@@ -707,7 +805,7 @@ def _pull_one_task(
         return
 
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.pull.started",
         payload={
             "provider_id": provider.provider_id,
@@ -724,7 +822,7 @@ def _pull_one_task(
     except Exception as exc:  # noqa: BLE001 — best-effort loop
         results["failed"] += 1
         _emit_audit(
-            backend,
+            telemetry,
             action="sync.pull.failed",
             payload={
                 "provider_id": provider.provider_id,
@@ -768,7 +866,7 @@ def _pull_one_task(
         )
         results["pulled"] += 1
         _emit_audit(
-            backend,
+            telemetry,
             action="sync.pull.completed",
             payload={
                 "provider_id": provider.provider_id,
@@ -818,6 +916,7 @@ def _pull_one_task(
             strategy=strategy,
             yes=yes,
             existing=existing,
+            telemetry=telemetry,
         )
         if not resolved:
             # manual_merge: file was written, task is parked pending
@@ -835,7 +934,7 @@ def _pull_one_task(
             # could not disambiguate a parked manual_merge from a
             # process crash mid-pull.
             _emit_audit(
-                backend,
+                telemetry,
                 action="sync.pull.deferred",
                 payload={
                     "provider_id": provider.provider_id,
@@ -864,7 +963,7 @@ def _pull_one_task(
             # conflict — only the terminal name changes.
             results["pulled"] += 1
             _emit_audit(
-                backend,
+                telemetry,
                 action="sync.pull.deferred",
                 payload={
                     "provider_id": provider.provider_id,
@@ -913,7 +1012,7 @@ def _pull_one_task(
             actor=f"sync.{provider.provider_id}",
         )
         _emit_audit(
-            backend,
+            telemetry,
             action="sync.push.deferred",
             payload={
                 "provider_id": provider.provider_id,
@@ -951,7 +1050,7 @@ def _pull_one_task(
 
     results["pulled"] += 1
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.pull.completed",
         payload={
             "provider_id": provider.provider_id,
@@ -1098,6 +1197,7 @@ def _resolve_conflict(
     strategy: Any,
     yes: bool,
     existing: Any,
+    telemetry: SyncTelemetryLog,
 ) -> tuple[bool, bool, str]:
     """Apply the configured conflict-resolution strategy.
 
@@ -1203,7 +1303,7 @@ def _resolve_conflict(
             err=True,
         )
         _emit_audit(
-            backend,
+            telemetry,
             action="sync.conflict_detected",
             payload={
                 "provider_id": provider.provider_id,
@@ -1239,7 +1339,7 @@ def _resolve_conflict(
         new_state = SyncState.conflict
 
     _emit_audit(
-        backend,
+        telemetry,
         action="sync.conflict_detected",
         payload={
             "provider_id": provider.provider_id,
@@ -1321,6 +1421,7 @@ def _run_watch_loop(
     task: str | None,
     yes: bool,
     interval: int,
+    telemetry: SyncTelemetryLog,
 ) -> None:
     """Poll forever until Ctrl-C. ``--interval 0`` runs ONE iteration.
 
@@ -1351,6 +1452,7 @@ def _run_watch_loop(
                     fix=fix,
                     task=task,
                     yes=yes,
+                    telemetry=telemetry,
                 )
             except typer.Exit:
                 # manual_merge etc. — surface but keep polling. The next
@@ -1429,15 +1531,17 @@ def _resolve_configured_providers(state_dir: Path) -> list[str]:
 def _run_reconciliation(
     backend: SqliteBackend,
     state_dir: Path,
+    *,
+    full: bool = False,
 ) -> Any:
-    """Build a ReconciliationEngine and run scan()."""
+    """Build a ReconciliationEngine and run scan() against the stored watermark."""
     from fakoli_state.clock import SystemClock
 
     # Configured providers list flows from the project's config (Phase 9
     # T5 ``sync.providers``) and falls back to the registry when absent.
     # Tests that monkeypatch ``PROVIDER_REGISTRY`` continue to work
     # because the fallback path queries the registry directly.
-    from fakoli_state.sync.reconciliation import ReconciliationEngine
+    from fakoli_state.sync.reconciliation import WATERMARK_FILENAME, ReconciliationEngine
 
     configured = _resolve_configured_providers(state_dir)
     engine = ReconciliationEngine(
@@ -1445,8 +1549,9 @@ def _run_reconciliation(
         state_dir=state_dir,
         clock=SystemClock(),
         configured_providers=configured,
+        watermark_path=state_dir / WATERMARK_FILENAME,
     )
-    return engine.scan()
+    return engine.scan(full=full)
 
 
 def _apply_reconciliation_fixes(
@@ -1454,9 +1559,13 @@ def _apply_reconciliation_fixes(
     state_dir: Path,
     report: Any,
 ) -> list[Any]:
-    """Build the engine again and call .fix() on the report."""
+    """Build the engine again and call .fix() on the report.
+
+    The engine shares the scan's watermark path so applying fixes drops
+    the watermark and the next scan is a full pass.
+    """
     from fakoli_state.clock import SystemClock
-    from fakoli_state.sync.reconciliation import ReconciliationEngine
+    from fakoli_state.sync.reconciliation import WATERMARK_FILENAME, ReconciliationEngine
 
     configured = _resolve_configured_providers(state_dir)
     engine = ReconciliationEngine(
@@ -1464,6 +1573,7 @@ def _apply_reconciliation_fixes(
         state_dir=state_dir,
         clock=SystemClock(),
         configured_providers=configured,
+        watermark_path=state_dir / WATERMARK_FILENAME,
     )
     return engine.fix(report)
 
@@ -1509,15 +1619,40 @@ def _print_fix_actions(actions: list[Any]) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _open_telemetry(state_dir: Path) -> SyncTelemetryLog:
+    """Open the buffered ``sync.*`` telemetry channel for ``state_dir``."""
+    from fakoli_state.clock import SystemClock
+    from fakoli_state.sync.telemetry import SyncTelemetryLog
+
+    return SyncTelemetryLog(state_dir, clock=SystemClock(), actor="sync-cli")
+
+
+def _flush_telemetry(telemetry: SyncTelemetryLog) -> None:
+    """Flush buffered audit records; a write failure only warns.
+
+    Same non-fatal contract as :func:`_emit_audit`: the sync already
+    happened, so losing telemetry lines is strictly better than aborting.
+    The buffer survives a failed flush, so the next one retries them.
+    """
+    try:
+        telemetry.flush()
+    except OSError as exc:
+        typer.echo(
+            f"  warning: failed to flush {telemetry.pending} sync audit record(s): "
+            f"{type(exc).__name__}: {exc}",
+            err=True,
+        )
+
+
 def _emit_audit(
-    backend: SqliteBackend,
+    telemetry: SyncTelemetryLog,
     *,
     action: str,
     payload: dict[str, Any],
     target_kind: str,
     target_id: str,
 ) -> None:
-    """Append a sync.* audit event via append().
+    """Record a sync.* audit row on the telemetry channel.
 
     Strips None fields before dispatch.  After the Phase 9 T3 discriminated
     union, ``SyncAuditPayload`` is no longer a single all-optional model:
@@ -1531,37 +1666,35 @@ def _emit_audit(
     (``external_id`` on first-push, ``audit_note`` on most events,
     ``resolution`` on clean pulls, etc.).  Without it the JSONL would carry
     ``"audit_note": null`` rows that clutter forensic queries and break
-    ``jq 'has("audit_note")'`` filters.  The dispatcher in
-    ``state/sqlite.py:_apply_mutation`` validates the cleaned dict against
-    ``ACTION_TO_PAYLOAD[action]`` so any genuinely-missing REQUIRED field
-    surfaces as ``ValidationError`` from ``append`` and propagates —
+    ``jq 'has("audit_note")'`` filters.  :meth:`SyncTelemetryLog.record`
+    validates the cleaned dict against ``ACTION_TO_PAYLOAD[action]`` so any
+    genuinely-missing REQUIRED field surfaces as ``EventRejected`` —
     silently dropping it would be the wrong fix.
 
+    These rows no longer go through ``backend.append``: they are audit-only
+    no-ops in the projection, and routing them through the canonical log
+    cost a flock + transaction per step and grew events.jsonl forever.
+    Records are buffered; ``_run_sync_once`` flushes at the end of the pass.
+
     Audit emission failures are non-fatal: a sync that succeeded but
     whose audit row failed to write is strictly better than aborting
     the sync entirely. We catch only the specific failure classes the
-    backend documents — anything else (KeyboardInterrupt, programmer
-    errors like ValidationError, etc.) propagates so we don't silently
-    swallow real bugs.
+    channel documents — anything else (KeyboardInterrupt, programmer
+    errors, etc.) propagates so we don't silently swallow real bugs.
     """
-    from fakoli_state.clock import SystemClock
-    from fakoli_state.state.backend import EventRejected, StateLocked, TransactionAborted
-    from fakoli_state.state.models import EventDraft
+    from fakoli_state.state.backend import EventRejected
 
     clean: dict[str, Any] = {k: v for k, v in payload.items() if v is not None}
-    draft = EventDraft(
-        timestamp=SystemClock().now(),
-        actor="sync-cli",
-        action=action,
-        target_kind=target_kind,
-        target_id=target_id,
-        payload_json=clean,
-    )
     try:
-        backend.append(draft)
-    except (TransactionAborted, StateLocked, OSError) as exc:
-        # Infra / contention: the sync itself already succeeded, so losing the
-        # audit line is acceptable — warn and move on.
+        telemetry.record(
+            action=action,
+            payload=clean,
+            target_kind=target_kind,
+            target_id=target_id,
+        )
+    except OSError as exc:
+        # A size-triggered flush failed: the sync itself already succeeded,
+        # so losing the audit line is acceptable — warn and move on.
         typer.echo(
             f"  warning: failed to emit audit event {action!r}: "
             f"{type(exc).__name__}: {exc}",
@@ -1571,7 +1704,7 @@ def _emit_audit(
         # A rejected audit payload is a programmer error in THIS module's
         # payload construction (a malformed *_payload), not a user-input
         # problem — surface it loudly so a regression is not mistaken for
-        # transient lock contention.
+        # transient I/O trouble.
         typer.echo(
             f"  ERROR: audit event {action!r} rejected by validation "
             f"(malformed payload — this is a bug): {exc}",
@@ -1604,5 +1737,5 @@ def _is_tty() -> bool:
 # ---------------------------------------------------------------------------
 
 
-def _to_json(obj: Any) -> str:  # pragma: no cover — convenience for debug printing
+def _to_json(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, default=str)
@@ -174,6 +174,22 @@ class Config:
     # old→new id mapping, and writes .fakoli-state/.gitattributes in one step.
     events_storage: Literal["local", "git"] = "local"
 
+    # Event-log segmentation (local mode only; see state/segments.py).
+    #
+    # Once the open segment (events.jsonl) holds ``events_segment_max_events``
+    # events or ``events_segment_max_mb`` MiB, the write path seals it into a
+    # gzip-compressed segment under ``segments/`` and starts a fresh one.
+    # Replay, forward catch-up and ``compact-events`` read the manifest
+    # instead of re-scanning sealed history line by line.
+    #
+    #   events_segment_max_events:        # blank (DEFAULT) = no count trigger
+    #   events_segment_max_mb:            # blank (DEFAULT) = no size trigger
+    #
+    # Both blank keeps the pre-segmentation single-file log. Ignored when
+    # ``events_storage: git`` — a committed log is never sealed.
+    events_segment_max_events: int | None = None
+    events_segment_max_mb: int | None = None
+
     sync_github_enabled: bool = False
     sync_github_conflict_strategy: Literal[
         "local_wins", "remote_wins", "prompt", "manual_merge"
@@ -311,6 +327,8 @@ def load_config(path: str | Path) -> Config:
         "events_storage",
     )
 
+    events_segment_max_events, events_segment_max_mb = _parse_segmentation(data, resolved)
+
     sync_conflict_strategy = _validate_literal(
         data.get("sync_github_conflict_strategy", "prompt"),
         ("local_wins", "remote_wins", "prompt", "manual_merge"),
@@ -363,6 +381,8 @@ def load_config(path: str | Path) -> Config:
         auto_expand=auto_expand,
         auto_expand_threshold=auto_expand_threshold,
         events_storage=events_storage,  # type: ignore[arg-type]
+        events_segment_max_events=events_segment_max_events,
+        events_segment_max_mb=events_segment_max_mb,
         sync_github_enabled=bool(data.get("sync_github_enabled", False)),
         sync_github_conflict_strategy=sync_conflict_strategy,  # type: ignore[arg-type]
         sync_providers=sync_providers,
@@ -463,11 +483,52 @@ def read_events_storage(path: str | Path) -> Literal["local", "git"]:
     return value  # type: ignore[return-value]
 
 
+def read_events_segmentation(path: str | Path) -> tuple[int | None, int | None]:
+    """Return ``(events_segment_max_events, events_segment_max_mb)`` from *path*.
+
+    Narrow read for the backend factories, alongside
+    :func:`read_events_storage` and with the same contract: a missing or
+    unparseable config means "not configured" (``(None, None)`` — the log is
+    simply never sealed), while an explicitly set but invalid value raises.
+    No warning on parse failure — ``read_events_storage`` already logged it.
+    """
+    resolved = Path(path).expanduser().resolve()
+    if not resolved.exists():
+        return None, None
+    try:
+        with resolved.open(encoding="utf-8") as fh:
+            raw: object = yaml.safe_load(fh)
+    except (OSError, yaml.YAMLError):
+        return None, None
+    if not isinstance(raw, dict):
+        return None, None
+    return _parse_segmentation(raw, resolved)
+
+
 # ---------------------------------------------------------------------------
 # Private helpers
 # ---------------------------------------------------------------------------
 
 
+def _parse_segmentation(
+    data: dict[str, object], config_path: Path
+) -> tuple[int | None, int | None]:
+    """Validate the two segment thresholds: blank or a positive integer."""
+    values: list[int | None] = []
+    for key in ("events_segment_max_events", "events_segment_max_mb"):
+        value = data.get(key)
+        if value is None:
+            values.append(None)
+            continue
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(
+                f"{key} must be a positive integer or blank, got {value!r} "
+                f"({config_path})."
+            )
+        values.append(value)
+    return values[0], values[1]
+
+
 def _validate_required(data: dict[str, object], path: Path) -> None:
     """Raise ValueError if required top-level keys are missing or blank."""
     for key in ("project_name", "project_id"):
@@ -680,6 +741,17 @@ durability: relaxed
 # ---------------------------------------------------------------------------
 events_storage: local
 
+# ---------------------------------------------------------------------------
+# Event-log segmentation  (local mode only)
+#   Seal events.jsonl into a gzip-compressed segment under segments/ once it
+#   holds this many events or MiB; blank disables that trigger. Both blank
+#   (DEFAULT) keeps a single growing log. `fakoli-state compact-events` folds
+#   sealed segments into a projection checkpoint so replay only reads what
+#   came after it.
+# ---------------------------------------------------------------------------
+events_segment_max_events:
+events_segment_max_mb:
+
 # ---------------------------------------------------------------------------
 # Branch naming convention (v1.15.0)
 #
@@ -239,7 +239,7 @@ def _open_backend(state_dir: Path):  # type: ignore[return]
     initialized). Caller must call backend.close() in a try/finally.
     """
     from fakoli_state.clock import SystemClock
-    from fakoli_state.config import read_events_storage
+    from fakoli_state.config import read_events_segmentation, read_events_storage
     from fakoli_state.state.sqlite import SqliteBackend
 
     if not state_dir.exists():
@@ -249,6 +249,7 @@ def _open_backend(state_dir: Path):  # type: ignore[return]
         )
     db_path = str(state_dir / "state.db")
     events_path = str(state_dir / "events.jsonl")
+    max_events, max_mb = read_events_segmentation(state_dir / "config.yaml")
     backend = SqliteBackend(
         db_path=db_path,
         events_path=events_path,
@@ -257,6 +258,8 @@ def _open_backend(state_dir: Path):  # type: ignore[return]
         # replay strategy, so it must be resolved BEFORE the backend opens —
         # mirrors cli/_helpers._open_backend.
         events_storage=read_events_storage(state_dir / "config.yaml"),
+        segment_max_events=max_events,
+        segment_max_bytes=max_mb * 1024 * 1024 if max_mb is not None else None,
     )
     backend.initialize()
     return backend
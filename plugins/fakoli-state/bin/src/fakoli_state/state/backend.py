@@ -176,6 +176,16 @@ class Backend(Protocol):
         most-recent first. Used by `show` to surface task history."""
         ...
 
+    def latest_event_id(self) -> str | None:
+        """Return the id of the most recently applied event, or None if none.
+
+        "Most recent" is projection order (insertion into the ``events``
+        table), which in git mode is the replay's HLC order rather than
+        wall-clock append order. Used as a cheap change watermark: any
+        ``append`` or rebuild that changes the projection changes it.
+        """
+        ...
+
     def get_prd(self) -> PRD | None:
         """Return the current PRD, or None if not yet parsed."""
         ...
@@ -0,0 +1,313 @@
+"""Sealed event-log segments, manifest, and projection checkpoint.
+
+``events.jsonl`` is append-only, so every full-log pass — replay, forward
+catch-up, ``migrate-events`` — used to grow with the project forever. In
+``events_storage: local`` mode the backend can instead seal the log into
+immutable segments once it crosses a size or event-count threshold:
+
+* ``events.jsonl`` stays the OPEN segment — the only file ``append`` writes
+  and the only one the flock covers.
+* ``segments/events-NNNNNN.jsonl.gz`` — sealed segments, gzip-compressed,
+  never rewritten.
+* ``segments/manifest.json`` — one :class:`SegmentSummary` per sealed segment
+  (id range, Lamport range, event count, sha256 of the uncompressed bytes)
+  plus the optional projection checkpoint. Written atomically (tmp + rename).
+* ``segments/checkpoint.db`` — optional compaction output: the SQLite
+  projection after replaying every sealed segment up to
+  ``checkpoint.through_seq``. Replay restores it and applies only what came
+  after, so a rebuild reads the manifest, the checkpoint and the open
+  segment. Sealed segments are kept, so the full history stays restorable
+  (``replay --full`` ignores the checkpoint).
+
+Crash ordering when sealing: segment file → manifest → truncate the open
+segment. A crash before the manifest write leaves an orphan ``.gz`` that the
+next seal overwrites; a crash after it leaves lines in ``events.jsonl`` that
+the manifest already covers, which every reader skips by id
+(``seq <= manifest.last_seq``). Either way no event is lost or applied twice.
+
+Git mode never seals: its log is committed and merged with ``merge=union``,
+and a union merge cannot reconcile two branches' binary segments.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from fakoli_state.state.schema import SCHEMA_VERSION
+
+__all__ = [
+    "CHECKPOINT_FILENAME",
+    "MANIFEST_FILENAME",
+    "SEGMENTS_DIRNAME",
+    "ProjectionCheckpoint",
+    "SegmentManifest",
+    "SegmentStore",
+    "SegmentSummary",
+    "event_seq",
+    "iter_log_lines",
+]
+
+# Subdirectory beside events.jsonl holding sealed segments + manifest.
+SEGMENTS_DIRNAME = "segments"
+MANIFEST_FILENAME = "manifest.json"
+CHECKPOINT_FILENAME = "checkpoint.db"
+
+_MANIFEST_VERSION = 1
+
+
+class SegmentSummary(BaseModel):
+    """Manifest entry for one sealed segment."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    first_id: str
+    last_id: str
+    first_seq: int
+    last_seq: int
+    event_count: int
+    # Local-mode lines carry no Lamport counter; both stay None there.
+    lamport_min: int | None = None
+    lamport_max: int | None = None
+    # sha256 + length of the UNCOMPRESSED JSONL bytes, so the check survives
+    # a re-compression and pins exactly what replay will read.
+    sha256: str
+    bytes: int
+    sealed_at: datetime.datetime
+
+
+class ProjectionCheckpoint(BaseModel):
+    """Manifest entry for the compacted projection (``checkpoint.db``)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = CHECKPOINT_FILENAME
+    through_seq: int
+    schema_version: int
+    sha256: str
+    created_at: datetime.datetime
+
+
+class SegmentManifest(BaseModel):
+    """``segments/manifest.json`` — sealed segments oldest first."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    version: int = _MANIFEST_VERSION
+    segments: list[SegmentSummary] = Field(default_factory=list)
+    checkpoint: ProjectionCheckpoint | None = None
+
+    @property
+    def last_seq(self) -> int:
+        """Highest event sequence number covered by a sealed segment (0 if none)."""
+        return self.segments[-1].last_seq if self.segments else 0
+
+
+def event_seq(event_id: object) -> int | None:
+    """Return N for a local-mode ``E{N}`` id, else None."""
+    if isinstance(event_id, str) and event_id.startswith("E") and event_id[1:].isdigit():
+        return int(event_id[1:])
+    return None
+
+
+class SegmentStore:
+    """Reads and writes the ``segments/`` directory beside one events log.
+
+    Stateless apart from the path: every call re-reads the manifest, so two
+    processes sharing a log never act on a stale copy. Writers (``seal``,
+    ``set_checkpoint``) must hold the backend's append flock.
+    """
+
+    def __init__(self, events_path: str | os.PathLike[str]) -> None:
+        self._dir = Path(events_path).parent / SEGMENTS_DIRNAME
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self._dir / CHECKPOINT_FILENAME
+
+    def load_manifest(self) -> SegmentManifest:
+        """Return the manifest, or an empty one when nothing has been sealed.
+
+        A manifest that exists but does not parse raises ``ValueError`` — it
+        is the index of sealed history, so guessing would silently drop
+        events from every replay.
+        """
+        path = self._dir / MANIFEST_FILENAME
+        if not path.exists():
+            return SegmentManifest()
+        try:
+            return SegmentManifest.model_validate_json(path.read_bytes())
+        except Exception as exc:
+            raise ValueError(f"segment manifest {path} is unreadable: {exc}") from exc
+
+    def write_manifest(self, manifest: SegmentManifest) -> None:
+        """Atomically replace the manifest (tmp + fsync + rename)."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        path = self._dir / MANIFEST_FILENAME
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(manifest.model_dump_json(indent=2) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    def seal(self, lines: list[str], *, sealed_at: datetime.datetime) -> SegmentSummary:
+        """Write *lines* as the next sealed segment and record it in the manifest.
+
+        *lines* are complete, already-validated event lines in log order; the
+        caller (``SqliteBackend._seal_open_segment``) filters out anything the
+        manifest already covers. The segment is written under a temporary
+        name, fsynced and renamed before the manifest mentions it.
+        """
+        manifest = self.load_manifest()
+        payload = "".join(line if line.endswith("\n") else line + "\n" for line in lines)
+        data = payload.encode("utf-8")
+
+        ids: list[str] = []
+        lamports: list[int] = []
+        for line in lines:
+            raw = json.loads(line)
+            ids.append(str(raw["id"]))
+            lamport = raw.get("lamport")
+            if isinstance(lamport, int) and not isinstance(lamport, bool):
+                lamports.append(lamport)
+        first_seq = event_seq(ids[0])
+        last_seq = event_seq(ids[-1])
+        if first_seq is None or last_seq is None:
+            raise ValueError("seal: segments hold local-mode E{N} event ids only.")
+
+        name = f"events-{len(manifest.segments) + 1:06d}.jsonl.gz"
+        self._dir.mkdir(parents=True, exist_ok=True)
+        target = self._dir / name
+        tmp = target.with_name(name + ".tmp")
+        with open(tmp, "wb") as raw_fh:
+            with gzip.GzipFile(fileobj=raw_fh, mode="wb", mtime=0) as gz:
+                gz.write(data)
+            raw_fh.flush()
+            os.fsync(raw_fh.fileno())
+        os.replace(tmp, target)
+
+        summary = SegmentSummary(
+            name=name,
+            first_id=ids[0],
+            last_id=ids[-1],
+            first_seq=first_seq,
+            last_seq=last_seq,
+            event_count=len(ids),
+            lamport_min=min(lamports) if lamports else None,
+            lamport_max=max(lamports) if lamports else None,
+            sha256=hashlib.sha256(data).hexdigest(),
+            bytes=len(data),
+            sealed_at=sealed_at,
+        )
+        manifest.segments.append(summary)
+        self.write_manifest(manifest)
+        return summary
+
+    def read_segment(self, summary: SegmentSummary) -> list[str]:
+        """Return the lines of a sealed segment after verifying its checksum.
+
+        Raises ``ValueError`` when the file is missing or its content does
+        not match the manifest — sealed history is immutable, so any
+        difference is corruption.
+        """
+        path = self._dir / summary.name
+        try:
+            with gzip.open(path, "rb") as fh:
+                data = fh.read()
+        except (OSError, EOFError) as exc:
+            raise ValueError(f"sealed segment {path} is unreadable: {exc}") from exc
+        if len(data) != summary.bytes or hashlib.sha256(data).hexdigest() != summary.sha256:
+            raise ValueError(f"sealed segment {path} does not match its manifest checksum.")
+        return data.decode("utf-8").splitlines()
+
+    def usable_checkpoint(self, manifest: SegmentManifest) -> ProjectionCheckpoint | None:
+        """Return the manifest's checkpoint if replay can restore from it.
+
+        Usable means: built against the current ``SCHEMA_VERSION``, ending on
+        a sealed-segment boundary, and byte-identical to what compaction
+        recorded. Anything else returns None and replay falls back to the
+        sealed segments — never an error, the checkpoint is only a cache.
+        """
+        checkpoint = manifest.checkpoint
+        if checkpoint is None or checkpoint.schema_version != SCHEMA_VERSION:
+            return None
+        if checkpoint.through_seq not in {s.last_seq for s in manifest.segments}:
+            return None
+        if not self.checkpoint_path.exists():
+            return None
+        if _file_sha256(self.checkpoint_path) != checkpoint.sha256:
+            return None
+        return checkpoint
+
+    def set_checkpoint(
+        self,
+        built_path: Path,
+        *,
+        through_seq: int,
+        created_at: datetime.datetime,
+    ) -> ProjectionCheckpoint:
+        """Move a freshly built projection into place and record it."""
+        checkpoint = ProjectionCheckpoint(
+            through_seq=through_seq,
+            schema_version=SCHEMA_VERSION,
+            sha256=_file_sha256(built_path),
+            created_at=created_at,
+        )
+        os.replace(built_path, self.checkpoint_path)
+        manifest = self.load_manifest()
+        manifest.checkpoint = checkpoint
+        self.write_manifest(manifest)
+        return checkpoint
+
+
+def iter_log_lines(events_path: str | os.PathLike[str]) -> Iterator[str]:
+    """Yield every raw line of the log: sealed segments, then the open segment.
+
+    Open-segment lines the manifest already covers (left behind by a crash
+    between the manifest write and the truncate) are skipped, so callers see
+    each event exactly once. For readers that want the whole history without
+    replaying it — ``migrate-events``, ``sync audit``.
+    """
+    store = SegmentStore(events_path)
+    manifest = store.load_manifest()
+    for summary in manifest.segments:
+        yield from store.read_segment(summary)
+    path = Path(events_path)
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if manifest.segments and _covered(line, manifest.last_seq):
+                continue
+            yield line.rstrip("\n")
+
+
+def _covered(line: str, last_seq: int) -> bool:
+    """True when *line* parses to an event id the manifest already sealed."""
+    try:
+        raw = json.loads(line)
+    except json.JSONDecodeError:
+        return False
+    seq = event_seq(raw.get("id")) if isinstance(raw, dict) else None
+    return seq is not None and seq <= last_seq
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -22,18 +22,20 @@ import json
 import logging
 import os
 import random
+import shutil
 import sqlite3
 import sys
 import threading
 import time
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import contextmanager
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, NamedTuple
 
 from pydantic import BaseModel
 
 from fakoli_state.state.backend import (
-    BackendError,  # noqa: F401
+    BackendError,
     EventRejected,
     IdempotentNoOp,
     SchemaMismatch,
@@ -83,6 +85,12 @@ from fakoli_state.state.payloads import (
     TaskSyncedFromRemotePayload,
 )
 from fakoli_state.state.schema import DDL, SCHEMA_VERSION
+from fakoli_state.state.segments import (
+    ProjectionCheckpoint,
+    SegmentManifest,
+    SegmentStore,
+    event_seq,
+)
 
 if TYPE_CHECKING:
     from fakoli_state.clock import Clock
@@ -209,6 +217,12 @@ class SqliteBackend:
                    envelope and order-tolerant replay, so events.jsonl can be
                    committed and merged with ``merge=union`` (git-backed
                    events Phase A, docs/specs/2026-06-10-git-backed-events.md).
+    segment_max_events / segment_max_bytes :
+                   local mode only — seal the open segment (events.jsonl)
+                   into ``segments/`` once it holds this many events / bytes.
+                   ``None`` (default) disables that trigger; both ``None``
+                   means the log is never sealed automatically. See
+                   ``state/segments.py``.
     sleep_fn     : injectable sleep used by the flock contention backoff in
                    ``_append_lock``. Defaults to ``time.sleep``; tests inject
                    a fake that advances a fake monotonic counter instead of
@@ -236,6 +250,8 @@ class SqliteBackend:
         clock: Clock,
         durability: str = "relaxed",
         events_storage: str = "local",
+        segment_max_events: int | None = None,
+        segment_max_bytes: int | None = None,
         sleep_fn: Callable[[float], None] = time.sleep,
         monotonic_fn: Callable[[], float] = time.monotonic,
     ) -> None:
@@ -244,6 +260,15 @@ class SqliteBackend:
         self._clock = clock
         self._durability = durability
         self._events_storage = events_storage
+        self._segment_max_events = segment_max_events
+        self._segment_max_bytes = segment_max_bytes
+        # Sealed segments + manifest beside the log. Read-side support is
+        # unconditional (a log sealed by one process replays in every other);
+        # only the seal trigger depends on the thresholds above.
+        self._segments = SegmentStore(events_path)
+        # Highest event seq already sealed, as of the last manifest read —
+        # the seal trigger's event count is ``_next_seq - _sealed_through``.
+        self._sealed_through: int = 0
         self._sleep_fn = sleep_fn
         self._monotonic_fn = monotonic_fn
         self._conn: sqlite3.Connection | None = None
@@ -341,6 +366,8 @@ class SqliteBackend:
         # id authority; we never read SQLite MAX(id) for this purpose).
         log_max = self._scan_tail_id()
         self._next_seq = log_max
+        if self._events_storage != "git":
+            self._sealed_through = self._segments.load_manifest().last_seq
 
         # Forward catch-up: if projection is behind the log, re-apply the tail.
         # Suppress audit side-effects during catch-up (same contract as replay).
@@ -396,6 +423,8 @@ class SqliteBackend:
           3. Append the materialized Event line to ``events.jsonl`` (log-first).
           4. If ``durability="strict"``: fsync the log file before COMMIT.
           5. ``BEGIN IMMEDIATE; _write_<action>; _insert_event_row; COMMIT``.
+          6. Local mode with a segment threshold set: seal the open segment
+             once it is full (``_seal_open_segment``).
 
         On write failure after log append (step 3 succeeded, step 5 raised):
           - ROLLBACK SQLite.
@@ -550,13 +579,19 @@ class SqliteBackend:
                     f"Transaction aborted for event {event_id!r} (log line remains): {exc}"
                 ) from exc
 
+            # ---- Phase 6: seal the open segment once it is full ----
+            # Still under the flock: sealing truncates events.jsonl, which no
+            # other writer may append to mid-seal.
+            if self._events_storage != "git" and self._open_segment_full():
+                self._seal_open_segment()
+
         return event
 
     # ------------------------------------------------------------------
     # Replay
     # ------------------------------------------------------------------
 
-    def replay_from_empty(self, events_path: str) -> None:
+    def replay_from_empty(self, events_path: str, *, use_checkpoint: bool = True) -> None:
         """Reconstruct state.db from events.jsonl. Strict no-skip replay.
 
         Steps (SL1-RR-1)
@@ -569,6 +604,13 @@ class SqliteBackend:
         4. Torn trailing line (from a crash mid-append) is tolerated and skipped.
            Any interior malformed line raises — that is corruption, not a torn write.
         5. Re-seed ``_next_seq`` from the max id seen during replay.
+
+        Sealed segments (local mode): when ``segments/manifest.json`` sits
+        beside *events_path*, the sealed segments are replayed in manifest
+        order before the open segment. With ``use_checkpoint`` (default) and
+        a usable compaction checkpoint, step 1 restores ``checkpoint.db``
+        instead of starting empty and only the segments sealed after it are
+        applied. ``use_checkpoint=False`` always replays the full history.
         """
         if self._events_storage == "git":
             # v1.22.0 — order-tolerant replay; see _replay_from_empty_git.
@@ -587,6 +629,12 @@ class SqliteBackend:
             if os.path.exists(path):
                 os.remove(path)
 
+        store = SegmentStore(events_path)
+        manifest = store.load_manifest()
+        checkpoint = store.usable_checkpoint(manifest) if use_checkpoint else None
+        if checkpoint is not None:
+            shutil.copyfile(store.checkpoint_path, self._db_path)
+
         # Re-open fresh.  initialize() will also seed _next_seq via scan_tail
         # and run forward catch-up — but since we are rebuilding from scratch
         # the catch-up will be a no-op (table_max == log_max after replay).
@@ -596,64 +644,31 @@ class SqliteBackend:
         try:
             self.initialize()
 
-            if not os.path.exists(events_path):
-                return
-
             conn = self._require_conn()
-            last_event_id = 0
-
-            with open(events_path, encoding="utf-8") as fh:
-                lines = fh.readlines()
+            last_event_id = checkpoint.through_seq if checkpoint is not None else 0
 
-            for i, raw_line in enumerate(lines):
-                stripped = raw_line.strip()
-                if not stripped:
+            for summary in manifest.segments:
+                if checkpoint is not None and summary.last_seq <= checkpoint.through_seq:
                     continue
+                last_event_id = max(
+                    last_event_id,
+                    self._replay_local_lines(
+                        conn,
+                        store.read_segment(summary),
+                        source=summary.name,
+                        tolerate_torn_tail=False,
+                    ),
+                )
 
-                # Determine if this is the last (possibly torn) line.
-                is_last = i == len(lines) - 1
-
-                try:
-                    raw: dict[str, Any] = json.loads(stripped)
-                except json.JSONDecodeError as exc:
-                    if is_last:
-                        # Torn trailing line — tolerate silently.
-                        logger.debug(
-                            "replay_from_empty: skipping torn trailing line (line %d): %s",
-                            i + 1,
-                            exc,
-                        )
-                        break
-                    # Interior malformed line — this is corruption.
-                    raise ValueError(
-                        f"replay_from_empty: malformed JSON on interior line {i + 1}: {exc}"
-                    ) from exc
-
-                try:
-                    event = Event.model_validate(raw)
-                except Exception as exc:
-                    if is_last:
-                        # Torn/corrupt trailing line — tolerate.
-                        logger.debug(
-                            "replay_from_empty: skipping invalid trailing event (line %d): %s",
-                            i + 1,
-                            exc,
-                        )
-                        break
-                    raise ValueError(
-                        f"replay_from_empty: cannot parse Event on interior line {i + 1}: {exc}"
-                    ) from exc
-
-                # Apply via _write_* only — no _check_*, no logging.
-                self._apply_write_only(conn, event)
-
-                # Track max id for counter re-sync.
-                try:
-                    seq = int(event.id[1:])
-                    if seq > last_event_id:
-                        last_event_id = seq
-                except (ValueError, IndexError):
-                    pass
+            if os.path.exists(events_path):
+                with open(events_path, encoding="utf-8") as fh:
+                    lines = fh.readlines()
+                last_event_id = max(
+                    last_event_id,
+                    self._replay_local_lines(
+                        conn, lines, skip_through=manifest.last_seq
+                    ),
+                )
 
             # Re-seed counter from the max id replayed. scan_tail already seeded it
             # from the log during initialize() above, but we keep it consistent with
@@ -663,6 +678,78 @@ class SqliteBackend:
         finally:
             self._replaying = False
 
+    def _replay_local_lines(
+        self,
+        conn: sqlite3.Connection,
+        lines: list[str],
+        *,
+        source: str | None = None,
+        tolerate_torn_tail: bool = True,
+        skip_through: int = 0,
+    ) -> int:
+        """Apply one segment's lines in file order; return the max seq applied.
+
+        The strict local replay loop, shared by the open segment and sealed
+        segments. ``source`` names a sealed segment in error messages; sealed
+        segments pass ``tolerate_torn_tail=False`` because they only ever
+        hold complete, validated lines. Lines with a seq at or below
+        ``skip_through`` are already covered by a sealed segment (crash
+        between manifest write and truncate) and are skipped.
+        """
+        where = f" of {source}" if source else ""
+        last_event_id = 0
+        for i, raw_line in enumerate(lines):
+            stripped = raw_line.strip()
+            if not stripped:
+                continue
+
+            # Determine if this is the last (possibly torn) line.
+            is_last = tolerate_torn_tail and i == len(lines) - 1
+
+            try:
+                raw: dict[str, Any] = json.loads(stripped)
+            except json.JSONDecodeError as exc:
+                if is_last:
+                    # Torn trailing line — tolerate silently.
+                    logger.debug(
+                        "replay_from_empty: skipping torn trailing line (line %d): %s",
+                        i + 1,
+                        exc,
+                    )
+                    break
+                # Interior malformed line — this is corruption.
+                raise ValueError(
+                    f"replay_from_empty: malformed JSON on interior line {i + 1}{where}: {exc}"
+                ) from exc
+
+            try:
+                event = Event.model_validate(raw)
+            except Exception as exc:
+                if is_last:
+                    # Torn/corrupt trailing line — tolerate.
+                    logger.debug(
+                        "replay_from_empty: skipping invalid trailing event (line %d): %s",
+                        i + 1,
+                        exc,
+                    )
+                    break
+                raise ValueError(
+                    f"replay_from_empty: cannot parse Event on interior line {i + 1}{where}: "
+                    f"{exc}"
+                ) from exc
+
+            seq = event_seq(event.id)
+            if skip_through and seq is not None and seq <= skip_through:
+                continue
+
+            # Apply via _write_* only — no _check_*, no logging.
+            self._apply_write_only(conn, event)
+
+            # Track max id for counter re-sync.
+            if seq is not None and seq > last_event_id:
+                last_event_id = seq
+        return last_event_id
+
     def _replay_from_empty_git(self, events_path: str) -> None:
         """Order-tolerant rebuild for ``events_storage: git`` (v1.22.0 Phase A).
 
@@ -759,6 +846,86 @@ class SqliteBackend:
         finally:
             self._replaying = False
 
+    # ------------------------------------------------------------------
+    # Segments / compaction (local mode)
+    # ------------------------------------------------------------------
+
+    def compact_events(self) -> ProjectionCheckpoint | None:
+        """Seal the open segment and fold sealed history into a checkpoint.
+
+        1. Under the append flock: seal whatever the open segment holds, so
+           the checkpoint covers every event appended so far.
+        2. Outside the flock (sealed segments are immutable): build
+           ``segments/checkpoint.db`` by replaying sealed segments into a
+           scratch projection — starting from the previous usable checkpoint
+           when there is one, so repeated compaction only folds new segments.
+        3. Under the flock again: move the checkpoint into place and record
+           it in the manifest.
+
+        Sealed segments are kept — the checkpoint is a cache over them, and
+        ``replay_from_empty(..., use_checkpoint=False)`` still rebuilds from
+        full history. Returns None when nothing has been sealed.
+
+        Raises ``BackendError`` in git mode, which never seals.
+        """
+        if self._events_storage == "git":
+            raise BackendError(
+                "compact_events: git-mode logs are committed and merged whole; "
+                "segmentation applies to events_storage: local only."
+            )
+        with self._append_lock():
+            if os.path.getsize(self._events_path) > 0:
+                self._seal_open_segment()
+            manifest = self._segments.load_manifest()
+        if not manifest.segments:
+            return None
+
+        store = self._segments
+        through_seq = manifest.last_seq
+        base = store.usable_checkpoint(manifest)
+        if base is not None and base.through_seq == through_seq:
+            return base
+
+        built = store.directory / (store.checkpoint_path.name + ".tmp")
+        for suffix in ("", "-wal", "-shm"):
+            stale = Path(str(built) + suffix)
+            if stale.exists():
+                stale.unlink()
+        if base is not None:
+            shutil.copyfile(store.checkpoint_path, built)
+
+        scratch = SqliteBackend(
+            db_path=str(built),
+            events_path=self._events_path,
+            clock=self._clock,
+        )
+        # _replaying: no forward catch-up against the live log on open, and
+        # no audit side effects from _write_* while folding history.
+        scratch._replaying = True
+        try:
+            scratch.initialize()
+            conn = scratch._require_conn()
+            for summary in manifest.segments:
+                if base is not None and summary.last_seq <= base.through_seq:
+                    continue
+                scratch._replay_local_lines(
+                    conn,
+                    store.read_segment(summary),
+                    source=summary.name,
+                    tolerate_torn_tail=False,
+                )
+            # Self-contained file: fold the WAL back in and leave WAL mode so
+            # the checkpoint's bytes (and checksum) are stable once closed.
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            scratch.close()
+
+        with self._append_lock():
+            return store.set_checkpoint(
+                built, through_seq=through_seq, created_at=self._clock.now()
+            )
+
     # ------------------------------------------------------------------
     # Query methods
     # ------------------------------------------------------------------
@@ -957,6 +1124,16 @@ class SqliteBackend:
             ).fetchall()
         return [(r[0], r[1]) for r in rows]
 
+    def latest_event_id(self) -> str | None:
+        """Return the id of the last row inserted into ``events``, or None."""
+        conn = self._require_conn()
+        # rowid, not id: git-mode ids (E-<hex>) carry no order, and a replay
+        # inserts rows in application order either way.
+        row = conn.execute(
+            "SELECT id FROM events ORDER BY rowid DESC LIMIT 1"
+        ).fetchone()
+        return None if row is None else str(row[0])
+
     def get_latest_evidence(self, task_id: str) -> Evidence | None:
         """Return the most recently submitted Evidence for task_id, or None."""
         conn = self._require_conn()
@@ -1327,6 +1504,9 @@ class SqliteBackend:
         backward through the candidate lines in the tail window and return the
         *first* line that carries a valid E###### id — skipping the torn/idless
         trailing line and falling back to the previous complete line.
+
+        An empty open segment (just sealed) falls back to the manifest's last
+        sealed id, so numbering continues across the seal.
         """
         # Walk from the last line backwards; return the first valid E###### id found.
         # This skips a torn or id-less trailing line and falls back to the previous
@@ -1343,7 +1523,7 @@ class SqliteBackend:
             except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
                 continue
 
-        return 0
+        return self._segments.load_manifest().last_seq
 
     def _scan_tail_envelope(self) -> tuple[str | None, int]:
         """Return (event_id, lamport) of the last valid log line — git mode.
@@ -1434,6 +1614,71 @@ class SqliteBackend:
         if log_ids != table_ids:
             self.replay_from_empty(self._events_path)
 
+    def _open_segment_full(self) -> bool:
+        """True when the open segment crossed a configured seal threshold.
+
+        Called under the append flock after every local-mode append. The
+        byte check is one ``stat``; the event count comes from the in-memory
+        counters, so the common not-full case reads nothing from disk.
+        """
+        if self._segment_max_bytes is not None:
+            try:
+                if os.path.getsize(self._events_path) >= self._segment_max_bytes:
+                    return True
+            except OSError:
+                return False
+        if self._segment_max_events is not None:
+            if self._next_seq - self._sealed_through < self._segment_max_events:
+                return False
+            # Another process may have sealed since we last looked; recount
+            # against the manifest before sealing a short segment.
+            self._sealed_through = self._segments.load_manifest().last_seq
+            return self._next_seq - self._sealed_through >= self._segment_max_events
+        return False
+
+    def _seal_open_segment(self) -> SegmentManifest | None:
+        """Move the open segment's events into a sealed segment. Caller holds the flock.
+
+        Refuses (warns, returns None) when the open segment holds a line that
+        does not parse — sealing must never fossilize a torn or corrupt line
+        into compressed history; the next append after the damage is dealt
+        with retries. Lines the manifest already covers are dropped. A seal
+        failure never fails the append that triggered it: the event is
+        already committed, and the next append simply tries again.
+        """
+        try:
+            manifest = self._segments.load_manifest()
+            with open(self._events_path, encoding="utf-8") as fh:
+                raw_lines = fh.read().splitlines()
+            pending: list[str] = []
+            for raw_line in raw_lines:
+                stripped = raw_line.strip()
+                if not stripped:
+                    continue
+                try:
+                    seq = event_seq(json.loads(stripped).get("id"))
+                except (json.JSONDecodeError, AttributeError):
+                    seq = None
+                if seq is None:
+                    logger.warning(
+                        "seal: %s holds an unparseable or id-less line; "
+                        "leaving the open segment unsealed",
+                        self._events_path,
+                    )
+                    return None
+                if seq > manifest.last_seq:
+                    pending.append(stripped)
+            if pending:
+                self._segments.seal(pending, sealed_at=self._clock.now())
+                manifest = self._segments.load_manifest()
+            # Truncate in place (same inode) — the flock we hold is on it.
+            os.truncate(self._events_path, 0)
+        except (OSError, ValueError) as exc:
+            logger.warning("seal: could not seal %s: %s", self._events_path, exc)
+            return None
+        self._sealed_through = manifest.last_seq
+        return manifest
+
     def _serialize_event_line(self, event: Event) -> str:
         """Serialize *event* to its newline-terminated JSONL line.
 
@@ -1483,7 +1728,8 @@ class SqliteBackend:
         via ``replay_from_empty``, or ``initialize()`` sets it directly when
         catch-up runs outside of replay).
         """
-        if not os.path.exists(self._events_path):
+        manifest = self._segments.load_manifest()
+        if not manifest.segments and not os.path.exists(self._events_path):
             if from_seq <= to_seq:
                 raise TransactionAborted(
                     f"forward_catch_up: events.jsonl does not exist but "
@@ -1493,28 +1739,18 @@ class SqliteBackend:
 
         target_ids = {f"E{n:06d}" for n in range(from_seq, to_seq + 1)}
 
-        with open(self._events_path, encoding="utf-8") as fh:
-            for raw_line in fh:
-                stripped = raw_line.strip()
-                if not stripped:
-                    continue
-                try:
-                    raw: dict[str, Any] = json.loads(stripped)
-                except json.JSONDecodeError:
-                    continue
-                event_id = raw.get("id", "")
-                if event_id not in target_ids:
-                    continue
-                try:
-                    event = Event.model_validate(raw)
-                except Exception as exc:
-                    raise TransactionAborted(
-                        f"forward_catch_up: cannot parse event {event_id!r}: {exc}"
-                    ) from exc
-                self._apply_write_only(conn, event)
-                target_ids.discard(event_id)
-                if not target_ids:
-                    break
+        # Sealed segments first, and only those whose id range overlaps the
+        # gap — the manifest summary answers that without opening the file.
+        for summary in manifest.segments:
+            if summary.last_seq < from_seq or summary.first_seq > to_seq:
+                continue
+            self._catch_up_lines(conn, self._segments.read_segment(summary), target_ids)
+            if not target_ids:
+                return
+
+        if os.path.exists(self._events_path):
+            with open(self._events_path, encoding="utf-8") as fh:
+                self._catch_up_lines(conn, fh, target_ids)
 
         if target_ids:
             raise TransactionAborted(
@@ -1522,6 +1758,35 @@ class SqliteBackend:
                 f"to converge on: {sorted(target_ids)}"
             )
 
+    def _catch_up_lines(
+        self,
+        conn: sqlite3.Connection,
+        lines: Iterable[str],
+        target_ids: set[str],
+    ) -> None:
+        """Apply every line whose id is in *target_ids*; discard it from the set."""
+        for raw_line in lines:
+            stripped = raw_line.strip()
+            if not stripped:
+                continue
+            try:
+                raw: dict[str, Any] = json.loads(stripped)
+            except json.JSONDecodeError:
+                continue
+            event_id = raw.get("id", "")
+            if event_id not in target_ids:
+                continue
+            try:
+                event = Event.model_validate(raw)
+            except Exception as exc:
+                raise TransactionAborted(
+                    f"forward_catch_up: cannot parse event {event_id!r}: {exc}"
+                ) from exc
+            self._apply_write_only(conn, event)
+            target_ids.discard(event_id)
+            if not target_ids:
+                break
+
     def _apply_write_only(
         self,
         conn: sqlite3.Connection,
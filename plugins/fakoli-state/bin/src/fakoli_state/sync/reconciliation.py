@@ -8,6 +8,35 @@ loose coordination:
    project's git branches and worktrees.
 3. **External sync targets** (GitHub Issues today; pluggable in future).
 
+:meth:`ReconciliationEngine.scan` reads each source once — a
+:class:`ScanSnapshot` of backend rows plus one batched git snapshot and the
+packet listing — and then runs the six checks concurrently against it. The
+checks are pure functions of the snapshot: none re-queries the backend or
+spawns git.
+
+Incremental scans
+-----------------
+An engine given a ``watermark_path`` (the CLI passes
+``.fakoli-state/reconcile-state.json``) persists what the last scan saw: the
+newest event id, the packets directory's mtime, a signature of git's ref and
+worktree metadata, each active claim's lease expiry and each sync mapping's
+last scan time, plus every check's discrepancies. The next scan reads those
+marks first — one indexed query and a handful of ``stat`` calls — and re-runs
+only the checks whose sources moved:
+
+* a new event invalidates everything (tasks, claims and mappings all live
+  behind the event log);
+* a git signature change re-runs ``orphan_branch`` / ``orphan_worktree``;
+* a packets-directory mtime change re-runs ``orphan_packet``;
+* the clock re-runs ``stale_claim`` once any lease has expired, and
+  re-checks only the mappings whose ``last_synced_at`` crossed the drift
+  threshold since their last scan.
+
+Every other check reuses its cached result, so a repeated scan of a quiet
+project touches neither git nor the packets directory. ``scan(full=True)``
+ignores the watermark; a missing, unreadable or differently-configured one is
+treated the same way. The watermark is a cache, never an error source.
+
 Each check produces a :class:`Discrepancy`; the collection is rolled up
 into a :class:`ReconciliationReport`. :meth:`ReconciliationEngine.fix`
 applies suggested remediations and returns a list of
@@ -25,9 +54,15 @@ CLI safety prompt.
 from __future__ import annotations
 
 import datetime
+import hashlib
+import os
 import re
 import shutil
 import subprocess
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import StrEnum
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -37,6 +72,7 @@ from pydantic import BaseModel, ConfigDict, Field
 if TYPE_CHECKING:
     from fakoli_state.clock import Clock
     from fakoli_state.state.backend import Backend
+    from fakoli_state.state.models import Claim, SyncMapping, Task
 
 
 # ---------------------------------------------------------------------------
@@ -56,6 +92,15 @@ _DEFAULT_DRIFT_THRESHOLD_DAYS = 7
 # uppercased task id ("T001").
 _AGENT_BRANCH_RE = re.compile(r"^agent/(t\d+)(?:-.*)?$")
 
+# The six checks are cheap in-memory passes once the snapshot exists; the
+# pool mainly overlaps the snapshot's git subprocesses with the backend reads
+# and the packet-directory listing.
+_SCAN_WORKERS = 6
+
+# Persisted scan watermark, written beside state.db by the CLI.
+WATERMARK_FILENAME = "reconcile-state.json"
+_WATERMARK_VERSION = 1
+
 
 # ---------------------------------------------------------------------------
 # Public models — DiscrepancyKind / Severity / Discrepancy / Report / FixAction
@@ -189,6 +234,82 @@ class FixAction(BaseModel):
     error: str | None = None
 
 
+# ---------------------------------------------------------------------------
+# Scan snapshot
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _GitSnapshot:
+    """Local branches + worktrees, read in one batched pass.
+
+    ``is_repo`` is False when git is missing, *state_dir* is not inside a
+    repository, or the read failed/timed out — the branch and worktree
+    checks then report nothing (reconciliation is best-effort).
+    """
+
+    is_repo: bool = False
+    branches: tuple[str, ...] = ()
+    worktrees: tuple[dict[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class _ScanSnapshot:
+    """Everything one :meth:`ReconciliationEngine.scan` reads, read once.
+
+    ``packets`` is None when ``.fakoli-state/packets/`` does not exist.
+    """
+
+    now: datetime.datetime
+    tasks: tuple[Task, ...] = ()
+    active_claims: tuple[Claim, ...] = ()
+    sync_mappings: tuple[SyncMapping, ...] = ()
+    git: _GitSnapshot = field(default_factory=_GitSnapshot)
+    packets: tuple[Path, ...] | None = None
+
+
+@dataclass(frozen=True)
+class _SourceMarks:
+    """Cheap change markers for each scan source, read before the snapshot.
+
+    Reading them first means a change racing the scan leaves the stored
+    watermark behind the data, so the next scan re-checks rather than
+    trusting a result computed from older inputs.
+    """
+
+    last_event_id: str | None
+    packets_mtime_ns: int | None
+    git_signature: str | None
+
+
+class _MappingScan(BaseModel):
+    """Per-mapping drift bookkeeping in the watermark."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    scanned_at: datetime.datetime
+    # ``last_synced_at + drift threshold``: the moment the mapping turns
+    # stale. None once it is flagged — nothing the clock does changes it then.
+    stale_after: datetime.datetime | None = None
+
+
+class _ScanWatermark(BaseModel):
+    """``reconcile-state.json`` — what the last scan saw and found."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    version: int = _WATERMARK_VERSION
+    updated_at: datetime.datetime
+    # Engine settings the cached results depend on; a change means a full pass.
+    params: dict[str, Any]
+    last_event_id: str | None = None
+    packets_mtime_ns: int | None = None
+    git_signature: str | None = None
+    claim_leases: dict[str, datetime.datetime] = Field(default_factory=dict)
+    mappings: dict[str, _MappingScan] = Field(default_factory=dict)
+    results: dict[str, list[Discrepancy]] = Field(default_factory=dict)
+
+
 # ---------------------------------------------------------------------------
 # ReconciliationEngine
 # ---------------------------------------------------------------------------
@@ -219,6 +340,10 @@ class ReconciliationEngine:
         this project. Used by ``missing_sync_mapping``: a ``done`` task
         with no SyncMapping is only flagged when at least one provider
         is configured. Empty by default — calling code resolves config.
+    watermark_path:
+        Where to persist the scan watermark (see *Incremental scans* in the
+        module docstring). None — the default — keeps every scan a full,
+        stateless pass.
     """
 
     def __init__(
@@ -229,6 +354,7 @@ class ReconciliationEngine:
         clock: Clock | None = None,
         drift_threshold_days: int = _DEFAULT_DRIFT_THRESHOLD_DAYS,
         configured_providers: list[str] | None = None,
+        watermark_path: Path | None = None,
     ) -> None:
         self._backend = backend
         self._state_dir = state_dir
@@ -240,21 +366,106 @@ class ReconciliationEngine:
         self._clock = clock
         self._drift_threshold = datetime.timedelta(days=drift_threshold_days)
         self._configured_providers = list(configured_providers or [])
+        self._watermark_path = watermark_path
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def scan(self) -> ReconciliationReport:
-        """Run every check and return a :class:`ReconciliationReport`."""
+    def scan(self, *, full: bool = False) -> ReconciliationReport:
+        """Run every check and return a :class:`ReconciliationReport`.
+
+        Two phases on one thread pool:
+
+        1. Snapshot — the git read (``for-each-ref`` + ``worktree list``,
+           run concurrently) and the packet-directory listing go to the
+           pool while this thread reads tasks, active claims and sync
+           mappings from the backend. The backend is only ever touched
+           from the calling thread.
+        2. Checks — the six ``_scan_*`` checks run concurrently against
+           the immutable snapshot.
+
+        With a ``watermark_path`` only the checks whose sources changed
+        since the stored watermark run, and the snapshot reads only what
+        those checks need; ``full=True`` forces a complete pass (and
+        rewrites the watermark from it).
+        """
         scanned_at = self._clock.now()
-        discrepancies: list[Discrepancy] = []
-        discrepancies.extend(self._scan_orphan_branches())
-        discrepancies.extend(self._scan_orphan_packets())
-        discrepancies.extend(self._scan_orphan_worktrees())
-        discrepancies.extend(self._scan_stale_claims())
-        discrepancies.extend(self._scan_missing_sync_mappings())
-        discrepancies.extend(self._scan_drift_sync_state())
+        marks = self._read_marks() if self._watermark_path is not None else None
+        previous = None if full or marks is None else self._load_watermark(marks)
+
+        rerun: set[DiscrepancyKind]
+        results: dict[DiscrepancyKind, list[Discrepancy]] = {}
+        due_mappings: list[str] = []
+        if previous is None:
+            rerun = set(DiscrepancyKind)
+        else:
+            assert marks is not None
+            rerun = set()
+            if marks.git_signature != previous.git_signature:
+                rerun |= {DiscrepancyKind.orphan_branch, DiscrepancyKind.orphan_worktree}
+            if marks.packets_mtime_ns != previous.packets_mtime_ns:
+                rerun.add(DiscrepancyKind.orphan_packet)
+            # Expired leases stay in the watermark until released, so the
+            # check keeps re-running (cheaply) while any claim is stale —
+            # its description quotes the current time.
+            if any(lease < scanned_at for lease in previous.claim_leases.values()):
+                rerun.add(DiscrepancyKind.stale_claim)
+            due_mappings = sorted(
+                key
+                for key, m in previous.mappings.items()
+                if m.stale_after is not None and scanned_at > m.stale_after
+            )
+            for kind in DiscrepancyKind:
+                if kind not in rerun:
+                    results[kind] = list(previous.results.get(str(kind), []))
+
+        checks: dict[DiscrepancyKind, Callable[[_ScanSnapshot], list[Discrepancy]]] = {
+            DiscrepancyKind.orphan_branch: self._scan_orphan_branches,
+            DiscrepancyKind.orphan_packet: self._scan_orphan_packets,
+            DiscrepancyKind.orphan_worktree: self._scan_orphan_worktrees,
+            DiscrepancyKind.stale_claim: self._scan_stale_claims,
+            DiscrepancyKind.missing_sync_mapping: self._scan_missing_sync_mappings,
+            DiscrepancyKind.drift_sync_state: self._scan_drift_sync_state,
+        }
+        to_run = [kind for kind in checks if kind in rerun]
+        snapshot = _ScanSnapshot(now=scanned_at)
+        if to_run:
+            with ThreadPoolExecutor(
+                max_workers=_SCAN_WORKERS, thread_name_prefix="reconcile"
+            ) as pool:
+                snapshot = self._take_snapshot(pool, scanned_at, rerun)
+                for kind, found in zip(
+                    to_run,
+                    pool.map(lambda kind: checks[kind](snapshot), to_run),
+                    strict=True,
+                ):
+                    results[kind] = found
+
+        # Mappings that crossed the drift threshold since their last scan:
+        # re-check just those (the events are unchanged, so nothing else
+        # about any mapping can have moved).
+        rechecked: list[SyncMapping] = []
+        for key in due_mappings:
+            task_id, _, external_system = key.partition("/")
+            mapping = self._backend.get_sync_mapping(task_id, external_system=external_system)
+            if mapping is not None:
+                rechecked.append(mapping)
+        if rechecked:
+            results[DiscrepancyKind.drift_sync_state].extend(
+                self._scan_drift_sync_state(
+                    _ScanSnapshot(now=scanned_at, sync_mappings=tuple(rechecked))
+                )
+            )
+
+        if marks is not None and (previous is None or rerun or due_mappings):
+            self._write_watermark(
+                self._next_watermark(
+                    marks, previous, snapshot, rerun, rechecked, results, scanned_at
+                )
+            )
+
+        discrepancies = [d for found in results.values() for d in found]
 
         # Deterministic order: by kind ASC, then target_id ASC. Makes
         # report-equality tests + CLI rendering stable.
@@ -286,7 +497,12 @@ class ReconciliationEngine:
         message in ``error``. This is the "best-effort" wrapping loop
         the critic flagged on PR #47: do NOT let one bad branch break
         the rest of the reconciliation pass.
+
+        A non-dry run drops the scan watermark afterwards, so the next scan
+        is a full pass over whatever the fixes left behind.
         """
+        if not dry_run:
+            self._drop_watermark()
         actions: list[FixAction] = []
         for d in report.discrepancies:
             command = d.suggested_fix
@@ -316,18 +532,159 @@ class ReconciliationEngine:
                 ))
         return actions
 
+    # ------------------------------------------------------------------
+    # Snapshot + watermark
+    # ------------------------------------------------------------------
+
+    def _take_snapshot(
+        self,
+        pool: ThreadPoolExecutor,
+        now: datetime.datetime,
+        kinds: set[DiscrepancyKind],
+    ) -> _ScanSnapshot:
+        """Read the sources the checks in *kinds* need, each at most once."""
+        needs_git = bool(kinds & {DiscrepancyKind.orphan_branch, DiscrepancyKind.orphan_worktree})
+        git_future = pool.submit(_git_snapshot, self._state_dir) if needs_git else None
+        packets_future = (
+            pool.submit(_list_packets, self._state_dir / ".fakoli-state" / "packets")
+            if DiscrepancyKind.orphan_packet in kinds
+            else None
+        )
+        needs_tasks = bool(kinds & {
+            DiscrepancyKind.orphan_branch,
+            DiscrepancyKind.orphan_packet,
+            DiscrepancyKind.orphan_worktree,
+            DiscrepancyKind.missing_sync_mapping,
+        })
+        needs_claims = bool(kinds & {DiscrepancyKind.orphan_worktree, DiscrepancyKind.stale_claim})
+        needs_mappings = bool(
+            kinds & {DiscrepancyKind.missing_sync_mapping, DiscrepancyKind.drift_sync_state}
+        )
+        return _ScanSnapshot(
+            now=now,
+            tasks=tuple(self._backend.list_tasks()) if needs_tasks else (),
+            active_claims=tuple(self._backend.list_active_claims()) if needs_claims else (),
+            sync_mappings=tuple(self._backend.list_sync_mappings()) if needs_mappings else (),
+            git=git_future.result() if git_future is not None else _GitSnapshot(),
+            packets=packets_future.result() if packets_future is not None else None,
+        )
+
+    def _params(self) -> dict[str, Any]:
+        """Engine settings a cached result depends on."""
+        return {
+            "state_dir": str(self._state_dir),
+            "configured_providers": list(self._configured_providers),
+            "drift_threshold_seconds": self._drift_threshold.total_seconds(),
+        }
+
+    def _read_marks(self) -> _SourceMarks:
+        packets_dir = self._state_dir / ".fakoli-state" / "packets"
+        try:
+            packets_mtime_ns: int | None = packets_dir.stat().st_mtime_ns
+        except OSError:
+            packets_mtime_ns = None
+        return _SourceMarks(
+            last_event_id=self._backend.latest_event_id(),
+            packets_mtime_ns=packets_mtime_ns,
+            git_signature=_git_signature(self._state_dir),
+        )
+
+    def _load_watermark(self, marks: _SourceMarks) -> _ScanWatermark | None:
+        """Return the stored watermark if its results can be reused, else None.
+
+        Reusable means: readable, the current format, written with the same
+        engine settings, and no event applied since. Anything else means a
+        full pass — the watermark is only a cache.
+        """
+        assert self._watermark_path is not None
+        try:
+            watermark = _ScanWatermark.model_validate_json(self._watermark_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if watermark.version != _WATERMARK_VERSION or watermark.params != self._params():
+            return None
+        if watermark.last_event_id != marks.last_event_id:
+            return None
+        return watermark
+
+    def _next_watermark(
+        self,
+        marks: _SourceMarks,
+        previous: _ScanWatermark | None,
+        snapshot: _ScanSnapshot,
+        rerun: set[DiscrepancyKind],
+        rechecked: list[SyncMapping],
+        results: dict[DiscrepancyKind, list[Discrepancy]],
+        now: datetime.datetime,
+    ) -> _ScanWatermark:
+        if previous is None or DiscrepancyKind.stale_claim in rerun:
+            claim_leases = {c.id: c.lease_expires_at for c in snapshot.active_claims}
+        else:
+            claim_leases = dict(previous.claim_leases)
+        if previous is None or DiscrepancyKind.drift_sync_state in rerun:
+            mappings = {
+                _mapping_key(m): _MappingScan(
+                    scanned_at=now, stale_after=self._stale_after(m, now=now)
+                )
+                for m in snapshot.sync_mappings
+            }
+        else:
+            mappings = dict(previous.mappings)
+        for mapping in rechecked:
+            mappings[_mapping_key(mapping)] = _MappingScan(
+                scanned_at=now, stale_after=self._stale_after(mapping, now=now)
+            )
+        return _ScanWatermark(
+            updated_at=now,
+            params=self._params(),
+            last_event_id=marks.last_event_id,
+            packets_mtime_ns=marks.packets_mtime_ns,
+            git_signature=marks.git_signature,
+            claim_leases=claim_leases,
+            mappings=mappings,
+            results={str(kind): found for kind, found in results.items()},
+        )
+
+    def _stale_after(
+        self, mapping: SyncMapping, *, now: datetime.datetime
+    ) -> datetime.datetime | None:
+        """When *mapping* turns stale, or None if the drift check flags it already."""
+        if str(mapping.sync_state) in ("conflict", "external_deleted"):
+            return None
+        stale_after = mapping.last_synced_at + self._drift_threshold
+        return None if now > stale_after else stale_after
+
+    def _write_watermark(self, watermark: _ScanWatermark) -> None:
+        """Atomically replace the watermark (tmp + rename); failures are ignored."""
+        assert self._watermark_path is not None
+        tmp = self._watermark_path.with_name(self._watermark_path.name + ".tmp")
+        try:
+            tmp.write_text(watermark.model_dump_json() + "\n", encoding="utf-8")
+            os.replace(tmp, self._watermark_path)
+        except OSError:
+            # A scan that cannot persist its watermark is still a correct
+            # scan; the next one just runs in full.
+            tmp.unlink(missing_ok=True)
+
+    def _drop_watermark(self) -> None:
+        if self._watermark_path is None:
+            return
+        try:
+            self._watermark_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
     # ------------------------------------------------------------------
     # Check 1 — orphan_branch
     # ------------------------------------------------------------------
 
-    def _scan_orphan_branches(self) -> list[Discrepancy]:
+    def _scan_orphan_branches(self, snapshot: _ScanSnapshot) -> list[Discrepancy]:
         """``agent/t*-*`` branches whose task id is not in the SQLite store."""
-        if not _is_git_repo(self._state_dir):
+        if not snapshot.git.is_repo:
             return []
-        branches = _git_list_branches(self._state_dir)
-        known_task_ids = {t.id.lower() for t in self._backend.list_tasks()}
+        known_task_ids = {t.id.lower() for t in snapshot.tasks}
         out: list[Discrepancy] = []
-        for branch in branches:
+        for branch in snapshot.git.branches:
             m = _AGENT_BRANCH_RE.match(branch)
             if m is None:
                 continue
@@ -352,20 +709,18 @@ class ReconciliationEngine:
     # Check 2 — orphan_packet
     # ------------------------------------------------------------------
 
-    def _scan_orphan_packets(self) -> list[Discrepancy]:
+    def _scan_orphan_packets(self, snapshot: _ScanSnapshot) -> list[Discrepancy]:
         """Packet files under ``.fakoli-state/packets/`` for missing tasks.
 
         Packet naming convention is ``<TASK_ID>.md`` (e.g. ``T001.md``);
-        anything that isn't a ``.md`` file is ignored.
+        anything that isn't a ``.md`` file is ignored (by
+        :func:`_list_packets`, when the snapshot is taken).
         """
-        packets_dir = self._state_dir / ".fakoli-state" / "packets"
-        if not packets_dir.exists():
+        if snapshot.packets is None:
             return []
-        known_task_ids = {t.id for t in self._backend.list_tasks()}
+        known_task_ids = {t.id for t in snapshot.tasks}
         out: list[Discrepancy] = []
-        for entry in sorted(packets_dir.iterdir()):
-            if not entry.is_file() or entry.suffix != ".md":
-                continue
+        for entry in snapshot.packets:
             task_id = entry.stem
             if task_id in known_task_ids:
                 continue
@@ -387,17 +742,14 @@ class ReconciliationEngine:
     # Check 3 — orphan_worktree
     # ------------------------------------------------------------------
 
-    def _scan_orphan_worktrees(self) -> list[Discrepancy]:
+    def _scan_orphan_worktrees(self, snapshot: _ScanSnapshot) -> list[Discrepancy]:
         """Worktrees pointing at ``agent/t*-*`` branches whose task is gone."""
-        if not _is_git_repo(self._state_dir):
+        if not snapshot.git.is_repo:
             return []
-        worktrees = _git_list_worktrees(self._state_dir)
-        known_task_ids = {t.id.lower() for t in self._backend.list_tasks()}
-        active_claims_by_task = {
-            c.task_id.lower() for c in self._backend.list_active_claims()
-        }
+        known_task_ids = {t.id.lower() for t in snapshot.tasks}
+        active_claims_by_task = {c.task_id.lower() for c in snapshot.active_claims}
         out: list[Discrepancy] = []
-        for wt in worktrees:
+        for wt in snapshot.git.worktrees:
             branch = wt.get("branch")
             if branch is None:
                 continue
@@ -441,11 +793,11 @@ class ReconciliationEngine:
     # Check 4 — stale_claim
     # ------------------------------------------------------------------
 
-    def _scan_stale_claims(self) -> list[Discrepancy]:
+    def _scan_stale_claims(self, snapshot: _ScanSnapshot) -> list[Discrepancy]:
         """Active claims whose ``lease_expires_at`` is in the past."""
-        now = self._clock.now()
+        now = snapshot.now
         out: list[Discrepancy] = []
-        for claim in self._backend.list_active_claims():
+        for claim in snapshot.active_claims:
             if claim.lease_expires_at >= now:
                 continue
             out.append(Discrepancy(
@@ -475,7 +827,7 @@ class ReconciliationEngine:
     # Check 5 — missing_sync_mapping
     # ------------------------------------------------------------------
 
-    def _scan_missing_sync_mappings(self) -> list[Discrepancy]:
+    def _scan_missing_sync_mappings(self, snapshot: _ScanSnapshot) -> list[Discrepancy]:
         """Done tasks without a SyncMapping for EACH configured provider.
 
         P2-2 fix: when a project configures multiple providers
@@ -490,18 +842,22 @@ class ReconciliationEngine:
         Each discrepancy carries ``payload['missing_provider']`` so the
         operator can see exactly which provider is unmapped, and the
         suggested-fix points at that specific provider id.
+
+        The lookup is keyed on ``(task_id, external_system)`` from the
+        snapshot's mappings — the same scoped match the per-task
+        ``get_sync_mapping(..., external_system=...)`` query made, without
+        one query per done task per provider.
         """
         if not self._configured_providers:
             return []
+        mapped = {(m.task_id, str(m.external_system)) for m in snapshot.sync_mappings}
         out: list[Discrepancy] = []
-        for task in self._backend.list_tasks(status="done"):
+        for task in snapshot.tasks:
+            if str(task.status) != "done":
+                continue
             for provider_id in self._configured_providers:
-                # Scoped lookup: pass ``external_system=`` so we get THIS
-                # provider's mapping (or None), not the ASC-first.
-                mapping = self._backend.get_sync_mapping(
-                    task.id, external_system=provider_id,
-                )
-                if mapping is not None:
+                # Scoped: THIS provider's mapping, not any provider's.
+                if (task.id, provider_id) in mapped:
                     continue
                 out.append(Discrepancy(
                     kind=DiscrepancyKind.missing_sync_mapping,
@@ -530,7 +886,7 @@ class ReconciliationEngine:
     # Check 6 — drift_sync_state
     # ------------------------------------------------------------------
 
-    def _scan_drift_sync_state(self) -> list[Discrepancy]:
+    def _scan_drift_sync_state(self, snapshot: _ScanSnapshot) -> list[Discrepancy]:
         """SyncMappings in conflict, externally deleted, or whose
         last_synced_at is too old.
 
@@ -541,9 +897,9 @@ class ReconciliationEngine:
         gone — operators had to grep stderr to discover dangling
         references.
         """
-        now = self._clock.now()
+        now = snapshot.now
         out: list[Discrepancy] = []
-        for mapping in self._backend.list_sync_mappings():
+        for mapping in snapshot.sync_mappings:
             state_str = str(mapping.sync_state)
             in_conflict = state_str == "conflict"
             externally_deleted = state_str == "external_deleted"
@@ -699,49 +1055,125 @@ class ReconciliationEngine:
 # ---------------------------------------------------------------------------
 
 
-def _is_git_repo(cwd: Path) -> bool:
-    """True if *cwd* is inside a git repository.
+def _git_snapshot(cwd: Path) -> _GitSnapshot:
+    """Read local branches and worktrees under *cwd* in one batched pass.
 
-    Mirrors :func:`fakoli_state.git_ops.branch.is_git_repo` but is duplicated
-    here so the reconciliation module does not pull a dependency on the
-    claim-flow helpers. Stderr is suppressed; timeouts and missing-git
-    both return False.
+    ``git for-each-ref`` and ``git worktree list --porcelain`` are started
+    together and share one ``_GIT_TIMEOUT_SECONDS`` deadline, replacing the
+    four sequential subprocesses (a ``rev-parse`` repo probe ahead of each
+    listing) the branch and worktree checks used to spawn. A non-zero
+    ``for-each-ref`` doubles as the repo probe: outside a repository it
+    fails, and the snapshot reports ``is_repo=False``. Stderr is discarded;
+    missing git, spawn errors and timeouts all yield an empty snapshot.
     """
     if shutil.which("git") is None:
-        return False
+        return _GitSnapshot()
+    argvs = (
+        ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/"],
+        ["git", "worktree", "list", "--porcelain"],
+    )
+    procs: list[subprocess.Popen[str]] = []
     try:
-        r = subprocess.run(
-            ["git", "rev-parse", "--git-dir"],
-            cwd=str(cwd),
-            capture_output=True,
-            timeout=_GIT_TIMEOUT_SECONDS,
-        )
+        for argv in argvs:
+            procs.append(subprocess.Popen(
+                argv,
+                cwd=str(cwd),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            ))
+        deadline = time.monotonic() + _GIT_TIMEOUT_SECONDS
+        outputs: list[str | None] = []
+        for proc in procs:
+            stdout, _ = proc.communicate(timeout=max(0.0, deadline - time.monotonic()))
+            outputs.append(stdout if proc.returncode == 0 else None)
     except (subprocess.TimeoutExpired, OSError):
-        return False
-    return r.returncode == 0
+        for proc in procs:
+            proc.kill()
+            proc.communicate()
+        return _GitSnapshot()
+    refs_out, worktrees_out = outputs
+    if refs_out is None:
+        return _GitSnapshot()
+    return _GitSnapshot(
+        is_repo=True,
+        branches=tuple(line.strip() for line in refs_out.splitlines() if line.strip()),
+        worktrees=tuple(_parse_worktree_porcelain(worktrees_out or "")),
+    )
+
+
+def _git_signature(cwd: Path) -> str | None:
+    """Hash the git metadata that changes whenever a branch or worktree does.
+
+    Stats — never spawns git — the files and directories git rewrites when a
+    local branch or worktree is created, deleted or checked out: ``HEAD``,
+    ``packed-refs``, ``reftable/``, every directory under ``refs/heads/``
+    (loose refs are written by rename, so the directory mtime moves), and
+    ``worktrees/<name>/HEAD``. Returns None outside a repository. A cheap
+    proxy for hashing the ``for-each-ref`` / ``worktree list`` output: an
+    unchanged signature lets an incremental scan skip both subprocesses.
+    """
+    dirs = _git_dirs(cwd)
+    if dirs is None:
+        return None
+    git_dir, common_dir = dirs
+    paths = [
+        git_dir / "HEAD",
+        common_dir / "HEAD",
+        common_dir / "packed-refs",
+        common_dir / "reftable",
+        common_dir / "reftable" / "tables.list",
+        common_dir / "worktrees",
+    ]
+    try:
+        with os.scandir(common_dir / "worktrees") as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                paths.append(Path(entry.path) / "HEAD")
+    except OSError:
+        pass
+    for root, dirnames, _ in os.walk(common_dir / "refs" / "heads"):
+        dirnames.sort()
+        paths.append(Path(root))
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            digest.update(f"{path}\0-\n".encode())
+            continue
+        digest.update(f"{path}\0{st.st_mtime_ns}:{st.st_size}:{st.st_ino}\n".encode())
+    return digest.hexdigest()
 
 
-def _git_list_branches(cwd: Path) -> list[str]:
-    """Return all local branch names under *cwd*.
+def _git_dirs(cwd: Path) -> tuple[Path, Path] | None:
+    """Return ``(git_dir, common_dir)`` for the repository containing *cwd*.
 
-    Empty list on any git failure — reconciliation is best-effort.
+    Follows a ``.git`` file (linked worktree / submodule) to its git dir and
+    that dir's ``commondir``. None when no ``.git`` is found up the tree.
     """
-    try:
-        r = subprocess.run(
-            ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/"],
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            timeout=_GIT_TIMEOUT_SECONDS,
-        )
-    except (subprocess.TimeoutExpired, OSError):
-        return []
-    if r.returncode != 0:
-        return []
-    return [line.strip() for line in r.stdout.splitlines() if line.strip()]
+    for base in (cwd.resolve(), *cwd.resolve().parents):
+        dot_git = base / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = (base / content[len("gitdir:"):].strip()).resolve()
+        else:
+            continue
+        try:
+            common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        except OSError:
+            return git_dir, git_dir
+        return git_dir, (git_dir / common).resolve()
+    return None
 
 
-def _git_list_worktrees(cwd: Path) -> list[dict[str, str]]:
+def _parse_worktree_porcelain(stdout: str) -> list[dict[str, str]]:
     """Parse ``git worktree list --porcelain`` into a list of dicts.
 
     Each dict has keys ``path``, ``branch`` (without the ``refs/heads/``
@@ -749,21 +1181,9 @@ def _git_list_worktrees(cwd: Path) -> list[dict[str, str]]:
     caller filters by ``agent/`` branch pattern, so the main worktree
     (typically on ``main``) is harmlessly ignored.
     """
-    try:
-        r = subprocess.run(
-            ["git", "worktree", "list", "--porcelain"],
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            timeout=_GIT_TIMEOUT_SECONDS,
-        )
-    except (subprocess.TimeoutExpired, OSError):
-        return []
-    if r.returncode != 0:
-        return []
     out: list[dict[str, str]] = []
     current: dict[str, str] = {}
-    for line in r.stdout.splitlines():
+    for line in stdout.splitlines():
         line = line.rstrip()
         if not line:
             if current:
@@ -787,6 +1207,26 @@ def _git_list_worktrees(cwd: Path) -> list[dict[str, str]]:
     return out
 
 
+def _list_packets(packets_dir: Path) -> tuple[Path, ...] | None:
+    """Return the ``*.md`` packet files in *packets_dir*, sorted; None if absent."""
+    if not packets_dir.exists():
+        return None
+    # scandir's d_type answers is_file() without a stat per entry — the
+    # difference matters with thousands of packets.
+    with os.scandir(packets_dir) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if os.path.splitext(entry.name)[1] == ".md" and entry.is_file()
+        )
+    return tuple(packets_dir / name for name in names)
+
+
+def _mapping_key(mapping: SyncMapping) -> str:
+    """Watermark key for one sync mapping: ``<task_id>/<external_system>``."""
+    return f"{mapping.task_id}/{mapping.external_system}"
+
+
 def _git_run(argv: list[str], *, cwd: Path) -> None:
     """Run a git command; raise RuntimeError on non-zero or timeout."""
     try:
@@ -807,6 +1247,7 @@ def _git_run(argv: list[str], *, cwd: Path) -> None:
 
 
 __all__ = [
+    "WATERMARK_FILENAME",
     "DiscrepancyKind",
     "Severity",
     "Discrepancy",
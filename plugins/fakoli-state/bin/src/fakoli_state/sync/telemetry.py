@@ -0,0 +1,305 @@
+"""Sync telemetry channel — ``sync.*`` audit records kept out of the event log.
+
+Every push / pull / conflict / batch step used to land in ``events.jsonl``
+through ``backend.append``: one flock, one SQLite transaction and one
+permanent log line per step. None of those events mutate the projection
+(their dispatch handlers are audit-only no-ops), yet every replay, git-mode
+convergence scan and ``migrate-events`` run paid for them forever. A
+``--watch`` loop over 500 tasks writes thousands of them per hour.
+
+This module moves that traffic to a side channel under
+``<state_dir>/telemetry/``:
+
+* ``sync-audit.jsonl`` — the open segment. Records are buffered in memory
+  and written in one locked append per flush (batch end, or every
+  ``flush_every`` records), never fsynced and never replayed.
+* ``sync-audit-NNNNNN.jsonl.gz`` — sealed segments. Once the open segment
+  exceeds ``rotate_bytes`` it is gzip-compressed under the next sequence
+  number; only the newest ``keep_segments`` sealed segments are retained.
+
+State-changing sync events (``sync_mapping.upserted``,
+``sync_mapping.deleted``, ``task.synced_from_remote``) stay in the canonical
+log — replay must reconstruct mappings and remote-applied task rewrites.
+
+Records share the :class:`~fakoli_state.state.models.EventDraft` field set
+(``timestamp``, ``actor``, ``action``, ``target_kind``, ``target_id``,
+``payload_json``) and carry no ``id``: like ``audit.jsonl`` lines they are
+not events. Payloads are still validated against
+:data:`~fakoli_state.state.payloads.ACTION_TO_PAYLOAD`, so a malformed record
+is rejected exactly as ``append`` used to reject it.
+
+:func:`query_sync_audit` is the forensic read path. It spans both stores —
+legacy ``sync.*`` rows already in ``events.jsonl`` (logs written before the
+split still replay them) plus every telemetry segment — and returns them in
+timestamp order.
+"""
+
+from __future__ import annotations
+
+import datetime
+import fcntl
+import gzip
+import json
+import os
+import re
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fakoli_state.state.backend import EventRejected
+from fakoli_state.state.payloads import ACTION_TO_PAYLOAD
+from fakoli_state.state.segments import iter_log_lines
+
+if TYPE_CHECKING:
+    from fakoli_state.clock import Clock
+
+__all__ = [
+    "TELEMETRY_ACTIONS",
+    "TELEMETRY_DIRNAME",
+    "SyncTelemetryLog",
+    "query_sync_audit",
+]
+
+# Subdirectory under <state_dir> holding the telemetry segments.
+TELEMETRY_DIRNAME = "telemetry"
+
+# Every action routed to the telemetry channel instead of ``backend.append``.
+# ACTION_TO_PAYLOAD is exactly the ``sync.*`` audit vocabulary (Phase 9 T3).
+TELEMETRY_ACTIONS: frozenset[str] = frozenset(ACTION_TO_PAYLOAD)
+
+_OPEN_SEGMENT = "sync-audit.jsonl"
+_LOCK_FILE = ".sync-audit.lock"
+_SEALED_RE = re.compile(r"^sync-audit-(\d{6})\.jsonl\.gz$")
+
+# Defaults sized for a long-running --watch daemon: a 500-task batch emits
+# ~2000 records, so 256 keeps the buffer small while still collapsing the
+# per-record open/write into a handful of appends per batch.
+_DEFAULT_FLUSH_EVERY = 256
+_DEFAULT_ROTATE_BYTES = 4 * 1024 * 1024
+_DEFAULT_KEEP_SEGMENTS = 32
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+
+class SyncTelemetryLog:
+    """Buffered writer for the ``sync.*`` telemetry channel.
+
+    Usage::
+
+        with SyncTelemetryLog(state_dir, clock=SystemClock()) as telemetry:
+            telemetry.record(action="sync.push.started", payload={...},
+                             target_kind="task", target_id="T001")
+
+    ``record`` validates and buffers; ``flush`` writes every buffered line
+    with a single append under an exclusive flock on a sibling lock file
+    (not the segment itself — rotation renames the segment, and a waiter
+    holding the old inode would append into a sealed file). ``close`` is
+    ``flush``; the context manager calls it on exit.
+    """
+
+    def __init__(
+        self,
+        state_dir: Path,
+        *,
+        clock: Clock,
+        actor: str = "sync-cli",
+        flush_every: int = _DEFAULT_FLUSH_EVERY,
+        rotate_bytes: int = _DEFAULT_ROTATE_BYTES,
+        keep_segments: int = _DEFAULT_KEEP_SEGMENTS,
+    ) -> None:
+        self._dir = Path(state_dir) / TELEMETRY_DIRNAME
+        self._clock = clock
+        self._actor = actor
+        self._flush_every = max(1, flush_every)
+        self._rotate_bytes = rotate_bytes
+        self._keep_segments = keep_segments
+        self._buffer: list[str] = []
+
+    def __enter__(self) -> SyncTelemetryLog:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Number of records buffered but not yet flushed."""
+        return len(self._buffer)
+
+    def record(
+        self,
+        *,
+        action: str,
+        payload: dict[str, Any],
+        target_kind: str,
+        target_id: str,
+    ) -> None:
+        """Validate one ``sync.*`` record and buffer it for the next flush.
+
+        Raises :class:`EventRejected` for an action outside
+        :data:`TELEMETRY_ACTIONS` or a payload that fails its model — the
+        same contract ``backend.append`` enforced when these rows lived in
+        the event log. Flushes automatically once ``flush_every`` records
+        are buffered.
+        """
+        model = ACTION_TO_PAYLOAD.get(action)
+        if model is None:
+            raise EventRejected(f"telemetry: action {action!r} is not a sync audit action.")
+        try:
+            model.model_validate(payload)
+        except Exception as exc:
+            raise EventRejected(
+                f"payload validation failed for action {action!r}: {exc}"
+            ) from exc
+        line = json.dumps(
+            {
+                "timestamp": self._clock.now().isoformat(),
+                "actor": self._actor,
+                "action": action,
+                "target_kind": target_kind,
+                "target_id": target_id,
+                "payload_json": payload,
+            },
+            sort_keys=True,
+        )
+        self._buffer.append(line + "\n")
+        if len(self._buffer) >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered record in one append; rotate when oversized.
+
+        The buffer is cleared only after the write succeeds, so an
+        ``OSError`` leaves the records in place for the next attempt.
+        """
+        if not self._buffer:
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        data = "".join(self._buffer)
+        with open(self._dir / _LOCK_FILE, "a", encoding="utf-8") as lock_fh:
+            fcntl.flock(lock_fh.fileno(), fcntl.LOCK_EX)
+            try:
+                open_segment = self._dir / _OPEN_SEGMENT
+                with open(open_segment, "a", encoding="utf-8") as fh:
+                    fh.write(data)
+                self._buffer.clear()
+                if open_segment.stat().st_size >= self._rotate_bytes:
+                    self._rotate(open_segment)
+            finally:
+                fcntl.flock(lock_fh.fileno(), fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Flush any buffered records. Idempotent."""
+        self.flush()
+
+    def _rotate(self, open_segment: Path) -> None:
+        """Seal the open segment as the next ``.jsonl.gz`` and prune old ones.
+
+        Caller holds the lock. The compressed copy is written under a
+        temporary name and renamed into place before the open segment is
+        removed, so a crash mid-rotation leaves at worst a duplicate — never
+        a lost record.
+        """
+        sealed = _sealed_segments(self._dir)
+        next_seq = _segment_seq(sealed[-1]) + 1 if sealed else 1
+        target = self._dir / f"sync-audit-{next_seq:06d}.jsonl.gz"
+        tmp = target.with_name(target.name + ".tmp")
+        with open(open_segment, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, target)
+        open_segment.unlink()
+        sealed.append(target)
+        if self._keep_segments > 0:
+            for stale in sealed[: -self._keep_segments]:
+                stale.unlink(missing_ok=True)
+
+
+def _sealed_segments(directory: Path) -> list[Path]:
+    """Return the sealed segments in ``directory``, oldest first."""
+    if not directory.is_dir():
+        return []
+    return sorted(p for p in directory.iterdir() if _SEALED_RE.match(p.name))
+
+
+def _segment_seq(segment: Path) -> int:
+    """Return the sequence number encoded in a sealed segment's file name."""
+    match = _SEALED_RE.match(segment.name)
+    return int(match.group(1)) if match else 0
+
+
+def _record_time(record: dict[str, Any]) -> datetime.datetime:
+    """Sort key: the record's timestamp, or the epoch floor when unparseable."""
+    try:
+        ts = datetime.datetime.fromisoformat(str(record.get("timestamp")))
+    except ValueError:
+        return _EPOCH
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=datetime.UTC)
+
+
+def _iter_jsonl(lines: Iterator[str]) -> Iterator[dict[str, Any]]:
+    """Yield parsed records, skipping blank and torn lines."""
+    for raw_line in lines:
+        stripped = raw_line.strip()
+        if not stripped:
+            continue
+        try:
+            record = json.loads(stripped)
+        except json.JSONDecodeError:
+            # Telemetry is best-effort: a torn line from a crash mid-flush
+            # is dropped rather than failing the whole query.
+            continue
+        if isinstance(record, dict):
+            yield record
+
+
+def _iter_telemetry(directory: Path) -> Iterator[dict[str, Any]]:
+    """Yield every telemetry record, sealed segments first."""
+    for segment in _sealed_segments(directory):
+        with gzip.open(segment, "rt", encoding="utf-8") as fh:
+            yield from _iter_jsonl(fh)
+    open_segment = directory / _OPEN_SEGMENT
+    if open_segment.exists():
+        with open(open_segment, encoding="utf-8") as fh:
+            yield from _iter_jsonl(fh)
+
+
+def query_sync_audit(
+    state_dir: Path,
+    *,
+    action: str | None = None,
+    target_id: str | None = None,
+) -> list[dict[str, Any]]:
+    """Return ``sync.*`` audit records from both stores, oldest first.
+
+    Reads legacy rows from the event log, sealed segments included (any action in
+    :data:`TELEMETRY_ACTIONS`) and every telemetry segment, then sorts by
+    ``timestamp`` (stable, so same-instant records keep write order).
+
+    ``action`` filters by exact action name, or by prefix when it ends in
+    ``.`` or ``*`` (``"sync.pull."`` / ``"sync.pull.*"``). ``target_id``
+    filters by exact target.
+    """
+    state_dir = Path(state_dir)
+    prefix: str | None = None
+    if action is not None and action.endswith(("*", ".")):
+        prefix = action.rstrip("*")
+
+    def _wanted(record: dict[str, Any]) -> bool:
+        name = record.get("action")
+        if name not in TELEMETRY_ACTIONS:
+            return False
+        if prefix is not None:
+            if not str(name).startswith(prefix):
+                return False
+        elif action is not None and name != action:
+            return False
+        return target_id is None or record.get("target_id") == target_id
+
+    records: list[dict[str, Any]] = []
+    records.extend(
+        r for r in _iter_jsonl(iter_log_lines(state_dir / "events.jsonl")) if _wanted(r)
+    )
+    records.extend(r for r in _iter_telemetry(state_dir / TELEMETRY_DIRNAME) if _wanted(r))
+    records.sort(key=_record_time)
+    return records
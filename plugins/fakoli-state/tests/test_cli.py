@@ -162,6 +162,30 @@ class TestInit:
         finally:
             os.chdir(original_cwd)
 
+    def test_init_force_drops_sealed_segments(self, tmp_path: Path) -> None:
+        """--force reinit after compact-events must not restore the old
+        project from its sealed segments and checkpoint."""
+        original_cwd = os.getcwd()
+        os.chdir(tmp_path)
+        try:
+            runner.invoke(app, ["init", "--name", "alpha"], catch_exceptions=False)
+            compacted = runner.invoke(app, ["compact-events"], catch_exceptions=False)
+            assert compacted.exit_code == 0, compacted.output
+
+            result = runner.invoke(
+                app, ["init", "--name", "beta", "--force"], catch_exceptions=False
+            )
+            assert result.exit_code == 0, f"--force init failed: {result.output}"
+            status = runner.invoke(app, ["status"], catch_exceptions=False)
+        finally:
+            os.chdir(original_cwd)
+
+        state_dir = tmp_path / ".fakoli-state"
+        assert not (state_dir / "segments").exists()
+        assert 'fakoli-state for "beta"' in status.output
+        lines = (state_dir / "events.jsonl").read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0])["id"] == "E000001"
+
     def test_init_refuses_in_plugin_root(self, tmp_path: Path) -> None:
         """init refuses when .claude-plugin/plugin.json declares name == fakoli-state."""
         # Create fake plugin manifest
@@ -297,6 +321,24 @@ class TestStatusInitialized:
         assert result.exit_code == 0
         assert "My Project" in result.output
 
+    def test_status_initialized_at_survives_compaction(self, tmp_path: Path) -> None:
+        """'Initialized' is the first event's timestamp even once compact-events
+        has sealed it out of events.jsonl."""
+        original_cwd = os.getcwd()
+        os.chdir(tmp_path)
+        try:
+            runner.invoke(app, ["init", "--name", "My Project"], catch_exceptions=False)
+            events_path = tmp_path / ".fakoli-state" / "events.jsonl"
+            first = json.loads(events_path.read_text(encoding="utf-8").splitlines()[0])
+            compacted = runner.invoke(app, ["compact-events"], catch_exceptions=False)
+            assert compacted.exit_code == 0, compacted.output
+            assert events_path.read_text(encoding="utf-8") == ""
+            result = runner.invoke(app, ["status"], catch_exceptions=False)
+        finally:
+            os.chdir(original_cwd)
+
+        assert f"Initialized: {first['timestamp']}" in result.output
+
     def test_status_initialized_hook_format(self, tmp_path: Path) -> None:
         """status --hook-format after init outputs the key:value compact line."""
         result = self._init_and_status(tmp_path, extra_status_args=["--hook-format"])
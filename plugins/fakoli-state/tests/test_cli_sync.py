@@ -295,20 +295,30 @@ def _seed_sync_mapping(
 
 
 def _read_events_jsonl(project_root: Path) -> list[dict[str, Any]]:
-    """Parse events.jsonl into a list of dicts.
+    """Parse events.jsonl plus the sync telemetry channel into one list.
 
     ``project_root`` is the directory containing ``.fakoli-state/``.
+    ``sync.*`` audit rows live in ``.fakoli-state/telemetry/`` rather than
+    the canonical log, so they are read through
+    :func:`~fakoli_state.sync.telemetry.query_sync_audit` (which also covers
+    any legacy ``sync.*`` rows in events.jsonl) and appended after the
+    canonical events.
     """
-    events_path = project_root / ".fakoli-state" / "events.jsonl"
-    if not events_path.exists():
-        return []
+    from fakoli_state.sync.telemetry import TELEMETRY_ACTIONS, query_sync_audit
+
+    state_dir = project_root / ".fakoli-state"
+    events_path = state_dir / "events.jsonl"
     out: list[dict[str, Any]] = []
-    with events_path.open(encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            out.append(json.loads(line))
+    if events_path.exists():
+        with events_path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["action"] not in TELEMETRY_ACTIONS:
+                    out.append(event)
+    out.extend(query_sync_audit(state_dir))
     return out
 
 
@@ -357,6 +367,23 @@ class TestSyncBareReconciliation:
         # No discrepancies → exit 0, no failures.
         assert r.exit_code == 0, r.output
 
+    def test_scan_persists_watermark_and_full_rescans(
+        self, initialized_project: Path, patched_registry: dict[str, Any]
+    ) -> None:
+        """Bare `sync` writes the scan watermark; `--full` still succeeds over it."""
+        watermark = initialized_project / ".fakoli-state" / "reconcile-state.json"
+        r = runner.invoke(
+            app, ["sync", "--cwd", str(initialized_project)], catch_exceptions=False
+        )
+        assert r.exit_code == 0, r.output
+        assert watermark.exists()
+        r = runner.invoke(
+            app, ["sync", "--cwd", str(initialized_project), "--full"],
+            catch_exceptions=False,
+        )
+        assert r.exit_code == 0, r.output
+        assert "No discrepancies found" in r.output
+
     def test_bare_sync_uninitialized_errors(self, tmp_path: Path) -> None:
         """Bare `sync` against a directory that has not been init'd exits 1."""
         r = runner.invoke(
@@ -833,7 +860,7 @@ class TestSyncWatch:
 
 
 class TestSyncAuditEvents:
-    """Verify sync.* events land in events.jsonl with expected payloads."""
+    """Verify sync.* events land on the telemetry channel with expected payloads."""
 
     def test_push_emits_started_and_completed(
         self,
@@ -910,6 +937,60 @@ class TestSyncAuditEvents:
         assert len(batch_started) == 1
         assert batch_started[0]["payload_json"]["provider_id"] == _TEST_PROVIDER_ID
 
+    def test_audit_rows_stay_out_of_canonical_log(
+        self,
+        initialized_project: Path,
+        patched_registry: dict[str, Any],
+    ) -> None:
+        """Only the state-changing sync_mapping.upserted reaches events.jsonl."""
+        cls = _make_scripted_provider_cls()
+        patched_registry[_TEST_PROVIDER_ID] = cls
+        _seed_task(initialized_project)
+        r = runner.invoke(
+            app,
+            ["sync", "github", "--push", "--cwd", str(initialized_project)],
+            catch_exceptions=False,
+        )
+        assert r.exit_code == 0, r.output
+        log_path = initialized_project / ".fakoli-state" / "events.jsonl"
+        canonical = [
+            json.loads(line)["action"]
+            for line in log_path.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+        assert not [a for a in canonical if a.startswith("sync.")], canonical
+        assert "sync_mapping.upserted" in canonical
+        segment = initialized_project / ".fakoli-state" / "telemetry" / "sync-audit.jsonl"
+        assert segment.exists()
+
+    def test_sync_audit_command_filters_by_prefix_and_task(
+        self,
+        initialized_project: Path,
+        patched_registry: dict[str, Any],
+    ) -> None:
+        cls = _make_scripted_provider_cls()
+        patched_registry[_TEST_PROVIDER_ID] = cls
+        _seed_task(initialized_project)
+        runner.invoke(
+            app,
+            ["sync", "github", "--push", "--cwd", str(initialized_project)],
+            catch_exceptions=False,
+        )
+        r = runner.invoke(
+            app,
+            [
+                "sync", "audit",
+                "--action", "sync.push.*",
+                "--task", "T001",
+                "--cwd", str(initialized_project),
+            ],
+            catch_exceptions=False,
+        )
+        assert r.exit_code == 0, r.output
+        rows = [json.loads(line) for line in r.output.splitlines() if line.strip()]
+        assert [row["action"] for row in rows] == ["sync.push.started", "sync.push.completed"]
+        assert {row["target_id"] for row in rows} == {"T001"}
+
 
 # ---------------------------------------------------------------------------
 # Nothing-to-sync graceful path
@@ -22,6 +22,7 @@ from fakoli_state.config import (
     Config,
     config_template,
     load_config,
+    read_events_segmentation,
     read_events_storage,
     write_default_config,
 )
@@ -646,3 +647,37 @@ class TestReadEventsStorage:
         )
         with pytest.raises(ValueError, match="events_storage"):
             read_events_storage(config_path)
+
+
+class TestEventsSegmentationConfig:
+    def test_disabled_when_keys_absent(self, tmp_path: Path) -> None:
+        config = load_config(_write_config(tmp_path / "config.yaml", _minimal_yaml()))
+        assert config.events_segment_max_events is None
+        assert config.events_segment_max_mb is None
+
+    def test_template_ships_blank_thresholds(self, tmp_path: Path) -> None:
+        config_path = _write_config(
+            tmp_path / "config.yaml", config_template(project_name="X")
+        )
+        assert read_events_segmentation(config_path) == (None, None)
+
+    def test_values_are_read(self, tmp_path: Path) -> None:
+        config_path = _write_config(
+            tmp_path / "config.yaml",
+            _minimal_yaml() + "events_segment_max_events: 5000\nevents_segment_max_mb: 8\n",
+        )
+        assert load_config(config_path).events_segment_max_events == 5000
+        assert read_events_segmentation(config_path) == (5000, 8)
+
+    def test_missing_or_unparseable_file_disables(self, tmp_path: Path) -> None:
+        assert read_events_segmentation(tmp_path / "config.yaml") == (None, None)
+        config_path = _write_config(tmp_path / "bad.yaml", "sync:\n  providers: [unclosed\n")
+        assert read_events_segmentation(config_path) == (None, None)
+
+    @pytest.mark.parametrize("value", ["0", "-3", "lots", "true"])
+    def test_invalid_value_raises(self, tmp_path: Path, value: str) -> None:
+        config_path = _write_config(
+            tmp_path / "config.yaml", _minimal_yaml() + f"events_segment_max_events: {value}\n"
+        )
+        with pytest.raises(ValueError, match="events_segment_max_events"):
+            read_events_segmentation(config_path)
@@ -980,6 +980,27 @@ class TestMigrateEvents:
             b.close()
         assert post_state == _map_pre_state_ids(pre_state, id_mapping)
 
+    def test_sealed_segments_are_folded_into_the_rewritten_log(
+        self, tmp_path: Path
+    ) -> None:
+        _build_local_project(tmp_path)
+        state_dir = tmp_path / ".fakoli-state"
+        compacted = _run_in(tmp_path, ["compact-events"])
+        assert compacted.exit_code == 0, compacted.output
+        assert (state_dir / "events.jsonl").read_text(encoding="utf-8") == ""
+
+        result = _run_in(tmp_path, ["migrate-events", "--to", "git", "--yes"])
+        assert result.exit_code == 0, result.output
+
+        lines = _log_lines(state_dir)
+        assert len(lines) == 24
+        assert all(_HASH_ID_RE.fullmatch(line["id"]) for line in lines)
+        assert not (state_dir / "segments").exists()
+        backup = state_dir / "events.jsonl.pre-git-migration.bak"
+        assert backup.read_text(encoding="utf-8") == _FIXTURE_EVENTS.read_text(
+            encoding="utf-8"
+        )
+
     def test_second_run_is_an_idempotent_no_op(self, tmp_path: Path) -> None:
         _build_local_project(tmp_path)
         first = _run_in(tmp_path, ["migrate-events", "--to", "git", "--yes"])
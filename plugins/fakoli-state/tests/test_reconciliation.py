@@ -244,6 +244,285 @@ class TestEmptyProject:
             b.close()
 
 
+# ---------------------------------------------------------------------------
+# Shared scan snapshot
+# ---------------------------------------------------------------------------
+
+
+class TestScanSnapshot:
+    """One backend read per collection and one batched git read per scan."""
+
+    def test_backend_collections_read_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _init_git_repo(tmp_path)
+        _git(tmp_path, "branch", "agent/t099-orphaned")
+        (tmp_path / ".fakoli-state" / "packets").mkdir(parents=True)
+        (tmp_path / ".fakoli-state" / "packets" / "T098.md").write_text("x")
+        b = _make_backend(tmp_path)
+        calls: dict[str, int] = {}
+        for name in (
+            "list_tasks", "list_active_claims", "list_sync_mappings", "get_sync_mapping",
+        ):
+            original = getattr(b, name)
+
+            def _counted(*args: Any, _name: str = name, _orig: Any = original, **kw: Any) -> Any:
+                calls[_name] = calls.get(_name, 0) + 1
+                return _orig(*args, **kw)
+
+            monkeypatch.setattr(b, name, _counted)
+        try:
+            engine = ReconciliationEngine(
+                b, state_dir=tmp_path, clock=_make_clock(),
+                configured_providers=["github_issues"],
+            )
+            report = engine.scan()
+        finally:
+            b.close()
+        assert calls == {"list_tasks": 1, "list_active_claims": 1, "list_sync_mappings": 1}
+        assert report.summary == {"orphan_branch": 1, "orphan_packet": 1}
+
+    def test_git_read_is_two_concurrent_subprocesses(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import fakoli_state.sync.reconciliation as reconciliation
+
+        _init_git_repo(tmp_path)
+        _git(tmp_path, "branch", "agent/t099-orphaned")
+        spawned: list[list[str]] = []
+        real_popen = subprocess.Popen
+
+        def _popen(argv: list[str], **kw: Any) -> Any:
+            spawned.append(argv)
+            return real_popen(argv, **kw)
+
+        def _no_run(*args: Any, **kw: Any) -> Any:
+            raise AssertionError("scan must not spawn sequential git subprocesses")
+
+        monkeypatch.setattr(reconciliation.subprocess, "Popen", _popen)
+        monkeypatch.setattr(reconciliation.subprocess, "run", _no_run)
+        b = _make_backend(tmp_path)
+        try:
+            report = ReconciliationEngine(b, state_dir=tmp_path, clock=_make_clock()).scan()
+        finally:
+            b.close()
+        assert [argv[1] for argv in spawned] == ["for-each-ref", "worktree"]
+        assert [d.target_id for d in report.discrepancies] == ["agent/t099-orphaned"]
+
+    def test_outside_a_repo_git_snapshot_is_empty(self, tmp_path: Path) -> None:
+        from fakoli_state.sync.reconciliation import _git_snapshot
+
+        snapshot = _git_snapshot(tmp_path)
+        assert snapshot.is_repo is False
+        assert snapshot.branches == ()
+
+
+# ---------------------------------------------------------------------------
+# Incremental scans (persisted watermark)
+# ---------------------------------------------------------------------------
+
+
+class TestIncrementalScan:
+    """A stored watermark limits a scan to the checks whose sources moved."""
+
+    def _engine(
+        self, b: SqliteBackend, tmp_path: Path, clock: FrozenClock, **kw: Any,
+    ) -> ReconciliationEngine:
+        return ReconciliationEngine(
+            b, state_dir=tmp_path, clock=clock,
+            watermark_path=tmp_path / "reconcile-state.json", **kw,
+        )
+
+    def _forbid_sources(self, b: SqliteBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+        import fakoli_state.sync.reconciliation as reconciliation
+
+        def _fail(*args: Any, **kw: Any) -> Any:
+            raise AssertionError("a quiet incremental scan must reuse cached results")
+
+        for name in ("list_tasks", "list_active_claims", "list_sync_mappings"):
+            monkeypatch.setattr(b, name, _fail)
+        monkeypatch.setattr(reconciliation, "_git_snapshot", _fail)
+        monkeypatch.setattr(reconciliation, "_list_packets", _fail)
+
+    def test_quiet_rescan_reuses_cached_results(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _init_git_repo(tmp_path)
+        _git(tmp_path, "branch", "agent/t099-orphaned")
+        packets = tmp_path / ".fakoli-state" / "packets"
+        packets.mkdir(parents=True)
+        (packets / "T098.md").write_text("x")
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            _setup_project(b)
+            first = self._engine(b, tmp_path, clock).scan()
+            assert first.summary == {"orphan_branch": 1, "orphan_packet": 1}
+
+            self._forbid_sources(b, monkeypatch)
+            second = self._engine(b, tmp_path, clock).scan()
+        finally:
+            b.close()
+        assert second.discrepancies == first.discrepancies
+
+    def test_new_branch_rechecks_git_only(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import fakoli_state.sync.reconciliation as reconciliation
+
+        _init_git_repo(tmp_path)
+        packets = tmp_path / ".fakoli-state" / "packets"
+        packets.mkdir(parents=True)
+        (packets / "T098.md").write_text("x")
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            _setup_project(b)
+            assert self._engine(b, tmp_path, clock).scan().summary == {"orphan_packet": 1}
+
+            _git(tmp_path, "branch", "agent/t099-orphaned")
+
+            def _no_packets(*args: Any, **kw: Any) -> Any:
+                raise AssertionError("packets did not change")
+
+            monkeypatch.setattr(reconciliation, "_list_packets", _no_packets)
+            report = self._engine(b, tmp_path, clock).scan()
+        finally:
+            b.close()
+        assert report.summary == {"orphan_branch": 1, "orphan_packet": 1}
+
+    def test_new_event_invalidates_the_watermark(self, tmp_path: Path) -> None:
+        packets = tmp_path / ".fakoli-state" / "packets"
+        packets.mkdir(parents=True)
+        (packets / "T001.md").write_text("x")
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            _setup_project(b)
+            assert self._engine(b, tmp_path, clock).scan().summary == {"orphan_packet": 1}
+            _setup_task(b, task_id="T001")
+            report = self._engine(b, tmp_path, clock).scan()
+        finally:
+            b.close()
+        assert report.discrepancies == []
+
+    def test_lease_expiry_is_picked_up_without_new_events(self, tmp_path: Path) -> None:
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            _setup_project(b)
+            _setup_task(b, task_id="T001")
+            _create_active_claim(
+                b, claim_id="C001", task_id="T001",
+                lease_expires_at=_T0 + timedelta(hours=1),
+            )
+            assert self._engine(b, tmp_path, clock).scan().discrepancies == []
+            clock.advance(hours=2)
+            report = self._engine(b, tmp_path, clock).scan()
+        finally:
+            b.close()
+        assert [d.target_id for d in report.discrepancies] == ["C001"]
+        assert clock.now().isoformat() in report.discrepancies[0].description
+
+    def test_only_due_mappings_are_rechecked(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import json
+
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            _setup_project(b)
+            _setup_task(b, task_id="T001")
+            _setup_task(b, task_id="T002", feature_id="F002")
+            b.apply_sync_mapping(SyncMapping(
+                task_id="T001", external_system="github_issues",
+                external_id="gh-1", last_synced_at=_T0 - timedelta(days=6),
+            ))
+            b.apply_sync_mapping(SyncMapping(
+                task_id="T002", external_system="github_issues",
+                external_id="gh-2", last_synced_at=_T0,
+            ))
+            assert self._engine(b, tmp_path, clock).scan().discrepancies == []
+
+            clock.advance(hours=48)
+            looked_up: list[str] = []
+            original = b.get_sync_mapping
+
+            def _counted(task_id: str, **kw: Any) -> Any:
+                looked_up.append(task_id)
+                return original(task_id, **kw)
+
+            monkeypatch.setattr(b, "get_sync_mapping", _counted)
+            report = self._engine(b, tmp_path, clock).scan()
+            again = self._engine(b, tmp_path, clock).scan()
+        finally:
+            b.close()
+        assert looked_up == ["T001"]
+        assert [(d.target_id, d.payload["reason"]) for d in report.discrepancies] == [
+            ("T001", "stale"),
+        ]
+        assert again.discrepancies == report.discrepancies
+        state = json.loads((tmp_path / "reconcile-state.json").read_text())
+        assert state["mappings"]["T001/github_issues"]["stale_after"] is None
+        scanned_at = state["mappings"]["T002/github_issues"]["scanned_at"]
+        assert datetime.fromisoformat(scanned_at) == _T0
+
+    def test_full_ignores_the_watermark(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import fakoli_state.sync.reconciliation as reconciliation
+
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            _setup_project(b)
+            self._engine(b, tmp_path, clock).scan()
+            calls: list[Path] = []
+            real = reconciliation._list_packets
+
+            def _counted(packets_dir: Path) -> Any:
+                calls.append(packets_dir)
+                return real(packets_dir)
+
+            monkeypatch.setattr(reconciliation, "_list_packets", _counted)
+            self._engine(b, tmp_path, clock).scan()
+            assert calls == []
+            self._engine(b, tmp_path, clock).scan(full=True)
+        finally:
+            b.close()
+        assert len(calls) == 1
+
+    def test_corrupt_watermark_means_a_full_pass(self, tmp_path: Path) -> None:
+        (tmp_path / "reconcile-state.json").write_text("{not json")
+        packets = tmp_path / ".fakoli-state" / "packets"
+        packets.mkdir(parents=True)
+        (packets / "T098.md").write_text("x")
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            report = self._engine(b, tmp_path, clock).scan()
+        finally:
+            b.close()
+        assert report.summary == {"orphan_packet": 1}
+
+    def test_fix_drops_the_watermark(self, tmp_path: Path) -> None:
+        packets = tmp_path / ".fakoli-state" / "packets"
+        packets.mkdir(parents=True)
+        (packets / "T098.md").write_text("x")
+        clock = _make_clock()
+        b = _make_backend(tmp_path, clock)
+        try:
+            engine = self._engine(b, tmp_path, clock)
+            report = engine.scan()
+            assert (tmp_path / "reconcile-state.json").exists()
+            engine.fix(report)
+        finally:
+            b.close()
+        assert not (tmp_path / "reconcile-state.json").exists()
+        assert not (packets / "T098.md").exists()
+
+
 # ---------------------------------------------------------------------------
 # Check 1 — orphan_branch
 # ---------------------------------------------------------------------------
@@ -0,0 +1,280 @@
+"""Event-log segmentation, compaction checkpoint, and segment-aware replay.
+
+Drives the committed replay fixture (``fixtures/replay/sample-project``)
+through a backend that seals every few events, then proves the sealed layout
+is invisible to every reader:
+
+* the NORMAL build, forward catch-up, full replay and checkpoint replay all
+  reproduce the committed golden snapshot;
+* ids continue across a seal (the tail scan falls back to the manifest);
+* a crash between the manifest write and the open-segment truncate neither
+  loses nor double-applies an event;
+* a tampered sealed segment is refused, a tampered checkpoint is ignored.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from fakoli_state.clock import FrozenClock
+from fakoli_state.state.backend import BackendError
+from fakoli_state.state.models import EventDraft
+from fakoli_state.state.segments import SEGMENTS_DIRNAME, SegmentStore, iter_log_lines
+from fakoli_state.state.snapshot import serialize_state
+from fakoli_state.state.sqlite import SqliteBackend
+
+_T0 = datetime(2026, 5, 24, 18, 0, 0, tzinfo=UTC)
+
+_FIXTURE_DIR = Path(__file__).parent / "fixtures" / "replay" / "sample-project"
+
+
+def _committed_events() -> list[dict[str, Any]]:
+    with (_FIXTURE_DIR / "events.jsonl").open(encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _golden() -> str:
+    with (_FIXTURE_DIR / "expected-state.json").open(encoding="utf-8") as fh:
+        return json.dumps(json.load(fh), sort_keys=True)
+
+
+def _snapshot(backend: SqliteBackend) -> str:
+    return json.dumps(serialize_state(backend), sort_keys=True)
+
+
+def _make_backend(
+    state_dir: Path,
+    *,
+    db_name: str = "state.db",
+    segment_max_events: int | None = None,
+    segment_max_bytes: int | None = None,
+    events_storage: str = "local",
+) -> SqliteBackend:
+    events_path = state_dir / "events.jsonl"
+    events_path.touch()
+    backend = SqliteBackend(
+        db_path=str(state_dir / db_name),
+        events_path=str(events_path),
+        clock=FrozenClock(_T0),
+        events_storage=events_storage,
+        segment_max_events=segment_max_events,
+        segment_max_bytes=segment_max_bytes,
+    )
+    backend.initialize()
+    return backend
+
+
+def _build_sealed(state_dir: Path, *, every: int = 5) -> SqliteBackend:
+    backend = _make_backend(state_dir, segment_max_events=every)
+    for raw in _committed_events():
+        backend.append(EventDraft.model_validate({k: v for k, v in raw.items() if k != "id"}))
+    return backend
+
+
+class TestSealing:
+    def test_seals_every_n_events_with_manifest_summaries(self, tmp_path: Path) -> None:
+        backend = _build_sealed(tmp_path)
+        try:
+            assert _snapshot(backend) == _golden()
+        finally:
+            backend.close()
+
+        total = len(_committed_events())
+        manifest = SegmentStore(tmp_path / "events.jsonl").load_manifest()
+        assert [s.event_count for s in manifest.segments] == [5] * (total // 5)
+        assert manifest.segments[0].first_id == "E000001"
+        assert manifest.segments[0].last_id == "E000005"
+        assert manifest.segments[1].first_seq == 6
+        assert manifest.last_seq == (total // 5) * 5
+
+        first = tmp_path / SEGMENTS_DIRNAME / manifest.segments[0].name
+        with gzip.open(first, "rt", encoding="utf-8") as fh:
+            assert json.loads(fh.readline())["id"] == "E000001"
+
+        open_ids = [
+            json.loads(line)["id"]
+            for line in (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()
+        ]
+        assert open_ids == [f"E{n:06d}" for n in range(manifest.last_seq + 1, total + 1)]
+        assert [json.loads(line)["id"] for line in iter_log_lines(tmp_path / "events.jsonl")] == [
+            f"E{n:06d}" for n in range(1, total + 1)
+        ]
+
+    def test_byte_threshold_seals(self, tmp_path: Path) -> None:
+        backend = _make_backend(tmp_path, segment_max_bytes=1)
+        try:
+            raw = _committed_events()[0]
+            backend.append(EventDraft.model_validate({k: v for k, v in raw.items() if k != "id"}))
+        finally:
+            backend.close()
+        assert (tmp_path / "events.jsonl").read_text(encoding="utf-8") == ""
+        assert SegmentStore(tmp_path / "events.jsonl").load_manifest().last_seq == 1
+
+    def test_ids_continue_across_a_seal_after_reopen(self, tmp_path: Path) -> None:
+        events = _committed_events()
+        backend = _make_backend(tmp_path, segment_max_events=3)
+        try:
+            for raw in events[:3]:
+                backend.append(
+                    EventDraft.model_validate({k: v for k, v in raw.items() if k != "id"})
+                )
+        finally:
+            backend.close()
+        assert (tmp_path / "events.jsonl").read_text(encoding="utf-8") == ""
+
+        reopened = _make_backend(tmp_path, segment_max_events=3)
+        try:
+            event = reopened.append(
+                EventDraft.model_validate({k: v for k, v in events[3].items() if k != "id"})
+            )
+        finally:
+            reopened.close()
+        assert event is not None
+        assert event.id == "E000004"
+
+    def test_disabled_by_default(self, tmp_path: Path) -> None:
+        backend = _make_backend(tmp_path)
+        try:
+            for raw in _committed_events():
+                backend.append(
+                    EventDraft.model_validate({k: v for k, v in raw.items() if k != "id"})
+                )
+        finally:
+            backend.close()
+        assert not (tmp_path / SEGMENTS_DIRNAME).exists()
+
+
+class TestSegmentAwareReaders:
+    def test_forward_catch_up_reads_sealed_segments(self, tmp_path: Path) -> None:
+        _build_sealed(tmp_path).close()
+        # A fresh projection over the same log: initialize() must catch up
+        # across every sealed segment plus the open one.
+        fresh = _make_backend(tmp_path, db_name="other.db")
+        try:
+            assert _snapshot(fresh) == _golden()
+        finally:
+            fresh.close()
+
+    def test_full_replay_matches_golden(self, tmp_path: Path) -> None:
+        _build_sealed(tmp_path).close()
+        backend = _make_backend(tmp_path, db_name="replayed.db")
+        try:
+            backend.replay_from_empty(str(tmp_path / "events.jsonl"), use_checkpoint=False)
+            assert _snapshot(backend) == _golden()
+        finally:
+            backend.close()
+
+    def test_crash_before_truncate_is_not_double_applied(self, tmp_path: Path) -> None:
+        _build_sealed(tmp_path).close()
+        store = SegmentStore(tmp_path / "events.jsonl")
+        last = store.load_manifest().segments[-1]
+        # Re-create the pre-truncate open segment: the last sealed lines
+        # followed by whatever was appended after them.
+        events_path = tmp_path / "events.jsonl"
+        stale = "".join(line + "\n" for line in store.read_segment(last))
+        events_path.write_text(stale + events_path.read_text(encoding="utf-8"), encoding="utf-8")
+
+        backend = _make_backend(tmp_path, db_name="replayed.db")
+        try:
+            backend.replay_from_empty(str(events_path))
+            assert _snapshot(backend) == _golden()
+        finally:
+            backend.close()
+        ids = [json.loads(line)["id"] for line in iter_log_lines(events_path)]
+        assert len(ids) == len(set(ids)) == len(_committed_events())
+
+    def test_tampered_segment_is_refused(self, tmp_path: Path) -> None:
+        _build_sealed(tmp_path).close()
+        store = SegmentStore(tmp_path / "events.jsonl")
+        first = store.directory / store.load_manifest().segments[0].name
+        with gzip.open(first, "wt", encoding="utf-8") as fh:
+            fh.write("{}\n")
+        # A fresh projection catches up from the sealed history on open.
+        with pytest.raises(ValueError, match="checksum"):
+            _make_backend(tmp_path, db_name="replayed.db")
+
+
+class TestCompaction:
+    def test_checkpoint_replay_matches_golden(self, tmp_path: Path) -> None:
+        backend = _build_sealed(tmp_path)
+        try:
+            checkpoint = backend.compact_events()
+        finally:
+            backend.close()
+        assert checkpoint is not None
+        assert checkpoint.through_seq == len(_committed_events())
+        # compact seals the open segment, so the checkpoint covers everything.
+        assert (tmp_path / "events.jsonl").read_text(encoding="utf-8") == ""
+
+        replayed = _make_backend(tmp_path, db_name="replayed.db")
+        try:
+            replayed.replay_from_empty(str(tmp_path / "events.jsonl"))
+            assert _snapshot(replayed) == _golden()
+        finally:
+            replayed.close()
+
+    def test_compaction_is_incremental_and_idempotent(self, tmp_path: Path) -> None:
+        events = _committed_events()
+        backend = _make_backend(tmp_path, segment_max_events=5)
+        try:
+            for raw in events[:10]:
+                backend.append(
+                    EventDraft.model_validate({k: v for k, v in raw.items() if k != "id"})
+                )
+            first = backend.compact_events()
+            for raw in events[10:]:
+                backend.append(
+                    EventDraft.model_validate({k: v for k, v in raw.items() if k != "id"})
+                )
+            second = backend.compact_events()
+            again = backend.compact_events()
+        finally:
+            backend.close()
+        assert first is not None and first.through_seq == 10
+        assert second is not None and second.through_seq == len(events)
+        assert again == second
+
+        replayed = _make_backend(tmp_path, db_name="replayed.db")
+        try:
+            replayed.replay_from_empty(str(tmp_path / "events.jsonl"))
+            assert _snapshot(replayed) == _golden()
+        finally:
+            replayed.close()
+
+    def test_corrupt_checkpoint_falls_back_to_full_history(self, tmp_path: Path) -> None:
+        backend = _build_sealed(tmp_path)
+        try:
+            backend.compact_events()
+        finally:
+            backend.close()
+        store = SegmentStore(tmp_path / "events.jsonl")
+        store.checkpoint_path.write_bytes(b"not a database")
+        assert store.usable_checkpoint(store.load_manifest()) is None
+
+        replayed = _make_backend(tmp_path, db_name="replayed.db")
+        try:
+            replayed.replay_from_empty(str(tmp_path / "events.jsonl"))
+            assert _snapshot(replayed) == _golden()
+        finally:
+            replayed.close()
+
+    def test_empty_log_has_nothing_to_compact(self, tmp_path: Path) -> None:
+        backend = _make_backend(tmp_path)
+        try:
+            assert backend.compact_events() is None
+        finally:
+            backend.close()
+
+    def test_git_mode_refuses(self, tmp_path: Path) -> None:
+        backend = _make_backend(tmp_path, events_storage="git")
+        try:
+            with pytest.raises(BackendError):
+                backend.compact_events()
+        finally:
+            backend.close()
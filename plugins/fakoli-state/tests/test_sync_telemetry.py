@@ -0,0 +1,164 @@
+"""Tests for fakoli_state.sync.telemetry — the out-of-log sync audit channel.
+
+Coverage:
+- ``SyncTelemetryLog.record`` validates against ``ACTION_TO_PAYLOAD`` and
+  rejects unknown actions / malformed payloads with ``EventRejected``.
+- Buffering: nothing touches disk until ``flush`` (or ``flush_every``).
+- Rotation: an oversized open segment is sealed as gzip, sequence numbers
+  advance, and ``keep_segments`` prunes the oldest.
+- ``query_sync_audit`` spans legacy ``sync.*`` rows in events.jsonl and
+  every telemetry segment, in timestamp order, with action/target filters.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from fakoli_state.clock import FrozenClock
+from fakoli_state.state.backend import EventRejected
+from fakoli_state.sync.telemetry import (
+    TELEMETRY_DIRNAME,
+    SyncTelemetryLog,
+    query_sync_audit,
+)
+
+
+def _push_started(log: SyncTelemetryLog, task_id: str = "T001") -> None:
+    log.record(
+        action="sync.push.started",
+        payload={"provider_id": "github_issues", "task_id": task_id, "direction": "push"},
+        target_kind="task",
+        target_id=task_id,
+    )
+
+
+class TestRecord:
+    def test_unknown_action_rejected(self, tmp_path: Path, frozen_clock: FrozenClock) -> None:
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock)
+        with pytest.raises(EventRejected):
+            log.record(
+                action="task.created",
+                payload={},
+                target_kind="task",
+                target_id="T001",
+            )
+
+    def test_missing_required_field_rejected(
+        self, tmp_path: Path, frozen_clock: FrozenClock
+    ) -> None:
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock)
+        with pytest.raises(EventRejected):
+            # sync.push.failed requires exception_type + exception_message.
+            log.record(
+                action="sync.push.failed",
+                payload={"provider_id": "github_issues", "task_id": "T001"},
+                target_kind="task",
+                target_id="T001",
+            )
+        assert log.pending == 0
+
+    def test_records_are_buffered_until_flush(
+        self, tmp_path: Path, frozen_clock: FrozenClock
+    ) -> None:
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock)
+        _push_started(log)
+        assert log.pending == 1
+        assert not (tmp_path / TELEMETRY_DIRNAME).exists()
+        log.flush()
+        assert log.pending == 0
+        lines = (tmp_path / TELEMETRY_DIRNAME / "sync-audit.jsonl").read_text().splitlines()
+        record = json.loads(lines[0])
+        assert record["action"] == "sync.push.started"
+        assert record["actor"] == "sync-cli"
+        assert "id" not in record
+
+    def test_flush_every_triggers_write(self, tmp_path: Path, frozen_clock: FrozenClock) -> None:
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock, flush_every=2)
+        _push_started(log, "T001")
+        assert log.pending == 1
+        _push_started(log, "T002")
+        assert log.pending == 0
+
+    def test_context_manager_flushes(self, tmp_path: Path, frozen_clock: FrozenClock) -> None:
+        with SyncTelemetryLog(tmp_path, clock=frozen_clock) as log:
+            _push_started(log)
+        assert len(query_sync_audit(tmp_path)) == 1
+
+
+class TestRotation:
+    def test_oversized_segment_is_sealed_as_gzip(
+        self, tmp_path: Path, frozen_clock: FrozenClock
+    ) -> None:
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock, rotate_bytes=1)
+        _push_started(log, "T001")
+        log.flush()
+        _push_started(log, "T002")
+        log.flush()
+        directory = tmp_path / TELEMETRY_DIRNAME
+        sealed = sorted(p.name for p in directory.glob("*.jsonl.gz"))
+        assert sealed == ["sync-audit-000001.jsonl.gz", "sync-audit-000002.jsonl.gz"]
+        assert not (directory / "sync-audit.jsonl").exists()
+        with gzip.open(directory / sealed[0], "rt", encoding="utf-8") as fh:
+            assert json.loads(fh.readline())["target_id"] == "T001"
+
+    def test_keep_segments_prunes_oldest(self, tmp_path: Path, frozen_clock: FrozenClock) -> None:
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock, rotate_bytes=1, keep_segments=2)
+        for task_id in ("T001", "T002", "T003"):
+            _push_started(log, task_id)
+            log.flush()
+        sealed = sorted(p.name for p in (tmp_path / TELEMETRY_DIRNAME).glob("*.jsonl.gz"))
+        assert sealed == ["sync-audit-000002.jsonl.gz", "sync-audit-000003.jsonl.gz"]
+        assert [r["target_id"] for r in query_sync_audit(tmp_path)] == ["T002", "T003"]
+
+
+class TestQuery:
+    def test_spans_legacy_log_rows_and_segments_in_time_order(
+        self, tmp_path: Path, frozen_clock: FrozenClock
+    ) -> None:
+        # A pre-split log: one canonical event and one legacy sync.* row whose
+        # timestamp is earlier than anything on the telemetry channel.
+        legacy = {
+            "id": "E000002",
+            "timestamp": "2026-05-24T17:00:00Z",
+            "actor": "sync-cli",
+            "action": "sync.pull.started",
+            "target_kind": "task",
+            "target_id": "T009",
+            "payload_json": {"provider_id": "github_issues", "task_id": "T009"},
+        }
+        canonical = dict(legacy, id="E000001", action="task.created")
+        (tmp_path / "events.jsonl").write_text(
+            json.dumps(canonical) + "\n" + json.dumps(legacy) + "\n", encoding="utf-8"
+        )
+        log = SyncTelemetryLog(tmp_path, clock=frozen_clock, rotate_bytes=1)
+        _push_started(log, "T001")
+        log.flush()
+        frozen_clock.advance(minutes=1)
+        _push_started(log, "T002")
+        log.close()
+
+        records = query_sync_audit(tmp_path)
+        assert [r["target_id"] for r in records] == ["T009", "T001", "T002"]
+        assert query_sync_audit(tmp_path, action="sync.pull.started")[0]["id"] == "E000002"
+        assert [r["target_id"] for r in query_sync_audit(tmp_path, action="sync.push.*")] == [
+            "T001",
+            "T002",
+        ]
+        assert [r["target_id"] for r in query_sync_audit(tmp_path, target_id="T002")] == ["T002"]
+
+    def test_torn_trailing_line_is_skipped(
+        self, tmp_path: Path, frozen_clock: FrozenClock
+    ) -> None:
+        with SyncTelemetryLog(tmp_path, clock=frozen_clock) as log:
+            _push_started(log)
+        segment = tmp_path / TELEMETRY_DIRNAME / "sync-audit.jsonl"
+        with segment.open("a", encoding="utf-8") as fh:
+            fh.write('{"action": "sync.push.sta')
+        assert len(query_sync_audit(tmp_path)) == 1
+
+    def test_missing_state_is_empty(self, tmp_path: Path) -> None:
+        assert query_sync_audit(tmp_path) == []
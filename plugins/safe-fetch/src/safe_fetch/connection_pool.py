@@ -0,0 +1,160 @@
+"""Process-lifetime HTTP connection pool keyed by (scheme, pinned IP, SNI host, port).
+
+``fetch`` used to build and close an ``httpx.AsyncClient`` per call, so every
+request paid a fresh TCP + TLS handshake even when an agent read a dozen pages
+from one docs site. This module keeps clients alive between calls instead.
+
+The key is the whole connection identity, not just the origin httpx would use.
+httpcore pools connections by ``(scheme, host, port)``; with IP pinning the
+host is the validated IP, so two hostnames behind one CDN address would share
+a TLS connection negotiated for whichever SNI name came first. One client per
+``(scheme, pinned_ip, sni_host, port)`` rules that out: a pooled connection is
+only ever reused for the same hostname at the same validated address.
+
+Reuse never skips policy. ``_fetch_pinned`` still runs ``validate_and_resolve``
+on every hop *before* asking the pool for a client, and the freshly validated
+IP is part of the key — if DNS now answers differently, the lookup lands on a
+different (new) client and the old connection is never touched.
+
+Budget: at most ``SAFE_FETCH_POOL_MAX_HOSTS`` keys, each with at most
+``SAFE_FETCH_POOL_MAX_PER_HOST`` connections. Keep-alive connections idle
+longer than ``SAFE_FETCH_POOL_IDLE_TIMEOUT`` seconds are dropped by httpx, and
+a key whose client has been idle that long is closed on the next lease. When
+the key budget is full the least recently used key is evicted; its client is
+closed at once, or when its last in-flight lease ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, NamedTuple
+
+import httpx
+
+
+class PoolKey(NamedTuple):
+    """Connection identity: the validated IP plus the hostname TLS is verified against."""
+
+    scheme: str
+    ip: str
+    sni_host: str
+    port: int
+
+
+@dataclass
+class _Entry:
+    client: httpx.AsyncClient
+    last_used: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    evicted: bool = False
+
+
+class ConnectionPool:
+    """LRU of keep-alive ``httpx.AsyncClient`` instances, one per :class:`PoolKey`.
+
+    Clients are bound to the event loop that created them. If the pool is used
+    from a different loop (a test suite running one loop per test), entries
+    from the old loop are dropped rather than reused.
+
+    ``transport`` is for tests (an ``httpx.MockTransport`` shared by every
+    client); production passes None and gets httpx's TLS-verifying transport.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_hosts: int | None = None,
+        max_per_host: int | None = None,
+        idle_timeout: float | None = None,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._max_hosts = max(1, max_hosts if max_hosts is not None else int(
+            os.environ.get("SAFE_FETCH_POOL_MAX_HOSTS", "16")
+        ))
+        self._max_per_host = max(1, max_per_host if max_per_host is not None else int(
+            os.environ.get("SAFE_FETCH_POOL_MAX_PER_HOST", "4")
+        ))
+        self._idle_timeout = idle_timeout if idle_timeout is not None else float(
+            os.environ.get("SAFE_FETCH_POOL_IDLE_TIMEOUT", "30")
+        )
+        self._timeout = timeout
+        self._transport = transport
+        # Insertion order doubles as recency order: a lease moves its key last.
+        self._entries: dict[PoolKey, _Entry] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @asynccontextmanager
+    async def lease(self, key: PoolKey) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client for *key*, creating it if needed.
+
+        Call only with a key built from an address ``validate_and_resolve``
+        just returned — the pool trusts the key, it does not re-check it.
+        """
+        self._bind_loop()
+        await self._sweep_idle()
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            entry = _Entry(client=self._new_client())
+        self._entries[key] = entry
+        entry.leases += 1
+        await self._enforce_budget()
+        try:
+            yield entry.client
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if entry.evicted and entry.leases == 0:
+                await entry.client.aclose()
+
+    async def aclose(self) -> None:
+        """Close every pooled client (server shutdown)."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            entry.evicted = True
+            if entry.leases == 0:
+                await entry.client.aclose()
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            follow_redirects=False,
+            timeout=self._timeout,
+            transport=self._transport,
+            limits=httpx.Limits(
+                max_connections=self._max_per_host,
+                max_keepalive_connections=self._max_per_host,
+                keepalive_expiry=self._idle_timeout,
+            ),
+        )
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sockets from another loop cannot be awaited (or closed) here.
+            self._entries.clear()
+            self._loop = loop
+
+    async def _sweep_idle(self) -> None:
+        cutoff = time.monotonic() - self._idle_timeout
+        for key, entry in list(self._entries.items()):
+            if entry.leases == 0 and entry.last_used < cutoff:
+                del self._entries[key]
+                await entry.client.aclose()
+
+    async def _enforce_budget(self) -> None:
+        while len(self._entries) > self._max_hosts:
+            # Oldest first; the entry just leased is last and never chosen
+            # while anything older remains.
+            key = next(iter(self._entries))
+            entry = self._entries.pop(key)
+            entry.evicted = True
+            if entry.leases == 0:
+                await entry.client.aclose()
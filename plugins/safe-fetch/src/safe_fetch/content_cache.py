@@ -0,0 +1,358 @@
+"""On-disk cache of fetched responses and their sanitized output.
+
+Agents re-read the same documentation pages many times a session, and every
+``fetch`` used to download, parse, extract and sanitize from scratch. The
+cache keeps two things per URL:
+
+* the **raw response** — body plus the freshness and validator headers
+  (``Cache-Control``, ``Expires``, ``Date``, ``Age``, ``ETag``,
+  ``Last-Modified``), so a stale entry can be revalidated with a conditional
+  GET and a ``304`` reuses the stored body;
+* the **derived output** — the sanitized text ``extract_and_sanitize``
+  produced from it, keyed by ``(final URL, content hash, content type,
+  pipeline version)``. The version is a fingerprint of the sanitizer /
+  extractor code and library versions (``pipeline.pipeline_fingerprint``), so
+  changing either one makes old derived entries unreachable and they age out
+  of the LRU; the raw body is re-run through the new pipeline on next use.
+
+Freshness follows RFC 9111 for a private cache: ``max-age``, else
+``Expires - Date``, else 10% of ``Date - Last-Modified`` (capped at a day).
+``no-store`` and ``Vary: *`` responses are never stored, ``no-cache`` ones
+are stored but always revalidated, and a response with neither a lifetime
+nor a validator is not worth keeping.
+
+The cache is an optimisation, never a dependency: unreadable or missing
+files are treated as misses and write failures are ignored. Files are
+written atomically (temp file + rename) so concurrent servers can share a
+directory. Total size is bounded by ``max_bytes``; past it, the least recently
+used files are evicted until the cache is back under 90% of the budget.
+
+Configuration (environment): ``SAFE_FETCH_CACHE_DIR`` (default
+``$XDG_CACHE_HOME/safe-fetch``), ``SAFE_FETCH_CACHE_MAX_BYTES`` (default
+100 MB; ``0`` disables the cache).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Mapping
+
+_STORED_HEADERS = ("cache-control", "date", "expires", "age", "etag", "last-modified")
+_HEURISTIC_FRACTION = 0.1
+_HEURISTIC_MAX = 24 * 3600.0
+_EVICT_TO = 0.9
+_SUBDIRS = ("meta", "raw", "derived")
+
+
+def parse_cache_control(value: str) -> dict[str, str | None]:
+    """Split a ``Cache-Control`` value into ``{directive: argument or None}``."""
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        if name:
+            directives[name.strip().lower()] = arg.strip().strip('"') if sep else None
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def freshness_lifetime(headers: Mapping[str, str], response_time: float) -> float:
+    """Seconds a response stays fresh after it was generated (0 = revalidate first).
+
+    *headers* must have lower-case names.
+    """
+    cc = parse_cache_control(headers.get("cache-control", ""))
+    if "no-cache" in cc:
+        return 0.0
+    if "max-age" in cc:
+        try:
+            return max(0.0, float(int(cc["max-age"] or "")))
+        except ValueError:
+            return 0.0
+    date = _http_date(headers.get("date")) or response_time
+    if "expires" in headers:
+        expires = _http_date(headers["expires"])
+        # An unparseable Expires (often "0") means "already expired".
+        return max(0.0, expires - date) if expires is not None else 0.0
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None and date > last_modified:
+        return min(_HEURISTIC_MAX, (date - last_modified) * _HEURISTIC_FRACTION)
+    return 0.0
+
+
+def _expires_at(headers: Mapping[str, str], response_time: float) -> float:
+    try:
+        age = max(0.0, float(headers.get("age", "0")))
+    except ValueError:
+        age = 0.0
+    return response_time + freshness_lifetime(headers, response_time) - age
+
+
+def _sha256(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Metadata for one cached URL. The body and derived text live in their own files."""
+
+    url: str
+    final_url: str
+    content_type: str
+    content_hash: str
+    headers: dict[str, str]
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional-request headers for revalidating this entry."""
+        validators = {}
+        if "etag" in self.headers:
+            validators["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["last-modified"]
+        return validators
+
+
+class ContentCache:
+    """Size-bounded on-disk cache of raw responses and sanitized output.
+
+    *version* identifies the extraction/sanitization pipeline and is part of
+    every derived-output key. All methods do blocking file I/O; the server
+    calls them through ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        version: str,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if directory is None:
+            directory = os.environ.get("SAFE_FETCH_CACHE_DIR") or Path(
+                os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            ) / "safe-fetch"
+        self._dir = Path(directory)
+        self._version = version
+        self._max_bytes = max(0, max_bytes if max_bytes is not None else int(
+            os.environ.get("SAFE_FETCH_CACHE_MAX_BYTES", str(100 * 1024 * 1024))
+        ))
+        self._clock = clock
+        # Bytes on disk, computed by one directory scan on first write and
+        # kept up to date by this process afterwards.
+        self._total: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    @property
+    def size(self) -> int:
+        """Bytes currently held on disk."""
+        with self._lock:
+            return self._ensure_total()
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """The entry stored for request *url*, fresh or stale, or None."""
+        if not self.enabled:
+            return None
+        path = self._meta_path(url)
+        try:
+            entry = CacheEntry(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+        self._touch(path)
+        return entry
+
+    def store(
+        self,
+        url: str,
+        final_url: str,
+        content_type: str,
+        headers: Mapping[str, str],
+        body: bytes | bytearray,
+    ) -> CacheEntry | None:
+        """Record a ``200`` response for *url*. Returns None if it is not cacheable."""
+        if not self.enabled or len(body) > self._max_bytes:
+            return None
+        kept = _stored_headers(headers)
+        cc = parse_cache_control(kept.get("cache-control", ""))
+        now = self._clock()
+        expires_at = _expires_at(kept, now)
+        has_validator = "etag" in kept or "last-modified" in kept
+        if (
+            "no-store" in cc
+            or any(name.lower() == "vary" and value.strip() == "*" for name, value in headers.items())
+            or (expires_at <= now and not has_validator)
+        ):
+            self._unlink(self._meta_path(url))
+            return None
+
+        content_hash = hashlib.sha256(body).hexdigest()
+        entry = CacheEntry(
+            url=url,
+            final_url=final_url,
+            content_type=content_type,
+            content_hash=content_hash,
+            headers=kept,
+            stored_at=now,
+            expires_at=expires_at,
+        )
+        raw_path = self._path("raw", content_hash)
+        if not raw_path.exists():
+            self._write(raw_path, body)
+        else:
+            self._touch(raw_path)
+        self._write_meta(entry)
+        return entry
+
+    def revalidated(self, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        """Refresh *entry* from a ``304 Not Modified`` response's headers."""
+        merged = {**entry.headers, **_stored_headers(headers)}
+        if "age" not in headers:
+            merged.pop("age", None)
+        now = self._clock()
+        entry = CacheEntry(**{**asdict(entry), "headers": merged, "stored_at": now,
+                              "expires_at": _expires_at(merged, now)})
+        self._write_meta(entry)
+        return entry
+
+    def load_body(self, entry: CacheEntry) -> bytes | None:
+        return self._read(self._path("raw", entry.content_hash))
+
+    def load_derived(self, entry: CacheEntry) -> str | None:
+        data = self._read(self._derived_path(entry))
+        return data.decode("utf-8") if data is not None else None
+
+    def store_derived(self, entry: CacheEntry, text: str) -> None:
+        if self.enabled:
+            self._write(self._derived_path(entry), text.encode("utf-8"))
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._files():
+                self._unlink_locked(path)
+
+    # -- paths ---------------------------------------------------------------
+
+    def _meta_path(self, url: str) -> Path:
+        return self._path("meta", _sha256(url))
+
+    def _derived_path(self, entry: CacheEntry) -> Path:
+        return self._path(
+            "derived",
+            _sha256(entry.final_url, entry.content_hash, entry.content_type, self._version),
+        )
+
+    def _path(self, kind: str, name: str) -> Path:
+        return self._dir / kind / name[:2] / name
+
+    def _files(self) -> list[Path]:
+        return [
+            path
+            for kind in _SUBDIRS
+            for path in (self._dir / kind).glob("*/*")
+            if not path.name.startswith(".")
+        ]
+
+    # -- file I/O ------------------------------------------------------------
+
+    def _read(self, path: Path) -> bytes | None:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        self._touch(path)
+        return data
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        self._write(self._meta_path(entry.url), json.dumps(asdict(entry)).encode())
+
+    def _write(self, path: Path, data: bytes | bytearray) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+            tmp.write_bytes(data)
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            self._total = self._ensure_total() + len(data) - old_size
+            if self._total > self._max_bytes:
+                self._evict_locked()
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _unlink(self, path: Path) -> None:
+        with self._lock:
+            self._unlink_locked(path)
+
+    def _unlink_locked(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._total is not None:
+            self._total -= size
+
+    def _ensure_total(self) -> int:
+        if self._total is None:
+            total = 0
+            for path in self._files():
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    pass
+            self._total = total
+        return self._total
+
+    def _evict_locked(self) -> None:
+        files = []
+        for path in self._files():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime_ns, st.st_size, path))
+        files.sort()
+        self._total = sum(size for _mtime, size, _path in files)
+        target = self._max_bytes * _EVICT_TO
+        for _mtime, _size, path in files:
+            if self._total <= target:
+                break
+            self._unlink_locked(path)
+
+
+def _stored_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    lowered = {name.lower(): value for name, value in headers.items()}
+    return {name: lowered[name] for name in _STORED_HEADERS if name in lowered}
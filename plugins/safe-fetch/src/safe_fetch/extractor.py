@@ -6,10 +6,17 @@ import json
 import re
 
 import trafilatura
+from lxml.html import HtmlElement, tostring as html_tostring
 
+from .charset import decode_body
 
-def extract_content(html: str, url: str | None = None) -> str:
-    """Extract main content from HTML, returning clean markdown."""
+
+def extract_content(html: str | HtmlElement, url: str | None = None) -> str:
+    """Extract main content from HTML, returning clean markdown.
+
+    *html* may be markup or an already-parsed document tree (the output of
+    ``sanitize_html_tree``), which Trafilatura uses without re-parsing.
+    """
     result = trafilatura.extract(
         html,
         url=url,
@@ -24,11 +31,17 @@ def extract_content(html: str, url: str | None = None) -> str:
         return result.strip()
 
     # Fallback: strip tags and return raw text
+    if isinstance(html, HtmlElement):
+        html = html_tostring(html, encoding="unicode")
     return _strip_tags_fallback(html)
 
 
-def extract_pdf(data: bytes) -> str:
-    """Extract text from a PDF using PyMuPDF."""
+def extract_pdf(data: bytes | bytearray, max_chars: int | None = None) -> str:
+    """Extract text from a PDF using PyMuPDF.
+
+    Pages are extracted lazily; with *max_chars* set, extraction stops at the
+    first page that brings the text past that many characters.
+    """
     try:
         import pymupdf
     except ImportError:
@@ -37,10 +50,14 @@ def extract_pdf(data: bytes) -> str:
     try:
         doc = pymupdf.open(stream=data, filetype="pdf")
         pages = []
+        chars = 0
         for i, page in enumerate(doc):
             text = page.get_text("text")
             if text.strip():
                 pages.append(f"## Page {i + 1}\n\n{text.strip()}")
+                chars += len(pages[-1]) + 2
+                if max_chars is not None and chars >= max_chars:
+                    break
         doc.close()
         return "\n\n".join(pages) if pages else "(No extractable text in PDF)"
     except Exception as e:
@@ -48,38 +65,48 @@ def extract_pdf(data: bytes) -> str:
 
 
 def extract_by_content_type(
-    body: str | bytes, content_type: str, url: str | None = None
+    body: str | bytes | bytearray,
+    content_type: str,
+    url: str | None = None,
+    max_chars: int | None = None,
 ) -> str:
-    """Route extraction based on content type."""
+    """Route extraction based on content type.
+
+    Byte bodies are decoded with the charset the ``Content-Type`` header (or,
+    for HTML, a ``<meta>`` tag) declares.
+
+    *max_chars* lets page-structured formats (PDF) stop early once they have
+    produced that much text; other types are always extracted in full.
+    """
     ct = content_type.lower().split(";")[0].strip()
 
     if ct in ("application/json", "text/json"):
-        return _extract_json(body)
+        return _extract_json(body, content_type)
     elif ct.startswith("text/plain"):
-        if isinstance(body, bytes):
-            body = body.decode("utf-8", errors="replace")
+        if not isinstance(body, str):
+            body = decode_body(body, content_type)
         return body
     elif ct == "application/pdf":
         if isinstance(body, str):
             body = body.encode("utf-8")
-        return extract_pdf(body)
+        return extract_pdf(body, max_chars)
     elif ct.startswith("text/html") or ct.startswith("application/xhtml"):
-        if isinstance(body, bytes):
-            body = body.decode("utf-8", errors="replace")
+        if not isinstance(body, str):
+            body = decode_body(body, content_type)
         return extract_content(body, url)
     else:
         # Unknown type — try HTML extraction, fall back to raw text
-        if isinstance(body, bytes):
-            body = body.decode("utf-8", errors="replace")
+        if not isinstance(body, str):
+            body = decode_body(body, content_type)
         result = extract_content(body, url)
         if result:
             return result
         return body
 
 
-def _extract_json(body: str | bytes) -> str:
-    if isinstance(body, bytes):
-        body = body.decode("utf-8", errors="replace")
+def _extract_json(body: str | bytes | bytearray, content_type: str) -> str:
+    if not isinstance(body, str):
+        body = decode_body(body, content_type)
     try:
         parsed = json.loads(body)
         return json.dumps(parsed, indent=2, ensure_ascii=False)
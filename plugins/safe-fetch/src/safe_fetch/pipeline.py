@@ -0,0 +1,81 @@
+"""CPU-bound stages of fetch/search — run on the worker pool, off the event loop.
+
+Each function is a pure function of plain data (bytes, str, dicts) and lives at
+module level so it can be pickled into a process-pool worker. Network I/O
+never happens here; the async tools in ``server`` do that and hand the raw
+result over.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from importlib import metadata
+from pathlib import Path
+
+from . import charset, extractor, sanitizer
+from .charset import decode_body, resolve_charset
+from .extractor import extract_by_content_type, extract_content
+from .sanitizer import sanitize_html, sanitize_html_tree, sanitize_text
+
+# Libraries whose version changes what extraction produces.
+_PIPELINE_DISTRIBUTIONS = ("trafilatura", "lxml", "pymupdf")
+
+
+@functools.lru_cache(maxsize=1)
+def pipeline_fingerprint() -> str:
+    """Version of the extract/sanitize pipeline, for keying cached output.
+
+    A hash of this module's, ``sanitizer``'s, ``extractor``'s and ``charset``'s source plus
+    the installed versions of the extraction libraries — any change to a
+    sanitizer rule or an upgrade of Trafilatura invalidates derived cache
+    entries without anyone remembering to bump a constant.
+    """
+    digest = hashlib.sha256()
+    for module_file in (__file__, sanitizer.__file__, extractor.__file__, charset.__file__):
+        digest.update(Path(module_file).read_bytes())
+    for dist in _PIPELINE_DISTRIBUTIONS:
+        try:
+            version = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            version = "missing"
+        digest.update(f"\0{dist}={version}".encode())
+    return digest.hexdigest()[:16]
+
+
+def extract_and_sanitize(
+    body: bytes | bytearray, content_type: str, url: str, max_chars: int | None = None
+) -> str:
+    """Layers 4–5 of ``fetch``: HTML sanitize → extract → text sanitize.
+
+    HTML bytes go to lxml undecoded, with the charset resolved from the
+    ``Content-Type`` header or a ``<meta>`` declaration. *max_chars* is
+    passed to extraction so PDFs stop at the page that fills a
+    ``max_tokens`` budget.
+    """
+    ct = content_type.lower().split(";")[0].strip()
+    if ct.startswith("text/html") or ct.startswith("application/xhtml"):
+        doc = sanitize_html_tree(body, resolve_charset(body, content_type))
+        if doc is not None and doc.tag == "html":
+            # Full document: hand the cleaned tree straight to Trafilatura,
+            # skipping a serialize/parse round trip.
+            extracted = extract_content(doc, url)
+        else:
+            # Fragments (and unparseable input) go through markup, where
+            # Trafilatura applies its own fragment handling.
+            html_str = decode_body(body, content_type)
+            extracted = extract_by_content_type(sanitize_html(html_str), content_type, url)
+    else:
+        extracted = extract_by_content_type(body, content_type, url, max_chars)
+    return sanitize_text(extracted)
+
+
+def format_search_results(results: list[dict]) -> str:
+    """Render search API results as a sanitized numbered list."""
+    lines = []
+    for i, r in enumerate(results, 1):
+        title = sanitize_text(r.get("title", ""))
+        desc = sanitize_text(r.get("description", ""))
+        url = r.get("url", "")
+        lines.append(f"{i}. **{title}**\n   {url}\n   {desc}")
+    return "\n\n".join(lines)
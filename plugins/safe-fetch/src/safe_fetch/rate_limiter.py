@@ -1,32 +1,71 @@
-"""Token-bucket rate limiter with per-domain and global limits."""
+"""Token-bucket rate limiter with per-domain and global limits.
+
+Every request takes one token from the global bucket and one from its
+domain's bucket. :meth:`RateLimiter.check` is the non-blocking form: it takes
+both tokens or raises :class:`RateLimitError`. :meth:`RateLimiter.acquire`
+waits for them instead, up to a caller-supplied deadline, so a burst of
+fetches is smoothed out rather than failed:
+
+* **Fair across domains.** Waiters queue per domain and tokens are handed to
+  the waiting domains round-robin, so a burst against one site cannot starve
+  requests to others. Within a domain waiters are served in arrival order,
+  and a new caller never overtakes a queued one.
+* **Fails fast.** A request that cannot be served before its deadline, even
+  if it had the global bucket to itself, is rejected at once instead of
+  after waiting the deadline out.
+* **Bounded memory.** A domain bucket left idle long enough to refill is
+  identical to a fresh one, so it is dropped. At most ``max_domains``
+  buckets are kept; past that the least recently used are evicted.
+
+:meth:`RateLimiter.stats` reports queue depth and wait times.
+
+Configuration (environment): ``RATE_LIMIT_PER_DOMAIN`` (requests per minute,
+default 10), ``RATE_LIMIT_GLOBAL`` (default 60), ``RATE_LIMIT_MAX_DOMAINS``
+(default 1024).
+"""
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
+from typing import Callable
 
 
 @dataclass
 class _Bucket:
     capacity: float
     refill_rate: float  # tokens per second
+    now: float
     tokens: float = field(init=False)
     last_refill: float = field(init=False)
 
     def __post_init__(self):
         self.tokens = self.capacity
-        self.last_refill = time.monotonic()
+        self.last_refill = self.now
 
-    def try_consume(self) -> bool:
-        now = time.monotonic()
-        elapsed = now - self.last_refill
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.last_refill)
         self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
         self.last_refill = now
-        if self.tokens >= 1.0:
-            self.tokens -= 1.0
-            return True
-        return False
+
+    def is_full(self) -> bool:
+        return self.tokens >= self.capacity
+
+    def time_until(self, tokens: float) -> float:
+        """Seconds until *tokens* tokens will have been available, as of the last refill.
+
+        Tokens are handed out as they arrive, so this is not capped by
+        ``capacity``: the tenth waiter on a bucket of five waits for five refills.
+        """
+        missing = tokens - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.refill_rate <= 0:
+            return float("inf")
+        return missing / self.refill_rate
 
 
 class RateLimitError(Exception):
@@ -34,28 +73,218 @@ class RateLimitError(Exception):
 
 
 class RateLimiter:
-    def __init__(self):
-        self._per_domain_rpm = int(os.environ.get("RATE_LIMIT_PER_DOMAIN", "10"))
-        self._global_rpm = int(os.environ.get("RATE_LIMIT_GLOBAL", "60"))
-        self._domain_buckets: dict[str, _Bucket] = {}
+    """Per-domain and global token buckets with fair, deadline-bounded waiting.
+
+    Like ``ConnectionPool``, the limiter binds to the event loop it is first
+    awaited on. Waiters left over from another loop (one loop per test) are
+    dropped rather than served.
+    """
+
+    def __init__(
+        self,
+        *,
+        per_domain_rpm: int | None = None,
+        global_rpm: int | None = None,
+        max_domains: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._per_domain_rpm = per_domain_rpm if per_domain_rpm is not None else int(
+            os.environ.get("RATE_LIMIT_PER_DOMAIN", "10")
+        )
+        self._global_rpm = global_rpm if global_rpm is not None else int(
+            os.environ.get("RATE_LIMIT_GLOBAL", "60")
+        )
+        self._max_domains = max(1, max_domains if max_domains is not None else int(
+            os.environ.get("RATE_LIMIT_MAX_DOMAINS", "1024")
+        ))
+        self._clock = clock
         self._global_bucket = _Bucket(
             capacity=self._global_rpm,
             refill_rate=self._global_rpm / 60.0,
+            now=clock(),
         )
+        # Insertion order doubles as recency order: a use moves the domain last.
+        self._domain_buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        # Domains with queued waiters, in round-robin order.
+        self._waiters: OrderedDict[str, deque[asyncio.Future[None]]] = OrderedDict()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waited = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
 
     def check(self, domain: str) -> None:
-        if not self._global_bucket.try_consume():
+        """Take a token for *domain* now, or raise :class:`RateLimitError`."""
+        now = self._clock()
+        if self._waiters:
+            self._dispatch(now)
+        self._global_bucket.refill(now)
+        bucket = self._bucket(domain, now)
+        if self._global_bucket.tokens < 1.0:
+            self._rejected += 1
+            raise RateLimitError(f"Global rate limit exceeded ({self._global_rpm} req/min)")
+        if domain in self._waiters or bucket.tokens < 1.0:
+            self._rejected += 1
             raise RateLimitError(
-                f"Global rate limit exceeded ({self._global_rpm} req/min)"
+                f"Per-domain rate limit exceeded for {domain} ({self._per_domain_rpm} req/min)"
             )
+        self._take(bucket)
 
-        if domain not in self._domain_buckets:
-            self._domain_buckets[domain] = _Bucket(
-                capacity=self._per_domain_rpm,
-                refill_rate=self._per_domain_rpm / 60.0,
-            )
+    async def acquire(self, domain: str, timeout: float = 0.0) -> float:
+        """Take a token for *domain*, waiting up to *timeout* seconds for one.
+
+        Returns the seconds waited. Raises :class:`RateLimitError` at once if
+        the token cannot arrive before the deadline, or when it passes.
+        """
+        if timeout <= 0:
+            self.check(domain)
+            return 0.0
+        self._bind_loop()
+        now = self._clock()
+        if not self._waiters:
+            self._global_bucket.refill(now)
+            bucket = self._bucket(domain, now)
+            if self._global_bucket.tokens >= 1.0 and bucket.tokens >= 1.0:
+                self._take(bucket)
+                return 0.0
 
-        if not self._domain_buckets[domain].try_consume():
+        self._dispatch(now)
+        self._global_bucket.refill(now)
+        bucket = self._bucket(domain, now)
+        queue = self._waiters.get(domain)
+        ahead = sum(1 for waiter in queue if not waiter.done()) if queue else 0
+        if bucket.time_until(ahead + 1.0) > timeout:
+            self._rejected += 1
             raise RateLimitError(
                 f"Per-domain rate limit exceeded for {domain} ({self._per_domain_rpm} req/min)"
             )
+        if self._global_bucket.time_until(1.0) > timeout:
+            self._rejected += 1
+            raise RateLimitError(f"Global rate limit exceeded ({self._global_rpm} req/min)")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(domain, deque()).append(waiter)
+        self._dispatch(now)
+        if not waiter.done():
+            self._restart_dispatcher()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise RateLimitError(
+                f"Rate limit wait for {domain} exceeded the {timeout:g}s deadline"
+            ) from None
+        waited = self._clock() - now
+        self._waited += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return waited
+
+    def stats(self) -> dict[str, float | int]:
+        """Queue depth and wait-time counters since the limiter was created."""
+        return {
+            "queued": sum(
+                1 for queue in self._waiters.values() for waiter in queue if not waiter.done()
+            ),
+            "queued_domains": len(self._waiters),
+            "domains": len(self._domain_buckets),
+            "waited": self._waited,
+            "rejected": self._rejected,
+            "wait_seconds_total": self._wait_total,
+            "wait_seconds_max": self._wait_max,
+        }
+
+    # -- buckets -------------------------------------------------------------
+
+    def _bucket(self, domain: str, now: float) -> _Bucket:
+        bucket = self._domain_buckets.get(domain)
+        if bucket is None:
+            self._evict(now)
+            bucket = self._domain_buckets[domain] = _Bucket(
+                capacity=self._per_domain_rpm,
+                refill_rate=self._per_domain_rpm / 60.0,
+                now=now,
+            )
+        else:
+            self._domain_buckets.move_to_end(domain)
+            bucket.refill(now)
+        return bucket
+
+    def _take(self, bucket: _Bucket) -> None:
+        self._global_bucket.tokens -= 1.0
+        bucket.tokens -= 1.0
+
+    def _evict(self, now: float) -> None:
+        # Oldest first: drop buckets that have refilled (idle long enough to be
+        # indistinguishable from new ones), and anything past the size budget.
+        # Domains with queued waiters keep their bucket.
+        for domain in list(self._domain_buckets):
+            bucket = self._domain_buckets[domain]
+            bucket.refill(now)
+            over_budget = len(self._domain_buckets) >= self._max_domains
+            if not over_budget and not bucket.is_full():
+                break
+            if domain not in self._waiters:
+                del self._domain_buckets[domain]
+
+    # -- waiting -------------------------------------------------------------
+
+    def _dispatch(self, now: float) -> float | None:
+        """Serve whatever waiters can be served at *now*, round-robin by domain.
+
+        Returns the seconds until the next waiter could be served, or None
+        when nobody is waiting.
+        """
+        self._global_bucket.refill(now)
+        served = True
+        while served and self._waiters:
+            served = False
+            for domain in list(self._waiters):
+                queue = self._waiters[domain]
+                while queue and queue[0].done():  # timed out or cancelled
+                    queue.popleft()
+                if not queue:
+                    del self._waiters[domain]
+                    continue
+                if self._global_bucket.tokens < 1.0:
+                    break
+                bucket = self._domain_buckets[domain]
+                bucket.refill(now)
+                if bucket.tokens >= 1.0:
+                    self._take(bucket)
+                    queue.popleft().set_result(None)
+                    served = True
+                    self._waiters.move_to_end(domain)
+                    if not queue:
+                        del self._waiters[domain]
+        if not self._waiters:
+            return None
+        domain_waits = []
+        for domain in self._waiters:
+            bucket = self._domain_buckets[domain]
+            bucket.refill(now)
+            domain_waits.append(bucket.time_until(1.0))
+        return max(self._global_bucket.time_until(1.0), min(domain_waits))
+
+    def _restart_dispatcher(self) -> None:
+        # Restarted on every new waiter: its domain may become servable sooner
+        # than the one the current dispatcher is sleeping for.
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._dispatcher.cancel()
+        self._dispatcher = asyncio.get_running_loop().create_task(self._run_dispatcher())
+
+    async def _run_dispatcher(self) -> None:
+        while True:
+            delay = self._dispatch(self._clock())
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures and tasks from another loop cannot be resolved here.
+            self._waiters.clear()
+            self._dispatcher = None
+            self._loop = loop
@@ -0,0 +1,218 @@
+"""Relevance ranking of extracted markdown against a ``fetch`` prompt.
+
+Under ``max_tokens``, plain truncation keeps the head of a document, which on
+long reference pages is mostly navigation and introduction. When a ``prompt``
+is given, :func:`select_relevant` instead:
+
+1. splits the sanitized markdown into paragraph chunks, each tagged with the
+   heading path of its section (fenced code blocks stay whole);
+2. scores every chunk against the prompt with Okapi BM25, counting the
+   section's heading words as part of each of its chunks;
+3. keeps the highest-scoring chunks that fit the character budget and emits
+   them in document order, re-stating section headings where the output
+   enters a new section and marking each run of omitted paragraphs.
+
+Pure Python with no dependencies; it runs on the worker pool next to
+extraction. The input is already-sanitized text and the output only
+rearranges pieces of it, so ranking adds no new content beyond its markers.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_TOKEN_RE = re.compile(r"\w+")
+
+# BM25 parameters (the usual defaults) and the weight of heading words.
+_K1 = 1.2
+_B = 0.75
+_HEADING_WEIGHT = 2
+
+# Upper bound on one "[… N paragraphs omitted …]" marker plus its separator.
+_MARKER_COST = 40
+
+# Function words plus the instruction words prompts tend to start with
+# ("extract the API reference section"), which say nothing about the topic.
+_STOPWORDS = frozenset(
+    """a an and are as at be by can do does for from how i in into is it its
+    me my of on or show tell that the their them then there these this to
+    was what when where which who why will with you your about all any
+    details explain extract find focus get give information list only page
+    part parts section sections summarize summary""".split()
+)
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One paragraph (or fenced code block) and the headings it sits under."""
+
+    index: int
+    section: tuple[str, ...]
+    text: str
+
+
+def chunk_markdown(text: str) -> list[Chunk]:
+    """Split markdown into paragraph chunks tagged with their heading path.
+
+    Heading lines are not chunks themselves; each chunk's ``section`` holds
+    the heading lines (``"## Install"``) of the sections enclosing it.
+    """
+    chunks: list[Chunk] = []
+    section: list[tuple[int, str]] = []
+    para: list[str] = []
+    in_fence = False
+
+    def flush() -> None:
+        if para and any(line.strip() for line in para):
+            body = "\n".join(para).strip("\n")
+            chunks.append(Chunk(len(chunks), tuple(h for _, h in section), body))
+        para.clear()
+
+    for line in text.splitlines():
+        if _FENCE_RE.match(line):
+            if not in_fence:
+                flush()
+            para.append(line)
+            in_fence = not in_fence
+            if not in_fence:
+                flush()
+            continue
+        if in_fence:
+            para.append(line)
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            while section and section[-1][0] >= level:
+                section.pop()
+            section.append((level, line.strip()))
+        elif not line.strip():
+            flush()
+        else:
+            para.append(line)
+    flush()
+    return chunks
+
+
+def _terms(text: str) -> list[str]:
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS or len(token) < 2:
+            continue
+        # Crude plural folding: "options" and "option" score alike.
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def score_chunks(chunks: list[Chunk], prompt: str) -> list[float]:
+    """BM25 score of each chunk against *prompt* (0 for no query-term match)."""
+    query = set(_terms(prompt))
+    if not query or not chunks:
+        return [0.0] * len(chunks)
+
+    heading_terms: dict[tuple[str, ...], list[str]] = {}
+    docs: list[Counter[str]] = []
+    for chunk in chunks:
+        if chunk.section not in heading_terms:
+            heading_terms[chunk.section] = _terms(" ".join(chunk.section))
+        counts = Counter(_terms(chunk.text))
+        for term in heading_terms[chunk.section]:
+            counts[term] += _HEADING_WEIGHT
+        docs.append(counts)
+
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_len = sum(lengths) / len(lengths) or 1.0
+    n = len(docs)
+    idf = {}
+    for term in query:
+        df = sum(1 for doc in docs if term in doc)
+        idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for doc, length in zip(docs, lengths):
+        norm = _K1 * (1 - _B + _B * length / avg_len)
+        score = 0.0
+        for term in query:
+            tf = doc.get(term, 0)
+            if tf:
+                score += idf[term] * tf * (_K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def select_relevant(text: str, prompt: str, max_chars: int) -> str | None:
+    """The chunks of *text* most relevant to *prompt*, within *max_chars*.
+
+    Returns *text* unchanged when it already fits, and None when ranking
+    cannot help: nothing matches the prompt, or not even the best chunk
+    fits. The caller then falls back to head truncation.
+    """
+    if len(text) <= max_chars:
+        return text
+    chunks = chunk_markdown(text)
+    scores = score_chunks(chunks, prompt)
+    ranked = sorted(
+        (i for i, score in enumerate(scores) if score > 0),
+        key=lambda i: (-scores[i], i),
+    )
+    if not ranked:
+        return None
+
+    # Greedy by score. Each chunk is charged its text, its full heading path
+    # and one omission marker, an upper bound on what rendering adds for it,
+    # so the rendered result never exceeds the budget.
+    budget = max_chars - len(_header(len(chunks), len(chunks))) - _MARKER_COST
+    selected: set[int] = set()
+    for i in ranked:
+        chunk = chunks[i]
+        cost = len(chunk.text) + 2 + _MARKER_COST
+        cost += sum(len(heading) + 2 for heading in chunk.section)
+        if cost <= budget:
+            selected.add(i)
+            budget -= cost
+    if not selected:
+        return None
+    return _render(chunks, selected)
+
+
+def _header(shown: int, total: int) -> str:
+    return (
+        f"[Showing the {shown} of {total} paragraphs most relevant "
+        f"to the extraction focus, in document order]"
+    )
+
+
+def _render(chunks: list[Chunk], selected: set[int]) -> str:
+    parts = [_header(len(selected), len(chunks))]
+    current: tuple[str, ...] = ()
+    last = -1
+    for chunk in chunks:
+        if chunk.index not in selected:
+            continue
+        omitted = chunk.index - last - 1
+        if omitted:
+            parts.append(f"[… {omitted} paragraph{'s' if omitted != 1 else ''} omitted …]")
+        if chunk.section != current:
+            # Re-state only the headings below the part of the path already shown.
+            shared = 0
+            while (
+                shared < min(len(current), len(chunk.section))
+                and current[shared] == chunk.section[shared]
+            ):
+                shared += 1
+            parts.extend(chunk.section[shared:])
+            current = chunk.section
+        parts.append(chunk.text)
+        last = chunk.index
+    trailing = len(chunks) - last - 1
+    if trailing:
+        parts.append(f"[… {trailing} paragraph{'s' if trailing != 1 else ''} omitted …]")
+    return "\n\n".join(parts)
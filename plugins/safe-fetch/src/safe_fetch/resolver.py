@@ -0,0 +1,226 @@
+"""Async DNS resolution with a bounded, TTL-respecting cache.
+
+``validate_and_resolve`` used to call blocking ``socket.getaddrinfo`` on every
+hop of every fetch, and ``check_url`` resolved the same name again. The
+:class:`DNSCache` here sits in front of an async resolver and answers repeat
+lookups from memory:
+
+* **TTL-bounded.** An answer is served only while ``now < expires_at``; at
+  expiry the name is resolved again. A TTL of 0 is never cached. The cache
+  holds addresses only — the private/reserved-IP policy is re-applied by
+  ``url_policy`` to every answer, cached or fresh, and the connection is
+  still pinned to an address from that answer, so a cached entry cannot
+  widen the DNS-rebinding window past the record's own TTL.
+* **Negative caching.** NXDOMAIN is remembered for ``negative_ttl`` seconds.
+  Transient failures (timeouts, SERVFAIL) are not cached.
+* **In-flight de-duplication.** Concurrent lookups of one name share a single
+  query.
+* **Bounded.** At most ``max_entries`` names, least recently used evicted.
+
+Resolvers (``SAFE_FETCH_DNS_RESOLVER``):
+
+* ``system`` (default) — the OS resolver via ``loop.getaddrinfo``, which
+  honours ``/etc/hosts`` and the system search path but exposes no TTL, so
+  answers are cached for ``SAFE_FETCH_DNS_TTL`` seconds (default 30).
+* ``dnspython`` — queries A/AAAA records with ``dns.asyncresolver`` and
+  caches each answer for its real record TTL (capped at
+  ``SAFE_FETCH_DNS_MAX_TTL``). Requires the optional ``dnspython`` package;
+  it bypasses ``/etc/hosts``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import os
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+
+class ResolveError(Exception):
+    """The name could not be resolved (transient or unknown failure)."""
+
+
+class HostNotFound(ResolveError):
+    """The name does not exist (NXDOMAIN / EAI_NONAME). Negatively cached."""
+
+
+@dataclass(frozen=True)
+class Answer:
+    """Addresses for one name, in resolver order, valid for ``ttl`` seconds."""
+
+    addresses: tuple[str, ...]
+    ttl: float
+
+
+class Resolver(Protocol):
+    async def resolve(self, host: str) -> Answer: ...
+
+
+class SystemResolver:
+    """OS resolver (``getaddrinfo``) with a fixed TTL — it reports none."""
+
+    def __init__(self, ttl: float | None = None):
+        self._ttl = ttl if ttl is not None else float(os.environ.get("SAFE_FETCH_DNS_TTL", "30"))
+
+    async def resolve(self, host: str) -> Answer:
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM)
+        except socket.gaierror as exc:
+            if exc.errno in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", None)):
+                raise HostNotFound(host) from None
+            raise ResolveError(f"{host}: {exc}") from None
+        addresses = tuple(dict.fromkeys(sockaddr[0] for *_rest, sockaddr in infos))
+        return Answer(addresses, self._ttl)
+
+
+class DnspythonResolver:
+    """A/AAAA lookups through ``dns.asyncresolver``, keeping the record TTLs."""
+
+    def __init__(self):
+        try:
+            import dns.asyncresolver  # noqa: F401
+        except ImportError:
+            raise RuntimeError(
+                "SAFE_FETCH_DNS_RESOLVER=dnspython requires the dnspython package"
+            ) from None
+
+    async def resolve(self, host: str) -> Answer:
+        import dns.asyncresolver
+        import dns.exception
+        import dns.resolver
+
+        addresses: list[str] = []
+        ttls: list[int] = []
+        for rdtype in ("A", "AAAA"):
+            try:
+                answer = await dns.asyncresolver.resolve(host, rdtype)
+            except dns.resolver.NXDOMAIN:
+                raise HostNotFound(host) from None
+            except dns.resolver.NoAnswer:
+                continue
+            except dns.exception.DNSException as exc:
+                raise ResolveError(f"{host}: {exc}") from None
+            if answer.rrset is not None:
+                ttls.append(answer.rrset.ttl)
+            addresses.extend(rdata.address for rdata in answer)
+        if not addresses:
+            raise HostNotFound(host)
+        return Answer(tuple(addresses), min(ttls) if ttls else 0)
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    answer: Answer | None  # None = negative entry (NXDOMAIN)
+
+
+class DNSCache:
+    """Bounded LRU cache with TTL expiry, negative caching and in-flight de-dup."""
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        *,
+        max_entries: int | None = None,
+        negative_ttl: float | None = None,
+        max_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._resolver = resolver
+        self._max_entries = max(1, max_entries if max_entries is not None else int(
+            os.environ.get("SAFE_FETCH_DNS_CACHE_SIZE", "512")
+        ))
+        self._negative_ttl = negative_ttl if negative_ttl is not None else float(
+            os.environ.get("SAFE_FETCH_DNS_NEGATIVE_TTL", "10")
+        )
+        self._max_ttl = max_ttl if max_ttl is not None else float(
+            os.environ.get("SAFE_FETCH_DNS_MAX_TTL", "300")
+        )
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[Answer]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def resolve(self, host: str) -> tuple[str, ...]:
+        """Return the addresses for *host*; raises :class:`ResolveError` / :class:`HostNotFound`.
+
+        IP literals are returned as-is without a lookup or cache entry.
+        """
+        try:
+            return (str(ipaddress.ip_address(host.strip("[]"))),)
+        except ValueError:
+            pass
+        key = host.lower().rstrip(".")
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._clock() < entry.expires_at:
+                self._entries.move_to_end(key)
+                if entry.answer is None:
+                    raise HostNotFound(host)
+                return entry.answer.addresses
+            del self._entries[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # shield: one waiter being cancelled must not cancel the shared query.
+            return (await asyncio.shield(pending)).addresses
+
+        future: asyncio.Future[Answer] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            answer = await self._resolver.resolve(key)
+        except HostNotFound as exc:
+            self._store(key, None, self._negative_ttl)
+            future.set_exception(exc)
+            # Retrieved here so an un-awaited shared future does not warn.
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc if isinstance(exc, Exception) else ResolveError(host))
+            future.exception()
+            raise
+        else:
+            self._store(key, answer, min(answer.ttl, self._max_ttl))
+            future.set_result(answer)
+            return answer.addresses
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store(self, key: str, answer: Answer | None, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = _Entry(expires_at=self._clock() + ttl, answer=answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def _make_resolver() -> Resolver:
+    kind = os.environ.get("SAFE_FETCH_DNS_RESOLVER", "system")
+    if kind == "dnspython":
+        return DnspythonResolver()
+    if kind != "system":
+        raise ValueError(f"SAFE_FETCH_DNS_RESOLVER must be 'system' or 'dnspython', got {kind!r}")
+    return SystemResolver()
+
+
+_default_cache: DNSCache | None = None
+
+
+def default_cache() -> DNSCache:
+    """The process-wide cache used by ``url_policy.validate_and_resolve_async``."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DNSCache(_make_resolver())
+    return _default_cache
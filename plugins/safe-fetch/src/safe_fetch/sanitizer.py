@@ -7,13 +7,21 @@ import re
 import unicodedata
 
 from lxml import etree
-from lxml.html import fromstring as html_fromstring, tostring as html_tostring
+from lxml.html import (
+    HTMLParser,
+    document_fromstring as html_document_fromstring,
+    fromstring as html_fromstring,
+    tostring as html_tostring,
+)
 
 
 # ---------------------------------------------------------------------------
 # Constants — all compiled once at import time
 # ---------------------------------------------------------------------------
 
+# lxml.html's own test for "a whole document, not a fragment" on bytes input.
+_FULL_HTML_BYTES_RE = re.compile(rb"^\s*<(?:html|!doctype)", re.I)
+
 # Tags to strip entirely (content and all)
 _STRIP_TAGS = frozenset(
     {
@@ -86,6 +94,10 @@ _LLM_DELIMITER_VARIANT_RE = re.compile(
     re.I,
 )
 
+# Delimiters the variant regex does not cover. Every ``<|...|>`` literal is a
+# variant match, so these four are the only ones needing their own scan.
+_BRACKET_DELIMITERS = [d for d in _LLM_DELIMITERS if not _LLM_DELIMITER_VARIANT_RE.fullmatch(d)]
+
 # Zero-width and invisible Unicode — use str.translate for O(n) removal
 _INVISIBLE_CHARS = frozenset(
     {
@@ -116,14 +128,15 @@ _BIDI_CHARS = frozenset(
     | {chr(cp) for cp in range(0x2066, 0x206A)}
 )
 
-# Combined translate table: maps all invisible + bidi chars to None (deletion)
-_STRIP_CHAR_TABLE = str.maketrans(
-    {ord(c): None for c in _INVISIBLE_CHARS | _BIDI_CHARS}
+# One character class for all invisible + bidi chars and the Unicode tag
+# characters (U+E0000–U+E007F). A regex delete scans non-ASCII text several
+# times faster than str.translate, which does a dict lookup per character.
+_STRIP_CHARS_RE = re.compile(
+    "["
+    + "".join(re.escape(c) for c in sorted(_INVISIBLE_CHARS | _BIDI_CHARS))
+    + "\U000E0000-\U000E007F]+"
 )
 
-# Unicode tag characters (U+E0000–U+E007F)
-_TAG_CHAR_PATTERN = re.compile(r"[\U000E0000-\U000E007F]+")
-
 # Markdown image exfiltration pattern
 _MD_IMAGE_EXFIL = re.compile(
     r"!\[([^\]]*)\]\((https?://[^)]*[?&]"
@@ -136,7 +149,14 @@ _MD_IMAGE_EXFIL = re.compile(
 _MD_IMAGE = re.compile(r"!\[([^\]]*)\]\((https?://[^)]+)\)")
 
 # Base64 pattern (blocks of 50+ chars)
-_BASE64_BLOCK = re.compile(r"(?:[A-Za-z0-9+/]{50,}={0,2})")
+# The lookbehind only lets a match start where a run starts. Same matches as
+# without it (a run too short from its start is too short from any later
+# offset), but the scanner no longer re-walks the tail of every short run.
+_BASE64_BLOCK = re.compile(r"(?<![A-Za-z0-9+/])(?:[A-Za-z0-9+/]{50,}={0,2})")
+
+# Padding a base64 block of a given length % 4 needs before b64decode accepts
+# it; anything shorter raises, so the block cannot be a payload.
+_BASE64_MIN_PADDING = {0: 0, 1: 3, 2: 2, 3: 1}
 
 # Instruction-like patterns for detecting injected instructions
 _INSTRUCTION_PATTERNS = [
@@ -149,9 +169,10 @@ _INSTRUCTION_PATTERNS = [
     re.compile(r"(?:curl|wget|fetch)\s+https?://", re.I),
 ]
 
-# XPath expressions — compiled once, reused
-_XPATH_COMMENT = etree.XPath("//comment()")
-_XPATH_META = etree.XPath("//meta")
+# All instruction patterns as one alternation (one search instead of four)
+_INSTRUCTION_RE = re.compile(
+    "|".join(f"(?:{pat.pattern})" for pat in _INSTRUCTION_PATTERNS), re.I
+)
 
 
 # ---------------------------------------------------------------------------
@@ -161,82 +182,93 @@ _XPATH_META = etree.XPath("//meta")
 
 def sanitize_html(html_content: str) -> str:
     """Strip dangerous/hidden HTML elements before content extraction."""
-    try:
-        doc = html_fromstring(html_content)
-    except Exception:
+    doc = sanitize_html_tree(html_content)
+    if doc is None:
         return re.sub(r"<[^>]+>", "", html_content)
-
-    _remove_dangerous_elements(doc)
-    _remove_hidden_elements(doc)
-    _strip_comments(doc)
-    _clean_data_attributes(doc)
-    _strip_meta_instructions(doc)
-
     return html_tostring(doc, encoding="unicode")
 
 
-def _remove_dangerous_elements(doc: etree._Element) -> None:
-    for tag in _STRIP_TAGS:
-        for el in doc.xpath(f"//{tag}"):
-            parent = el.getparent()
-            if parent is not None:
-                parent.remove(el)
+def sanitize_html_tree(
+    html_content: str | bytes | bytearray, encoding: str = "utf-8"
+) -> etree._Element | None:
+    """Parse and sanitize *html_content*, returning the cleaned lxml tree.
+
+    Same rules as :func:`sanitize_html`, without serializing the result — the
+    caller can hand the tree straight to extraction. Returns None if the
+    document cannot be parsed. Raw bytes are parsed in *encoding* by libxml2
+    itself, without first being decoded into a Python string.
 
+    All five checks (dangerous tags, hidden elements, comments, long
+    ``data-*`` attributes, instruction-bearing ``<meta>``) run in one
+    ``iter()`` traversal. Removals are collected and applied afterwards in
+    reverse document order, so a descendant goes before its ancestor and the
+    result matches applying the checks one pass at a time.
+    """
+    try:
+        doc = _parse_html(html_content, encoding)
+    except Exception:
+        return None
 
-def _remove_hidden_elements(doc: etree._Element) -> None:
-    # Single pass: check both inline style and class
     to_remove = []
     for el in doc.iter():
-        if not isinstance(el.tag, str):
+        tag = el.tag
+        if not isinstance(tag, str):
+            if tag is etree.Comment:
+                to_remove.append(el)
             continue
-
-        # Check inline style
-        style = el.get("style")
-        if style and _HIDDEN_CSS_RE.search(style):
+        if (
+            tag in _STRIP_TAGS
+            or _is_hidden(el)
+            or (tag == "meta" and _is_instruction_meta(el))
+        ):
             to_remove.append(el)
             continue
+        _drop_long_data_attributes(el)
 
-        # Check class
-        class_attr = el.get("class")
-        if class_attr:
-            classes = set(class_attr.lower().split())
-            if classes & _HIDDEN_CLASSES:
-                to_remove.append(el)
-
-    # Remove in reverse order to avoid parent-before-child issues
     for el in reversed(to_remove):
         parent = el.getparent()
         if parent is not None:
             parent.remove(el)
+    return doc
 
 
-def _strip_comments(doc: etree._Element) -> None:
-    for comment in _XPATH_COMMENT(doc):
-        parent = comment.getparent()
-        if parent is not None:
-            parent.remove(comment)
+def _parse_html(html_content: str | bytes | bytearray, encoding: str) -> etree._Element:
+    if isinstance(html_content, str):
+        return html_fromstring(html_content)
+    try:
+        parser = HTMLParser(encoding=encoding)
+        if _FULL_HTML_BYTES_RE.match(html_content):
+            # What lxml.html.fromstring does for a full document, but
+            # document_fromstring also takes a bytearray without copying it.
+            return html_document_fromstring(html_content, parser=parser)
+        return html_fromstring(bytes(html_content), parser=parser)
+    except LookupError:
+        # A codec Python knows but libxml2 does not (e.g. "euc_jp").
+        return html_fromstring(html_content.decode(encoding, errors="replace"))
 
 
-def _clean_data_attributes(doc: etree._Element) -> None:
-    for el in doc.iter():
-        if not isinstance(el.tag, str):
-            continue
-        to_remove = [
-            attr
-            for attr, val in el.attrib.items()
-            if attr.startswith("data-") and len(val) > 100
-        ]
-        for attr in to_remove:
-            del el.attrib[attr]
+def _is_hidden(el: etree._Element) -> bool:
+    """Hidden by inline style or by a well-known hiding class."""
+    style = el.get("style")
+    if style and _HIDDEN_CSS_RE.search(style):
+        return True
+    class_attr = el.get("class")
+    return bool(class_attr) and not _HIDDEN_CLASSES.isdisjoint(class_attr.lower().split())
 
 
-def _strip_meta_instructions(doc: etree._Element) -> None:
-    for meta in _XPATH_META(doc):
-        content = meta.get("content", "")
-        if any(pat.search(content) for pat in _INSTRUCTION_PATTERNS):
-            parent = meta.getparent()
-            if parent is not None:
-                parent.remove(meta)
+def _is_instruction_meta(el: etree._Element) -> bool:
+    return _INSTRUCTION_RE.search(el.get("content", "")) is not None
+
+
+def _drop_long_data_attributes(el: etree._Element) -> None:
+    attrib = el.attrib
+    to_remove = [
+        attr
+        for attr, val in attrib.items()
+        if attr.startswith("data-") and len(val) > 100
+    ]
+    for attr in to_remove:
+        del attrib[attr]
 
 
 # ---------------------------------------------------------------------------
@@ -245,30 +277,50 @@ def _strip_meta_instructions(doc: etree._Element) -> None:
 
 
 def sanitize_text(text: str) -> str:
-    """Apply text-level sanitization to extracted content."""
-    text = unicodedata.normalize("NFKC", text)
-    # Single str.translate call removes all invisible + bidi chars (O(n))
-    text = text.translate(_STRIP_CHAR_TABLE)
-    text = _TAG_CHAR_PATTERN.sub("", text)
+    """Apply text-level sanitization to extracted content.
+
+    Each stage skips itself when it provably has nothing to do, so clean text
+    is mostly scanned rather than copied: pure-ASCII text is already NFKC and
+    holds no invisible, bidi or tag characters; ``is_normalized`` avoids
+    rebuilding text that NFKC would leave unchanged; and the image rules only
+    run when the text contains ``![``.
+    """
+    if not text.isascii():
+        if not unicodedata.is_normalized("NFKC", text):
+            text = unicodedata.normalize("NFKC", text)
+        text = _STRIP_CHARS_RE.sub("", text)
     text = _strip_llm_delimiters(text)
     text = _neutralize_base64_payloads(text)
-    text = _defang_exfiltration_urls(text)
+    if "![" in text:
+        text = _defang_exfiltration_urls(text)
     return text
 
 
 def _strip_llm_delimiters(text: str) -> str:
-    for delim in _LLM_DELIMITERS:
-        text = text.replace(delim, "")
-    text = _LLM_DELIMITER_VARIANT_RE.sub("", text)
-    return text
+    # Repeat until nothing changes: removing one delimiter can join the text
+    # around it into another ("<|im_<|pad|>start|>").
+    while True:
+        length = len(text)
+        if "INST]" in text or "SYS>>" in text:
+            for delim in _BRACKET_DELIMITERS:
+                text = text.replace(delim, "")
+        if "<|" in text:
+            text = _LLM_DELIMITER_VARIANT_RE.sub("", text)
+        if len(text) == length:
+            return text
 
 
 def _neutralize_base64_payloads(text: str) -> str:
     def _check_b64(match: re.Match) -> str:
         b64_str = match.group(0)
+        data = b64_str.rstrip("=")
+        # Prefilter: a block b64decode would reject for its padding decodes
+        # to nothing, so skip the decode attempt entirely.
+        if len(b64_str) - len(data) < _BASE64_MIN_PADDING[len(data) % 4]:
+            return b64_str
         try:
             decoded = base64.b64decode(b64_str).decode("utf-8", errors="ignore")
-            if any(pat.search(decoded) for pat in _INSTRUCTION_PATTERNS):
+            if _INSTRUCTION_RE.search(decoded):
                 return "[BASE64-PAYLOAD-REMOVED]"
         except Exception:
             pass
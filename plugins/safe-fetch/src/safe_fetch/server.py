@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 import logging
 import os
 from pathlib import Path
 import sys
+from typing import NamedTuple
 from urllib.parse import urljoin, urlparse
 
 from dotenv import load_dotenv
@@ -18,15 +21,19 @@ load_dotenv(Path.home() / ".env", override=False)
 import httpx
 from mcp.server.fastmcp import FastMCP
 
-from .extractor import extract_by_content_type, truncate_to_tokens
+from .connection_pool import ConnectionPool, PoolKey
+from .content_cache import CacheEntry, ContentCache
+from .extractor import truncate_to_tokens
+from .pipeline import extract_and_sanitize, format_search_results, pipeline_fingerprint
 from .rate_limiter import RateLimiter, RateLimitError
-from .sanitizer import sanitize_html, sanitize_text, frame_content
+from .relevance import select_relevant
+from .sanitizer import frame_content
 from .url_policy import (
-    validate_url,
-    validate_and_resolve,
-    check_url_safety,
+    validate_and_resolve_async,
+    check_url_safety_async,
     URLPolicyError,
 )
+from .workers import WorkerBusy, WorkerError, WorkerPool, WorkerTimeout
 
 # Logging to stderr (stdout is reserved for JSON-RPC)
 logging.basicConfig(
@@ -36,12 +43,25 @@ logging.basicConfig(
 )
 log = logging.getLogger("safe-fetch")
 
+
+@asynccontextmanager
+async def _lifespan(_server: FastMCP):
+    try:
+        yield {}
+    finally:
+        await _pool.aclose()
+        _workers.shutdown()
+
+
 mcp = FastMCP(
     "safe-fetch",
     instructions="Sanitizing web fetch — strips prompt injection vectors before content reaches the LLM.",
+    lifespan=_lifespan,
 )
 
 _rate_limiter = RateLimiter()
+# Seconds a fetch may queue for a rate-limit token before [RATE LIMITED].
+_RATE_LIMIT_WAIT = float(os.environ.get("RATE_LIMIT_MAX_WAIT", "10"))
 
 _USER_AGENT = os.environ.get(
     "SAFE_FETCH_USER_AGENT",
@@ -50,6 +70,28 @@ _USER_AGENT = os.environ.get(
 _TIMEOUT = float(os.environ.get("SAFE_FETCH_TIMEOUT", "30"))
 _MAX_BODY = int(os.environ.get("SAFE_FETCH_MAX_BODY", str(5 * 1024 * 1024)))  # 5 MB
 _MAX_REDIRECTS = 5
+# Early termination under max_tokens: read until the sanitized output is this
+# much larger than the budget, so the cut (and any markup torn by it) falls in
+# the part truncation drops anyway.
+_BUDGET_MARGIN = 1.25
+# First HTML probe at this many body bytes per budgeted character.
+_HTML_BYTES_PER_CHAR = 4
+_SEARCH_TIMEOUT = 15.0
+_SEARCH_HOST = "api.search.brave.com"
+
+# Keep-alive clients shared by every fetch/search for the life of the process.
+_pool = ConnectionPool(timeout=_TIMEOUT)
+
+# Extraction/sanitization runs here; the event loop only does network work.
+_workers = WorkerPool()
+
+# Raw responses + sanitized output on disk, revalidated per HTTP freshness rules.
+_cache = ContentCache(version=pipeline_fingerprint())
+
+# fetch_many: URLs in flight at once across all batches, and URLs per call.
+_BATCH_CONCURRENCY = max(1, int(os.environ.get("SAFE_FETCH_BATCH_CONCURRENCY", "4")))
+_BATCH_MAX_URLS = 20
+_batch_slots = asyncio.Semaphore(_BATCH_CONCURRENCY)
 
 
 class _BodyTooLarge(Exception):
@@ -60,6 +102,105 @@ class _TooManyRedirects(Exception):
     """Raised when a redirect chain exceeds _MAX_REDIRECTS hops."""
 
 
+class _Fetched(NamedTuple):
+    """Final response of a redirect chain (``body`` is empty for a 304).
+
+    ``complete`` is False when an :class:`_EarlyStop` ended the download; the
+    body is then only a prefix and must not be cached.
+    """
+
+    body: bytes | bytearray
+    content_type: str
+    final_url: str
+    status: int
+    headers: httpx.Headers
+    complete: bool = True
+
+
+class _BodyBuffer:
+    """A response body accumulated in one ``bytearray``.
+
+    Collecting chunks in a list and joining them held every byte twice at the
+    end of a download. Here each chunk is copied once, into a buffer
+    preallocated from ``Content-Length`` when the server sends one, and
+    :meth:`finish` hands over the buffer itself rather than a copy. If the
+    server sends more than it declared, the buffer grows as usual.
+    """
+
+    def __init__(self, expected: int | None = None):
+        self._buf = bytearray(expected or 0)
+        self.size = 0
+
+    def append(self, chunk: bytes) -> int:
+        """Add *chunk*; returns the number of bytes held."""
+        end = self.size + len(chunk)
+        if end <= len(self._buf):
+            self._buf[self.size : end] = chunk
+        else:
+            del self._buf[self.size :]
+            self._buf += chunk
+        self.size = end
+        return end
+
+    def prefix(self) -> bytes:
+        """A copy of the bytes so far, for an early-stop probe."""
+        return bytes(memoryview(self._buf)[: self.size])
+
+    def finish(self) -> bytearray:
+        del self._buf[self.size :]
+        return self._buf
+
+
+def _expected_length(response: httpx.Response) -> int | None:
+    """Decoded body size promised by the headers, when it can be trusted for sizing."""
+    if response.headers.get("content-encoding", "identity").lower() != "identity":
+        return None  # Content-Length counts compressed bytes
+    try:
+        length = int(response.headers.get("content-length", ""))
+    except ValueError:
+        return None
+    return length if 0 < length <= _MAX_BODY else None
+
+
+class _EarlyStop:
+    """Stop downloading once a body prefix already fills a ``max_tokens`` budget.
+
+    HTML and plain text are probed while streaming: at a first threshold, and
+    at every doubling of the bytes read after it, the prefix is run through
+    the normal extract/sanitize pipeline. Reading stops as soon as its output
+    exceeds the budget by ``_BUDGET_MARGIN`` and that output becomes the
+    result. Geometric probing keeps the repeated extraction work below twice
+    that of one full pass. Other types need the whole body (JSON, PDF); PDFs
+    instead stop extracting at the page that fills the budget.
+    """
+
+    def __init__(self, max_tokens: int):
+        # truncate_to_tokens keeps ~4 characters per token.
+        self.min_chars = int(max_tokens * 4 * _BUDGET_MARGIN)
+        self.result: str | None = None
+
+    def first_probe(self, content_type: str) -> int | None:
+        """Body size at which to first try the prefix, or None to read it all."""
+        ct = content_type.lower().split(";")[0].strip()
+        if ct.startswith("text/plain"):
+            return self.min_chars
+        if ct.startswith("text/html") or ct.startswith("application/xhtml"):
+            return self.min_chars * _HTML_BYTES_PER_CHAR
+        return None
+
+    def extract_limit(self, content_type: str) -> int | None:
+        """``max_chars`` for page-incremental extraction of a complete body."""
+        ct = content_type.lower().split(";")[0].strip()
+        return self.min_chars if ct == "application/pdf" else None
+
+    async def probe(self, prefix: bytes, content_type: str, url: str) -> bool:
+        sanitized = await _workers.run(extract_and_sanitize, prefix, content_type, url)
+        if len(sanitized) < self.min_chars:
+            return False
+        self.result = sanitized
+        return True
+
+
 def _pin_to_ip(url: str, ip: str) -> str:
     """Return *url* with its host replaced by *ip* (IPv6 bracketed, port kept).
 
@@ -77,33 +218,47 @@ def _pin_to_ip(url: str, ip: str) -> str:
 async def _fetch_pinned(
     start_url: str,
     *,
+    validators: dict[str, str] | None = None,
+    validators_url: str | None = None,
+    early_stop: _EarlyStop | None = None,
     transport: httpx.AsyncBaseTransport | None = None,
-) -> tuple[bytes, str, str]:
-    """Fetch *start_url*, following redirects safely. Returns (body, content_type, final_url).
+) -> _Fetched:
+    """Fetch *start_url*, following redirects safely. Returns the final :class:`_Fetched`.
 
     Security properties (closing two HIGH SSRF findings):
       - Every hop — the initial URL AND each redirect target — is re-run through
-        ``validate_and_resolve`` (allowlist + private/metadata IP guard). httpx's
-        own ``follow_redirects`` is OFF; redirects to internal hosts are blocked.
+        ``validate_and_resolve_async`` (allowlist + private/metadata IP guard,
+        resolved through the TTL-bounded DNS cache). httpx's own
+        ``follow_redirects`` is OFF; redirects to internal hosts are blocked.
       - Each hop connects to the exact IP the policy validated (Host + SNI
         preserved), so a DNS-rebinding answer between check and connect cannot
         redirect the socket to an internal address.
       - The body cap is enforced incrementally while streaming, so an oversized
         body or decompression bomb is aborted before it is fully buffered.
 
-    ``transport`` is for tests (inject an ``httpx.MockTransport``); production
-    passes None and uses the default transport with TLS verification.
+    Connections come from the process-wide ``_pool``, keyed by the hop's
+    (scheme, pinned IP, SNI host, port). The lookup happens after that hop's
+    ``validate_and_resolve_async``, so a kept-alive connection is only reused for
+    an address the policy has just re-approved.
+
+    ``validators`` are the content cache's ``If-None-Match`` /
+    ``If-Modified-Since`` for the resource at ``validators_url``. They are
+    sent only on the hop whose URL is ``validators_url``; every other hop,
+    including hops to other origins, goes out unconditional. A ``304`` to the
+    conditional hop is returned with an empty body. ``early_stop`` may end the
+    download of a long body early (``complete=False``); the size cap still
+    applies to whatever is read.
+
+    ``transport`` is for tests (inject an ``httpx.MockTransport``); it gets a
+    private pool that is closed on return. Production passes None and uses the
+    shared pool with TLS verification.
     """
-    client = httpx.AsyncClient(
-        follow_redirects=False,
-        timeout=_TIMEOUT,
-        transport=transport,
-    )
+    pool = _pool if transport is None else ConnectionPool(timeout=_TIMEOUT, transport=transport)
     try:
         # current_url is always hostname-based (for policy checks + relative-redirect joins).
         current_url = start_url
         for _hop in range(_MAX_REDIRECTS + 1):
-            normalized, pinned_ip = validate_and_resolve(current_url)
+            normalized, pinned_ip = await validate_and_resolve_async(current_url)
             parsed_hop = urlparse(normalized)
             host = parsed_hop.hostname or ""
             # Host header must carry the port for non-default ports (RFC 7230 §5.4);
@@ -111,12 +266,23 @@ async def _fetch_pinned(
             # for the sni_hostname extension and the certificate-verification name.
             host_header = f"{host}:{parsed_hop.port}" if parsed_hop.port else host
             request_url = _pin_to_ip(normalized, pinned_ip)
-            headers = {"User-Agent": _USER_AGENT, "Host": host_header}
+            conditional = bool(validators) and normalized == validators_url
+            request_headers = {
+                **(validators if conditional else {}),
+                "User-Agent": _USER_AGENT,
+                "Host": host_header,
+            }
+            key = PoolKey(
+                parsed_hop.scheme,
+                pinned_ip,
+                host,
+                parsed_hop.port or (443 if parsed_hop.scheme == "https" else 80),
+            )
 
-            async with client.stream(
+            async with pool.lease(key) as client, client.stream(
                 "GET",
                 request_url,
-                headers=headers,
+                headers=request_headers,
                 extensions={"sni_hostname": host},
             ) as response:
                 if response.is_redirect and "location" in response.headers:
@@ -125,23 +291,133 @@ async def _fetch_pinned(
                     current_url = urljoin(normalized, response.headers["location"])
                     continue
 
-                response.raise_for_status()
                 content_type = response.headers.get("content-type", "text/html")
+                if response.status_code == 304 and conditional:
+                    return _Fetched(b"", content_type, normalized, 304, response.headers)
+                response.raise_for_status()
 
-                chunks: list[bytes] = []
-                total = 0
+                next_probe = early_stop.first_probe(content_type) if early_stop else None
+                # A body that may stop early is not preallocated at full size.
+                body = _BodyBuffer(_expected_length(response) if next_probe is None else None)
                 async for chunk in response.aiter_bytes():
-                    total += len(chunk)
+                    total = body.append(chunk)
                     if total > _MAX_BODY:
                         raise _BodyTooLarge(
                             f"[TOO LARGE] Response body exceeds {_MAX_BODY} bytes"
                         )
-                    chunks.append(chunk)
-                return b"".join(chunks), content_type, normalized
+                    if next_probe is not None and total >= next_probe:
+                        prefix = body.prefix()
+                        if await early_stop.probe(prefix, content_type, normalized):
+                            return _Fetched(
+                                prefix,
+                                content_type,
+                                normalized,
+                                response.status_code,
+                                response.headers,
+                                complete=False,
+                            )
+                        next_probe = total * 2
+                return _Fetched(
+                    body.finish(), content_type, normalized, response.status_code, response.headers
+                )
 
         raise _TooManyRedirects()
     finally:
-        await client.aclose()
+        if pool is not _pool:
+            await pool.aclose()
+
+
+async def _fetch_sanitized(url: str, max_tokens: int = 0) -> tuple[str, str]:
+    """Layers 2–5 for a policy-checked *url*. Returns ``(sanitized_text, final_url)``.
+
+    A fresh cache entry is served without contacting the origin (or spending
+    rate-limit budget); its final URL is re-validated first, since the policy
+    may have changed since the redirect chain was followed. A stale entry is
+    revalidated with a conditional GET, and a ``304`` reuses the stored body
+    and sanitized output. With *max_tokens*, the download and extraction stop
+    once the budget is filled (see :class:`_EarlyStop`); the result is then
+    longer than the budget but not the whole document, and is not cached.
+    Errors propagate for ``fetch`` to map.
+    """
+    entry = await asyncio.to_thread(_cache.lookup, url)
+    if entry is not None and entry.is_fresh():
+        await validate_and_resolve_async(entry.final_url)
+        sanitized = await _sanitize_cached(entry)
+        if sanitized is not None:
+            log.info("Cache hit %s", url)
+            return sanitized, entry.final_url
+
+    # Layer 2: Rate limiting — bursts wait (fairly, per domain) for a token
+    host = urlparse(url).hostname or "unknown"
+    waited = await _rate_limiter.acquire(host, _RATE_LIMIT_WAIT)
+    if waited:
+        log.info("Waited %.2fs for a rate-limit token for %s", waited, host)
+
+    # Layer 3: Fetch — manual redirect loop with per-hop policy re-validation,
+    # IP-pinned connections, and incremental size enforcement.
+    early_stop = _EarlyStop(max_tokens) if max_tokens > 0 else None
+    fetched = await _fetch_pinned(
+        url,
+        validators=entry.validators() if entry else None,
+        validators_url=entry.final_url if entry else None,
+        early_stop=early_stop,
+    )
+    if fetched.status == 304 and entry is not None and fetched.final_url == entry.final_url:
+        entry = await asyncio.to_thread(_cache.revalidated, entry, fetched.headers)
+        sanitized = await _sanitize_cached(entry)
+        if sanitized is not None:
+            log.info("Revalidated %s (not modified)", url)
+            return sanitized, entry.final_url
+    if fetched.status == 304:
+        # Stored copy unusable (evicted, or the chain now ends elsewhere).
+        fetched = await _fetch_pinned(url, early_stop=early_stop)
+
+    log.info(
+        "Fetched %s (%s, %d bytes%s)",
+        fetched.final_url,
+        fetched.content_type.split(";")[0],
+        len(fetched.body),
+        "" if fetched.complete else ", stopped at max_tokens budget",
+    )
+    if not fetched.complete:
+        return early_stop.result, fetched.final_url
+
+    entry = None
+    if fetched.status == 200:
+        entry = await asyncio.to_thread(
+            _cache.store,
+            url,
+            fetched.final_url,
+            fetched.content_type,
+            fetched.headers,
+            fetched.body,
+        )
+
+    # Layer 4–5: Extract + sanitize, on the worker pool
+    limit = early_stop.extract_limit(fetched.content_type) if early_stop else None
+    sanitized = await _workers.run(
+        extract_and_sanitize, fetched.body, fetched.content_type, fetched.final_url, limit
+    )
+    if entry is not None and limit is None:
+        # Budget-limited (partial) output is never stored as the derived entry.
+        await asyncio.to_thread(_cache.store_derived, entry, sanitized)
+    return sanitized, fetched.final_url
+
+
+async def _sanitize_cached(entry: CacheEntry) -> str | None:
+    """Sanitized output for a cached entry, re-deriving it if the pipeline changed.
+
+    Returns None when the stored body has been evicted.
+    """
+    sanitized = await asyncio.to_thread(_cache.load_derived, entry)
+    if sanitized is not None:
+        return sanitized
+    body = await asyncio.to_thread(_cache.load_body, entry)
+    if body is None:
+        return None
+    sanitized = await _workers.run(extract_and_sanitize, body, entry.content_type, entry.final_url)
+    await asyncio.to_thread(_cache.store_derived, entry, sanitized)
+    return sanitized
 
 
 @mcp.tool()
@@ -158,29 +434,41 @@ async def fetch(url: str, prompt: str = "", max_tokens: int = 0) -> str:
 
     Args:
         url: The URL to fetch (http/https only)
-        prompt: Optional — focus extraction on this topic (e.g. "extract the API reference section")
+        prompt: Optional — focus extraction on this topic (e.g. "extract the API reference section").
+            With max_tokens, the paragraphs most relevant to it are kept instead of the head.
         max_tokens: Optional — truncate output to approximately this many tokens (0 = no limit)
     """
+    return await _fetch_one(url, prompt, max_tokens)
+
+
+async def _fetch_one(url: str, prompt: str, max_tokens: int) -> str:
+    """Body of ``fetch``: one URL through every layer, errors as status markers."""
     # Layer 1: URL validation
     try:
-        validated_url = validate_url(url)
+        validated_url, _ip = await validate_and_resolve_async(url)
     except URLPolicyError as e:
         return f"[BLOCKED] {e}"
 
-    # Layer 2: Rate limiting
-    domain = urlparse(validated_url).hostname or "unknown"
-    try:
-        _rate_limiter.check(domain)
-    except RateLimitError as e:
-        return f"[RATE LIMITED] {e}"
+    focus = f"[Extraction focus: {prompt}]\n\n" if prompt else ""
 
-    # Layer 3: Fetch — manual redirect loop with per-hop policy re-validation,
-    # IP-pinned connections, and incremental size enforcement.
+    # Layers 2–5: cache, rate limit, fetch, extract + sanitize
     try:
-        body, content_type, validated_url = await _fetch_pinned(validated_url)
+        # Ranking against the prompt needs the whole document, so the
+        # early stop under max_tokens only applies without one.
+        sanitized, validated_url = await _fetch_sanitized(
+            validated_url, 0 if prompt else max_tokens
+        )
+        if prompt and max_tokens > 0:
+            ranked = await _workers.run(
+                select_relevant, sanitized, prompt, max(0, max_tokens * 4 - len(focus))
+            )
+            if ranked is not None:
+                sanitized = ranked
     except URLPolicyError as e:
         # A redirect pointed at a disallowed / private / metadata host.
         return f"[BLOCKED] {e}"
+    except RateLimitError as e:
+        return f"[RATE LIMITED] {e}"
     except _BodyTooLarge as e:
         return str(e)
     except _TooManyRedirects:
@@ -189,30 +477,17 @@ async def fetch(url: str, prompt: str = "", max_tokens: int = 0) -> str:
         return f"[HTTP ERROR] {e.response.status_code}: {e.response.reason_phrase}"
     except httpx.RequestError as e:
         return f"[REQUEST ERROR] {type(e).__name__}: {e}"
-
-    log.info(
-        "Fetched %s (%s, %d bytes)",
-        validated_url,
-        content_type.split(";")[0],
-        len(body),
-    )
-
-    # Layer 4–5: Extract + sanitize
-    ct = content_type.lower().split(";")[0].strip()
-    if ct.startswith("text/html") or ct.startswith("application/xhtml"):
-        html_str = body.decode("utf-8", errors="replace")
-        clean_html = sanitize_html(html_str)
-        extracted = extract_by_content_type(clean_html, content_type, validated_url)
-    else:
-        extracted = extract_by_content_type(body, content_type, validated_url)
-
-    sanitized = sanitize_text(extracted)
+    except WorkerBusy as e:
+        return f"[BUSY] {e}"
+    except WorkerTimeout as e:
+        return f"[TIMEOUT] {e}"
+    except WorkerError as e:
+        return f"[EXTRACTION ERROR] {e}"
 
     # Dynamic filtering: if prompt is given, add it as extraction context
-    if prompt:
-        sanitized = f"[Extraction focus: {prompt}]\n\n{sanitized}"
+    sanitized = focus + sanitized
 
-    # Token truncation
+    # Token truncation (a no-op after ranking, which already fits the budget)
     if max_tokens > 0:
         sanitized = truncate_to_tokens(sanitized, max_tokens)
 
@@ -220,6 +495,42 @@ async def fetch(url: str, prompt: str = "", max_tokens: int = 0) -> str:
     return frame_content(sanitized, validated_url)
 
 
+@mcp.tool()
+async def fetch_many(urls: list[str], max_tokens_each: int = 0, total_budget: int = 0) -> str:
+    """Fetch several URLs concurrently and return their sanitized content in input order.
+
+    Each URL goes through exactly the same layers as ``fetch`` (policy check
+    on every redirect hop, rate limits, sanitization, framing); failures are
+    reported per URL with the same markers ([BLOCKED], [RATE LIMITED], …).
+
+    Args:
+        urls: The URLs to fetch (http/https only, at most 20)
+        max_tokens_each: Optional — truncate each page to approximately this many tokens (0 = no limit)
+        total_budget: Optional — approximate token budget for all pages together, split evenly (0 = no limit)
+    """
+    if not urls:
+        return "[ERROR] no URLs given"
+    if len(urls) > _BATCH_MAX_URLS:
+        return f"[ERROR] at most {_BATCH_MAX_URLS} URLs per call, got {len(urls)}"
+
+    per_url = max(0, max_tokens_each)
+    if total_budget > 0:
+        share = max(1, total_budget // len(urls))
+        per_url = min(per_url, share) if per_url else share
+
+    async def run(url: str) -> str:
+        async with _batch_slots:
+            return await _fetch_one(url, "", per_url)
+
+    # Duplicate URLs are fetched once.
+    tasks = {url: asyncio.ensure_future(run(url)) for url in dict.fromkeys(urls)}
+    results = await asyncio.gather(*tasks.values())
+    by_url = dict(zip(tasks, results))
+    return "\n\n".join(
+        f"[{i}/{len(urls)}] {url}\n{by_url[url]}" for i, url in enumerate(urls, 1)
+    )
+
+
 @mcp.tool()
 async def search(
     query: str,
@@ -255,16 +566,19 @@ async def search(
         # Brave Search uses 'city' in the search_lang or as part of query refinement
         params["q"] = f"{query} {city}"
 
+    # The search API is a fixed, trusted endpoint — not policy-checked or
+    # IP-pinned — so its key carries the hostname and httpx resolves it.
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
+        async with _pool.lease(PoolKey("https", _SEARCH_HOST, _SEARCH_HOST, 443)) as client:
             response = await client.get(
-                "https://api.search.brave.com/res/v1/web/search",
+                f"https://{_SEARCH_HOST}/res/v1/web/search",
                 params=params,
                 headers={
                     "Accept": "application/json",
                     "Accept-Encoding": "gzip",
                     "X-Subscription-Token": api_key,
                 },
+                timeout=_SEARCH_TIMEOUT,
             )
             response.raise_for_status()
     except httpx.HTTPStatusError as e:
@@ -278,14 +592,14 @@ async def search(
     if not results:
         return frame_content("No results found.", f"search:{query}")
 
-    lines = []
-    for i, r in enumerate(results, 1):
-        title = sanitize_text(r.get("title", ""))
-        desc = sanitize_text(r.get("description", ""))
-        url = r.get("url", "")
-        lines.append(f"{i}. **{title}**\n   {url}\n   {desc}")
+    try:
+        formatted = await _workers.run(format_search_results, results)
+    except WorkerBusy as e:
+        return f"[BUSY] {e}"
+    except WorkerError as e:
+        return f"[SEARCH ERROR] {e}"
 
-    return frame_content("\n\n".join(lines), f"search:{query}")
+    return frame_content(formatted, f"search:{query}")
 
 
 @mcp.tool()
@@ -298,7 +612,7 @@ async def check_url(url: str) -> str:
     Args:
         url: The URL to check
     """
-    result = check_url_safety(url)
+    result = await check_url_safety_async(url)
     if result["safe"]:
         return f"[SAFE] {result['reason']}"
     else:
@@ -5,8 +5,11 @@ from __future__ import annotations
 import ipaddress
 import os
 import socket
+from typing import Iterable
 from urllib.parse import urlparse
 
+from .resolver import DNSCache, ResolveError, default_cache
+
 
 # Cloud metadata endpoints commonly targeted in SSRF
 _METADATA_IPS = frozenset(
@@ -91,7 +94,45 @@ def validate_and_resolve(url: str) -> tuple[str, str]:
     public IP during validation and a private/metadata IP at connect — a
     DNS-rebinding TOCTOU that defeats the SSRF guard entirely. Returning the
     exact validated IP closes that gap: resolution happens once, here.
+
+    Blocking (``socket.getaddrinfo``, uncached). The fetch path uses
+    :func:`validate_and_resolve_async`, which applies the same policy to an
+    answer from the shared TTL-bounded DNS cache.
     """
+    hostname = _check_url_policy(url)
+
+    # SSRF prevention: resolve once, require EVERY resolved address to be safe,
+    # and keep the first safe address to pin the connection to.
+    try:
+        infos = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise URLPolicyError(f"Cannot resolve hostname: {hostname}")
+
+    return url, _pin_safe_address(hostname, [sockaddr[0] for *_rest, sockaddr in infos])
+
+
+async def validate_and_resolve_async(
+    url: str, *, cache: DNSCache | None = None
+) -> tuple[str, str]:
+    """Async :func:`validate_and_resolve` backed by the shared DNS cache.
+
+    Same contract: returns ``(url, pinned_ip)`` or raises ``URLPolicyError``.
+    The private/reserved check runs on every call, against whatever answer
+    the cache returns — cached answers are never trusted past their TTL and
+    never exempt from the policy.
+    """
+    hostname = _check_url_policy(url)
+    if cache is None:
+        cache = default_cache()
+    try:
+        addresses = await cache.resolve(hostname)
+    except ResolveError:
+        raise URLPolicyError(f"Cannot resolve hostname: {hostname}") from None
+    return url, _pin_safe_address(hostname, addresses)
+
+
+def _check_url_policy(url: str) -> str:
+    """Scheme, host, port, blocklist and allowlist checks. Returns the hostname."""
     parsed = urlparse(url)
 
     # Scheme check
@@ -133,16 +174,13 @@ def validate_and_resolve(url: str) -> tuple[str, str]:
                 f"Allowed: {', '.join(sorted(allowed))}"
             )
 
-    # SSRF prevention: resolve once, require EVERY resolved address to be safe,
-    # and keep the first safe address to pin the connection to.
-    try:
-        infos = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
-    except socket.gaierror:
-        raise URLPolicyError(f"Cannot resolve hostname: {hostname}")
+    return hostname
+
 
+def _pin_safe_address(hostname: str, addresses: Iterable[str]) -> str:
+    """Require EVERY address to be public; return the first one to pin to."""
     pinned_ip: str | None = None
-    for _family, _type, _proto, _canonname, sockaddr in infos:
-        ip_str = sockaddr[0]
+    for ip_str in addresses:
         if _is_private_ip(ip_str):
             raise URLPolicyError(
                 f"SSRF blocked: {hostname} resolves to private/reserved IP {ip_str}"
@@ -154,7 +192,7 @@ def validate_and_resolve(url: str) -> tuple[str, str]:
         # getaddrinfo returned no usable address (empty result is rare but possible)
         raise URLPolicyError(f"Cannot resolve hostname to a usable address: {hostname}")
 
-    return url, pinned_ip
+    return pinned_ip
 
 
 def check_url_safety(url: str) -> dict:
@@ -168,3 +206,16 @@ def check_url_safety(url: str) -> dict:
         }
     except URLPolicyError as e:
         return {"safe": False, "url": url, "reason": str(e)}
+
+
+async def check_url_safety_async(url: str) -> dict:
+    """:func:`check_url_safety` resolving through the shared DNS cache."""
+    try:
+        validated, _ip = await validate_and_resolve_async(url)
+        return {
+            "safe": True,
+            "url": validated,
+            "reason": "URL passes all policy checks.",
+        }
+    except URLPolicyError as e:
+        return {"safe": False, "url": url, "reason": str(e)}
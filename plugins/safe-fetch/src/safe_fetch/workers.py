@@ -0,0 +1,159 @@
+"""Bounded worker pool for the CPU-bound extraction/sanitization stage.
+
+``sanitize_html`` (lxml), ``trafilatura.extract``, PyMuPDF and the
+``sanitize_text`` regex passes used to run on the event loop, so one large
+page stalled every concurrent fetch and search. ``WorkerPool.run`` moves a job
+onto a thread or process pool and awaits it, leaving the loop free for
+network work.
+
+Back-pressure: at most ``max_workers + max_queue`` jobs are admitted at once.
+A job beyond that is refused immediately with :class:`WorkerBusy` rather than
+queued without bound — the caller reports it and the agent retries later.
+
+Timeouts: a job that runs longer than ``job_timeout`` seconds raises
+:class:`WorkerTimeout` to its caller. In ``process`` mode the pool is then
+recycled, terminating the runaway worker (other jobs on that pool fail with
+:class:`WorkerError`). In ``thread`` mode a thread cannot be killed: the job
+finishes in the background and keeps its admission slot until it does, so a
+string of runaway jobs shows up as :class:`WorkerBusy`, never as unbounded
+growth.
+
+Configuration (environment): ``SAFE_FETCH_WORKER_MODE`` (``thread`` default,
+or ``process``), ``SAFE_FETCH_WORKERS``, ``SAFE_FETCH_WORKER_QUEUE``,
+``SAFE_FETCH_JOB_TIMEOUT``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+_MODES = ("thread", "process")
+
+
+class WorkerError(Exception):
+    """A job could not be completed by the worker pool."""
+
+
+class WorkerBusy(WorkerError):
+    """The pool is at its admission limit (back-pressure)."""
+
+
+class WorkerTimeout(WorkerError):
+    """A job exceeded the per-job timeout."""
+
+
+class WorkerPool:
+    """Thread- or process-pool stage with bounded admission and per-job timeouts.
+
+    The executor is created lazily on the first job, so importing the server
+    (tests, ``check_url``) never spawns workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: str | None = None,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+        job_timeout: float | None = None,
+    ):
+        mode = mode or os.environ.get("SAFE_FETCH_WORKER_MODE", "thread")
+        if mode not in _MODES:
+            raise ValueError(f"worker mode must be one of {_MODES}, got {mode!r}")
+        self._mode = mode
+        self._max_workers = max(1, max_workers if max_workers is not None else int(
+            os.environ.get("SAFE_FETCH_WORKERS", str(min(4, os.cpu_count() or 1)))
+        ))
+        self._max_queue = max(0, max_queue if max_queue is not None else int(
+            os.environ.get("SAFE_FETCH_WORKER_QUEUE", "16")
+        ))
+        self._job_timeout = job_timeout if job_timeout is not None else float(
+            os.environ.get("SAFE_FETCH_JOB_TIMEOUT", "20")
+        )
+        self._executor: concurrent.futures.Executor | None = None
+        # Admitted jobs not yet finished. Decremented from the executor's
+        # completion callback, which runs off the event loop — hence the lock.
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Jobs admitted and not yet finished (running or queued)."""
+        with self._lock:
+            return self._pending
+
+    @property
+    def capacity(self) -> int:
+        return self._max_workers + self._max_queue
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the pool and return its result.
+
+        Raises :class:`WorkerBusy` at the admission limit, :class:`WorkerTimeout`
+        past ``job_timeout``, and :class:`WorkerError` if the pool broke under
+        the job. Exceptions raised by *fn* itself propagate unchanged.
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise WorkerBusy(
+                    f"{self._pending} extraction jobs in flight "
+                    f"(limit {self.capacity}); retry shortly"
+                )
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._job_done(None)
+            raise
+        future.add_done_callback(self._job_done)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self._job_timeout)
+        except asyncio.TimeoutError:
+            if self._mode == "process":
+                self._recycle()
+            raise WorkerTimeout(
+                f"extraction exceeded {self._job_timeout:g}s and was abandoned"
+            ) from None
+        except BrokenProcessPool as exc:
+            self._recycle()
+            raise WorkerError(f"extraction worker died: {exc}") from None
+
+    def shutdown(self) -> None:
+        """Stop the executor without waiting for running jobs (server shutdown)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self._mode == "process":
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._max_workers
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="safe-fetch-worker"
+                )
+        return self._executor
+
+    def _recycle(self) -> None:
+        """Replace a process pool, terminating its workers (runaway or dead)."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # ProcessPoolExecutor has no public way to kill a running job.
+        for proc in list(getattr(executor, "_processes", {}).values()):
+            proc.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _job_done(self, _future: concurrent.futures.Future | None) -> None:
+        with self._lock:
+            self._pending -= 1
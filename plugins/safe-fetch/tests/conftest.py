@@ -0,0 +1,30 @@
+"""Shared fixtures for the safe-fetch tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.connection_pool import ConnectionPool
+from safe_fetch.content_cache import ContentCache
+from safe_fetch.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def mock_origin(tmp_path, monkeypatch) -> Callable[[Callable], None]:
+    """Route ``server.fetch`` to a ``MockTransport`` handler.
+
+    Call the returned function with the handler (sync or async). It replaces
+    the server's connection pool with one over that handler, and gives the
+    test a private content cache and a fresh rate limiter.
+    """
+
+    def install(handler: Callable) -> None:
+        monkeypatch.setattr(server, "_pool", ConnectionPool(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(server, "_cache", ContentCache(tmp_path / "cache", version="v1"))
+        monkeypatch.setattr(server, "_rate_limiter", RateLimiter())
+
+    return install
@@ -0,0 +1,117 @@
+"""Tests for charset resolution and charset-aware extraction."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.charset import decode_body, resolve_charset
+from safe_fetch.connection_pool import ConnectionPool
+from safe_fetch.content_cache import ContentCache
+from safe_fetch.pipeline import extract_and_sanitize
+from safe_fetch.rate_limiter import RateLimiter
+
+_TEXT = "Café crème — naïve façade, « déjà vu ». " * 10
+_LATIN = "Crème brûlée, naïve façade, « déjà vu ». " * 10
+_JA = "日本語のドキュメントです。設定方法を説明します。" * 10
+
+
+def _page(text: str, meta: str = "") -> str:
+    return (
+        f"<html><head>{meta}<title>T</title></head><body><article>"
+        f"<h1>Guide</h1><p>{text}</p></article></body></html>"
+    )
+
+
+class TestResolveCharset:
+    @pytest.mark.parametrize(
+        ("content_type", "body", "expected"),
+        [
+            ("text/html; charset=Shift_JIS", b"<html>", "shift_jis"),
+            ('text/html; charset="windows-1251"', b"<html>", "windows-1251"),
+            ("text/html; charset=ISO-8859-1", b"<html>", "windows-1252"),
+            ("text/html; charset=gb2312", b"<html>", "gb18030"),
+            ("text/html", b'<html><head><meta charset="euc-jp">', "euc-jp"),
+            ("text/html", b'<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">', "koi8-r"),
+            ("text/html", b"<html>no declaration", "utf-8"),
+            ("text/html; charset=no-such-codec", b"<html>", "utf-8"),
+            ("text/plain", b'<meta charset="koi8-r">', "utf-8"),
+        ],
+    )
+    def test_declarations(self, content_type, body, expected):
+        assert resolve_charset(body, content_type) == expected
+
+    def test_bom_wins_over_header(self):
+        assert resolve_charset(b"\xef\xbb\xbf<html>", "text/html; charset=windows-1252") == "utf-8"
+        assert resolve_charset("<html>".encode("utf-16"), "text/html") in ("utf-16le", "utf-16be")
+
+    def test_header_wins_over_meta(self):
+        body = b'<meta charset="koi8-r">'
+        assert resolve_charset(body, "text/html; charset=utf-8") == "utf-8"
+
+    def test_meta_beyond_prescan_window_is_ignored(self):
+        body = b"<html>" + b" " * 2000 + b'<meta charset="koi8-r">'
+        assert resolve_charset(body, "text/html") == "utf-8"
+
+    def test_meta_utf16_is_read_as_utf8(self):
+        assert resolve_charset(b'<meta charset="utf-16">', "text/html") == "utf-8"
+
+    def test_decode_body_strips_bom(self):
+        assert decode_body(b"\xef\xbb\xbfhi", "text/plain") == "hi"
+        assert decode_body(_TEXT.encode("cp1252"), "text/plain; charset=windows-1252") == _TEXT
+
+
+class TestExtraction:
+    @pytest.mark.parametrize(
+        ("text", "encoding", "label"),
+        [
+            (_TEXT, "cp1252", "windows-1252"),
+            (_LATIN, "latin-1", "iso-8859-1"),
+            (_JA, "shift_jis", "Shift_JIS"),
+            (_JA, "euc_jp", "EUC-JP"),
+            (_JA, "gb18030", "GB2312"),
+        ],
+        ids=["windows-1252", "iso-8859-1", "shift_jis", "euc-jp", "gb2312"],
+    )
+    def test_declared_header_charset(self, text, encoding, label):
+        body = _page(text).encode(encoding)
+        out = extract_and_sanitize(body, f"text/html; charset={label}", "https://example.com/")
+        assert text.split()[0] in out
+        assert "�" not in out
+
+    def test_meta_charset(self):
+        body = _page(_JA, '<meta charset="shift_jis">').encode("shift_jis")
+        out = extract_and_sanitize(body, "text/html", "https://example.com/")
+        assert _JA[:10] in out
+
+    def test_plain_text_and_json_respect_header(self):
+        assert _TEXT in extract_and_sanitize(
+            _TEXT.encode("cp1252"), "text/plain; charset=windows-1252", "u"
+        )
+        out = extract_and_sanitize(
+            f'{{"title": "{_JA[:12]}"}}'.encode("euc_jp"), "application/json; charset=euc-jp", "u"
+        )
+        assert _JA[:12] in out
+
+    def test_bytearray_body(self):
+        out = extract_and_sanitize(bytearray(_page(_TEXT).encode()), "text/html", "u")
+        assert "Café crème" in out
+
+
+class TestFetch:
+    async def test_windows_1252_page_is_not_garbled(self, tmp_path, monkeypatch):
+        body = _page(_TEXT).encode("cp1252")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/html; charset=windows-1252", "content-length": str(len(body))},
+                content=body,
+            )
+
+        monkeypatch.setattr(server, "_pool", ConnectionPool(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(server, "_cache", ContentCache(tmp_path / "cache", version="v1"))
+        monkeypatch.setattr(server, "_rate_limiter", RateLimiter())
+        result = await server.fetch("http://93.184.216.34/fr")
+        assert "Café crème — naïve façade" in result
@@ -0,0 +1,122 @@
+"""Tests for the keep-alive connection pool (ConnectionPool, PoolKey) and its use in fetch."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.connection_pool import ConnectionPool, PoolKey
+from safe_fetch.server import _fetch_pinned
+from safe_fetch.url_policy import URLPolicyError
+
+_PUBLIC = "93.184.216.34"
+_KEY = PoolKey("https", _PUBLIC, "docs.example.com", 443)
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "text/plain"}, content=b"ok")
+
+
+class TestLease:
+    async def test_same_key_reuses_client(self):
+        pool = ConnectionPool(transport=httpx.MockTransport(_ok))
+        async with pool.lease(_KEY) as first:
+            pass
+        async with pool.lease(_KEY) as second:
+            pass
+        assert first is second
+        assert len(pool) == 1
+        await pool.aclose()
+
+    async def test_sni_host_is_part_of_the_key(self):
+        """Two hostnames behind one IP never share a TLS connection."""
+        pool = ConnectionPool(transport=httpx.MockTransport(_ok))
+        async with pool.lease(_KEY) as a:
+            pass
+        async with pool.lease(_KEY._replace(sni_host="other.example.com")) as b:
+            pass
+        assert a is not b
+        await pool.aclose()
+
+    async def test_new_pinned_ip_gets_a_new_client(self):
+        pool = ConnectionPool(transport=httpx.MockTransport(_ok))
+        async with pool.lease(_KEY) as a:
+            pass
+        async with pool.lease(_KEY._replace(ip="93.184.216.35")) as b:
+            pass
+        assert a is not b
+        await pool.aclose()
+
+
+class TestBudget:
+    async def test_lru_key_is_evicted_and_closed(self):
+        pool = ConnectionPool(max_hosts=2, transport=httpx.MockTransport(_ok))
+        async with pool.lease(_KEY._replace(sni_host="a.example")) as a:
+            pass
+        async with pool.lease(_KEY._replace(sni_host="b.example")) as b:
+            pass
+        # Touch a so b is the least recently used.
+        async with pool.lease(_KEY._replace(sni_host="a.example")):
+            pass
+        async with pool.lease(_KEY._replace(sni_host="c.example")):
+            pass
+        assert len(pool) == 2
+        assert b.is_closed
+        assert not a.is_closed
+        await pool.aclose()
+
+    async def test_in_flight_client_is_closed_after_its_lease(self):
+        pool = ConnectionPool(max_hosts=1, transport=httpx.MockTransport(_ok))
+        async with pool.lease(_KEY) as busy:
+            async with pool.lease(_KEY._replace(sni_host="other.example")):
+                pass
+            assert not busy.is_closed
+        assert busy.is_closed
+        await pool.aclose()
+
+    async def test_idle_client_is_swept(self, monkeypatch):
+        import safe_fetch.connection_pool as connection_pool
+
+        clock = [1000.0]
+        monkeypatch.setattr(connection_pool.time, "monotonic", lambda: clock[0])
+        pool = ConnectionPool(idle_timeout=30, transport=httpx.MockTransport(_ok))
+        async with pool.lease(_KEY) as stale:
+            pass
+        clock[0] += 31
+        async with pool.lease(_KEY) as fresh:
+            pass
+        assert stale.is_closed
+        assert fresh is not stale
+        await pool.aclose()
+
+
+class TestFetchUsesPool:
+    async def test_repeat_fetches_share_one_client(self, monkeypatch):
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.host)
+            return _ok(request)
+
+        pool = ConnectionPool(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(server, "_pool", pool)
+        for _ in range(3):
+            body, _ctype, _final, *_ = await _fetch_pinned(f"http://{_PUBLIC}/page")
+            assert body == b"ok"
+        assert seen == [_PUBLIC] * 3
+        assert len(pool) == 1
+        await pool.aclose()
+
+    async def test_pooled_connection_does_not_bypass_redirect_validation(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(302, headers={"location": "http://127.0.0.1/admin"})
+
+        pool = ConnectionPool(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(server, "_pool", pool)
+        for _ in range(2):
+            with pytest.raises(URLPolicyError, match="private/reserved"):
+                await _fetch_pinned(f"http://{_PUBLIC}/page")
+        # Only the validated public hop ever got a pooled client.
+        assert len(pool) == 1
+        await pool.aclose()
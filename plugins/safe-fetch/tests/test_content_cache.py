@@ -0,0 +1,268 @@
+"""Tests for the on-disk sanitized-content cache and its use by ``fetch``."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.content_cache import ContentCache, freshness_lifetime, parse_cache_control
+
+_PUBLIC = "93.184.216.34"
+_URL = f"http://{_PUBLIC}/docs"
+_NOW = 1_750_000_000.0
+_HTML = b"<html><body><article><h1>Guide</h1><p>" + b"Install the package. " * 20 + b"</p></article></body></html>"
+
+
+def _cache(tmp_path, **kw) -> ContentCache:
+    kw.setdefault("version", "v1")
+    return ContentCache(tmp_path / "cache", **kw)
+
+
+class TestFreshness:
+    def test_parse_cache_control(self):
+        assert parse_cache_control('Max-Age=60, no-cache, private="x"') == {
+            "max-age": "60",
+            "no-cache": None,
+            "private": "x",
+        }
+
+    def test_max_age_wins(self):
+        headers = {"cache-control": "max-age=120", "expires": "Thu, 01 Jan 1970 00:00:00 GMT"}
+        assert freshness_lifetime(headers, _NOW) == 120
+
+    def test_no_cache_is_zero(self):
+        assert freshness_lifetime({"cache-control": "no-cache, max-age=600"}, _NOW) == 0
+
+    def test_expires_minus_date(self):
+        headers = {
+            "date": "Mon, 02 Jun 2025 10:00:00 GMT",
+            "expires": "Mon, 02 Jun 2025 10:05:00 GMT",
+        }
+        assert freshness_lifetime(headers, _NOW) == 300
+
+    def test_invalid_expires_means_expired(self):
+        assert freshness_lifetime({"expires": "0"}, _NOW) == 0
+
+    def test_heuristic_from_last_modified_is_capped(self):
+        headers = {
+            "date": "Mon, 02 Jun 2025 10:00:00 GMT",
+            "last-modified": "Mon, 02 Jun 2025 00:00:00 GMT",
+        }
+        assert freshness_lifetime(headers, _NOW) == pytest.approx(3600)
+        headers["last-modified"] = "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert freshness_lifetime(headers, _NOW) == 24 * 3600
+
+    def test_no_information_is_zero(self):
+        assert freshness_lifetime({}, _NOW) == 0
+
+
+class TestStore:
+    def test_round_trip(self, tmp_path):
+        cache = _cache(tmp_path, clock=lambda: _NOW)
+        entry = cache.store(_URL, _URL + "/", "text/html", {"Cache-Control": "max-age=60"}, b"body")
+        assert entry is not None
+        loaded = cache.lookup(_URL)
+        assert loaded == entry
+        assert loaded.is_fresh(_NOW + 59)
+        assert not loaded.is_fresh(_NOW + 60)
+        assert cache.load_body(loaded) == b"body"
+
+    def test_age_header_shortens_lifetime(self, tmp_path):
+        cache = _cache(tmp_path, clock=lambda: _NOW)
+        entry = cache.store(_URL, _URL, "text/html", {"cache-control": "max-age=60", "age": "50"}, b"x")
+        assert entry.expires_at == _NOW + 10
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"cache-control": "no-store, max-age=60"},
+            {"cache-control": "max-age=60", "vary": "*"},
+            {},  # no lifetime and no validator
+        ],
+    )
+    def test_uncacheable_responses_are_not_stored(self, tmp_path, headers):
+        cache = _cache(tmp_path)
+        assert cache.store(_URL, _URL, "text/html", headers, b"x") is None
+        assert cache.lookup(_URL) is None
+
+    def test_no_cache_with_validator_is_stored_stale(self, tmp_path):
+        cache = _cache(tmp_path, clock=lambda: _NOW)
+        entry = cache.store(_URL, _URL, "text/html", {"cache-control": "no-cache", "etag": '"a1"'}, b"x")
+        assert entry is not None
+        assert not entry.is_fresh(_NOW)
+        assert entry.validators() == {"If-None-Match": '"a1"'}
+
+    def test_uncacheable_response_drops_previous_entry(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.store(_URL, _URL, "text/html", {"etag": '"a1"'}, b"x")
+        cache.store(_URL, _URL, "text/html", {"cache-control": "no-store"}, b"y")
+        assert cache.lookup(_URL) is None
+
+    def test_revalidation_refreshes_lifetime_and_validators(self, tmp_path):
+        now = [_NOW]
+        cache = _cache(tmp_path, clock=lambda: now[0])
+        entry = cache.store(
+            _URL, _URL, "text/html",
+            {"cache-control": "max-age=10", "etag": '"a1"', "last-modified": "Mon, 02 Jun 2025 00:00:00 GMT"},
+            b"x",
+        )
+        now[0] += 100
+        refreshed = cache.revalidated(entry, {"cache-control": "max-age=30", "etag": '"a2"'})
+        assert refreshed.expires_at == now[0] + 30
+        assert refreshed.validators() == {
+            "If-None-Match": '"a2"',
+            "If-Modified-Since": "Mon, 02 Jun 2025 00:00:00 GMT",
+        }
+        assert cache.lookup(_URL) == refreshed
+
+    def test_corrupt_metadata_is_a_miss(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.store(_URL, _URL, "text/html", {"etag": '"a1"'}, b"x")
+        cache._meta_path(_URL).write_text("{not json")
+        assert cache.lookup(_URL) is None
+
+    def test_disabled_cache_stores_nothing(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=0)
+        assert cache.store(_URL, _URL, "text/html", {"etag": '"a1"'}, b"x") is None
+        assert not (tmp_path / "cache").exists()
+
+
+class TestDerived:
+    def test_pipeline_version_change_invalidates_derived_output(self, tmp_path):
+        old = _cache(tmp_path, version="v1")
+        entry = old.store(_URL, _URL, "text/html", {"cache-control": "max-age=60"}, b"x")
+        old.store_derived(entry, "sanitized by v1")
+        assert old.load_derived(entry) == "sanitized by v1"
+
+        new = _cache(tmp_path, version="v2")
+        entry = new.lookup(_URL)
+        assert new.load_derived(entry) is None
+        assert new.load_body(entry) == b"x"
+
+    def test_derived_output_keyed_by_content(self, tmp_path):
+        cache = _cache(tmp_path)
+        first = cache.store(_URL, _URL, "text/html", {"cache-control": "max-age=60"}, b"old")
+        cache.store_derived(first, "old text")
+        second = cache.store(_URL, _URL, "text/html", {"cache-control": "max-age=60"}, b"new")
+        assert cache.load_derived(second) is None
+
+
+class TestEviction:
+    def test_size_bound_evicts_least_recently_used(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=10_000)
+        for i in range(10):
+            cache.store(f"{_URL}/{i}", f"{_URL}/{i}", "text/html", {"etag": f'"{i}"'}, bytes([i]) * 2000)
+        assert cache.size <= 10_000
+        last = cache.lookup(f"{_URL}/9")
+        assert last is not None and cache.load_body(last) is not None
+        first = cache.lookup(f"{_URL}/0")
+        assert first is None or cache.load_body(first) is None
+
+    def test_body_larger_than_budget_is_not_stored(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=100)
+        assert cache.store(_URL, _URL, "text/html", {"etag": '"a"'}, b"x" * 101) is None
+
+
+class TestFetchWithCache:
+    @pytest.fixture
+    def origin(self, mock_origin, monkeypatch):
+        """A mock origin behind the server's pool, plus a private cache and pipeline counter."""
+        state = {"requests": [], "runs": 0, "response": None}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            state["requests"].append(request)
+            return state["response"](request)
+
+        mock_origin(handler)
+        real = server.extract_and_sanitize
+
+        def counting(*args):
+            state["runs"] += 1
+            return real(*args)
+
+        monkeypatch.setattr(server, "extract_and_sanitize", counting)
+        return state
+
+    async def test_fresh_hit_skips_network_and_pipeline(self, origin):
+        origin["response"] = lambda _req: httpx.Response(
+            200, headers={"content-type": "text/html", "cache-control": "max-age=300"}, content=_HTML
+        )
+        first = await server.fetch(_URL)
+        second = await server.fetch(_URL)
+        assert "Install the package" in first
+        assert second == first
+        assert len(origin["requests"]) == 1
+        assert origin["runs"] == 1
+
+    async def test_stale_entry_is_revalidated_with_conditional_get(self, origin):
+        def respond(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "no-cache"})
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/html", "etag": '"v1"', "cache-control": "no-cache"},
+                content=_HTML,
+            )
+
+        origin["response"] = respond
+        first = await server.fetch(_URL)
+        second = await server.fetch(_URL)
+        assert second == first
+        assert len(origin["requests"]) == 2
+        assert origin["requests"][1].headers["if-none-match"] == '"v1"'
+        assert origin["runs"] == 1
+
+    async def test_validators_only_go_to_the_resource_they_came_from(self, origin):
+        final = "http://93.184.216.35/moved"
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            if request.headers["host"] == _PUBLIC:
+                return httpx.Response(302, headers={"location": final})
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "no-cache"})
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/html", "etag": '"v1"', "cache-control": "no-cache"},
+                content=_HTML,
+            )
+
+        origin["response"] = respond
+        first = await server.fetch(_URL)
+        second = await server.fetch(_URL)
+        assert second == first
+        redirect_hop, final_hop = origin["requests"][2:]
+        assert "if-none-match" not in redirect_hop.headers
+        assert final_hop.headers["if-none-match"] == '"v1"'
+        assert origin["runs"] == 1
+
+    async def test_changed_content_replaces_entry(self, origin):
+        bodies = iter([_HTML, _HTML.replace(b"Install", b"Upgrade")])
+        origin["response"] = lambda _req: httpx.Response(
+            200, headers={"content-type": "text/html", "etag": '"x"', "cache-control": "no-cache"},
+            content=next(bodies),
+        )
+        await server.fetch(_URL)
+        second = await server.fetch(_URL)
+        assert "Upgrade the package" in second
+        assert origin["runs"] == 2
+
+    async def test_new_pipeline_version_rederives_without_network(self, origin, tmp_path, monkeypatch):
+        origin["response"] = lambda _req: httpx.Response(
+            200, headers={"content-type": "text/html", "cache-control": "max-age=300"}, content=_HTML
+        )
+        first = await server.fetch(_URL)
+        monkeypatch.setattr(server, "_cache", _cache(tmp_path, version="v2"))
+        second = await server.fetch(_URL)
+        assert second == first
+        assert len(origin["requests"]) == 1
+        assert origin["runs"] == 2
+
+    async def test_prompt_and_truncation_apply_to_cached_output(self, origin):
+        origin["response"] = lambda _req: httpx.Response(
+            200, headers={"content-type": "text/html", "cache-control": "max-age=300"}, content=_HTML
+        )
+        await server.fetch(_URL)
+        focused = await server.fetch(_URL, prompt="installation")
+        assert "[Extraction focus: installation]" in focused
+        assert len(origin["requests"]) == 1
@@ -0,0 +1,122 @@
+"""Tests for early termination of ``fetch`` under a ``max_tokens`` budget."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.extractor import extract_pdf
+
+_URL = "http://93.184.216.34/manual"
+_CHUNK = 16 * 1024
+
+
+def _html_chunks(n: int) -> list[bytes]:
+    head = b"<html><head><title>Manual</title></head><body><article>"
+    para = b"<h2>Section</h2><p>" + b"Configure the server before starting it. " * 30 + b"</p>"
+    body = head + para * (n * _CHUNK // len(para))
+    return [body[i : i + _CHUNK] for i in range(0, len(body), _CHUNK)]
+
+
+@pytest.fixture
+def origin(mock_origin):
+    """Mock origin that streams ``state['chunks']`` and counts how many were read."""
+    state = {"chunks": [], "content_type": "text/html", "sent": 0, "headers": {}}
+
+    async def stream():
+        for chunk in state["chunks"]:
+            state["sent"] += 1
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-type": state["content_type"], **state["headers"]}
+        return httpx.Response(200, headers=headers, content=stream())
+
+    mock_origin(handler)
+    return state
+
+
+class TestStreamingStop:
+    async def test_html_download_stops_once_budget_is_filled(self, origin):
+        origin["chunks"] = _html_chunks(200)  # ~3.2 MB
+        result = await server.fetch(_URL, max_tokens=500)
+        assert "Configure the server" in result
+        assert "[Content truncated at ~500 tokens]" in result
+        assert origin["sent"] < len(origin["chunks"]) // 10
+
+    async def test_plain_text_download_stops_once_budget_is_filled(self, origin):
+        origin["content_type"] = "text/plain"
+        line = b"Plain text line for the budget test.\n"
+        body = line * (2 * 1024 * 1024 // len(line))
+        origin["chunks"] = [body[i : i + _CHUNK] for i in range(0, len(body), _CHUNK)]
+        result = await server.fetch(_URL, max_tokens=1000)
+        assert "[Content truncated at ~1000 tokens]" in result
+        assert origin["sent"] <= 2
+
+    async def test_budget_bypasses_body_cap_for_long_pages(self, origin, monkeypatch):
+        monkeypatch.setattr(server, "_MAX_BODY", 1024 * 1024)
+        origin["chunks"] = _html_chunks(200)
+        result = await server.fetch(_URL, max_tokens=500)
+        assert "[TOO LARGE]" not in result
+        assert "Configure the server" in result
+
+    async def test_short_document_is_read_in_full_and_cached(self, origin):
+        origin["chunks"] = _html_chunks(1)[:1]
+        origin["headers"] = {"cache-control": "max-age=300"}
+        await server.fetch(_URL, max_tokens=5000)
+        assert origin["sent"] == 1
+        entry = server._cache.lookup(_URL)
+        assert entry is not None and server._cache.load_derived(entry) is not None
+
+    async def test_partial_download_is_not_cached(self, origin):
+        origin["chunks"] = _html_chunks(200)
+        origin["headers"] = {"cache-control": "max-age=300"}
+        await server.fetch(_URL, max_tokens=500)
+        assert server._cache.lookup(_URL) is None
+
+    async def test_json_is_read_in_full(self, origin):
+        origin["content_type"] = "application/json"
+        body = json.dumps({"items": ["x" * 100] * 2000}).encode()
+        origin["chunks"] = [body[i : i + _CHUNK] for i in range(0, len(body), _CHUNK)]
+        result = await server.fetch(_URL, max_tokens=100)
+        assert origin["sent"] == len(origin["chunks"])
+        assert "[Content truncated at ~100 tokens]" in result
+
+    async def test_without_budget_everything_is_read(self, origin):
+        origin["chunks"] = _html_chunks(20)
+        await server.fetch(_URL)
+        assert origin["sent"] == len(origin["chunks"])
+
+
+class TestPdfPageLimit:
+    @staticmethod
+    def _pdf(pages: int) -> bytes:
+        pymupdf = pytest.importorskip("pymupdf")
+        doc = pymupdf.open()
+        for i in range(pages):
+            doc.new_page().insert_text((72, 72), f"Page {i + 1} body text " * 5)
+        data = doc.tobytes()
+        doc.close()
+        return data
+
+    def test_stops_at_page_that_fills_limit(self):
+        data = self._pdf(10)
+        full = extract_pdf(data)
+        limited = extract_pdf(data, max_chars=200)
+        assert "## Page 10" in full
+        assert "## Page 1\n" in limited
+        assert "## Page 10" not in limited
+        assert full.startswith(limited)
+
+    async def test_fetch_extracts_pdf_pages_lazily(self, origin):
+        origin["content_type"] = "application/pdf"
+        origin["chunks"] = [self._pdf(50)]
+        origin["headers"] = {"cache-control": "max-age=300"}
+        result = await server.fetch(_URL, max_tokens=50)
+        assert "## Page 50" not in result
+        # The body was complete, so it is cached, but the page-limited text is not.
+        entry = server._cache.lookup(_URL)
+        assert entry is not None and server._cache.load_derived(entry) is None
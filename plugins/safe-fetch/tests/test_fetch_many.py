@@ -0,0 +1,98 @@
+"""Tests for the concurrent ``fetch_many`` batch tool."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.rate_limiter import RateLimiter
+
+_HOSTS = ["93.184.216.34", "93.184.216.35", "93.184.216.36", "93.184.216.37", "93.184.216.38"]
+
+
+@pytest.fixture
+def origin(mock_origin, monkeypatch):
+    """Mock origins that answer slowly and record peak concurrency."""
+    state = {"in_flight": 0, "peak": 0, "requests": [], "delay": {}}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(str(request.url))
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(state["delay"].get(request.url.path, 0.02))
+        finally:
+            state["in_flight"] -= 1
+        if request.url.path == "/redirect":
+            return httpx.Response(302, headers={"location": "http://169.254.169.254/latest/meta-data/"})
+        text = f"Page {request.url.path} on {request.url.host}. " * 20
+        return httpx.Response(200, headers={"content-type": "text/plain"}, content=text.encode())
+
+    mock_origin(handler)
+    monkeypatch.setattr(server, "_batch_slots", asyncio.Semaphore(2))
+    return state
+
+
+def _parts(result: str) -> list[str]:
+    """Split a batch result into its per-URL sections."""
+    return re.split(r"(?:^|\n\n)\[\d+/\d+\] ", result)[1:]
+
+
+class TestFetchMany:
+    async def test_results_in_input_order_despite_completion_order(self, origin):
+        origin["delay"] = {"/slow": 0.2, "/fast": 0.0}
+        urls = [f"http://{_HOSTS[0]}/slow", f"http://{_HOSTS[1]}/fast"]
+        result = await server.fetch_many(urls)
+        assert result.index("Page /slow") < result.index("Page /fast")
+        assert result.startswith(f"[1/2] {urls[0]}\n")
+        assert f"[2/2] {urls[1]}\n" in result
+        assert result.count("--- BEGIN") == 2
+
+    async def test_concurrency_is_capped(self, origin):
+        result = await server.fetch_many([f"http://{host}/p" for host in _HOSTS])
+        assert origin["peak"] == 2
+        assert result.count("--- BEGIN") == len(_HOSTS)
+
+    async def test_per_url_status_markers(self, origin, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_PER_DOMAIN", "1")
+        monkeypatch.setattr(server, "_rate_limiter", RateLimiter())
+        result = await server.fetch_many([
+            f"http://{_HOSTS[0]}/ok",
+            "http://127.0.0.1/admin",
+            f"http://{_HOSTS[1]}/redirect",
+            f"http://{_HOSTS[2]}/a",
+            f"http://{_HOSTS[2]}/b",
+        ])
+        parts = _parts(result)
+        assert len(parts) == 5
+        assert "Page /ok" in parts[0]
+        assert "[BLOCKED]" in parts[1]
+        # The redirect to the metadata endpoint is refused at that hop.
+        assert "[BLOCKED]" in parts[2]
+        assert not any("169.254.169.254" in url for url in origin["requests"])
+        assert sorted("[RATE LIMITED]" in part for part in parts[3:]) == [False, True]
+
+    async def test_total_budget_is_split_across_urls(self, origin):
+        result = await server.fetch_many(
+            [f"http://{_HOSTS[0]}/a", f"http://{_HOSTS[1]}/b"], max_tokens_each=500, total_budget=40
+        )
+        assert result.count("[Content truncated at ~20 tokens]") == 2
+
+    async def test_max_tokens_each(self, origin):
+        result = await server.fetch_many([f"http://{_HOSTS[0]}/a"], max_tokens_each=30)
+        assert "[Content truncated at ~30 tokens]" in result
+
+    async def test_duplicate_urls_are_fetched_once(self, origin):
+        url = f"http://{_HOSTS[0]}/same"
+        result = await server.fetch_many([url, url])
+        assert len(origin["requests"]) == 1
+        assert result.count("Page /same") > 0 and f"[2/2] {url}" in result
+
+    @pytest.mark.parametrize("urls", [[], [f"http://{_HOSTS[0]}/{i}" for i in range(21)]])
+    async def test_rejects_empty_or_oversized_batches(self, origin, urls):
+        assert (await server.fetch_many(urls)).startswith("[ERROR]")
+        assert origin["requests"] == []
@@ -16,7 +16,13 @@ import httpx
 import pytest
 
 from safe_fetch import server
-from safe_fetch.server import _fetch_pinned, _pin_to_ip, _BodyTooLarge, _TooManyRedirects
+from safe_fetch.server import (
+    _BodyBuffer,
+    _BodyTooLarge,
+    _fetch_pinned,
+    _pin_to_ip,
+    _TooManyRedirects,
+)
 from safe_fetch.url_policy import URLPolicyError
 
 # A public IP literal: getaddrinfo on a literal returns it unchanged, _is_private_ip
@@ -86,7 +92,7 @@ class TestPinnedConnection:
             seen["host_header"] = request.headers.get("host")
             return httpx.Response(200, headers={"content-type": "text/plain"}, content=b"ok")
 
-        body, ctype, final = await _fetch_pinned(_START, transport=_transport(handler))
+        body, ctype, final, *_ = await _fetch_pinned(_START, transport=_transport(handler))
         assert body == b"ok"
         assert ctype == "text/plain"
         # Connection target is the IP, not a re-resolved hostname.
@@ -102,7 +108,7 @@ class TestPinnedConnection:
             seen["host_header"] = request.headers.get("host")
             return httpx.Response(200, headers={"content-type": "text/plain"}, content=b"ok")
 
-        body, _ctype, _final = await _fetch_pinned(
+        body, _ctype, _final, *_ = await _fetch_pinned(
             f"http://{_PUBLIC}:8080/api", transport=_transport(handler)
         )
         assert body == b"ok"
@@ -128,16 +134,44 @@ class TestBodyCap:
         def handler(request: httpx.Request) -> httpx.Response:
             return httpx.Response(200, headers={"content-type": "text/plain"}, content=b"x" * 4000)
 
-        body, _ctype, _final = await _fetch_pinned(_START, transport=_transport(handler))
+        body, _ctype, _final, *_ = await _fetch_pinned(_START, transport=_transport(handler))
         assert len(body) == 4000
 
 
+class TestBodyBuffer:
+    def test_preallocated_buffer_is_filled_in_place(self):
+        buf = _BodyBuffer(10)
+        for chunk in (b"abcd", b"efg", b"hij"):
+            buf.append(chunk)
+        assert buf.prefix() == b"abcdefg" + b"hij"
+        assert buf.finish() == bytearray(b"abcdefghij")
+
+    def test_short_body_is_trimmed_and_long_body_grows(self):
+        short = _BodyBuffer(100)
+        short.append(b"abc")
+        assert short.finish() == b"abc"
+        long = _BodyBuffer(2)
+        assert long.append(b"abc") == 3
+        assert long.append(b"def") == 6
+        assert long.finish() == b"abcdef"
+
+    async def test_content_length_mismatch_still_returns_exact_body(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            # Declares more than it sends (httpx does not enforce Content-Length here).
+            return httpx.Response(
+                200, headers={"content-type": "text/plain", "content-length": "5000"}, content=b"ok"
+            )
+
+        body, *_ = await _fetch_pinned(_START, transport=_transport(handler))
+        assert body == b"ok"
+
+
 class TestNormalFetch:
     async def test_single_hop_success(self):
         def handler(request: httpx.Request) -> httpx.Response:
             return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<h1>hi</h1>")
 
-        body, ctype, final = await _fetch_pinned(_START, transport=_transport(handler))
+        body, ctype, final, *_ = await _fetch_pinned(_START, transport=_transport(handler))
         assert body == b"<h1>hi</h1>"
         assert ctype == "text/html"
         assert final == _START
@@ -149,6 +183,6 @@ class TestNormalFetch:
                 return httpx.Response(302, headers={"location": "http://93.184.216.34/final"})
             return httpx.Response(200, headers={"content-type": "text/plain"}, content=b"done")
 
-        body, _ctype, final = await _fetch_pinned(_START, transport=_transport(handler))
+        body, _ctype, final, *_ = await _fetch_pinned(_START, transport=_transport(handler))
         assert body == b"done"
         assert final.endswith("/final")
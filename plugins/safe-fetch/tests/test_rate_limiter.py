@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from safe_fetch.rate_limiter import RateLimiter, RateLimitError
@@ -45,3 +47,136 @@ class TestRateLimiter:
 
         with pytest.raises(RateLimitError, match="Global"):
             limiter.check("another.com")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBoundedMemory:
+    def test_refilled_buckets_are_dropped(self):
+        clock = _Clock()
+        limiter = RateLimiter(per_domain_rpm=60, global_rpm=1000, clock=clock)
+        for i in range(50):
+            limiter.check(f"d{i}.com")
+        clock.now += 2  # one request per second: every bucket is full again
+        limiter.check("new.com")
+        assert limiter.stats()["domains"] == 1
+
+    def test_domain_count_is_capped(self):
+        limiter = RateLimiter(per_domain_rpm=10, global_rpm=10_000, max_domains=8, clock=_Clock())
+        for i in range(100):
+            limiter.check(f"d{i}.com")
+        assert limiter.stats()["domains"] <= 8
+
+    def test_recently_used_bucket_keeps_its_state(self):
+        clock = _Clock()
+        limiter = RateLimiter(per_domain_rpm=1, global_rpm=1000, clock=clock)
+        limiter.check("busy.com")
+        clock.now += 1
+        limiter.check("other.com")
+        with pytest.raises(RateLimitError, match="Per-domain"):
+            limiter.check("busy.com")
+
+    def test_global_rejection_does_not_spend_a_domain_token(self):
+        limiter = RateLimiter(per_domain_rpm=2, global_rpm=1, clock=_Clock())
+        limiter.check("a.com")
+        with pytest.raises(RateLimitError, match="Global"):
+            limiter.check("b.com")
+        assert limiter._domain_buckets["b.com"].tokens == 2
+
+
+class TestAcquire:
+    async def test_waits_for_a_token_instead_of_failing(self):
+        limiter = RateLimiter(per_domain_rpm=1200, global_rpm=10_000)  # 20/s per domain
+        for _ in range(1200):
+            limiter.check("a.com")
+        waited = await limiter.acquire("a.com", timeout=1.0)
+        assert 0 < waited < 0.5
+        assert limiter.stats()["waited"] == 1
+
+    async def test_without_timeout_behaves_like_check(self):
+        limiter = RateLimiter(per_domain_rpm=1, global_rpm=100)
+        await limiter.acquire("a.com")
+        with pytest.raises(RateLimitError, match="Per-domain"):
+            await limiter.acquire("a.com")
+
+    async def test_unreachable_deadline_fails_fast(self):
+        limiter = RateLimiter(per_domain_rpm=1, global_rpm=100)
+        limiter.check("a.com")
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(RateLimitError, match="Per-domain"):
+            await limiter.acquire("a.com", timeout=5.0)
+        assert loop.time() - start < 0.1
+        assert limiter.stats()["rejected"] == 1
+
+    async def test_waiters_are_served_in_order_within_a_domain(self):
+        limiter = RateLimiter(per_domain_rpm=600, global_rpm=10_000)  # 10/s
+        for _ in range(600):
+            limiter.check("a.com")
+        order: list[int] = []
+
+        async def waiter(i: int) -> None:
+            await limiter.acquire("a.com", timeout=2.0)
+            order.append(i)
+
+        await asyncio.gather(*(waiter(i) for i in range(3)))
+        assert order == [0, 1, 2]
+
+    async def test_queue_depth_is_reported(self):
+        limiter = RateLimiter(per_domain_rpm=600, global_rpm=10_000)
+        for _ in range(600):
+            limiter.check("a.com")
+        tasks = [asyncio.ensure_future(limiter.acquire("a.com", timeout=2.0)) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = limiter.stats()
+        assert stats["queued"] >= 2 and stats["queued_domains"] == 1
+        await asyncio.gather(*tasks)
+        stats = limiter.stats()
+        assert stats["queued"] == 0 and stats["waited"] == 3
+        assert stats["wait_seconds_max"] >= stats["wait_seconds_total"] / 3 > 0
+
+    async def test_global_tokens_are_shared_fairly_across_domains(self):
+        limiter = RateLimiter(per_domain_rpm=10_000, global_rpm=1200)  # 20/s shared
+        for i in range(1200):
+            limiter.check(f"warmup{i % 7}.com")
+        served: list[str] = []
+
+        async def fetch(domain: str) -> None:
+            await limiter.acquire(domain, timeout=3.0)
+            served.append(domain)
+
+        # A burst of eight against one site, then one request to another.
+        burst = [asyncio.ensure_future(fetch("busy.com")) for _ in range(8)]
+        await asyncio.sleep(0)
+        other = asyncio.ensure_future(fetch("quiet.com"))
+        await asyncio.gather(*burst, other)
+        assert served.index("quiet.com") <= 2
+
+    async def test_deadline_expiry_raises_and_leaves_queue(self):
+        limiter = RateLimiter(per_domain_rpm=100, global_rpm=60)  # 1/s shared
+        for i in range(60):
+            limiter.check(f"warmup{i}.com")
+        results = await asyncio.gather(
+            *(limiter.acquire("a.com", timeout=1.3) for _ in range(3)), return_exceptions=True
+        )
+        assert sum(isinstance(r, RateLimitError) for r in results) == 2
+        assert "deadline" in str(next(r for r in results if isinstance(r, RateLimitError)))
+        assert limiter.stats()["queued"] == 0
+
+    async def test_request_behind_the_queue_past_deadline_fails_fast(self):
+        limiter = RateLimiter(per_domain_rpm=60, global_rpm=10_000)  # 1/s
+        for _ in range(60):
+            limiter.check("a.com")
+        first = asyncio.ensure_future(limiter.acquire("a.com", timeout=1.5))
+        await asyncio.sleep(0)
+        # Second in line needs ~2s of refill: rejected up front.
+        with pytest.raises(RateLimitError):
+            await limiter.acquire("a.com", timeout=1.5)
+        assert await first > 0
+        assert limiter.stats()["queued"] == 0
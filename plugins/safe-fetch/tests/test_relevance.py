@@ -0,0 +1,110 @@
+"""Tests for prompt-focused relevance ranking under ``max_tokens``."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from safe_fetch import server
+from safe_fetch.relevance import chunk_markdown, score_chunks, select_relevant
+
+_FILLER = "\n\n".join(
+    f"## Chapter {i}\n\nGeneral notes on chapter {i} covering layout, colours and fonts."
+    for i in range(60)
+)
+_AUTH = (
+    "## Authentication\n\n"
+    "Send an OAuth token in the Authorization header.\n\n"
+    "```python\nclient = Client(token=TOKEN)\n\nclient.get('/me')\n```\n\n"
+    "### Token refresh\n\n"
+    "Tokens expire after an hour; refresh them before they do."
+)
+_DOC = f"# Manual\n\nWelcome to the manual.\n\n{_FILLER}\n\n{_AUTH}\n\n## Appendix\n\nColours and fonts."
+
+
+class TestChunking:
+    def test_chunks_carry_heading_path(self):
+        chunks = chunk_markdown("# A\n\nintro\n\n## B\n\nfirst\n\nsecond\n\n# C\n\nlast")
+        assert [(c.section, c.text) for c in chunks] == [
+            (("# A",), "intro"),
+            (("# A", "## B"), "first"),
+            (("# A", "## B"), "second"),
+            (("# C",), "last"),
+        ]
+
+    def test_fenced_code_block_stays_whole(self):
+        chunks = chunk_markdown("text\n\n```\n# not a heading\n\nstill code\n```\n\nafter")
+        assert [c.text for c in chunks] == ["text", "```\n# not a heading\n\nstill code\n```", "after"]
+
+
+class TestScoring:
+    def test_matching_chunks_outscore_others(self):
+        chunks = chunk_markdown(_DOC)
+        scores = score_chunks(chunks, "how do I authenticate with a token")
+        best = max(range(len(chunks)), key=scores.__getitem__)
+        assert "token" in chunks[best].text.lower()
+        assert all(score == 0 for c, score in zip(chunks, scores) if c.section[-1].startswith("## Chapter"))
+
+    def test_heading_words_count_for_their_section(self):
+        chunks = chunk_markdown("## Installation\n\nRun the command below.\n\n## Usage\n\nCall run().")
+        scores = score_chunks(chunks, "installation")
+        assert scores[0] > 0 and scores[1] == 0
+
+    def test_stopword_only_prompt_scores_nothing(self):
+        assert set(score_chunks(chunk_markdown(_DOC), "extract the section")) == {0.0}
+
+
+class TestSelect:
+    def test_text_that_fits_is_returned_unchanged(self):
+        assert select_relevant("short", "anything", 100) == "short"
+
+    def test_relevant_chunks_in_document_order_within_budget(self):
+        out = select_relevant(_DOC, "authentication token refresh", 600)
+        assert out is not None and len(out) <= 600
+        assert out.startswith("[Showing the ")
+        assert "## Authentication" in out and "### Token refresh" in out
+        assert out.index("OAuth token") < out.index("client = Client") < out.index("Tokens expire")
+        assert "paragraphs omitted …]" in out
+        assert "Chapter 3" not in out
+
+    @pytest.mark.parametrize("budget", [150, 300, 1000, 3000])
+    def test_output_never_exceeds_budget(self, budget):
+        out = select_relevant(_DOC, "chapter notes token", budget)
+        assert out is None or len(out) <= budget
+
+    def test_no_match_falls_back(self):
+        assert select_relevant(_DOC, "kubernetes", 500) is None
+
+
+class TestFetchWithPrompt:
+    @pytest.fixture
+    def origin(self, mock_origin):
+        html = "<html><body><article>" + "".join(
+            f"<h2>Chapter {i}</h2><p>General notes on chapter {i} covering layout, colours and fonts "
+            f"in considerable and repetitive detail for the benefit of the reader.</p>"
+            for i in range(80)
+        ) + (
+            "<h2>Authentication</h2><p>Send an OAuth token in the Authorization header "
+            "with every request to the API.</p></article></body></html>"
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=html.encode())
+
+        mock_origin(handler)
+
+    async def test_prompt_keeps_relevant_section_instead_of_head(self, origin):
+        url = "http://93.184.216.34/api"
+        focused = await server.fetch(url, prompt="authentication token", max_tokens=200)
+        assert "[Extraction focus: authentication token]" in focused
+        assert "OAuth token" in focused
+        assert "[Content truncated" not in focused
+
+        head = await server.fetch(url, max_tokens=200)
+        assert "OAuth token" not in head
+        assert "[Content truncated at ~200 tokens]" in head
+
+    async def test_unmatched_prompt_truncates_head(self, origin):
+        result = await server.fetch("http://93.184.216.34/api", prompt="kubernetes", max_tokens=200)
+        assert "Chapter 0" in result
+        assert "[Content truncated at ~200 tokens]" in result
@@ -0,0 +1,183 @@
+"""Tests for the TTL-respecting DNS cache, driven by a fake resolver and a fake clock."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from safe_fetch.resolver import Answer, DNSCache, HostNotFound, ResolveError
+from safe_fetch.url_policy import URLPolicyError, validate_and_resolve_async
+
+
+class FakeResolver:
+    """Stand-in resolver: scripted answers per host, counts every query."""
+
+    def __init__(self, answers: dict[str, object]):
+        self.answers = answers
+        self.calls: list[str] = []
+        self.gate: asyncio.Event | None = None
+
+    async def resolve(self, host: str) -> Answer:
+        self.calls.append(host)
+        if self.gate is not None:
+            await self.gate.wait()
+        result = self.answers[host]
+        if isinstance(result, Exception):
+            raise result
+        return result  # type: ignore[return-value]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(resolver: FakeResolver, clock: FakeClock, **kw) -> DNSCache:
+    return DNSCache(resolver, clock=clock, negative_ttl=10, max_ttl=300, **kw)
+
+
+class TestTtl:
+    async def test_answer_served_from_cache_within_ttl(self):
+        resolver = FakeResolver({"docs.example.com": Answer(("93.184.216.34",), ttl=60)})
+        clock = FakeClock()
+        cache = _cache(resolver, clock)
+        assert await cache.resolve("docs.example.com") == ("93.184.216.34",)
+        clock.now += 59.9
+        assert await cache.resolve("DOCS.example.com.") == ("93.184.216.34",)
+        assert resolver.calls == ["docs.example.com"]
+
+    async def test_answer_never_used_at_or_past_ttl(self):
+        resolver = FakeResolver({"docs.example.com": Answer(("93.184.216.34",), ttl=60)})
+        clock = FakeClock()
+        cache = _cache(resolver, clock)
+        await cache.resolve("docs.example.com")
+        clock.now += 60
+        await cache.resolve("docs.example.com")
+        assert len(resolver.calls) == 2
+
+    async def test_ttl_is_capped(self):
+        resolver = FakeResolver({"a.example": Answer(("93.184.216.34",), ttl=86400)})
+        clock = FakeClock()
+        cache = _cache(resolver, clock)
+        await cache.resolve("a.example")
+        clock.now += 301
+        await cache.resolve("a.example")
+        assert len(resolver.calls) == 2
+
+    async def test_zero_ttl_is_not_cached(self):
+        resolver = FakeResolver({"a.example": Answer(("93.184.216.34",), ttl=0)})
+        cache = _cache(resolver, FakeClock())
+        await cache.resolve("a.example")
+        await cache.resolve("a.example")
+        assert len(resolver.calls) == 2
+        assert len(cache) == 0
+
+
+class TestNegativeCaching:
+    async def test_nxdomain_is_cached_for_negative_ttl(self):
+        resolver = FakeResolver({"gone.example": HostNotFound("gone.example")})
+        clock = FakeClock()
+        cache = _cache(resolver, clock)
+        for _ in range(2):
+            with pytest.raises(HostNotFound):
+                await cache.resolve("gone.example")
+        assert len(resolver.calls) == 1
+        clock.now += 10
+        with pytest.raises(HostNotFound):
+            await cache.resolve("gone.example")
+        assert len(resolver.calls) == 2
+
+    async def test_transient_failure_is_not_cached(self):
+        resolver = FakeResolver({"flaky.example": ResolveError("timeout")})
+        cache = _cache(resolver, FakeClock())
+        for _ in range(2):
+            with pytest.raises(ResolveError):
+                await cache.resolve("flaky.example")
+        assert len(resolver.calls) == 2
+
+
+class TestInflightAndBounds:
+    async def test_concurrent_lookups_share_one_query(self):
+        resolver = FakeResolver({"a.example": Answer(("93.184.216.34",), ttl=60)})
+        resolver.gate = asyncio.Event()
+        cache = _cache(resolver, FakeClock())
+        tasks = [asyncio.ensure_future(cache.resolve("a.example")) for _ in range(5)]
+        await asyncio.sleep(0)
+        resolver.gate.set()
+        results = await asyncio.gather(*tasks)
+        assert results == [("93.184.216.34",)] * 5
+        assert resolver.calls == ["a.example"]
+
+    async def test_concurrent_nxdomain_reaches_every_waiter(self):
+        resolver = FakeResolver({"gone.example": HostNotFound("gone.example")})
+        resolver.gate = asyncio.Event()
+        cache = _cache(resolver, FakeClock())
+        tasks = [asyncio.ensure_future(cache.resolve("gone.example")) for _ in range(3)]
+        await asyncio.sleep(0)
+        resolver.gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, HostNotFound) for r in results)
+        assert len(resolver.calls) == 1
+
+    async def test_lru_bound(self):
+        resolver = FakeResolver({
+            f"h{i}.example": Answer((f"93.184.216.{i}",), ttl=60) for i in range(1, 4)
+        })
+        cache = _cache(resolver, FakeClock(), max_entries=2)
+        await cache.resolve("h1.example")
+        await cache.resolve("h2.example")
+        await cache.resolve("h1.example")  # h2 becomes least recently used
+        await cache.resolve("h3.example")
+        await cache.resolve("h1.example")
+        await cache.resolve("h2.example")
+        assert resolver.calls == ["h1.example", "h2.example", "h3.example", "h2.example"]
+
+    async def test_ip_literal_skips_resolver(self):
+        resolver = FakeResolver({})
+        cache = _cache(resolver, FakeClock())
+        assert await cache.resolve("2606:4700::1") == ("2606:4700::1",)
+        assert resolver.calls == []
+
+
+class TestPolicyOnCachedAnswers:
+    async def test_private_answer_blocked_on_every_call(self):
+        resolver = FakeResolver({"internal.example": Answer(("10.0.0.5",), ttl=60)})
+        cache = _cache(resolver, FakeClock())
+        for _ in range(2):
+            with pytest.raises(URLPolicyError, match="private/reserved"):
+                await validate_and_resolve_async("https://internal.example/", cache=cache)
+        assert len(resolver.calls) == 1
+
+    async def test_rebinding_after_ttl_is_blocked(self):
+        """A public answer expires; the rebinding (private) answer is checked, not trusted."""
+        resolver = FakeResolver({"rebind.example": Answer(("93.184.216.34",), ttl=5)})
+        clock = FakeClock()
+        cache = _cache(resolver, clock)
+        url, ip = await validate_and_resolve_async("https://rebind.example/", cache=cache)
+        assert ip == "93.184.216.34"
+        resolver.answers["rebind.example"] = Answer(("169.254.169.254",), ttl=5)
+        # Still within TTL: the pinned address stays the validated public one.
+        _url, ip = await validate_and_resolve_async("https://rebind.example/", cache=cache)
+        assert ip == "93.184.216.34"
+        clock.now += 5
+        with pytest.raises(URLPolicyError, match="private/reserved"):
+            await validate_and_resolve_async("https://rebind.example/", cache=cache)
+
+    async def test_nxdomain_maps_to_policy_error(self):
+        resolver = FakeResolver({"gone.example": HostNotFound("gone.example")})
+        with pytest.raises(URLPolicyError, match="Cannot resolve hostname"):
+            await validate_and_resolve_async(
+                "https://gone.example/", cache=_cache(resolver, FakeClock())
+            )
+
+    async def test_policy_checks_run_before_resolution(self):
+        resolver = FakeResolver({})
+        with pytest.raises(URLPolicyError, match="Blocked host"):
+            await validate_and_resolve_async(
+                "http://metadata.google.internal/", cache=_cache(resolver, FakeClock())
+            )
+        assert resolver.calls == []
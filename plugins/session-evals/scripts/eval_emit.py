@@ -12,6 +12,12 @@ curation step) and:
   run   <suite>       execute suite.json against any OpenAI-compatible
                       endpoint and write an evidence JSON (deterministic
                       checks only - no model grades itself, no judge).
+                      --concurrency N keeps N requests in flight over
+                      keep-alive connections; the evidence `timing` block
+                      (p50/p90/p99 latency, requests/s) makes the same run
+                      a throughput measurement. --repeat K / --warmup W /
+                      --duration S / --stream turn it into a serving
+                      benchmark (see run_suite and the `benchmark` block).
 
 Check semantics mirror anvil-serving's benchmark engine
 (evaluate_text_checks / validate_function_tool_call) so suites stay
@@ -47,13 +53,17 @@ Spec shape:
 
 import argparse
 import datetime
+import http.client
+import io
 import json
 import os
 import re
 import shutil
 import sys
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
 
 DEFAULT_ROOT = os.path.expanduser("~/.anvil-serving/eval-data")
@@ -256,69 +266,410 @@ def validate_tool_call(message, expect):
     return {"valid": True, "error": None}
 
 
+# A reused keep-alive connection the server has since closed fails like
+# this before any response; the request is retried once on a fresh one.
+_STALE = (http.client.RemoteDisconnected, BrokenPipeError,
+          ConnectionResetError, ConnectionAbortedError)
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port).
+
+    Thread-safe: a connection is checked out for one request at a time, so
+    a run at --concurrency N opens at most N connections per server instead
+    of one per eval.
+    """
+
+    def __init__(self):
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, key, timeout, fresh):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle and not fresh:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, host, port = key
+        cls = (http.client.HTTPSConnection if scheme == "https"
+               else http.client.HTTPConnection)
+        return cls(host, port, timeout=timeout), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def post(self, url, body, headers, timeout, read=None):
+        """POST `body` to `url`; return `read(response)` (default: the
+        response bytes); whatever `read` leaves unread is drained so
+        the connection can be reused.
+
+        Non-2xx statuses raise urllib.error.HTTPError, as urlopen does.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in (0, 1):
+            conn, reused = self._checkout(key, timeout, fresh=attempt > 0)
+            r = None
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                r = conn.getresponse()
+                ok = 200 <= r.status < 300
+                if ok and read:
+                    result = read(r)
+                    r.read()  # drain what a reader left (SSE after [DONE])
+                else:
+                    result = r.read()
+            except _STALE:
+                conn.close()
+                # only before a response: never re-send once one started
+                if reused and attempt == 0 and r is None:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if r.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            if not ok:
+                raise urllib.error.HTTPError(url, r.status, r.reason,
+                                             r.headers, io.BytesIO(result))
+            return result
+
+
+_pool = _ConnectionPool()
+
+
+def _proxied(url):
+    """True when urllib would route `url` through an environment proxy."""
+    parts = urllib.parse.urlsplit(url)
+    return (parts.scheme in urllib.request.getproxies()
+            and not urllib.request.proxy_bypass(parts.hostname or ""))
+
+
+def _read_sse(r, t0):
+    """Reassemble a streamed chat completion from its SSE lines.
+
+    Returns (response shaped like a non-streamed one, seconds from `t0`
+    to the first generated token - content, reasoning or tool-call delta -
+    or None if none came).
+    """
+    content = []
+    calls = {}
+    usage = None
+    ttfb = None
+    for line in r:
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            break
+        chunk = json.loads(data)
+        if chunk.get("usage"):
+            usage = chunk["usage"]
+        for choice in chunk.get("choices") or []:
+            delta = choice.get("delta") or {}
+            if ttfb is None and (delta.get("content") or delta.get("tool_calls")
+                                 or delta.get("reasoning_content")):
+                ttfb = time.perf_counter() - t0
+            if isinstance(delta.get("content"), str):
+                content.append(delta["content"])
+            for tc in delta.get("tool_calls") or []:
+                call = calls.setdefault(tc.get("index", 0), {
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""}})
+                if tc.get("id"):
+                    call["id"] = tc["id"]
+                fn = tc.get("function") or {}
+                call["function"]["name"] += fn.get("name") or ""
+                call["function"]["arguments"] += fn.get("arguments") or ""
+    msg = {"role": "assistant", "content": "".join(content)}
+    if calls:
+        msg["tool_calls"] = [calls[i] for i in sorted(calls)]
+    return {"choices": [{"message": msg}], "usage": usage}, ttfb
+
+
 def _post_chat(base, model, messages, max_tokens, timeout, tools=None,
-               api_key=None):
-    """One OpenAI-compatible chat call; deterministic settings (temp 0)."""
+               api_key=None, stream=False):
+    """One OpenAI-compatible chat call; deterministic settings (temp 0).
+
+    Returns (latency_s, response), or with `stream` (latency_s, response,
+    ttfb_s): the reply is streamed (usage requested in the last chunk) and
+    reassembled, so grading is unchanged.
+    Goes over the shared keep-alive pool unless an environment proxy
+    applies, in which case urlopen handles it as before.
+    """
     url = base.rstrip("/") + "/chat/completions"
     body = {"model": model, "messages": messages, "max_tokens": max_tokens,
-            "temperature": 0.0, "stream": False}
+            "temperature": 0.0, "stream": bool(stream)}
+    if stream:
+        body["stream_options"] = {"include_usage": True}
     if tools:
         body["tools"] = tools
         body["tool_choice"] = "auto"
     headers = {"Content-Type": "application/json"}
     if api_key:
         headers["Authorization"] = "Bearer " + api_key
-    req = urllib.request.Request(url, data=json.dumps(body).encode(),
-                                 headers=headers)
-    t0 = time.time()
-    with urllib.request.urlopen(req, timeout=timeout) as r:
-        data = json.loads(r.read())
-    return time.time() - t0, data
+    payload = json.dumps(body).encode()
+    t0 = time.perf_counter()
+
+    def read(r):
+        if stream:
+            return _read_sse(r, t0)
+        return json.loads(r.read()), None
+
+    if _proxied(url):
+        req = urllib.request.Request(url, data=payload, headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            data, ttfb = read(r)
+    else:
+        data, ttfb = _pool.post(url, payload, headers, timeout, read=read)
+    latency = time.perf_counter() - t0
+    if stream:
+        return latency, data, ttfb
+    return latency, data
+
+
+def _percentile(values, q):
+    """Linear-interpolated q-th percentile (0-100) of sorted `values`."""
+    if not values:
+        return None
+    k = (len(values) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _timing(latencies, wall, concurrency):
+    """The evidence `timing` block: latency percentiles over the requests
+    that got a response, and responses per second of wall time."""
+    lat = sorted(latencies)
+    pct = {"p%d" % q: (None if not lat else round(_percentile(lat, q), 3))
+           for q in (50, 90, 99)}
+    return {"concurrency": concurrency,
+            "wall_s": round(wall, 3),
+            "requests": len(lat),
+            "requests_per_s": round(len(lat) / wall, 3) if wall > 0 else None,
+            "latency_s": pct}
+
+
+def _distribution(values):
+    """n/min/mean/p50/p90/p99/max of `values`, or None when empty."""
+    v = sorted(values)
+    if not v:
+        return None
+    dist = {"n": len(v), "min": round(v[0], 3),
+            "mean": round(sum(v) / len(v), 3)}
+    for q in (50, 90, 99):
+        dist["p%d" % q] = round(_percentile(v, q), 3)
+    dist["max"] = round(v[-1], 3)
+    return dist
+
+
+def _run_eval(ev, base_url, model, timeout, api_key, post, stream=False):
+    """Send one eval and grade it; returns (row, sample).
+
+    `sample` holds the unrounded latency, ttfb and completion tokens/s of
+    the request (None where unknown). Tokens/s is the generation rate:
+    completion tokens over the time after the first token when streaming,
+    over the whole request otherwise.
+    """
+    messages = ev.get("messages") or [
+        {"role": "user", "content": ev["prompt"]}]
+    row = {"id": ev["id"], "checks": [], "tool": None, "latency_s": None,
+           "ttfb_s": None, "completion_tokens": None,
+           "passed": False, "error": None}
+    sample = {"latency": None, "ttfb": None, "tokens_per_s": None}
+    kwargs = {"tools": ev.get("tools"), "api_key": api_key}
+    if stream:
+        kwargs["stream"] = True
+    try:
+        got = post(base_url, model, messages, ev.get("max_tokens", 256),
+                   timeout, **kwargs)
+        latency, data = got[0], got[1]
+        ttfb = got[2] if len(got) > 2 else None
+        sample["latency"], sample["ttfb"] = latency, ttfb
+        row["latency_s"] = round(latency, 3)
+        if ttfb is not None:
+            row["ttfb_s"] = round(ttfb, 3)
+        usage = data.get("usage") if isinstance(data, dict) else None
+        tokens = usage.get("completion_tokens") if isinstance(
+            usage, dict) else None
+        if isinstance(tokens, int) and not isinstance(tokens, bool):
+            row["completion_tokens"] = tokens
+            gen = latency - ttfb if ttfb is not None else latency
+            if gen > 0:
+                sample["tokens_per_s"] = tokens / gen
+        choices = data.get("choices") if isinstance(data, dict) else None
+        choice = (choices or [{}])[0]
+        msg = choice.get("message") if isinstance(choice, dict) else None
+        msg = msg if isinstance(msg, dict) else {}
+        content = msg.get("content")
+        # anvil _message_text parity: block-list content grades as ""
+        # rather than crashing on list.lower()
+        content = content if isinstance(content, str) else ""
+        row["checks"] = evaluate_text_checks(content, ev.get("checks") or [])
+        ok = all(c["passed"] for c in row["checks"])
+        if ev.get("expect_tool"):
+            row["tool"] = validate_tool_call(msg, ev["expect_tool"])
+            ok = ok and row["tool"]["valid"]
+        row["passed"] = ok
+    except (urllib.error.URLError, http.client.HTTPException, OSError,
+            ValueError, KeyError, TypeError, AttributeError,
+            IndexError) as e:
+        # a malformed response from one local serve must cost one eval,
+        # never the whole evidence run
+        row["error"] = "%s: %s" % (type(e).__name__, e)
+    return row, sample
+
+
+def _closed_loop(jobs, concurrency, fn):
+    """[fn(job) for job in jobs] with up to `concurrency` calls in flight.
+
+    Closed loop: each worker takes the next job as soon as its previous
+    call returns, so the server sees a steady `concurrency` requests.
+    `jobs` may be an unbounded iterator (load mode ends it). Results come
+    back in job order.
+    """
+    if concurrency <= 1:
+        return [fn(job) for job in jobs]
+    jobs = enumerate(jobs)
+    lock = threading.Lock()
+    out = {}
+    errors = []
+
+    def worker():
+        while not errors:
+            with lock:
+                item = next(jobs, None)
+            if item is None:
+                return
+            try:
+                out[item[0]] = fn(item[1])
+            except BaseException as e:  # surfaced in the caller below
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return [out[i] for i in sorted(out)]
+
+
+def _load_jobs(evals, deadline):
+    """Evals round-robin until `deadline` (perf_counter), at least once each."""
+    i = 0
+    while i < len(evals) or time.perf_counter() < deadline:
+        yield evals[i % len(evals)]
+        i += 1
+
+
+def _benchmark(spec, runs, repeat, warmup, duration, stream, concurrency):
+    """The evidence `benchmark` block: per-eval distributions over every
+    measured run, and the evals whose pass/fail changed between runs."""
+    evals = {}
+    unstable = []
+    for ev in spec["evals"]:
+        got = runs[ev["id"]]
+        passes = sum(1 for row, _ in got if row["passed"])
+        flaky = 0 < passes < len(got)
+        if flaky:
+            unstable.append(ev["id"])
+        evals[ev["id"]] = {
+            "runs": len(got),
+            "passed": passes,
+            "errors": sum(1 for row, _ in got if row["error"]),
+            "unstable": flaky,
+            "latency_s": _distribution(
+                [x["latency"] for _, x in got if x["latency"] is not None]),
+            "ttfb_s": _distribution(
+                [x["ttfb"] for _, x in got if x["ttfb"] is not None]),
+            "tokens_per_s": _distribution(
+                [x["tokens_per_s"] for _, x in got
+                 if x["tokens_per_s"] is not None]),
+        }
+    return {
+        "schema": "session-evals/benchmark/1",
+        "mode": "load" if duration else "repeat",
+        "repeat": None if duration else repeat,
+        "duration_s": duration,
+        "warmup": warmup,
+        "stream": bool(stream),
+        "concurrency": concurrency,
+        "evals": evals,
+        "unstable": unstable,
+    }
+
 
+def run_suite(spec, base_url, model, timeout=120, api_key=None, post=None,
+              concurrency=1, repeat=1, warmup=0, duration=None, stream=False):
+    """Execute every eval; return the evidence dict. `post` is the seam.
 
-def run_suite(spec, base_url, model, timeout=120, api_key=None, post=None):
-    """Execute every eval; return the evidence dict. `post` is the seam."""
+    `post` returns (latency_s, response), or (latency_s, response, ttfb_s)
+    when called with stream=True (only passed when `stream` is set). With
+    concurrency > 1, up to that many evals are in flight at once (`post`
+    is then called from worker threads). Results keep spec order and one
+    eval's failure never affects another's row.
+
+    Benchmarking: `warmup` unrecorded passes over the suite come first;
+    then every eval is sent `repeat` times, or - load mode, `duration`
+    seconds - the suite is cycled closed-loop at `concurrency` until the
+    time is up. An eval passes only if every measured run passed; the
+    `benchmark` block carries per-eval latency/ttfb/tokens-per-second
+    distributions and flags evals whose outcome varied between runs.
+    """
     if not spec.get("evals"):
         raise ValueError("spec has no evals (validate_spec should gate this)")
+    if repeat < 1 or warmup < 0 or (duration is not None and duration <= 0):
+        raise ValueError("repeat must be >= 1, warmup >= 0, duration > 0")
     post = post or _post_chat
+    evals = spec["evals"]
+    if not duration:
+        concurrency = min(concurrency, len(evals) * repeat)
+    concurrency = max(1, concurrency)
+
+    def one(ev):
+        return _run_eval(ev, base_url, model, timeout, api_key, post, stream)
+
+    if warmup:
+        _closed_loop(evals * warmup, concurrency, one)
+    t0 = time.perf_counter()
+    if duration:
+        jobs = _load_jobs(evals, t0 + duration)
+    else:
+        jobs = evals * repeat
+    outcomes = _closed_loop(jobs, concurrency, one)
+    wall = time.perf_counter() - t0
+
+    runs = {}
+    for row, sample in outcomes:
+        runs.setdefault(row["id"], []).append((row, sample))
     results = []
-    failures = []
-    for ev in spec["evals"]:
-        messages = ev.get("messages") or [
-            {"role": "user", "content": ev["prompt"]}]
-        row = {"id": ev["id"], "checks": [], "tool": None, "latency_s": None,
-               "passed": False, "error": None}
-        try:
-            latency, data = post(base_url, model, messages,
-                                 ev.get("max_tokens", 256), timeout,
-                                 tools=ev.get("tools"), api_key=api_key)
-            row["latency_s"] = round(latency, 3)
-            choices = data.get("choices") if isinstance(data, dict) else None
-            choice = (choices or [{}])[0]
-            msg = choice.get("message") if isinstance(choice, dict) else None
-            msg = msg if isinstance(msg, dict) else {}
-            content = msg.get("content")
-            # anvil _message_text parity: block-list content grades as ""
-            # rather than crashing on list.lower()
-            content = content if isinstance(content, str) else ""
-            row["checks"] = evaluate_text_checks(content, ev.get("checks") or [])
-            ok = all(c["passed"] for c in row["checks"])
-            if ev.get("expect_tool"):
-                row["tool"] = validate_tool_call(msg, ev["expect_tool"])
-                ok = ok and row["tool"]["valid"]
-            row["passed"] = ok
-        except (urllib.error.URLError, OSError, ValueError, KeyError,
-                TypeError, AttributeError, IndexError) as e:
-            # a malformed response from one local serve must cost one eval,
-            # never the whole evidence run
-            row["error"] = "%s: %s" % (type(e).__name__, e)
-        if not row["passed"]:
-            failures.append({"id": ev["id"],
-                             "error": row["error"] or "checks failed"})
+    for ev in evals:
+        got = runs[ev["id"]]
+        row = got[0][0]
+        passes = sum(1 for r, _ in got if r["passed"])
+        if passes < len(got) and passes:
+            row = dict(row, passed=False, error=row["error"] or (
+                "unstable: passed %d/%d runs" % (passes, len(got))))
         results.append(row)
-
+    failures = [{"id": r["id"], "error": r["error"] or "checks failed"}
+                for r in results if not r["passed"]]
     passed = sum(1 for r in results if r["passed"])
-    return {
+    evidence = {
         "tool": "session-evals/eval_emit run",
         "suite": spec["suite"],
         "work_class": spec["work_class"],
@@ -329,7 +680,13 @@ def run_suite(spec, base_url, model, timeout=120, api_key=None, post=None):
         "failures": failures,
         "summary": {"total": len(results), "passed": passed,
                     "pass_rate": round(passed / len(results), 4)},
+        "timing": _timing([x["latency"] for _, x in outcomes
+                           if x["latency"] is not None], wall, concurrency),
     }
+    if repeat > 1 or warmup or duration or stream:
+        evidence["benchmark"] = _benchmark(spec, runs, repeat, warmup,
+                                           duration, stream, concurrency)
+    return evidence
 
 
 def cmd_run(args):
@@ -343,9 +700,21 @@ def cmd_run(args):
         for p in problems:
             print("spec error: %s" % p, file=sys.stderr)
         return 1
+    if (args.concurrency < 1 or args.repeat < 1 or args.warmup < 0
+            or (args.duration is not None and args.duration <= 0)):
+        print("run: --concurrency and --repeat must be >= 1, --warmup >= 0, "
+              "--duration > 0", file=sys.stderr)
+        return 1
+    if args.duration and args.repeat > 1:
+        print("run: --duration (load mode) and --repeat are exclusive",
+              file=sys.stderr)
+        return 1
     api_key = os.environ.get(args.api_key_env) if args.api_key_env else None
     evidence = run_suite(spec, args.base_url, args.model,
-                         timeout=args.timeout, api_key=api_key)
+                         timeout=args.timeout, api_key=api_key,
+                         concurrency=args.concurrency, repeat=args.repeat,
+                         warmup=args.warmup, duration=args.duration,
+                         stream=args.stream)
     text = json.dumps(evidence, indent=2, ensure_ascii=False)
     if args.out:
         with open(args.out, "w", encoding="utf-8") as f:
@@ -356,6 +725,17 @@ def cmd_run(args):
     print("%s: %d/%d passed (%.0f%%) against %s"
           % (spec["suite"], s["passed"], s["total"], 100 * s["pass_rate"],
              args.model), file=sys.stderr)
+    t = evidence["timing"]
+    if t["requests"]:
+        print("latency p50 %.3fs p90 %.3fs p99 %.3fs, %.2f req/s "
+              "at concurrency %d"
+              % (t["latency_s"]["p50"], t["latency_s"]["p90"],
+                 t["latency_s"]["p99"], t["requests_per_s"] or 0,
+                 t["concurrency"]), file=sys.stderr)
+    unstable = (evidence.get("benchmark") or {}).get("unstable")
+    if unstable:
+        print("unstable across runs: %s" % ", ".join(unstable),
+              file=sys.stderr)
     return 0 if s["passed"] == s["total"] else 2
 
 
@@ -377,6 +757,18 @@ def main(argv=None):
                     help="OpenAI-compatible base, e.g. http://127.0.0.1:30001/v1")
     sr.add_argument("--model", required=True, help="served model name")
     sr.add_argument("--timeout", type=int, default=120)
+    sr.add_argument("--concurrency", type=int, default=1,
+                    help="evals in flight at once (default 1)")
+    sr.add_argument("--repeat", type=int, default=1,
+                    help="send every eval K times; an eval passes only if "
+                    "all K runs pass (default 1)")
+    sr.add_argument("--warmup", type=int, default=0,
+                    help="unrecorded passes over the suite first (default 0)")
+    sr.add_argument("--duration", type=float,
+                    help="load mode: cycle the suite closed-loop at "
+                    "--concurrency for this many seconds")
+    sr.add_argument("--stream", action="store_true",
+                    help="stream responses to measure time to first token")
     sr.add_argument("--api-key-env", default="",
                     help="env var holding a bearer key (never pass the key "
                     "itself on the command line)")
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """session_miner.py - mine coding-agent sessions into eval candidates.
 
-Stdlib-only. Reads local session logs from four sources and emits ranked
+Stdlib-only (decodes with orjson when it happens to be installed). Reads local session logs from four sources and emits ranked
 eval-candidate records for human/Claude curation (see the session-evals
 skill). Never sends anything anywhere; output is a local JSON file.
 
@@ -19,19 +19,36 @@ Commands:
                                     output dir (session_stats.json)
   mine --corpus <corpus-dir>        mine every retro dir in a findings corpus
                                     and carry its failure themes alongside
+  mine ... --jobs N                 mine N files at a time (0 = one per CPU)
+
+Mined candidates are cached per session file under CACHE_DIR (keyed by
+path, size, mtime and this script's own digest; entries for sessions that
+no longer exist are dropped after each run) and `list` reuses directory
+listings whose mtime hasn't moved; --no-cache bypasses both.
 
 Formats drift between agent releases; parsing is tolerant by design -
 unknown types are skipped, malformed lines are counted, never fatal.
 """
 
 import argparse
+import codecs
 import datetime
+import functools
 import glob
+import hashlib
 import json
 import os
 import re
 import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:  # optional faster decoder; everything works without it
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 CLAUDE_ROOT = os.path.expanduser("~/.claude/projects")
 CODEX_ROOT = os.path.expanduser("~/.codex/sessions")
@@ -40,6 +57,12 @@ CODEX_ROOT = os.path.expanduser("~/.codex/sessions")
 CODEX_ARCHIVE = os.path.expanduser("~/.codex/archived_sessions")
 CURSOR_ROOT = os.path.expanduser("~/.cursor/projects")
 
+# Per-session candidates and the discovery manifest are cached here so a
+# re-mine after one new session costs that one file's work.
+CACHE_DIR = os.environ.get("SESSION_EVALS_CACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "session-evals")
+
 # Ranking weights: transparent and additive so the curator can see why a
 # candidate scored what it did (mirrors the "judgment stays with the
 # curator" split - the script only orders the reading list).
@@ -81,29 +104,72 @@ CLIP = 2000  # max chars kept per captured text field
 
 # ---------------------------------------------------------------- helpers
 
-def _jsonl(path):
+def _jsonl(path, skip=None):
     """Yield parsed dict records from a JSONL file.
 
     Tolerant by contract: unparseable lines, blank lines, and valid-JSON
     non-objects (a bare `42` or `"note"`) are skipped, never fatal.
-    utf-8-sig eats a BOM that would otherwise kill the first record.
+    A leading BOM is dropped so it can't kill the first record; invalid
+    UTF-8 is decoded with replacement characters.
+    `skip(raw_line)` may drop a record by its bytes before it is decoded.
     """
     try:
-        with open(path, encoding="utf-8-sig", errors="replace") as f:
-            for line in f:
+        with open(path, "rb") as f:
+            for n, line in enumerate(f):
+                if n == 0 and line.startswith(codecs.BOM_UTF8):
+                    line = line[len(codecs.BOM_UTF8):]
                 line = line.strip()
-                if not line:
+                if not line or (skip is not None and skip(line)):
                     continue
                 try:
-                    d = json.loads(line)
+                    d = _loads(line)
                 except (json.JSONDecodeError, ValueError):
-                    continue
+                    try:
+                        d = json.loads(line.decode("utf-8", errors="replace"))
+                    except (json.JSONDecodeError, ValueError):
+                        continue
                 if isinstance(d, dict):
                     yield d
     except OSError as e:
         print("warn: cannot read %s: %s" % (path, e), file=sys.stderr)
 
 
+# Byte-level prefilters. Tool output (Claude tool_result records, Codex
+# function_call_output / exec events / reasoning) is most of a corpus's
+# bytes and none of what the miners read, so those records are dropped
+# before decoding. A line the check can't classify exactly is decoded.
+_CLAUDE_BLOCK_USER = b',"message":{"role":"user","content":['
+_CODEX_HEAD_RE = re.compile(
+    rb'\{"timestamp":"[^"\\]*","type":"[a-z_]+","payload":\{"type":"([a-z_]+)"')
+_CODEX_MINED = {b"message", b"function_call", b"token_count"}
+
+
+def _skip_claude(line):
+    """User records with block content: mine_claude only reads string turns.
+
+    Everything before "message" is scalars, so that prefix decodes on its
+    own only when the match is at the record's top level.
+    """
+    cut = line.find(_CLAUDE_BLOCK_USER)
+    if cut < 0:
+        return False
+    try:
+        head = _loads(line[:cut] + b"}")
+    except (json.JSONDecodeError, ValueError):
+        return False
+    return isinstance(head, dict) and head.get("type") == "user"
+
+
+def _skip_codex(line):
+    """Rollout records whose payload type mine_codex never reads.
+
+    Rollout lines open with timestamp, type and payload.type in that
+    order, so the discriminator is read at a fixed position.
+    """
+    m = _CODEX_HEAD_RE.match(line)
+    return m is not None and m.group(1) not in _CODEX_MINED
+
+
 def _text(content):
     """Flatten Anthropic/Codex content (str or block list) to plain text."""
     if isinstance(content, str):
@@ -230,7 +296,7 @@ def mine_claude(path):
     intent = None
     ctx = None
     pending = []  # candidates awaiting the next human turn (followup signal)
-    for d in _jsonl(path):
+    for d in _jsonl(path, _skip_claude):
         m = d.get("message")
         if not isinstance(m, dict):
             continue
@@ -270,7 +336,7 @@ def mine_codex(path, source="codex"):
     intent = None
     ctx = None
     pending = []
-    for d in _jsonl(path):
+    for d in _jsonl(path, _skip_codex):
         payload = d.get("payload") if isinstance(d.get("payload"), dict) else {}
         ts = d.get("timestamp")
         ptype = payload.get("type")
@@ -357,6 +423,144 @@ def mine_session(path):
     return mine_claude(path)
 
 
+# ----------------------------------------------------------------- cache
+
+def _source_digest():
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+# Any edit to the miner invalidates what it cached, so a fix to a parser
+# never serves candidates the old code produced.
+MINER_VERSION = _source_digest()
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Best-effort atomic write; an unwritable cache only costs speed."""
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _cache_key(path):
+    """(cache file, key) for a session, or (None, None) if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, None
+    # candidates record `path` as given, so that string is the key (an
+    # alias of the same file re-mines rather than misreporting `session`)
+    where = _cache_where(path)
+    name = hashlib.sha256(where.encode("utf-8", "surrogatepass")).hexdigest()
+    return (name[:32] + ".json",
+            [path, st.st_size, st.st_mtime_ns, MINER_VERSION])
+
+
+def _cache_where(path):
+    """Absolute path an entry is pruned by (`path` may be cwd-relative)."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _cached_candidates(path, cache_dir):
+    """Candidates cached for `path` if it is unchanged since, else None."""
+    name, key = _cache_key(path)
+    if not cache_dir or name is None:
+        return None
+    entry = _read_json(os.path.join(cache_dir, "candidates", name))
+    if isinstance(entry, dict) and entry.get("key") == key:
+        return entry.get("candidates")
+    return None
+
+
+def _mine_and_cache(path, cache_dir=None):
+    """mine_session(path), storing the result for `_cached_candidates`.
+
+    The key is taken before mining: a session still being written is
+    re-mined next time instead of served stale.
+    """
+    name, key = _cache_key(path)
+    candidates = mine_session(path)
+    if cache_dir and name is not None:
+        _write_json(os.path.join(cache_dir, "candidates", name),
+                    {"key": key, "where": _cache_where(path),
+                     "candidates": candidates})
+    return candidates
+
+
+def _prune_candidates(cache_dir):
+    """Drop cached candidates that can never be hit again; returns how many.
+
+    Those are entries for sessions deleted or moved since (a moved session
+    is cached afresh under its new path), entries another miner version
+    wrote, and unreadable ones.
+    """
+    d = os.path.join(cache_dir, "candidates")
+    try:
+        names = os.listdir(d)
+    except OSError:
+        return 0
+    dropped = 0
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        entry = _read_json(os.path.join(d, name))
+        key = entry.get("key") if isinstance(entry, dict) else None
+        where = entry.get("where") if isinstance(entry, dict) else None
+        if (isinstance(key, list) and len(key) == 4
+                and key[3] == MINER_VERSION and isinstance(where, str)
+                and os.path.exists(where)):
+            continue
+        try:
+            os.remove(os.path.join(d, name))
+            dropped += 1
+        except OSError:
+            pass
+    return dropped
+
+
+def mine_sessions(paths, jobs=1, cache_dir=None):
+    """([candidates per path], cache hits), in input order.
+
+    Unchanged sessions come from `cache_dir`; the rest are mined `jobs`
+    files at a time in worker processes (0 = one per CPU).
+    """
+    results = [_cached_candidates(p, cache_dir) for p in paths]
+    todo = [i for i, r in enumerate(results) if r is None]
+    work = functools.partial(_mine_and_cache, cache_dir=cache_dir)
+    todo_paths = [paths[i] for i in todo]
+    mined = None
+    jobs = min(jobs if jobs > 0 else (os.cpu_count() or 1), len(todo))
+    if jobs > 1:
+        try:
+            with ProcessPoolExecutor(jobs) as pool:
+                mined = list(pool.map(work, todo_paths))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            # no usable process pool (sandbox, missing sem_open...)
+            print("warn: --jobs unavailable (%s); mining serially" % e,
+                  file=sys.stderr)
+    if mined is None:
+        mined = [work(p) for p in todo_paths]
+    for i, candidates in zip(todo, mined):
+        results[i] = candidates
+    return results, len(paths) - len(todo)
+
+
 # ------------------------------------------------------------- discovery
 
 def _wsl_openclaw_roots():
@@ -400,32 +604,92 @@ def resolve_session_path(p):
     return None
 
 
-def discover_sessions():
-    """Return [(source, path)] for every session file found on this machine."""
-    found = []
-    for p in glob.glob(os.path.join(CLAUDE_ROOT, "**", "*.jsonl"),
-                       recursive=True):
-        found.append(("claude", p))
-    for p in glob.glob(os.path.join(CODEX_ROOT, "**", "*.jsonl"),
-                       recursive=True):
-        found.append(("codex", p))
-    for p in glob.glob(os.path.join(CODEX_ARCHIVE, "*.jsonl")):
-        found.append(("codex", p))
-    for p in glob.glob(os.path.join(CURSOR_ROOT, "*", "agent-transcripts",
-                                    "*", "*.jsonl")):
-        found.append(("cursor", p))
+# A directory listed within this many ns of its mtime isn't trusted to the
+# manifest: an entry added in the same mtime tick (2s on FAT) would be lost.
+_RACY_NS = 2 * 10**9
+
+
+def _listing(d, old, new):
+    """(subdirs, *.jsonl files) of `d`, reused from manifest `old` while
+    the directory's mtime hasn't moved (adding, removing or renaming an
+    entry bumps it; appending to a file doesn't, nor need it).
+    Dot-entries are skipped, as glob's wildcards do."""
+    try:
+        mtime = os.stat(d).st_mtime_ns
+    except OSError:
+        return [], []
+    entry = old.get(d)
+    if not entry or entry[0] != mtime:
+        dirs, files = [], []
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.name.startswith("."):
+                        continue
+                    try:
+                        is_dir = e.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        dirs.append(e.name)
+                    elif e.name.endswith(".jsonl"):
+                        files.append(e.name)
+        except OSError:
+            return [], []
+        entry = [mtime, sorted(dirs), sorted(files)]
+    if time.time_ns() - mtime > _RACY_NS:
+        new[d] = entry
+    return entry[1], entry[2]
+
+
+def _walk(d, parts, old, new):
+    """*.jsonl files under `d` along the directory pattern `parts`: a
+    name, "*" (any one dir) or a trailing "**" (any depth, glob-style)."""
+    if parts and parts[0] not in ("*", "**"):
+        return _walk(os.path.join(d, parts[0]), parts[1:], old, new)
+    dirs, files = _listing(d, old, new)
+    if not parts:
+        return [os.path.join(d, f) for f in files]
+    found = [os.path.join(d, f) for f in files] if parts == ["**"] else []
+    rest = parts if parts == ["**"] else parts[1:]
+    for sub in dirs:
+        found += _walk(os.path.join(d, sub), rest, old, new)
+    return found
+
+
+def discover_sessions(use_cache=True):
+    """Return [(source, path)] for every session file found on this machine.
+
+    Walks each source's directory pattern against a manifest of directory
+    listings (CACHE_DIR/discovery.json): an unchanged directory costs one
+    stat instead of a listing, which is what a recursive glob over a large
+    or \\\\wsl$-mounted tree spends its time on.
+    """
+    manifest = os.path.join(CACHE_DIR, "discovery.json")
+    old = {}
+    if use_cache:
+        data = _read_json(manifest)
+        if isinstance(data, dict) and data.get("miner") == MINER_VERSION:
+            old = data.get("dirs") or {}
+    roots = [
+        ("claude", CLAUDE_ROOT, ["**"]),
+        ("codex", CODEX_ROOT, ["**"]),
+        ("codex", CODEX_ARCHIVE, []),
+        ("cursor", CURSOR_ROOT, ["*", "agent-transcripts", "*"]),
+    ]
     # OpenClaw embeds a codex agent; its rollouts live at a known depth so
-    # the glob stays anchored (a recursive ** across a WSL home is minutes).
+    # the walk stays anchored (a recursive ** across a WSL home is minutes).
     for root in _wsl_openclaw_roots():
+        parts = ["agents", "*", "agent", "codex-home", "sessions", "**"]
         if root.rstrip("\\/").endswith("home"):
-            root = os.path.join(root, "*", ".openclaw")
-        pat = os.path.join(root, "agents", "*", "agent", "codex-home",
-                           "sessions", "**", "*.jsonl")
-        try:
-            for p in glob.glob(pat, recursive=True):
-                found.append(("openclaw", p))
-        except OSError:
-            continue
+            parts = ["*", ".openclaw"] + parts
+        roots.append(("openclaw", root, parts))
+    new = {}
+    found = []
+    for source, root, parts in roots:
+        found += [(source, p) for p in _walk(root, parts, old, new)]
+    if use_cache and new != old:
+        _write_json(manifest, {"miner": MINER_VERSION, "dirs": new})
     return found
 
 
@@ -463,7 +727,7 @@ def corpus_inputs(corpus_dir):
 
 def cmd_list(args):
     rows = []
-    for source, p in discover_sessions():
+    for source, p in discover_sessions(not args.no_cache):
         if args.substr and args.substr.lower() not in p.lower():
             continue
         try:
@@ -497,10 +761,9 @@ def cmd_mine(args):
     if not sessions:
         raise SystemExit("nothing to mine: pass session files, --retro or --corpus")
 
-    candidates = []
+    live_paths = []
     missing = []
     seen = set()
-    mined = 0
     for sp in sessions:
         live = resolve_session_path(sp)
         if live is None:
@@ -515,9 +778,14 @@ def cmd_mine(args):
         if key in seen:
             continue
         seen.add(key)
-        mined += 1
-        candidates.extend(mine_session(live))
-
+        live_paths.append(live)
+
+    per_session, cached = mine_sessions(
+        live_paths, args.jobs, None if args.no_cache else CACHE_DIR)
+    if not args.no_cache:
+        _prune_candidates(CACHE_DIR)
+    mined = len(live_paths)
+    candidates = [c for cands in per_session for c in cands]
     candidates.sort(key=lambda c: -c["score"])
     if args.max_candidates:
         candidates = candidates[:args.max_candidates]
@@ -537,8 +805,8 @@ def cmd_mine(args):
     if args.out:
         with open(args.out, "w", encoding="utf-8") as f:
             f.write(text + "\n")
-        print("wrote %d candidates (%d sessions) -> %s"
-              % (len(candidates), mined, args.out))
+        print("wrote %d candidates (%d sessions, %d cached) -> %s"
+              % (len(candidates), mined, cached, args.out))
         if missing:
             print("warn: %d session files missing (moved/deleted?)"
                   % len(missing), file=sys.stderr)
@@ -553,6 +821,8 @@ def main(argv=None):
     sl = sub.add_parser("list", help="enumerate sessions across sources")
     sl.add_argument("substr", nargs="?", default="",
                     help="filter paths containing this substring")
+    sl.add_argument("--no-cache", action="store_true",
+                    help="list every directory afresh (ignore the manifest)")
     sl.set_defaults(func=cmd_list)
 
     sm = sub.add_parser("mine", help="mine sessions into eval candidates")
@@ -564,6 +834,11 @@ def main(argv=None):
     sm.add_argument("--max-candidates", type=int, default=200,
                     help="keep top N ranked candidates (default 200; 0 = no cap)")
     sm.add_argument("--out", help="write JSON here instead of stdout")
+    sm.add_argument("--jobs", type=int, default=1,
+                    help="mine N session files at a time (0 = one per CPU)")
+    sm.add_argument("--no-cache", action="store_true",
+                    help="re-mine every session instead of reusing "
+                    "cached candidates")
     sm.set_defaults(func=cmd_mine)
 
     args = ap.parse_args(argv)
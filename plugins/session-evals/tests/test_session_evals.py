@@ -6,6 +6,9 @@ import importlib.util
 import json
 import os
 import sys
+import time
+
+import pytest
 
 HERE = os.path.dirname(__file__)
 SCRIPTS = os.path.join(HERE, "..", "scripts")
@@ -23,6 +26,12 @@ miner = _load("session_miner")
 emitter = _load("eval_emit")
 
 
+@pytest.fixture(autouse=True)
+def _private_cache(tmp_path, monkeypatch):
+    # mine and list cache under CACHE_DIR; never touch the real one
+    monkeypatch.setattr(miner, "CACHE_DIR", str(tmp_path / "cache"))
+
+
 def write_jsonl(path, rows):
     with open(path, "w", encoding="utf-8") as f:
         for r in rows:
@@ -249,6 +258,130 @@ def test_mine_dedups_live_and_archived_copies(tmp_path, monkeypatch):
     assert len(data["candidates"]) == 2         # one session's candidates
 
 
+
+def test_mine_serves_unchanged_sessions_from_cache(tmp_path, monkeypatch):
+    s1, s2 = str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")
+    claude_session(s1)
+    codex_session(s2)
+    out = str(tmp_path / "cands.json")
+    miner.main(["mine", s1, s2, "--out", out])
+    first = json.loads(open(out, encoding="utf-8").read())
+
+    mined = []
+    real = miner.mine_session
+    monkeypatch.setattr(miner, "mine_session",
+                        lambda p: mined.append(p) or real(p))
+    miner.main(["mine", s1, s2, "--out", out])
+    assert mined == []
+    assert json.loads(open(out, encoding="utf-8").read()) == first
+
+    codex_session(s2, secret=True)          # rewritten: size/mtime move
+    miner.main(["mine", s1, s2, "--out", out])
+    assert mined == [s2]
+    data = json.loads(open(out, encoding="utf-8").read())
+    assert any("openai-style key" in c["redaction_flags"]
+               for c in data["candidates"])
+
+    miner.main(["mine", s1, s2, "--no-cache", "--out", out])
+    assert mined == [s2, s1, s2]
+
+
+def test_mine_cache_is_keyed_on_miner_version(tmp_path, monkeypatch):
+    s1 = str(tmp_path / "a.jsonl")
+    claude_session(s1)
+    cache = str(tmp_path / "cache")
+    miner.mine_sessions([s1], cache_dir=cache)
+    assert miner.mine_sessions([s1], cache_dir=cache)[1] == 1
+    monkeypatch.setattr(miner, "MINER_VERSION", "edited")
+    assert miner.mine_sessions([s1], cache_dir=cache)[1] == 0
+
+
+def test_mine_prunes_cache_entries_for_vanished_sessions(tmp_path,
+                                                         monkeypatch):
+    s1, s2 = str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")
+    claude_session(s1)
+    codex_session(s2)
+    out = str(tmp_path / "cands.json")
+    entries = tmp_path / "cache" / "candidates"
+    miner.main(["mine", s1, s2, "--out", out])
+    assert len(os.listdir(entries)) == 2
+
+    os.remove(s2)
+    miner.main(["mine", s1, "--out", out])
+    kept, = os.listdir(entries)
+    assert kept == miner._cache_key(s1)[0]
+
+    # an entry from another miner version can never be hit again
+    monkeypatch.setattr(miner, "MINER_VERSION", "edited")
+    codex_session(s2)
+    miner.main(["mine", s2, "--out", out])
+    assert os.listdir(entries) == [miner._cache_key(s2)[0]]
+
+
+def test_parallel_mining_matches_serial(tmp_path, monkeypatch):
+    # workers unpickle `_mine_and_cache` by module name, so the script must
+    # be importable as `session_miner` (spawn) and be that module (fork)
+    monkeypatch.syspath_prepend(SCRIPTS)
+    monkeypatch.setitem(sys.modules, "session_miner", miner)
+    paths = []
+    for n in range(6):
+        p = str(tmp_path / ("s%d.jsonl" % n))
+        [claude_session, codex_session, cursor_session][n % 3](p)
+        paths.append(p)
+    serial, _ = miner.mine_sessions(paths)
+    parallel, hits = miner.mine_sessions(
+        paths, jobs=3, cache_dir=str(tmp_path / "cache"))
+    assert parallel == serial and hits == 0
+    # the workers filled the cache
+    assert miner.mine_sessions(
+        paths, cache_dir=str(tmp_path / "cache")) == (serial, 6)
+
+
+def test_discovery_manifest_relists_only_changed_dirs(tmp_path, monkeypatch):
+    claude = tmp_path / "claude"
+    for proj in ("p1", "p2"):
+        (claude / proj / "sub").mkdir(parents=True)
+        write_jsonl(claude / proj / "s.jsonl", [{}])
+        write_jsonl(claude / proj / "sub" / "agent.jsonl", [{}])
+    (claude / ".hidden").mkdir()
+    write_jsonl(claude / ".hidden" / "x.jsonl", [{}])
+    cursor = tmp_path / "cursor"
+    (cursor / "proj" / "agent-transcripts" / "t1").mkdir(parents=True)
+    write_jsonl(cursor / "proj" / "agent-transcripts" / "t1" / "t.jsonl",
+                [{}])
+    monkeypatch.setattr(miner, "CLAUDE_ROOT", str(claude))
+    monkeypatch.setattr(miner, "CURSOR_ROOT", str(cursor))
+    monkeypatch.setattr(miner, "CODEX_ROOT", str(tmp_path / "none"))
+    monkeypatch.setattr(miner, "CODEX_ARCHIVE", str(tmp_path / "none2"))
+    monkeypatch.setenv("SESSION_EVALS_OPENCLAW_ROOTS", str(tmp_path / "oc"))
+
+    def age(root):  # directories fresher than _RACY_NS aren't trusted
+        for d, _, _ in os.walk(root):
+            os.utime(d, ns=(1, 10**18))
+
+    age(claude)
+    age(cursor)
+    expected = sorted(
+        [("claude", p) for p in miner.glob.glob(
+            os.path.join(str(claude), "**", "*.jsonl"), recursive=True)]
+        + [("cursor", str(cursor / "proj" / "agent-transcripts" / "t1"
+                          / "t.jsonl"))])
+    assert sorted(miner.discover_sessions()) == expected
+
+    listed = []
+    real = os.scandir
+    monkeypatch.setattr(miner.os, "scandir",
+                        lambda d: listed.append(d) or real(d))
+    assert sorted(miner.discover_sessions()) == expected
+    assert listed == []
+
+    write_jsonl(claude / "p2" / "new.jsonl", [{}])
+    os.utime(claude / "p2", ns=(1, 10**18 + 1))
+    found = miner.discover_sessions()
+    assert ("claude", str(claude / "p2" / "new.jsonl")) in found
+    assert listed == [str(claude / "p2")]
+
+
 def test_diff_in_tool_input_scores_and_classifies():
     patch = "--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-x\n+y\n"
     c = miner._mk_candidate(
@@ -277,6 +410,66 @@ def test_jsonl_tolerates_non_dict_lines_and_bom(tmp_path):
     assert len(cands) == 1 and cands[0]["source"] == "codex"
 
 
+def test_byte_prefilter_keeps_mined_candidates_identical(tmp_path, monkeypatch):
+    # On-disk field order and compact separators, which the prefilter keys on.
+    def compact(path, rows):
+        with open(path, "w", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, separators=(",", ":")) + "\n")
+
+    base = {"parentUuid": None, "isSidechain": False, "cwd": "/p",
+            "gitBranch": "main"}
+    claude = tmp_path / "claude.jsonl"
+    compact(claude, [
+        {**base, "type": "user", "message": {"role": "user",
+                                             "content": "Fix app.py"},
+         "timestamp": "t0"},
+        {**base, "type": "assistant", "message": {
+            "role": "assistant", "usage": {"input_tokens": 10},
+            "content": [{"type": "tool_use", "name": "Task", "input": {
+                "message": {"role": "user", "content": ["nested"]}}}]},
+         "timestamp": "t1"},
+        {**base, "type": "user", "message": {"role": "user", "content": [
+            {"tool_use_id": "t", "type": "tool_result", "content": "x" * 500}]},
+         "timestamp": "t2"},
+        {**base, "type": "user", "message": {"role": "user",
+                                             "content": "now the tests"},
+         "timestamp": "t3"},
+    ])
+    codex = tmp_path / "codex.jsonl"
+    compact(codex, [
+        {"timestamp": "t0", "type": "session_meta",
+         "payload": {"cwd": "/p", "session_id": "abc"}},
+        {"timestamp": "t1", "type": "response_item",
+         "payload": {"type": "message", "role": "user", "content": [
+             {"type": "input_text", "text": "Plan the work"}]}},
+        {"timestamp": "t2", "type": "response_item",
+         "payload": {"type": "function_call", "name": "shell",
+                     "arguments": "{}"}},
+        {"timestamp": "t3", "type": "response_item",
+         "payload": {"type": "function_call_output",
+                     "output": '{"type":"message","role":"user"}'}},
+        {"timestamp": "t4", "type": "event_msg",
+         "payload": {"type": "token_count", "info": {
+             "total_token_usage": {"input_tokens": 7}}}},
+    ])
+
+    skipped = []
+    for name in ("_skip_claude", "_skip_codex"):
+        fn = getattr(miner, name)
+        monkeypatch.setattr(miner, name, lambda line, fn=fn:
+                            skipped.append(fn(line)) or skipped[-1])
+    fast = [miner.mine_session(str(p)) for p in (claude, codex)]
+    assert skipped.count(True) == 2  # the tool_result and function_call_output
+
+    plain = _load("session_miner")
+    plain._loads = json.loads
+    plain._skip_claude = plain._skip_codex = lambda line: False
+    slow = [plain.mine_session(str(p)) for p in (claude, codex)]
+    assert fast == slow
+    assert fast[0][0]["followup_user_text"] == "now the tests"
+
+
 def test_followup_secret_is_flagged(tmp_path):
     p = str(tmp_path / "c.jsonl")
     write_jsonl(p, [
@@ -494,6 +687,223 @@ def test_run_exit_contract_and_out_file(tmp_path, monkeypatch):
     assert rc == 2                            # some failed -> 2
 
 
+
+def _many_evals(n):
+    return make_spec(evals=[
+        {"id": "e%02d" % i, "prompt": "step %d" % i,
+         "checks": [{"name": "fetch", "contains": "git fetch"}]}
+        for i in range(n)])
+
+
+def test_concurrent_run_keeps_order_and_isolates_errors():
+    spec = _many_evals(8)
+
+    def post(base, model, messages, max_tokens, timeout,
+             tools=None, api_key=None):
+        i = int(messages[0]["content"].split()[1])
+        time.sleep(0.002 * (8 - i))     # later evals finish first
+        if i == 3:
+            raise ConnectionResetError("serve dropped the connection")
+        return 0.1 * (i + 1), {"choices": [{"message": {
+            "content": "git fetch"}}]}
+
+    ev = emitter.run_suite(spec, "http://x/v1", "m", post=post,
+                           concurrency=4)
+    assert [r["id"] for r in ev["results"]] == [e["id"] for e in spec["evals"]]
+    assert ev["summary"]["passed"] == 7
+    assert ev["failures"] == [{"id": "e03", "error":
+                               "ConnectionResetError: serve dropped the "
+                               "connection"}]
+    t = ev["timing"]
+    assert t["concurrency"] == 4 and t["requests"] == 7
+    assert t["latency_s"] == {"p50": 0.5, "p90": 0.74, "p99": 0.794}
+    assert t["requests_per_s"] > 0
+
+
+def test_percentile_interpolates():
+    assert emitter._percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert emitter._percentile([1.0, 2.0, 3.0, 4.0], 99) == pytest.approx(3.97)
+    assert emitter._percentile([2.0], 90) == 2.0
+    assert emitter._percentile([], 50) is None
+
+
+def test_post_chat_reuses_keepalive_connections(monkeypatch):
+    import http.server
+    import threading
+
+    peers = set()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            peers.add(self.client_address)
+            body = json.loads(self.rfile.read(
+                int(self.headers["Content-Length"])))
+            if body["messages"][0]["content"] == "step 5":
+                out, status = b"overloaded", 503
+            else:
+                out, status = json.dumps({"choices": [{"message": {
+                    "content": "git fetch"}}]}).encode(), 200
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *a):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("NO_PROXY", "*")
+    monkeypatch.setattr(emitter, "_pool", emitter._ConnectionPool())
+    try:
+        base = "http://127.0.0.1:%d/v1" % server.server_address[1]
+        ev = emitter.run_suite(_many_evals(12), base, "m", concurrency=2)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert ev["summary"]["passed"] == 11
+    assert ev["failures"][0]["id"] == "e05"
+    assert "HTTP Error 503" in ev["failures"][0]["error"]
+    assert len(peers) <= 2          # 12 requests over at most 2 connections
+
+
+
+def test_repeat_flags_unstable_evals_and_reports_distributions():
+    calls = {}
+
+    def post(base, model, messages, max_tokens, timeout,
+             tools=None, api_key=None):
+        key = messages[0]["content"]
+        calls[key] = calls.get(key, 0) + 1
+        # "step 1" passes only on odd calls: warmup, then fail/pass/fail
+        good = key != "step 1" or calls[key] % 2
+        return 0.5, {"choices": [{"message": {
+            "content": "git fetch" if good else "nope"}}],
+            "usage": {"completion_tokens": 20}}
+
+    ev = emitter.run_suite(_many_evals(3), "http://x/v1", "m", post=post,
+                           repeat=3, warmup=1, concurrency=2)
+    assert calls == {"step 0": 4, "step 1": 4, "step 2": 4}
+    assert ev["summary"]["passed"] == 2
+    assert ev["failures"] == [{"id": "e01",
+                               "error": "unstable: passed 1/3 runs"}]
+    bench = ev["benchmark"]
+    assert bench["schema"] == "session-evals/benchmark/1"
+    assert bench["mode"] == "repeat" and bench["warmup"] == 1
+    assert bench["unstable"] == ["e01"]
+    e0 = bench["evals"]["e00"]
+    assert (e0["runs"], e0["passed"], e0["unstable"]) == (3, 3, False)
+    assert e0["latency_s"]["p50"] == 0.5
+    assert e0["tokens_per_s"]["mean"] == 40.0
+    assert e0["ttfb_s"] is None                 # not streamed
+    assert ev["timing"]["requests"] == 9        # warmup not recorded
+
+
+def test_plain_run_has_no_benchmark_block():
+    ev = emitter.run_suite(make_spec(), "http://x/v1", "m",
+                           post=fake_post_factory())
+    assert "benchmark" not in ev
+
+
+def test_load_mode_cycles_suite_until_duration():
+    def post(base, model, messages, max_tokens, timeout,
+             tools=None, api_key=None):
+        time.sleep(0.005)
+        return 0.005, {"choices": [{"message": {"content": "git fetch"}}]}
+
+    ev = emitter.run_suite(_many_evals(2), "http://x/v1", "m", post=post,
+                           duration=0.1, concurrency=3)
+    bench = ev["benchmark"]
+    assert bench["mode"] == "load" and bench["repeat"] is None
+    assert bench["concurrency"] == 3
+    assert all(e["runs"] > 1 for e in bench["evals"].values())
+    assert ev["timing"]["requests"] == sum(
+        e["runs"] for e in bench["evals"].values())
+    assert [r["id"] for r in ev["results"]] == ["e00", "e01"]
+
+
+def test_run_rejects_duration_with_repeat(tmp_path):
+    spec_path = str(tmp_path / "spec.json")
+    with open(spec_path, "w", encoding="utf-8") as f:
+        json.dump(make_spec(), f)
+    rc = emitter.main(["run", spec_path, "--base-url", "http://x/v1",
+                       "--model", "m", "--duration", "5", "--repeat", "2"])
+    assert rc == 1
+
+
+def _sse(*chunks):
+    return b"".join(b"data: " + json.dumps(c).encode() + b"\n\n"
+                    for c in chunks) + b"data: [DONE]\n\n"
+
+
+def test_read_sse_reassembles_content_tool_calls_and_usage():
+    import io
+
+    body = _sse(
+        {"choices": [{"delta": {"role": "assistant"}}]},
+        {"choices": [{"delta": {"content": "run git "}}]},
+        {"choices": [{"delta": {"content": "fetch"}}]},
+        {"choices": [{"delta": {"tool_calls": [{
+            "index": 0, "id": "c1",
+            "function": {"name": "record_zip", "arguments": '{"zip":'}}]}}]},
+        {"choices": [{"delta": {"tool_calls": [{
+            "index": 0, "function": {"arguments": ' "10001"}'}}]}}]},
+        {"choices": [], "usage": {"completion_tokens": 7}})
+    data, ttfb = emitter._read_sse(io.BytesIO(body), time.perf_counter())
+    msg = data["choices"][0]["message"]
+    assert msg["content"] == "run git fetch"
+    assert emitter.validate_tool_call(
+        msg, {"name": "record_zip", "required_args": {"zip": "10001"}}
+    )["valid"]
+    assert data["usage"] == {"completion_tokens": 7}
+    assert ttfb is not None and ttfb >= 0
+
+
+def test_streamed_post_reuses_connection(monkeypatch):
+    import http.server
+    import threading
+
+    peers = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            peers.append(self.client_address)
+            body = json.loads(self.rfile.read(
+                int(self.headers["Content-Length"])))
+            assert body["stream"] is True
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for part in (_sse({"choices": [{"delta": {"content": "ok"}}]},
+                              {"choices": [],
+                               "usage": {"completion_tokens": 1}}),):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *a):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("NO_PROXY", "*")
+    monkeypatch.setattr(emitter, "_pool", emitter._ConnectionPool())
+    base = "http://127.0.0.1:%d/v1" % server.server_address[1]
+    try:
+        got = [emitter._post_chat(base, "m", [], 8, 5, stream=True)
+               for _ in range(3)]
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert all(g[1]["choices"][0]["message"]["content"] == "ok" for g in got)
+    assert all(g[2] is not None and g[2] <= g[0] for g in got)
+    assert len(set(peers)) == 1     # drained after [DONE], then reused
+
+
 def test_required_args_must_be_string_or_null():
     spec = make_spec()
     spec["evals"][1]["expect_tool"]["required_args"] = {"zip": 10001}
@@ -0,0 +1,175 @@
+"""Parse throughput of ``session_stats.py`` on a synthetic transcript set.
+
+Writes Claude Code and Codex transcripts dominated by large tool outputs (the
+shape of real long sessions), then parses them twice: once the original way
+(every line decoded with ``json.loads``) and once with the byte-level record
+prefilter and the optional faster decoder. Checks that both give identical
+``aggregate`` output and prints records per second for each.
+
+    python plugins/session-retro/benchmarks/bench_parse.py [--mb 200] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "session_stats.py"
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("session_stats", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Corpus (compact separators, field order as the agents write them)
+# ---------------------------------------------------------------------------
+
+_LINE = 'def handler_{0}(request):  # "quoted" \\ path\n    return render(request, "page_{0}.html")\n'
+
+
+def _dump(rng: random.Random) -> str:
+    return "".join(_LINE.format(i) for i in range(rng.randint(20, 600)))
+
+
+def _write(fh, record) -> None:
+    fh.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+
+def _claude(path: Path, rng: random.Random, size: int) -> None:
+    base = {"parentUuid": "p", "isSidechain": False, "userType": "external", "cwd": "/repo",
+            "sessionId": "s", "version": "2.0.0", "gitBranch": "main"}
+    with open(path, "w", encoding="utf-8") as fh:
+        i = 0
+        while fh.tell() < size:
+            ts = f"2026-06-25T{10 + i // 3600 % 10}:{i // 60 % 60:02d}:{i % 60:02d}.000Z"
+            i += 1
+            if i % 50 == 1:
+                _write(fh, {**base, "type": "user", "message": {"role": "user", "content": f"Step {i}: fix the parser"},
+                            "uuid": f"u{i}", "timestamp": ts})
+            if i % 97 == 0:
+                _write(fh, {**base, "type": "user", "message": {"role": "user", "content": (
+                    "<task-notification><summary>review pass</summary><agent_count>2</agent_count>"
+                    "<subagent_tokens>300</subagent_tokens></task-notification>")}, "uuid": f"n{i}", "timestamp": ts})
+            tool = rng.choice(["Read", "Bash", "Edit", "Grep"])
+            _write(fh, {**base, "type": "assistant", "message": {
+                "role": "assistant", "model": "m",
+                "usage": {"input_tokens": 3, "output_tokens": rng.randint(5, 400),
+                          "cache_read_input_tokens": 20000, "cache_creation_input_tokens": 100},
+                "content": [{"type": "text", "text": "Checking."},
+                            {"type": "tool_use", "id": f"t{i}", "name": tool, "input": {"file_path": "/repo/x.py"}}]},
+                "uuid": f"a{i}", "timestamp": ts})
+            body = _dump(rng)
+            content = [{"tool_use_id": f"t{i}", "type": "tool_result", "content": body}]
+            if i % 13 == 0:  # list-form result with text blocks: must be decoded in full
+                content = [{"tool_use_id": f"t{i}", "type": "tool_result",
+                            "content": [{"type": "text", "text": body}]}]
+            _write(fh, {**base, "type": "user", "message": {"role": "user", "content": content},
+                        "uuid": f"r{i}", "timestamp": ts,
+                        "toolUseResult": {"type": "text", "file": {"filePath": "/repo/x.py", "content": body}}})
+
+
+def _codex(path: Path, rng: random.Random, size: int) -> None:
+    def rec(ts, kind, payload):
+        return {"timestamp": ts, "type": kind, "payload": payload}
+
+    with open(path, "w", encoding="utf-8") as fh:
+        _write(fh, rec("2026-06-25T10:00:00.000Z", "session_meta", {"session_id": "sid", "id": "sid", "cwd": "/repo"}))
+        i, total = 0, 0
+        while fh.tell() < size:
+            ts = f"2026-06-25T{10 + i // 3600 % 10}:{i // 60 % 60:02d}:{i % 60:02d}.000Z"
+            i += 1
+            total += rng.randint(100, 2000)
+            if i % 40 == 1:
+                _write(fh, rec(ts, "response_item", {"type": "message", "role": "user",
+                                                     "content": [{"type": "input_text", "text": f"Step {i}"}]}))
+            _write(fh, rec(ts, "response_item", {"type": "reasoning", "summary": [],
+                                                 "encrypted_content": "gAAAA" + "x" * rng.randint(500, 4000)}))
+            _write(fh, rec(ts, "response_item", {"type": "function_call", "name": "shell", "call_id": f"c{i}",
+                                                 "arguments": json.dumps({"command": ["cat", "x.py"]})}))
+            _write(fh, rec(ts, "event_msg", {"type": "exec_command_end", "call_id": f"c{i}", "stdout": _dump(rng)}))
+            _write(fh, rec(ts, "response_item", {"type": "function_call_output", "call_id": f"c{i}",
+                                                 "output": _dump(rng)}))
+            _write(fh, rec(ts, "event_msg", {"type": "token_count", "info": {
+                "total_token_usage": {"input_tokens": total, "cached_input_tokens": total // 2,
+                                      "output_tokens": i * 10, "reasoning_output_tokens": i},
+                "last_token_usage": {"output_tokens": 10, "reasoning_output_tokens": 1}}}))
+            _write(fh, rec(ts, "response_item", {"type": "message", "role": "assistant",
+                                                 "content": [{"type": "output_text", "text": "done"}]}))
+
+
+def corpus(root: Path, mb: float) -> list[str]:
+    rng = random.Random(1234)
+    per_file = 20 * 1024 * 1024
+    paths = []
+    for n in range(max(2, int(mb * 1024 * 1024) // per_file)):
+        path = root / f"{'claude' if n % 2 == 0 else 'codex'}-{n}.jsonl"
+        (_claude if n % 2 == 0 else _codex)(path, rng, per_file)
+        paths.append(str(path))
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _run(mod, paths: list[str]):
+    return mod.aggregate([mod.parse(p) for p in paths])
+
+
+def _best(mod, paths: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(mod, paths)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=200.0, help="corpus size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fast = _load()
+    stdlib = _load()
+    stdlib._loads = json.loads
+    baseline = _load()
+    baseline._loads = json.loads
+    baseline._claude_stub = baseline._codex_stub = lambda line: None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = corpus(Path(tmp), args.mb)
+        records = 0
+        for p in paths:
+            with open(p, "rb") as fh:
+                records += sum(1 for _ in fh)
+        size = sum(Path(p).stat().st_size for p in paths) / 1e6
+        expected = json.dumps(_run(baseline, paths), sort_keys=True)
+        same = all(json.dumps(_run(mod, paths), sort_keys=True) == expected for mod in (fast, stdlib))
+        print(f"{len(paths)} files, {size:.0f} MB, {records} records; "
+              f"decoder: {'orjson' if fast._loads is not json.loads else 'json'}")
+        if not same:
+            print("OUTPUT MISMATCH")
+            return 1
+        ref = _best(baseline, paths, args.repeat)
+        print(f"{'':<20} {'records/s':>12} {'MB/s':>8}")
+        print(f"{'json.loads':<20} {records / ref:>12,.0f} {size / ref:>8.1f}")
+        for label, mod in (("prefilter + json", stdlib), ("prefilter + decoder", fast)):
+            t = _best(mod, paths, args.repeat)
+            print(f"{label:<20} {records / t:>12,.0f} {size / t:>8.1f}   ({ref / t:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,6 +9,9 @@ Deterministic data work for the session-retro skill. Three modes:
     session_stats.py report <a.jsonl> [b...]  # markdown: tables + ASCII charts
     session_stats.py html <a.jsonl> [b...] [--narrative note.md]  # interactive single-page site
 
+`stats`/`report`/`html` take `--jobs N` to parse N files at once in worker
+processes (0 = one per CPU; default 1). Output is identical to a serial run.
+
 `list`/`find` are for DISCOVERY — locate any session (not just the current one) by
 project, branch, first-message topic, or content (a PR number, feature, filename).
 Then pass its path to `stats`/`report`. `substr` filters by the project/worktree path.
@@ -16,16 +19,30 @@ Then pass its path to `stats`/`report`. `substr` filters by the project/worktree
 The narrative (interaction analysis, recommendations) is the model's job — this
 script fills the deterministic sections and hands back the user-turn list.
 
+`list`/`find` keep a local SQLite catalog of per-file breadcrumbs and a full-text
+index of each session's messages, tool names and file paths, keyed by (path, size,
+mtime), so repeat runs re-read only new or changed logs. It lives at
+$SESSION_RETRO_CATALOG, default ~/.cache/session-retro/catalog.sqlite3; deleting it
+is safe.
+
 Reads only local ~/.claude and ~/.codex logs. No network, no third-party deps
-(stdlib only).
+(stdlib only; decodes with orjson when it happens to be installed).
 """
-import json, os, re, sys, glob
-from collections import Counter, defaultdict
+import copy, heapq, html, io, json, math, os, re, sqlite3, sys, glob
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 PROJECTS = os.path.expanduser("~/.claude/projects")
 CODEX_SESSIONS = os.path.expanduser("~/.codex/sessions")
 CODEX_TOP_TYPES = {"session_meta", "turn_context", "response_item", "event_msg"}
+# Local cache of per-file breadcrumbs and searchable text so `list`/`find`
+# re-read only new or changed logs. Safe to delete; rebuilt on the next run.
+CATALOG = os.environ.get("SESSION_RETRO_CATALOG") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "session-retro", "catalog.sqlite3")
+CATALOG_VERSION = 2  # bump when _head/_codex_meta/_search_text output changes: cached rows are dropped
+FIND_LIMIT = 40  # sessions `find` prints (and snippets), best first
 
 
 def _text(content):
@@ -37,13 +54,90 @@ def _text(content):
     return ""
 
 
-def _jsonl(path):
-    with open(path, encoding="utf-8", errors="replace") as fh:
+try:  # optional faster decoder; everything works without it
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+_BAD = object()
+
+
+def _decode(line):
+    try:
+        return _loads(line)
+    except Exception:
+        pass
+    try:  # invalid UTF-8 (or something orjson refuses): decode leniently, as text mode did
+        return json.loads(line.decode("utf-8", errors="replace"))
+    except Exception:
+        return _BAD
+
+
+def _jsonl(path, stub=None):
+    """Records of a JSONL file; malformed lines are skipped.
+
+    `stub(line)` sees each raw line first and may return a small dict standing
+    in for a record the caller needs only a few top-level fields of, which
+    saves decoding the (typically huge) rest of it.
+    """
+    with open(path, "rb") as fh:
         for line in fh:
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
+            if stub is not None:
+                d = stub(line)
+                if d is not None:
+                    yield d
+                    continue
+            d = _decode(line)
+            if d is not _BAD:
+                yield d
+
+
+# Codex rollout lines begin {"timestamp":…,"type":…,"payload":{"type":…, so
+# both discriminators sit at fixed positions and can be read from the bytes.
+_CODEX_HEAD_RE = re.compile(rb'\{"timestamp":"([^"\\]*)","type":"([a-z_]+)","payload":\{"type":"([a-z_]+)"')
+_CODEX_PAYLOADS = {"message", "function_call", "custom_tool_call", "mcp_tool_call_end",
+                   "token_count", "task_complete"}  # the payload types parse_codex reads
+
+
+def _codex_stub(line):
+    """Stand-in for a rollout record parse_codex reads only the timestamp of
+    (tool output, reasoning, streaming events...)."""
+    m = _CODEX_HEAD_RE.match(line)
+    if not m or m[2] in (b"session_meta", b"turn_context") or m[3].decode() in _CODEX_PAYLOADS:
+        return None
+    return {"timestamp": m[1].decode(), "type": m[2].decode(), "payload": {"type": m[3].decode()}}
+
+
+_CLAUDE_TOOL_RESULTS = b',"message":{"role":"user","content":[{'
+_CLAUDE_TS_RE = re.compile(rb',"uuid":"[^"\\]*","timestamp":"([^"\\]*)"')
+
+
+def _claude_stub(line):
+    """Stand-in for a Claude user record that only carries tool results.
+
+    They hold most of a transcript's bytes, yet parse_claude reads only their
+    top-level timestamp/cwd/gitBranch. The keys before "message" are scalars,
+    so that prefix decodes on its own (which also proves the cut is top-level);
+    the timestamp follows the record's uuid right after the message. Lines of
+    any other shape return None and are decoded in full.
+    """
+    cut = line.find(_CLAUDE_TOOL_RESULTS)
+    if cut < 0:
+        return None
+    ts = _CLAUDE_TS_RE.search(line, cut)
+    if not ts:
+        return None
+    message = line[cut:ts.start()]
+    if b'"type":"tool_result"' not in message or b'"type":"text"' in message:
+        return None  # text blocks matter (task notifications); decode those
+    try:
+        d = _loads(line[:cut] + b"}")
+    except Exception:
+        return None
+    if not isinstance(d, dict) or d.get("type") != "user" or "cwd" not in d or "gitBranch" not in d:
+        return None
+    d["timestamp"] = ts[1].decode()
+    return d
 
 
 def _is_codex(path):
@@ -140,6 +234,85 @@ def parse(path):
     return parse_claude(path)
 
 
+def _parse_one(path):
+    """Worker for `parse_all`: (stats, None), or (None, error) so one bad file can't sink a batch."""
+    try:
+        return parse(path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _collect(results, paths):
+    """Yield parsed stats from `results` (aligned with `paths`), reporting progress and skipped files on stderr."""
+    tty = len(paths) > 1 and getattr(sys.stderr, "isatty", lambda: False)()
+    results = iter(results)
+    for i, path in enumerate(paths, 1):
+        try:
+            s, err = next(results)
+        except BrokenProcessPool as e:
+            # A worker died mid-run: finish the remaining files in this process.
+            print(("\r" if tty else "") + f"warning: --jobs unavailable ({e}); parsing serially", file=sys.stderr)
+            results = map(_parse_one, paths[i - 1:])
+            s, err = next(results)
+        if err:
+            print(("\r" if tty else "") + f"warning: skipped {path}: {err}", file=sys.stderr)
+        if tty:
+            print(f"\rparsed {i}/{len(paths)} sessions", end="", file=sys.stderr, flush=True)
+        if s is not None:
+            yield s
+    if tty:
+        print(file=sys.stderr)
+
+
+def _in_order(pool, pending, rest):
+    """Yield the results of `pending` futures in order, submitting one path of `rest`
+    as each is taken, so no more than len(pending) finished results wait in memory."""
+    rest = iter(rest)
+    while pending:
+        result = pending.popleft().result()
+        for path in rest:
+            pending.append(pool.submit(_parse_one, path))
+            break
+        yield result
+
+
+def iter_parsed(paths, jobs=1):
+    """Yield `parse` of every path in input order, `jobs` files at a time in worker
+    processes (0 = one per CPU). Files that fail to parse are skipped with a warning.
+
+    Each result is handed over as soon as it (and those before it) are ready. Only
+    2 * `jobs` files are in flight past the one being handed over, so a slow file
+    early in the list holds the rest back instead of letting their results pile up:
+    a caller folding them into an `Aggregator` holds that many parsed sessions at
+    most, however many paths there are.
+    """
+    jobs = min(jobs if jobs > 0 else (os.cpu_count() or 1), len(paths))
+    pool, results = None, None
+    if jobs > 1:
+        window = 2 * jobs
+        try:
+            pool = ProcessPoolExecutor(jobs)
+            pending = deque(pool.submit(_parse_one, p) for p in paths[:window])
+            results = _in_order(pool, pending, paths[window:])
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            # No usable process pool here (sandbox, missing sem_open...): parse serially.
+            print(f"warning: --jobs unavailable ({e}); parsing serially", file=sys.stderr)
+            if pool is not None:
+                pool.shutdown()
+            pool = results = None
+    try:
+        yield from _collect(results if results is not None else map(_parse_one, paths), paths)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def parse_all(paths, jobs=1):
+    """`parse` every path (see `iter_parsed`); results in input order, so `aggregate`
+    sees exactly what a serial run would."""
+    return list(iter_parsed(paths, jobs))
+
+
 def _base_stats(path, runtime):
     return dict(path=path, runtime=runtime, out=0, inp=0, cc=0, cr=0, asst=0,
                 user_turns=[], tools=Counter(), workflows=[], ts_first=None,
@@ -154,7 +327,7 @@ def _base_stats(path, runtime):
 def parse_claude(path):
     """Aggregate one Claude Code session JSONL into a stats dict."""
     s = _base_stats(path, "claude")
-    for d in _jsonl(path):
+    for d in _jsonl(path, _claude_stub):
         ts = d.get("timestamp")
         if ts:
             s["ts_first"] = s["ts_first"] or ts
@@ -209,7 +382,7 @@ def parse_codex(path):
     s = _base_stats(path, "codex")
     token_totals = []
     first_user = None
-    for d in _jsonl(path):
+    for d in _jsonl(path, _codex_stub):
         ts = d.get("timestamp")
         if ts:
             s["ts_first"] = s["ts_first"] or ts
@@ -335,132 +508,201 @@ def _duration_ms(a, b):
     return int((f(b) - f(a)).total_seconds() * 1000)
 
 
-def aggregate(sessions):
-    """Roll up one or more parsed sessions into a flat summary."""
-    # Forked/resumed rollouts are replay residue: the original rollout (or
-    # the unpaired spawn record) carries the real data, so pairing a fork
-    # with a spawn would duplicate the run and misattribute its metadata.
-    codex_subagents = [s for s in sessions if s.get("runtime") == "codex"
-                       and s.get("codex_is_subagent") and not s.get("codex_forked")]
-    codex_mains = [s for s in sessions if s.get("runtime") == "codex" and not s.get("codex_is_subagent")]
-    claude_sessions = [s for s in sessions if s.get("runtime") != "codex"]
-
-    workflow_runs = []
-    for s in sessions:
-        if s.get("runtime") != "codex":
-            workflow_runs.extend(s["workflows"])
-
-    spawn_workflows = [w for s in codex_mains if not s.get("codex_forked")
-                       for w in s["workflows"] if w.get("codex_spawn")]
-    for idx, sub in enumerate(codex_subagents):
-        prompt = sub.get("prompt_summary") or (sub["user_turns"][0] if sub.get("user_turns") else "")
-        label = _agent_label(sub)
-        spawn = spawn_workflows[idx] if idx < len(spawn_workflows) else {}
-        summary = spawn.get("summary") or label or prompt or os.path.basename(sub["path"])
-        kind = spawn.get("kind") or _codex_kind(prompt or label, sub.get("agent_type") or "")
-        ms = sub.get("duration_ms") or _duration_ms(sub.get("ts_first"), sub.get("ts_last"))
-        # A forked rollout's cumulative totals include the replayed parent
-        # history; the log format can't prove a per-subagent delta, so
-        # report those as unavailable (None) rather than 0 or the parent's
-        # totals counted twice.
-        forked = sub.get("codex_forked")
-        workflow_runs.append(dict(
-            summary=summary,
-            agents=1,
-            tokens=None if forked else sub["out"],
-            tool_uses=None if forked else sum(sub["tools"].values()),
-            ms=ms,
-            kind=kind,
-        ))
-    for spawn in spawn_workflows[len(codex_subagents):]:
-        workflow_runs.append(dict(
-            summary=spawn.get("summary", ""),
-            agents=spawn.get("agents", 1),
-            tokens=spawn.get("tokens"),
-            tool_uses=spawn.get("tool_uses"),
-            ms=0,
-            kind=spawn.get("kind", "other"),
-        ))
-
-    unknown_wf_runs = sum(1 for w in workflow_runs if w["tokens"] is None)
-    workflow_tokens = sum(w["tokens"] for w in workflow_runs if w["tokens"] is not None)
-    workflow_tokens_available = unknown_wf_runs == 0
-    # Forked/resumed rollouts replay another rollout's history, so ALL their
-    # additive counters (output/input/cache totals, tool calls, assistant
-    # turns, human turns, timeline events) include the replayed rollout's —
-    # exclude them from every sum instead of double-charging it. This applies
-    # to replayed MAIN rollouts too, not just subagents.
-    counted = [s for s in sessions if not s.get("codex_forked")]
-    main_output_tokens = sum(s["out"] for s in claude_sessions + codex_mains
-                             if not s.get("codex_forked"))
-    human_sessions = [s for s in claude_sessions + codex_mains if not s.get("codex_forked")]
-    out = dict(
-        sessions=[s["path"] for s in sessions],
-        cwd=next((s["cwd"] for s in sessions if s["cwd"]), None),
-        branch=next((s["branch"] for s in sessions if s["branch"]), None),
-        wall_hours=hours(min(s["ts_first"] for s in sessions if s["ts_first"]),
-                         max(s["ts_last"] for s in sessions if s["ts_last"]))
-        if any(s["ts_first"] for s in sessions) else 0.0,
-        assistant_turns=sum(s["asst"] for s in counted),
-        user_turns=sum(len(s["user_turns"]) for s in human_sessions),
-        runtimes=sorted({s.get("runtime", "claude") for s in sessions}),
-        main_output_tokens=main_output_tokens,
-        fresh_input_tokens=sum(s["inp"] for s in counted),
-        cache_creation_tokens=sum(s["cc"] for s in counted),
-        cache_read_tokens=sum(s["cr"] for s in counted),
-        workflows=len(workflow_runs),
-        workflow_agents=sum(w["agents"] for w in workflow_runs),
-        workflow_tokens=workflow_tokens,
-        workflow_tokens_available=workflow_tokens_available,
-        tools=dict(sum((s["tools"] for s in counted), Counter()).most_common()),
-        user_turn_text=[t for s in human_sessions for t in s["user_turns"]],
-    )
-    notes = []
-    if unknown_wf_runs:
-        notes.append(f"delegated token totals are unavailable for {unknown_wf_runs} of "
-                     f"{len(workflow_runs)} workflow runs in this log format")
-    forked_count = sum(1 for s in sessions if s.get("codex_forked"))
-    if forked_count:
-        notes.append(f"{forked_count} forked/resumed rollout(s) replay prior history; "
-                     "their cumulative totals are excluded from token, tool, and turn sums")
-    out["measurement_notes"] = notes
-    out["skills_used"] = dict(sum((s["skills"] for s in counted), Counter()).most_common())
-    at = sum((s["agent_types"] for s in counted), Counter())
-    for s in claude_sessions:
-        at += scan_agent_types(s["path"])
-    out["agent_types"] = dict(at.most_common())
-    out["workflows_named"] = dict(sum((s["wf_named"] for s in counted), Counter()).most_common())
-    # activity timeline: hourly buckets of main output tokens + workflow dispatches
-    tl = defaultdict(lambda: [0, 0])
-    for s in counted:
-        for ets, out_t in s["events"]:
-            tl[ets[:13]][0] += out_t
-        for wts in s["wf_ts"]:
-            tl[wts[:13]][1] += 1
-    out["timeline"] = [{"hour": k[5:].replace("T", " ") + ":00", "out": v[0], "wf": v[1]}
-                       for k, v in sorted(tl.items())]
-    by = defaultdict(lambda: [0, 0, 0, 0, 0])  # runs, agents, tokens, ms, unknown
-    runs = []
-    for w in workflow_runs:
+WORKFLOW_RUN_LIMIT = 200  # workflow_runs kept, most expensive first (report shows 8, html 30)
+USER_TURN_LIMIT = 1000  # human messages kept verbatim in user_turn_text (user_turns counts all)
+
+
+class Aggregator:
+    """Fold parsed sessions, one at a time, into the `aggregate` summary.
+
+    `add` keeps running counters, the hourly timeline and bounded lists (the
+    WORKFLOW_RUN_LIMIT most expensive workflow runs, the first USER_TURN_LIMIT
+    human messages), so nothing of a session outlives the call and a corpus-wide
+    retro needs the memory of one parsed session, not all of them. The only
+    per-session state kept is the compact record of a Codex subagent or spawn
+    still waiting for its partner. `result` can be called at any point.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.cwd = self.branch = self.ts_first = self.ts_last = None
+        self.runtimes = set()
+        self.asst = self.inp = self.cc = self.cr = self.main_out = 0
+        self.user_turns = 0
+        self.turn_text = ([], [])  # Claude, Codex: the summary lists all Claude turns first
+        self.forked = 0
+        self.tools, self.skills, self.wf_named = Counter(), Counter(), Counter()
+        self.agent_types, self.scanned_agent_types = Counter(), Counter()
+        self.timeline = defaultdict(lambda: [0, 0])  # hour -> [output tokens, workflow dispatches]
+        # Codex subagent rollouts pair with spawn_agent calls by position: the
+        # i-th (unforked) subagent with the i-th spawn from an unforked main.
+        self.subagents, self.spawns = deque(), deque()
+        self.n_subagents = self.n_spawns = self.n_claude_runs = 0
+        self.runs = []  # min-heap of (tokens, negated order, run): the top WORKFLOW_RUN_LIMIT
+        self.n_runs = self.unknown_runs = self.workflow_agents = self.workflow_tokens = 0
+        self.by = {}  # kind -> [runs, agents, tokens, ms, unknown runs, first order]
+
+    def add(self, s):
+        """Fold in one `parse` result; the caller can drop it afterwards."""
+        self.paths.append(s["path"])
+        if s["cwd"] and not self.cwd:
+            self.cwd = s["cwd"]
+        if s["branch"] and not self.branch:
+            self.branch = s["branch"]
+        if s["ts_first"] and (self.ts_first is None or s["ts_first"] < self.ts_first):
+            self.ts_first = s["ts_first"]
+        if s["ts_last"] and (self.ts_last is None or s["ts_last"] > self.ts_last):
+            self.ts_last = s["ts_last"]
+        self.runtimes.add(s.get("runtime", "claude"))
+        codex = s.get("runtime") == "codex"
+        # Forked/resumed rollouts replay another rollout's history, so ALL their
+        # additive counters (output/input/cache totals, tool calls, assistant
+        # turns, human turns, timeline events) include the replayed rollout's —
+        # exclude them from every sum instead of double-charging it. This applies
+        # to replayed MAIN rollouts too, not just subagents.
+        if s.get("codex_forked"):
+            self.forked += 1
+        else:
+            self.asst += s["asst"]
+            self.inp += s["inp"]
+            self.cc += s["cc"]
+            self.cr += s["cr"]
+            self.tools.update(s["tools"])
+            self.skills.update(s["skills"])
+            self.agent_types.update(s["agent_types"])
+            self.wf_named.update(s["wf_named"])
+            for ets, out_t in s["events"]:
+                self.timeline[ets[:13]][0] += out_t
+            for wts in s["wf_ts"]:
+                self.timeline[wts[:13]][1] += 1
+            if not (codex and s.get("codex_is_subagent")):
+                self.main_out += s["out"]
+                self.user_turns += len(s["user_turns"])
+                kept = self.turn_text[codex]
+                kept.extend(s["user_turns"][:USER_TURN_LIMIT - len(kept)])
+        if not codex:
+            self.scanned_agent_types.update(scan_agent_types(s["path"]))
+            for w in s["workflows"]:
+                self._run(w, (0, self.n_claude_runs))
+                self.n_claude_runs += 1
+        elif s.get("codex_forked"):
+            # Replay residue: the original rollout (or the unpaired spawn record)
+            # carries the real data, so pairing a fork with a spawn would
+            # duplicate the run and misattribute its metadata.
+            pass
+        elif s.get("codex_is_subagent"):
+            prompt = s.get("prompt_summary") or (s["user_turns"][0] if s.get("user_turns") else "")
+            self.subagents.append(dict(
+                order=(1, self.n_subagents), prompt=prompt, label=_agent_label(s),
+                name=os.path.basename(s["path"]), agent_type=s.get("agent_type") or "",
+                ms=s.get("duration_ms") or _duration_ms(s.get("ts_first"), s.get("ts_last")),
+                tokens=s["out"], tool_uses=sum(s["tools"].values())))
+            self.n_subagents += 1
+        else:
+            for w in s["workflows"]:
+                if w.get("codex_spawn"):
+                    self.spawns.append(w)
+        while self.subagents and self.spawns:
+            self._pair(self.subagents.popleft(), self.spawns.popleft())
+
+    def _pair(self, sub, spawn):
+        summary = spawn.get("summary") or sub["label"] or sub["prompt"] or sub["name"]
+        kind = spawn.get("kind") or _codex_kind(sub["prompt"] or sub["label"], sub["agent_type"])
+        self._run(dict(summary=summary, agents=1, tokens=sub["tokens"],
+                       tool_uses=sub["tool_uses"], ms=sub["ms"], kind=kind), sub["order"])
+
+    def _run(self, w, order):
+        """Count one workflow run; `order` reproduces the all-at-once listing order for ties."""
         k = wf_kind(w["summary"])
         if w.get("kind"):
             k = w["kind"]
-        by[k][0] += 1; by[k][1] += w["agents"]; by[k][3] += w["ms"]
+        v = self.by.setdefault(k, [0, 0, 0, 0, 0, order])
+        v[0] += 1; v[1] += w["agents"]; v[3] += w["ms"]
+        v[5] = min(v[5], order)
+        self.n_runs += 1
+        self.workflow_agents += w["agents"]
         if w["tokens"] is None:
-            by[k][4] += 1
+            v[4] += 1
+            self.unknown_runs += 1
+        else:
+            v[2] += w["tokens"]
+            self.workflow_tokens += w["tokens"]
+        item = (w["tokens"] or 0, tuple(-x for x in order), {**w, "kind": k})
+        if len(self.runs) < WORKFLOW_RUN_LIMIT:
+            heapq.heappush(self.runs, item)
         else:
-            by[k][2] += w["tokens"]
-        runs.append({**w, "kind": k})
-    # A type whose only runs are token-unavailable reports tokens=None, not a
-    # measured 0; a mixed type keeps the known sum and flags the unknown runs.
-    out["workflow_by_type"] = {k: dict(runs=v[0], agents=v[1],
-                                       tokens=(None if v[4] and not v[2] else v[2]),
-                                       unknown_runs=v[4],
-                                       minutes=round(v[3] / 60000, 1))
-                               for k, v in sorted(by.items(), key=lambda x: -x[1][2])}
-    out["workflow_runs"] = sorted(runs, key=lambda r: -(r["tokens"] or 0))
-    out["generative_total"] = out["main_output_tokens"] + out["workflow_tokens"]
-    return out
+            heapq.heappushpop(self.runs, item)
+
+    def result(self):
+        """The summary of everything added so far (same shape as `aggregate`)."""
+        final = copy.deepcopy(self)
+        # Subagents left without a spawn keep their own label; spawns left
+        # without a rollout are reported from the spawn call alone.
+        for sub in final.subagents:
+            final._pair(sub, {})
+        for spawn in final.spawns:
+            final._run(dict(summary=spawn.get("summary", ""), agents=spawn.get("agents", 1),
+                            tokens=spawn.get("tokens"), tool_uses=spawn.get("tool_uses"),
+                            ms=0, kind=spawn.get("kind", "other")), (2, final.n_spawns))
+            final.n_spawns += 1
+        return final._summary()
+
+    def _summary(self):
+        turn_text = (self.turn_text[0] + self.turn_text[1])[:USER_TURN_LIMIT]
+        out = dict(
+            sessions=self.paths,
+            cwd=self.cwd,
+            branch=self.branch,
+            wall_hours=hours(self.ts_first, self.ts_last) if self.ts_first else 0.0,
+            assistant_turns=self.asst,
+            user_turns=self.user_turns,
+            runtimes=sorted(self.runtimes),
+            main_output_tokens=self.main_out,
+            fresh_input_tokens=self.inp,
+            cache_creation_tokens=self.cc,
+            cache_read_tokens=self.cr,
+            workflows=self.n_runs,
+            workflow_agents=self.workflow_agents,
+            workflow_tokens=self.workflow_tokens,
+            workflow_tokens_available=self.unknown_runs == 0,
+            tools=dict(self.tools.most_common()),
+            user_turn_text=turn_text,
+        )
+        notes = []
+        if self.unknown_runs:
+            notes.append(f"delegated token totals are unavailable for {self.unknown_runs} of "
+                         f"{self.n_runs} workflow runs in this log format")
+        if self.forked:
+            notes.append(f"{self.forked} forked/resumed rollout(s) replay prior history; "
+                         "their cumulative totals are excluded from token, tool, and turn sums")
+        if self.n_runs > len(self.runs):
+            notes.append(f"workflow runs list the {len(self.runs)} most expensive of {self.n_runs}")
+        if self.user_turns > len(turn_text):
+            notes.append(f"human messages list the first {len(turn_text)} of {self.user_turns}")
+        out["measurement_notes"] = notes
+        out["skills_used"] = dict(self.skills.most_common())
+        out["agent_types"] = dict((self.agent_types + self.scanned_agent_types).most_common())
+        out["workflows_named"] = dict(self.wf_named.most_common())
+        out["timeline"] = [{"hour": k[5:].replace("T", " ") + ":00", "out": v[0], "wf": v[1]}
+                           for k, v in sorted(self.timeline.items())]
+        # A type whose only runs are token-unavailable reports tokens=None, not a
+        # measured 0; a mixed type keeps the known sum and flags the unknown runs.
+        out["workflow_by_type"] = {k: dict(runs=v[0], agents=v[1],
+                                           tokens=(None if v[4] and not v[2] else v[2]),
+                                           unknown_runs=v[4],
+                                           minutes=round(v[3] / 60000, 1))
+                                   for k, v in sorted(self.by.items(), key=lambda x: (-x[1][2], x[1][5]))}
+        out["workflow_runs"] = [r for _, _, r in sorted(self.runs, key=lambda x: (-x[0], [-o for o in x[1]]))]
+        out["generative_total"] = out["main_output_tokens"] + out["workflow_tokens"]
+        return out
+
+
+def aggregate(sessions):
+    """Roll up one or more parsed sessions into a flat summary."""
+    agg = Aggregator()
+    for s in sessions:
+        agg.add(s)
+    return agg.result()
 
 
 def bar(v, mx, width=44):
@@ -587,11 +829,10 @@ def report_md(agg):
 
 def md_to_html(md):
     """Minimal markdown -> HTML for the narrative (headings, bold, code, links, lists)."""
-    import html as _h
     out, inlist = [], False
 
     def inline(s):
-        s = _h.escape(s)
+        s = html.escape(s)
         s = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", s)
         s = re.sub(r"`(.+?)`", r"<code>\1</code>", s)
         s = re.sub(r"\[(.+?)\]\((.+?)\)", r'<a href="\2">\1</a>', s)
@@ -622,7 +863,13 @@ def md_to_html(md):
     return "\n".join(out)
 
 
-HTML_TEMPLATE = r"""<!doctype html><html lang="en"><head><meta charset="utf-8">
+HTML_ROWS = 30  # workflow runs in the sortable table; the rest page behind <details>
+HTML_TURNS = 50  # human turns shown before the rest page behind <details>
+HTML_BARS = 20  # bars per chart before the long tail collapses
+HTML_PAGE = 100  # rows per collapsed page
+HTML_TIMELINE = 96  # timeline columns; longer spans merge adjacent hours
+
+HTML_HEAD = r"""<!doctype html><html lang="en"><head><meta charset="utf-8">
 <meta name="viewport" content="width=device-width,initial-scale=1">
 <title>Session Retro</title>
 <style>
@@ -637,66 +884,187 @@ header h1{margin:0 0 4px;font-size:24px}.meta{color:var(--mut);font-size:12px;ma
 .card{background:var(--card);border:1px solid var(--bd);border-radius:12px;padding:18px}.card h2{margin:0 0 14px;font-size:15px}
 .bar{display:flex;align-items:center;gap:10px;margin:7px 0}.bar .lab{width:130px;color:var(--mut);font-size:12px;text-align:right;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}
 .bar .track{flex:1;background:#0d1117;border-radius:6px;overflow:hidden;height:22px;position:relative}
-.bar .fill{height:100%;border-radius:6px;transition:width .9s cubic-bezier(.2,.8,.2,1);min-width:2px}
+.bar .fill{height:100%;border-radius:6px;min-width:2px}
 .bar .val{position:absolute;right:8px;top:0;line-height:22px;font-size:11px}.bar:hover .fill{filter:brightness(1.25)}
 table{width:100%;border-collapse:collapse;font-size:12px}th,td{text-align:left;padding:7px 8px;border-bottom:1px solid var(--bd)}
-th{color:var(--mut);cursor:pointer;user-select:none}th:hover{color:var(--fg)}td.n,th.n{text-align:right;font-variant-numeric:tabular-nums}
+th{color:var(--mut)}table.sort th{cursor:pointer;user-select:none}table.sort th:hover{color:var(--fg)}td.n,th.n{text-align:right;font-variant-numeric:tabular-nums}
 .dough{display:flex;align-items:center;gap:18px;flex-wrap:wrap}.legend div{margin:6px 0;color:var(--mut);font-size:12px}.legend b{color:var(--fg)}
 .dot{display:inline-block;width:10px;height:10px;border-radius:50%;margin-right:7px}
 .tl{max-height:330px;overflow:auto}.tl .t{display:flex;gap:10px;padding:6px 0;border-bottom:1px solid #21262d}.tl .i{color:var(--ac);font-weight:700;min-width:22px}
+details.lazy{margin-top:8px}details.lazy summary{color:var(--ac);cursor:pointer;font-size:12px}
 .note{color:var(--mut);font-size:12px;margin-top:8px}
 .narrative{background:var(--card);border:1px solid var(--bd);border-radius:12px;padding:6px 22px 18px;margin-top:16px}
 .narrative h2{font-size:18px;border-bottom:1px solid var(--bd);padding-bottom:8px}.narrative h3{font-size:14px;color:var(--ac)}
 .narrative code{background:#0d1117;padding:2px 5px;border-radius:4px;font-size:12px}
 footer{color:var(--mut);font-size:12px;margin-top:28px;text-align:center}
 </style></head><body><div class="wrap">
-<header><h1>Session Retro</h1><div class="meta" id="meta"></div></header>
-<div class="kpis" id="kpis"></div>
-<div class="grid">
-<div class="card"><h2>Generated tokens — orchestrator vs delegated</h2><div class="dough" id="dough"></div><div class="note">Output tokens (the real work). Cache reads are shown separately.</div></div>
-<div class="card"><h2>Tokens processed (incl. cache)</h2><div id="cache"></div><div class="note">Cache reads = context re-read each turn; cheap, usually the largest line.</div></div>
-</div>
-<div class="grid">
-<div class="card"><h2>Workflows by type</h2><div id="wftype"></div><div class="note">Hover a bar for runs / agents / minutes.</div></div>
-<div class="card"><h2>Tool calls</h2><div id="tools"></div></div>
-</div>
-<div class="grid">
-<div class="card"><h2>Dynamic workflows in play</h2><div id="wfnamed"></div><div class="note">By invocation count. A reused workflow script counts each run.</div></div>
-<div class="card"><h2>Agents &amp; skills</h2><div id="agents"></div></div>
-</div>
-<div class="card" style="margin-bottom:16px"><h2>Activity timeline <span class="note">output tokens / hour, purple dots = workflow dispatches</span></h2><div id="timeline"></div></div>
-<div class="card" id="wfrunsCard" style="margin-bottom:16px"><h2>Most expensive workflow runs <span class="note">(click a header to sort)</span></h2><table id="wfruns"></table></div>
-<div class="card"><h2>Interaction timeline <span class="note" id="utc"></span></h2><div class="tl" id="turns"></div></div>
-<div class="narrative" id="narrative">__NARRATIVE__</div>
-<footer>Generated by the session-retro skill - reads only local ~/.claude / ~/.codex logs, sends nothing.</footer>
+"""
+
+# Collapsed pages keep their rows in a <template>, which the browser does not
+# parse into the page until the <details> is first opened.
+HTML_TAIL = r"""<footer>Generated by the session-retro skill - reads only local ~/.claude / ~/.codex logs, sends nothing.</footer>
 </div><script>
-const D = __DATA__, fmt = n => (n==null ? 'n/a' : (n||0).toLocaleString()), $ = id => document.getElementById(id);
-$('meta').textContent = [D.cwd, D.branch, D.wall_hours? D.wall_hours+' h':''].filter(Boolean).join('  -  ');
-$('kpis').innerHTML = [['Wall-clock',(D.wall_hours||0)+' h'],['Assistant turns',fmt(D.assistant_turns)],['Human messages',fmt(D.user_turns)],['Generated tokens',fmt(D.generative_total)],['Workflows',fmt(D.workflows)+' / '+fmt(D.workflow_agents)+' ag'],['Cache read',fmt(D.cache_read_tokens)]].map(([l,v])=>`<div class="kpi"><div class="v">${v}</div><div class="l">${l}</div></div>`).join('');
-function doughnut(parts){const tot=parts.reduce((a,p)=>a+p.value,0)||1,R=52,C=2*Math.PI*R;let off=0;const segs=parts.map(p=>{const dash=p.value/tot*C,s=`<circle r="${R}" cx="70" cy="70" fill="none" stroke="${p.color}" stroke-width="20" stroke-dasharray="${dash} ${C-dash}" stroke-dashoffset="${-off}" transform="rotate(-90 70 70)"/>`;off+=dash;return s;}).join('');return `<svg width="140" height="140" viewBox="0 0 140 140">${segs}</svg><div class="legend">${parts.map(p=>`<div><span class="dot" style="background:${p.color}"></span><b>${fmt(p.value)}</b> ${p.label} (${Math.round(100*p.value/tot)}%)</div>`).join('')}</div>`;}
-$('dough').innerHTML=doughnut([{label:'delegated to workflows',value:D.workflow_tokens,color:'#bc8cff'},{label:'main-loop orchestrator',value:D.main_output_tokens,color:'#58a6ff'}]);
-if(D.workflow_tokens_available===false){$('dough').parentElement.querySelector('.note').textContent='Delegated token totals are unavailable in this log format — percentages omitted.';$('dough').querySelectorAll('.legend div').forEach((lg,i)=>{lg.innerHTML=lg.innerHTML.replace(/\s*\(\d+%\)/,'');if(i===0)lg.innerHTML=lg.innerHTML.replace(/<b>[^<]*<\/b>/,'<b>n/a</b>');});}
-function hbars(el,items){const mx=Math.max(...items.map(i=>i.value),1);el.innerHTML=items.map(i=>`<div class="bar" title="${i.tip||''}"><div class="lab">${i.label}</div><div class="track"><div class="fill" style="width:${100*i.value/mx}%;background:${i.color}"></div><div class="val">${i.disp||fmt(i.value)}</div></div></div>`).join('');}
-hbars($('cache'),[{label:'cache read',value:D.cache_read_tokens,color:'#6e7681'},{label:'cache creation',value:D.cache_creation_tokens,color:'#484f58'},{label:'generated output',value:D.generative_total,color:'#58a6ff'},{label:'fresh input',value:D.fresh_input_tokens,color:'#3fb950'}]);
-hbars($('wftype'),Object.entries(D.workflow_by_type||{}).map(([k,v])=>({label:k,value:v.tokens,disp:fmt(v.tokens),tip:v.runs+' runs / '+v.agents+' agents / '+v.minutes+' min',color:'#3fb950'})));
-hbars($('tools'),Object.entries(D.tools||{}).map(([k,v])=>({label:k,value:v,disp:String(v),color:'#d29922'})));
-hbars($('wfnamed'),Object.entries(D.workflows_named||{}).map(([k,v])=>({label:k.length>22?k.slice(0,21)+'…':k,value:v,disp:v+'x',color:'#bc8cff',tip:k})));
-(function(){const at=Object.entries(D.agent_types||{}),sk=Object.entries(D.skills_used||{}),tot=Object.values(D.agent_types||{}).reduce((a,b)=>a+b,0);const m1=Math.max(...at.map(x=>x[1]),1),m2=Math.max(...sk.map(x=>x[1]),1);let h='<div class="note" style="margin:0 0 6px">Agent types ('+tot+' subagents)</div>';h+=(at.map(([k,v])=>`<div class="bar"><div class="lab">${k}</div><div class="track"><div class="fill" style="width:${100*v/m1}%;background:#58a6ff"></div><div class="val">${fmt(v)}</div></div></div>`).join('')||'<div class="note">none</div>');h+='<div class="note" style="margin:13px 0 6px">Skills invoked</div>';h+=(sk.length?sk.map(([k,v])=>`<div class="bar"><div class="lab">${k}</div><div class="track"><div class="fill" style="width:${100*v/m2}%;background:#3fb950"></div><div class="val">${v}</div></div></div>`).join(''):'<div class="note">none</div>');$('agents').innerHTML=h;})();
-(function(){const T=D.timeline||[];if(!T.length){$('timeline').closest('.card').style.display='none';return;}const mx=Math.max(...T.map(t=>t.out),1);$('timeline').innerHTML='<div style="display:flex;align-items:flex-end;gap:3px;height:120px">'+T.map(t=>`<div title="${t.hour}: ${fmt(t.out)} output tokens${t.wf?', '+t.wf+' workflow(s) dispatched':''}" style="flex:1;display:flex;flex-direction:column;justify-content:flex-end;align-items:center;height:100%"><div style="font-size:11px;color:#bc8cff;height:13px;line-height:13px">${t.wf?'●':''}</div><div style="width:100%;background:linear-gradient(#58a6ff,#1f6feb);border-radius:3px 3px 0 0;height:${Math.round(100*t.out/mx)}%;min-height:2px"></div></div>`).join('')+'</div><div style="display:flex;gap:3px;margin-top:5px">'+T.map((t,i)=>`<div style="flex:1;text-align:center;font-size:8px;color:var(--mut)">${i%2?'':t.hour.slice(6,11)}</div>`).join('')+'</div>';})();
-const runs=(D.workflow_runs||[]).slice(0,30);let sk='tokens',sd=-1;
-function rr(){runs.sort((a,b)=>sd*((a[sk]>b[sk])?1:(a[sk]<b[sk])?-1:0));$('wfruns').innerHTML='<tr><th data-k="kind">type</th><th data-k="agents" class="n">agents</th><th data-k="tokens" class="n">tokens</th><th data-k="ms" class="n">min</th><th data-k="summary">summary</th></tr>'+runs.map(r=>`<tr><td>${r.kind}</td><td class="n">${r.agents}</td><td class="n">${fmt(r.tokens)}</td><td class="n">${(r.ms/60000).toFixed(1)}</td><td>${(r.summary||'').replace(/</g,'&lt;').slice(0,60)}</td></tr>`).join('');$('wfruns').querySelectorAll('th').forEach(th=>th.onclick=()=>{const k=th.dataset.k;sd=(sk===k)?-sd:-1;sk=k;rr();});}
-runs.length?rr():$('wfrunsCard').style.display='none';
-$('utc').textContent='('+(D.user_turn_text||[]).length+' human turns)';
-$('turns').innerHTML=(D.user_turn_text||[]).map((t,i)=>`<div class="t"><div class="i">${i+1}</div><div>${t.replace(/</g,'&lt;')}</div></div>`).join('');
-if(!$('narrative').textContent.trim())$('narrative').style.display='none';
-</script></body></html>"""
+document.querySelectorAll('details.lazy').forEach(d=>d.addEventListener('toggle',()=>{const t=d.querySelector('template');if(t)t.replaceWith(t.content);},{once:true}));
+document.querySelectorAll('table.sort').forEach(tb=>{const b=tb.tBodies[0];let k=-1,sd=-1;const v=(r,i)=>{const c=r.cells[i];return c.dataset.v??c.textContent;};
+tb.querySelectorAll('th').forEach((th,i)=>th.onclick=()=>{sd=(k===i)?-sd:-1;k=i;[...b.rows].sort((x,y)=>{const a=v(x,i),c=v(y,i),na=parseFloat(a),nc=parseFloat(c);return sd*(isNaN(na)||isNaN(nc)?a.localeCompare(c):na-nc);}).forEach(r=>b.appendChild(r));});});
+</script></body></html>
+"""
+
+
+def _esc(s):
+    return html.escape(str(s))
+
+
+def _lazy(summary, body):
+    return f'<details class="lazy"><summary>{summary}</summary><template>{body}</template></details>'
+
+
+def _pages(rows, start, wrap, noun):
+    """The rows from `start` on, `wrap`ped in lazy pages of HTML_PAGE."""
+    for i in range(start, len(rows), HTML_PAGE):
+        page = rows[i:i + HTML_PAGE]
+        yield _lazy(f"{noun} {i + 1}–{i + len(page)}", wrap(page))
+
+
+def _bars(items, color, empty="none"):
+    """Horizontal bars for (label, value, shown value, tooltip); the tail past HTML_BARS collapses."""
+    if not items:
+        return f'<div class="note">{empty}</div>'
+    mx = max(v or 0 for _, v, _, _ in items) or 1
+    rows = [f'<div class="bar" title="{_esc(tip)}"><div class="lab">{_esc(label)}</div><div class="track">'
+            f'<div class="fill" style="width:{100 * (v or 0) / mx:.1f}%;background:{color}"></div>'
+            f'<div class="val">{_esc(disp)}</div></div></div>'
+            for label, v, disp, tip in items]
+    more = len(rows) - HTML_BARS
+    return "".join(rows[:HTML_BARS]) + (_lazy(f"{more} more", "".join(rows[HTML_BARS:])) if more > 0 else "")
+
+
+def _doughnut(parts, measured=True):
+    tot = sum(v for _, v, _ in parts) or 1
+    r, off, segs, legend = 52, 0.0, [], []
+    c = 2 * math.pi * r
+    for label, v, color in parts:
+        dash = v / tot * c
+        segs.append(f'<circle r="{r}" cx="70" cy="70" fill="none" stroke="{color}" stroke-width="20" '
+                    f'stroke-dasharray="{dash:.2f} {c - dash:.2f}" stroke-dashoffset="{-off:.2f}" '
+                    f'transform="rotate(-90 70 70)"/>')
+        off += dash
+        shown = fmt(v) if measured or legend else "n/a"  # first part is the delegated share
+        share = f" ({round(100 * v / tot)}%)" if measured else ""
+        legend.append(f'<div><span class="dot" style="background:{color}"></span><b>{shown}</b> {label}{share}</div>')
+    return (f'<svg width="140" height="140" viewBox="0 0 140 140">{"".join(segs)}</svg>'
+            f'<div class="legend">{"".join(legend)}</div>')
+
+
+def _timeline(T):
+    step = -(-len(T) // HTML_TIMELINE)
+    cols = [T[i:i + step] for i in range(0, len(T), step)]
+    sums = [(sum(t["out"] for t in col), sum(t["wf"] for t in col)) for col in cols]
+    mx = max(out for out, _ in sums) or 1
+    bars, labels = [], []
+    for i, (col, (out, wf)) in enumerate(zip(cols, sums)):
+        span = col[0]["hour"] if len(col) == 1 else f"{col[0]['hour']} – {col[-1]['hour']}"
+        tip = f"{span}: {fmt(out)} output tokens" + (f", {wf} workflow(s) dispatched" if wf else "")
+        bars.append(f'<div title="{tip}" style="flex:1;display:flex;flex-direction:column;justify-content:flex-end;'
+                    f'align-items:center;height:100%"><div style="font-size:11px;color:#bc8cff;height:13px;'
+                    f'line-height:13px">{"●" if wf else ""}</div><div style="width:100%;background:linear-gradient'
+                    f'(#58a6ff,#1f6feb);border-radius:3px 3px 0 0;height:{round(100 * out / mx)}%;min-height:2px">'
+                    '</div></div>')
+        labels.append(f'<div style="flex:1;text-align:center;font-size:8px;color:var(--mut)">'
+                      f'{"" if i % 2 else col[0]["hour"][6:11]}</div>')
+    unit = "hour" if step == 1 else f"{step} h"
+    return (f'<div class="card" style="margin-bottom:16px"><h2>Activity timeline <span class="note">output tokens / '
+            f'{unit}, purple dots = workflow dispatches</span></h2>'
+            f'<div style="display:flex;align-items:flex-end;gap:3px;height:120px">{"".join(bars)}</div>'
+            f'<div style="display:flex;gap:3px;margin-top:5px">{"".join(labels)}</div></div>\n')
+
+
+def _run_row(r):
+    tok = r["tokens"]
+    return (f'<tr><td>{_esc(r["kind"])}</td><td class="n">{r["agents"]}</td>'
+            f'<td class="n" data-v="{-1 if tok is None else tok}">{fmt(tok)}</td>'
+            f'<td class="n">{(r["ms"] or 0) / 60000:.1f}</td><td>{_esc((r.get("summary") or "")[:60])}</td></tr>')
+
+
+def _runs_table(rows, cls=""):
+    return (f'<table{cls}><thead><tr><th>type</th><th class="n">agents</th><th class="n">tokens</th>'
+            f'<th class="n">min</th><th>summary</th></tr></thead><tbody>{"".join(rows)}</tbody></table>')
+
+
+def _html_sections(D, narrative_html=""):
+    """The page as a sequence of HTML chunks, each rendered straight from the aggregate."""
+    yield HTML_HEAD
+    meta = "  -  ".join(str(x) for x in (D.get("cwd"), D.get("branch"),
+                                         f"{D['wall_hours']} h" if D.get("wall_hours") else "") if x)
+    yield f'<header><h1>Session Retro</h1><div class="meta">{_esc(meta)}</div></header>\n'
+    kpis = [("Wall-clock", f"{D.get('wall_hours') or 0} h"), ("Assistant turns", fmt(D["assistant_turns"])),
+            ("Human messages", fmt(D["user_turns"])), ("Generated tokens", fmt(D["generative_total"])),
+            ("Workflows", f"{fmt(D['workflows'])} / {fmt(D['workflow_agents'])} ag"),
+            ("Cache read", fmt(D["cache_read_tokens"]))]
+    yield ('<div class="kpis">' + "".join(f'<div class="kpi"><div class="v">{v}</div><div class="l">{l}</div></div>'
+                                           for l, v in kpis) + "</div>\n")
+    measured = D.get("workflow_tokens_available", True)
+    dough = _doughnut([("delegated to workflows", D["workflow_tokens"], "#bc8cff"),
+                       ("main-loop orchestrator", D["main_output_tokens"], "#58a6ff")], measured)
+    dnote = ("Output tokens (the real work). Cache reads are shown separately." if measured else
+             "Delegated token totals are unavailable in this log format — percentages omitted.")
+    cache = _bars([(label, v, fmt(v), "") for label, v in (
+        ("cache read", D["cache_read_tokens"]), ("cache creation", D["cache_creation_tokens"]),
+        ("generated output", D["generative_total"]), ("fresh input", D["fresh_input_tokens"]))], "#6e7681")
+    yield ('<div class="grid">\n<div class="card"><h2>Generated tokens — orchestrator vs delegated</h2>'
+           f'<div class="dough">{dough}</div><div class="note">{dnote}</div></div>\n'
+           f'<div class="card"><h2>Tokens processed (incl. cache)</h2>{cache}<div class="note">Cache reads = '
+           'context re-read each turn; cheap, usually the largest line.</div></div>\n</div>\n')
+    wftype = _bars([(k, v["tokens"], fmt(v["tokens"]), f"{v['runs']} runs / {v['agents']} agents / {v['minutes']} min")
+                    for k, v in (D.get("workflow_by_type") or {}).items()], "#3fb950")
+    tools = _bars([(k, v, str(v), k) for k, v in (D.get("tools") or {}).items()], "#d29922")
+    yield ('<div class="grid">\n<div class="card"><h2>Workflows by type</h2>'
+           f'{wftype}<div class="note">Hover a bar for runs / agents / minutes.</div></div>\n'
+           f'<div class="card"><h2>Tool calls</h2>{tools}</div>\n</div>\n')
+    named = _bars([(k if len(k) <= 22 else k[:21] + "…", v, f"{v}x", k)
+                   for k, v in (D.get("workflows_named") or {}).items()], "#bc8cff")
+    at, sk = D.get("agent_types") or {}, D.get("skills_used") or {}
+    agents = (f'<div class="note" style="margin:0 0 6px">Agent types ({sum(at.values())} subagents)</div>'
+              + _bars([(k, v, fmt(v), k) for k, v in at.items()], "#58a6ff")
+              + '<div class="note" style="margin:13px 0 6px">Skills invoked</div>'
+              + _bars([(k, v, str(v), k) for k, v in sk.items()], "#3fb950"))
+    yield ('<div class="grid">\n<div class="card"><h2>Dynamic workflows in play</h2>'
+           f'{named}<div class="note">By invocation count. A reused workflow script counts each run.</div></div>\n'
+           f'<div class="card"><h2>Agents &amp; skills</h2>{agents}</div>\n</div>\n')
+    if D.get("timeline"):
+        yield _timeline(D["timeline"])
+    runs = [_run_row(r) for r in D.get("workflow_runs") or []]
+    if runs:
+        top = "" if D["workflows"] <= len(runs) else f"{len(runs)} most expensive of {D['workflows']}, "
+        yield ('<div class="card" style="margin-bottom:16px"><h2>Most expensive workflow runs '
+               f'<span class="note">({top}click a header to sort)</span></h2>')
+        yield _runs_table(runs[:HTML_ROWS], ' class="sort"')
+        yield from _pages(runs, HTML_ROWS, _runs_table, "runs")
+        yield "</div>\n"
+    turns = D.get("user_turn_text") or []
+    shown = f"{len(turns)} human turns" if D["user_turns"] <= len(turns) else \
+        f"first {len(turns)} of {D['user_turns']} human turns"
+    yield f'<div class="card"><h2>Interaction timeline <span class="note">({shown})</span></h2>'
+    rows = [f'<div class="t"><div class="i">{i}</div><div>{_esc(t)}</div></div>' for i, t in enumerate(turns, 1)]
+    turn_list = lambda page: f'<div class="tl">{"".join(page)}</div>'
+    yield turn_list(rows[:HTML_TURNS])
+    yield from _pages(rows, HTML_TURNS, turn_list, "turns")
+    yield "</div>\n"
+    if narrative_html.strip():
+        yield f'<div class="narrative">{narrative_html}</div>\n'
+    yield HTML_TAIL
+
+
+def write_html(agg, out, narrative_html=""):
+    """Write the single-page site for `agg` to the text file `out`, one section at a time."""
+    for chunk in _html_sections(agg, narrative_html or ""):
+        out.write(chunk)
 
 
 def report_html(agg, narrative_html=""):
-    data = json.dumps(agg).replace("</", "<\\/")  # prevent </script> breakout
-    return (HTML_TEMPLATE
-            .replace("__DATA__", data)
-            .replace("__NARRATIVE__", narrative_html or ""))
+    buf = io.StringIO()
+    write_html(agg, buf, narrative_html)
+    return buf.getvalue()
 
 
 def _head(path, maxlines=800):
@@ -734,18 +1102,23 @@ def _head(path, maxlines=800):
     return dict(cwd=cwd, branch=branch, ts=ts, topic=topic, runtime=runtime or "claude")
 
 
-def _session_files():
-    return glob.glob(f"{PROJECTS}/**/*.jsonl", recursive=True) + glob.glob(f"{CODEX_SESSIONS}/**/*.jsonl", recursive=True)
+def _session_files(roots=None):
+    return [f for root in roots or (PROJECTS, CODEX_SESSIONS)
+            for f in glob.glob(f"{root}/**/*.jsonl", recursive=True)]
 
 
-def _session_rows(sub=""):
+def _haystack(f, h):
+    return " ".join(str(v or "") for v in (f, h.get("cwd"), h.get("branch"), h.get("topic"))).lower()
+
+
+def _scan_rows(sub=""):
+    """Uncached `_session_rows`: head-parse every file. Used when the catalog is unusable."""
     rows = []
     needle = sub.lower()
     for f in _session_files():
         try:
             h = _head(f)
-            haystack = " ".join(str(v or "") for v in (f, h.get("cwd"), h.get("branch"), h.get("topic"))).lower()
-            if needle and needle not in haystack:
+            if needle and needle not in _haystack(f, h):
                 continue
             sz = os.path.getsize(f)
             mt = datetime.fromtimestamp(os.path.getmtime(f)).strftime("%Y-%m-%d %H:%M")
@@ -755,6 +1128,268 @@ def _session_rows(sub=""):
     return rows
 
 
+_CATALOG_TABLES = ("session_text", "sessions_fts", "sessions")  # dropped (with their triggers) on a version change
+_CATALOG_SCHEMA = """
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, size INTEGER, mtime_ns INTEGER,
+    cwd TEXT, branch TEXT, ts TEXT, topic TEXT, runtime TEXT,
+    session_id TEXT, parent_thread_id TEXT, meta_ts TEXT, haystack TEXT,
+    indexed INTEGER NOT NULL DEFAULT 0);
+CREATE INDEX sessions_session_id ON sessions(session_id);
+"""
+# Trigram indexes: `sessions_fts` over `haystack` so the substring filter is an
+# index lookup, `session_text` over each session's searchable text for `find`.
+# Trigrams keep `find` a substring match ('#93', 'parse.py'), as the plain scan was.
+# Optional: older SQLite builds lack FTS5 or the trigram tokenizer.
+_CATALOG_FTS = """
+CREATE VIRTUAL TABLE sessions_fts USING fts5(
+    haystack, content='sessions', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER sessions_ai AFTER INSERT ON sessions BEGIN
+    INSERT INTO sessions_fts(rowid, haystack) VALUES (new.id, new.haystack); END;
+CREATE TRIGGER sessions_ad AFTER DELETE ON sessions BEGIN
+    INSERT INTO sessions_fts(sessions_fts, rowid, haystack) VALUES ('delete', old.id, old.haystack); END;
+CREATE VIRTUAL TABLE session_text USING fts5(body, tokenize='trigram');
+CREATE TRIGGER session_text_ad AFTER DELETE ON sessions BEGIN
+    DELETE FROM session_text WHERE rowid = old.id; END;
+"""
+
+
+def _catalog_open():
+    """Open the session catalog, (re)creating it if missing or stale. None if unusable."""
+    try:
+        os.makedirs(os.path.dirname(CATALOG), exist_ok=True)
+        db = sqlite3.connect(CATALOG, timeout=10)
+    except (OSError, sqlite3.Error):
+        return None
+    try:
+        if db.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+            for table in _CATALOG_TABLES:
+                db.execute(f"DROP TABLE IF EXISTS {table}")
+            db.executescript(_CATALOG_SCHEMA)
+            try:
+                db.executescript(_CATALOG_FTS)
+            except sqlite3.Error:
+                pass
+            db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+            db.commit()
+        return db
+    except sqlite3.Error:
+        db.close()
+        return None
+
+
+def _catalog_sync(db, roots=None):
+    """Re-read files that are new or whose (size, mtime) changed; drop vanished ones.
+
+    `roots` limits the pass to those session directories (default: all of
+    them); rows under other roots are left as they are.
+    """
+    roots = roots or (PROJECTS, CODEX_SESSIONS)
+    under = tuple(f"{root}/" for root in roots)
+    known = {p: (sz, mt) for p, sz, mt in db.execute("SELECT path, size, mtime_ns FROM sessions")
+             if p.startswith(under)}
+    live = set()
+    with db:
+        for f in _session_files(roots):
+            try:
+                st = os.stat(f)
+                if known.get(f) == (st.st_size, st.st_mtime_ns):
+                    live.add(f)
+                    continue
+                h = _head(f)
+                meta = _codex_meta(f) if h["runtime"] == "codex" else {}
+            except Exception:
+                continue
+            live.add(f)
+            db.execute("DELETE FROM sessions WHERE path = ?", (f,))
+            db.execute("INSERT INTO sessions (path, size, mtime_ns, cwd, branch, ts, topic, runtime, "
+                       "session_id, parent_thread_id, meta_ts, haystack) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                       (f, st.st_size, st.st_mtime_ns, h["cwd"], h["branch"], h["ts"], h["topic"], h["runtime"],
+                        meta.get("session_id"), meta.get("parent_thread_id"), meta.get("timestamp"),
+                        _haystack(f, h)))
+        db.executemany("DELETE FROM sessions WHERE path = ?", [(p,) for p in known if p not in live])
+
+
+def _has_table(db, name):
+    return db.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def _phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _catalog_rows(db, sub=""):
+    cols = "SELECT path, size, mtime_ns, cwd, branch, ts, topic, runtime, haystack FROM sessions"
+    needle = sub.lower()
+    if not needle:
+        cur = db.execute(cols)
+    elif _has_table(db, "sessions_fts") and len(needle) >= 3:  # trigrams need at least three characters
+        cur = db.execute(f"{cols} WHERE id IN (SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH ?)",
+                         (_phrase(needle),))
+    else:
+        cur = db.execute(f"{cols} WHERE instr(haystack, ?) > 0", (needle,))
+    rows = []
+    for f, sz, mt_ns, cwd, branch, ts, topic, runtime, haystack in cur:
+        if needle and needle not in haystack:  # FTS case folding is looser than str.lower()
+            continue
+        mt = datetime.fromtimestamp(mt_ns / 1e9).strftime("%Y-%m-%d %H:%M")
+        rows.append((mt, sz, f, dict(cwd=cwd, branch=branch, ts=ts, topic=topic, runtime=runtime)))
+    return rows
+
+
+def _session_rows(sub=""):
+    """(mtime, size, path, breadcrumbs) for each session whose path/cwd/branch/topic contains `sub`."""
+    db = _catalog_open()
+    if db is None:
+        return _scan_rows(sub)
+    try:
+        _catalog_sync(db)
+        return _catalog_rows(db, sub)
+    except sqlite3.Error:
+        return _scan_rows(sub)
+    finally:
+        db.close()
+
+
+_PATCH_FILE_RE = re.compile(r"^\*\*\* (?:Add|Update|Delete) File: (.+)$", re.M)
+_PATH_KEYS = ("file_path", "path", "notebook_path", "workdir")
+
+
+def _tool_text(name, inp, out):
+    out.append(str(name or ""))
+    if isinstance(inp, str):
+        try:
+            inp = json.loads(inp)
+        except Exception:
+            out.extend(_PATCH_FILE_RE.findall(inp))  # apply_patch input is the raw patch
+            return
+    if isinstance(inp, dict):
+        out.extend(str(inp[k]) for k in _PATH_KEYS if inp.get(k))
+
+
+def _search_fragments(path):
+    """What `find` searches, piece by piece: user/assistant message text, tool names and the file paths tools touched."""
+    for d in _jsonl(path):
+        out = []
+        m = d.get("message")
+        if isinstance(m, dict) and d.get("type") in ("user", "assistant"):
+            out.append(_text(m.get("content")))
+            for c in (m.get("content") if isinstance(m.get("content"), list) else []):
+                if isinstance(c, dict) and c.get("type") == "tool_use":
+                    _tool_text(c.get("name"), c.get("input"), out)
+        else:
+            payload = d.get("payload") if isinstance(d.get("payload"), dict) else {}
+            ptype = payload.get("type")
+            if ptype == "message" and payload.get("role") in ("user", "assistant"):
+                out.append(_text(payload.get("content")))
+            elif ptype in ("function_call", "custom_tool_call"):
+                _tool_text(payload.get("name"), payload.get("arguments") or payload.get("input"), out)
+        yield from (t for t in out if t)
+
+
+def _search_text(path):
+    """The text the catalog indexes for `find` (see `_search_fragments`)."""
+    return "\n".join(_search_fragments(path))
+
+
+def _catalog_index_text(db):
+    """Full-text index every session whose row is new or changed since it was last indexed."""
+    for sid, f in db.execute("SELECT id, path FROM sessions WHERE indexed = 0").fetchall():
+        try:
+            body = _search_text(f)
+        except OSError:
+            continue
+        with db:  # one transaction per file: an interrupted first build keeps its progress
+            db.execute("DELETE FROM session_text WHERE rowid = ?", (sid,))
+            db.execute("INSERT INTO session_text (rowid, body) VALUES (?, ?)", (sid, body))
+            db.execute("UPDATE sessions SET indexed = 1 WHERE id = ?", (sid,))
+
+
+def _catalog_find(db, kw, sub=""):
+    needle = sub.lower()
+    rows = []
+    cur = db.execute(
+        "SELECT s.id, s.path, s.mtime_ns, s.cwd, s.branch, s.ts, s.topic, s.runtime, s.haystack, "
+        "session_text.body FROM session_text JOIN sessions s ON s.id = session_text.rowid "
+        "WHERE session_text MATCH ? ORDER BY rank", (_phrase(kw),))
+    for rank, (sid, f, mt_ns, cwd, branch, ts, topic, runtime, haystack, body) in enumerate(cur):
+        if needle and needle not in haystack:
+            continue
+        hits = body.lower().count(kw)
+        if hits:
+            mt = datetime.fromtimestamp(mt_ns / 1e9).strftime("%Y-%m-%d %H:%M")
+            rows.append((rank, sid, mt, hits, f, dict(cwd=cwd, branch=branch, ts=ts, topic=topic, runtime=runtime)))
+    # Most hits first; BM25 (which favours short sessions) only breaks ties.
+    rows.sort(key=lambda r: (-r[3], r[0]))
+    # snippet() dominates the query cost, so only the rows that get printed pay for it.
+    shown = rows[:FIND_LIMIT]
+    snips = dict(db.execute(
+        "SELECT rowid, snippet(session_text, 0, '[', ']', '...', 48) FROM session_text "
+        f"WHERE session_text MATCH ? AND rowid IN ({','.join('?' * len(shown))})",
+        (_phrase(kw), *(r[1] for r in shown)))) if shown else {}
+    return [(mt, hits, f, h, " ".join((snips.get(sid) or "").split())) for _, sid, mt, hits, f, h in rows]
+
+
+_FIND_CHUNK = 1 << 20  # characters per read in the streaming fallback
+
+
+def _search_chunks(path, chunk):
+    """`_search_text(path)` in blocks of at most `chunk` characters, never built whole."""
+    sep = ""
+    for t in _search_fragments(path):
+        t, sep = sep + t, "\n"
+        for i in range(0, len(t), chunk):
+            yield t[i:i + chunk]
+
+
+def _count_in_file(path, kw, chunk=_FIND_CHUNK):
+    """Occurrences of lowercase `kw` in a log's search text, read `chunk` characters at a time.
+
+    Counts in the same text the catalog indexes (`_search_text`), so the fallback
+    finds the same sessions with the same hit counts. Only the tail a match could
+    still start in is carried into the next chunk, so a keyword split across a
+    boundary is counted once and memory stays O(chunk) beyond the current record.
+    """
+    hits, carry, keep = 0, "", len(kw) - 1
+    try:
+        for block in _search_chunks(path, chunk):
+            window = carry + block.lower() if carry else block.lower()
+            hits += window.count(kw)
+            start = max(0, len(window) - keep)
+            last = window.rfind(kw, max(0, start - keep))
+            if last >= 0:
+                start = max(start, last + len(kw))
+            carry = window[start:]
+    except OSError:
+        return 0
+    return hits
+
+
+def _find_rows(kw, sub=""):
+    """(mtime, hits, path, breadcrumbs, snippet) for sessions mentioning lowercase `kw`, best first.
+
+    Served from the catalog's full-text index when it is usable; otherwise every
+    candidate log's search text is streamed through `_count_in_file` (no snippets).
+    """
+    db = _catalog_open() if len(kw) >= 3 else None  # trigrams need at least three characters
+    if db is not None:
+        try:
+            if _has_table(db, "session_text"):
+                _catalog_sync(db)
+                _catalog_index_text(db)
+                return _catalog_find(db, kw, sub)
+        except sqlite3.Error:
+            pass
+        finally:
+            db.close()
+    rows = []
+    for mt, _, f, h in _session_rows(sub):
+        hits = _count_in_file(f, kw)
+        if hits:
+            rows.append((mt, hits, f, h, ""))
+    return sorted(rows, key=lambda r: -r[1])
+
+
 def _codex_meta(path):
     for d in _jsonl(path):
         if d.get("type") == "session_meta" and isinstance(d.get("payload"), dict):
@@ -762,11 +1397,36 @@ def _codex_meta(path):
     return {}
 
 
-def _codex_sort_key(path):
-    meta = _codex_meta(path)
-    return (1 if meta.get("parent_thread_id") else 0,
-            meta.get("timestamp") or "",
-            path)
+def _codex_sort_key(entry):
+    path, parent_thread_id, ts = entry
+    return (1 if parent_thread_id else 0, ts or "", path)
+
+
+def _codex_index():
+    """session_id -> [(path, parent_thread_id, timestamp)] for every rollout under CODEX_SESSIONS.
+
+    Read from the catalog (which only re-reads changed rollouts) when it is
+    usable, else built in one pass that opens each rollout once.
+    """
+    index = defaultdict(list)
+    db = _catalog_open()
+    if db is not None:
+        try:
+            _catalog_sync(db, (CODEX_SESSIONS,))
+            for sid, f, parent, ts in db.execute("SELECT session_id, path, parent_thread_id, meta_ts "
+                                                 "FROM sessions WHERE session_id IS NOT NULL"):
+                if f.startswith(CODEX_SESSIONS):
+                    index[sid].append((f, parent, ts))
+            return index
+        except sqlite3.Error:
+            index.clear()
+        finally:
+            db.close()
+    for f in glob.glob(f"{CODEX_SESSIONS}/**/*.jsonl", recursive=True):
+        meta = _codex_meta(f)
+        if meta.get("session_id"):
+            index[meta["session_id"]].append((f, meta.get("parent_thread_id"), meta.get("timestamp")))
+    return index
 
 
 def _canon(path):
@@ -783,6 +1443,7 @@ def expand_paths(paths):
     """Expand a Codex rollout to all rollout JSONLs from the same session_id."""
     expanded = []
     seen = set()
+    index = None
 
     def add(p):
         key = _canon(p)
@@ -793,7 +1454,11 @@ def expand_paths(paths):
     for path in paths:
         if _canon(path) in seen:
             continue  # already swept in via an earlier path's session expansion
-        if not _is_codex(path):
+        try:
+            codex = _is_codex(path)
+        except OSError:
+            codex = False  # unreadable: parse_all reports it
+        if not codex:
             add(path)
             continue
         meta = _codex_meta(path)
@@ -801,12 +1466,13 @@ def expand_paths(paths):
         if not session_id:
             add(path)
             continue
-        candidates = {_canon(path): path}
-        for candidate in glob.glob(f"{CODEX_SESSIONS}/**/*.jsonl", recursive=True):
-            if _codex_meta(candidate).get("session_id") == session_id:
-                candidates.setdefault(_canon(candidate), candidate)
-        for candidate in sorted(candidates.values(), key=_codex_sort_key):
-            add(candidate)
+        if index is None:
+            index = _codex_index()  # built once, and only if some path is a Codex rollout
+        candidates = {_canon(path): (path, meta.get("parent_thread_id"), meta.get("timestamp"))}
+        for entry in index.get(session_id, ()):
+            candidates.setdefault(_canon(entry[0]), entry)
+        for entry in sorted(candidates.values(), key=_codex_sort_key):
+            add(entry[0])
     return expanded
 
 
@@ -827,26 +1493,22 @@ def cmd_list(args):
 
 
 def cmd_find(args):
-    """Find sessions whose content mentions a keyword (PR #, feature, filename...)."""
-    if not args:
+    """Find sessions whose content mentions a keyword (PR #, feature, filename...), best match first."""
+    if not args or not args[0]:
         _print_safe("usage: find <keyword> [project-substr]   e.g. find '#93' anvil")
         return
     kw, sub = args[0].lower(), (args[1] if len(args) > 1 else "")
-    rows = []
-    for _, _, f, h in _session_rows(sub):
-        try:
-            hits = open(f, encoding="utf-8", errors="replace").read().lower().count(kw)
-        except Exception:
-            continue
-        if hits:
-            mt = datetime.fromtimestamp(os.path.getmtime(f)).strftime("%Y-%m-%d %H:%M")
-            rows.append((mt, hits, f, h))
-    for mt, hits, f, h in sorted(rows):
+    rows = _find_rows(kw, sub)
+    for mt, hits, f, h, snip in rows[:FIND_LIMIT]:
         proj = (h.get("cwd") or os.path.basename(os.path.dirname(f))).replace(os.path.expanduser("~/"), "~/")
         _print_safe(f"{mt}  {h['runtime']:<6}  {hits:>4}x  {(h['branch'] or '-'):22}  {proj[:46]}")
         if h["topic"]:
             _print_safe(f"            ↳ {h['topic']}")
+        if snip:
+            _print_safe(f"            {snip}")
         _print_safe(f"            {f}")
+    if len(rows) > FIND_LIMIT:
+        _print_safe(f"\n# {len(rows) - FIND_LIMIT} more sessions mention {args[0]!r}; narrow with a project substr")
     if not rows:
         _print_safe(f"no sessions mention {args[0]!r}{f' (filter {sub!r})' if sub else ''}")
 
@@ -875,6 +1537,15 @@ def main(argv):
     if mode == "find":
         cmd_find(args)
         return 0
+    jobs = 1
+    if "--jobs" in args:
+        i = args.index("--jobs")
+        try:
+            jobs = int(args[i + 1])
+            args = args[:i] + args[i + 2:]
+        except (IndexError, ValueError):
+            print("error: --jobs needs a number of worker processes (0 = one per CPU)", file=sys.stderr)
+            return 2
     narrative = ""
     if "--narrative" in args:
         i = args.index("--narrative")
@@ -888,11 +1559,17 @@ def main(argv):
     if not paths:
         print("error: no existing session JSONL paths given", file=sys.stderr)
         return 2
-    agg = aggregate([parse(p) for p in paths])
+    acc = Aggregator()
+    for s in iter_parsed(paths, jobs):
+        acc.add(s)
+    if not acc.paths:
+        print("error: none of the given session JSONL paths could be parsed", file=sys.stderr)
+        return 2
+    agg = acc.result()
     if mode == "stats":
         print(json.dumps(agg, indent=1))
     elif mode == "html":
-        print(report_html(agg, narrative))
+        write_html(agg, sys.stdout, narrative)
     else:
         print(report_md(agg))
     return 0
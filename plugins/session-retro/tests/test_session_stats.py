@@ -82,6 +82,7 @@ def test_codex_main_rollout_expands_subagents_and_splits_tokens(tmp_path, monkey
     codex_root = tmp_path / ".codex" / "sessions"
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(codex_root))
     monkeypatch.setattr(mod, "PROJECTS", str(tmp_path / ".claude" / "projects"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
 
     day = codex_root / "2026" / "06" / "25"
     main = day / "rollout-main.jsonl"
@@ -295,6 +296,7 @@ def test_list_and_find_survive_cp1252_stdout(tmp_path, monkeypatch):
     projects = tmp_path / ".claude" / "projects"
     monkeypatch.setattr(mod, "PROJECTS", str(projects))
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(tmp_path / ".codex" / "sessions"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
     write_jsonl(projects / "repo" / "session.jsonl", [
         {
             "timestamp": "2026-06-25T10:00:00Z",
@@ -318,12 +320,216 @@ def test_list_and_find_survive_cp1252_stdout(tmp_path, monkeypatch):
     assert "session.jsonl" in text
 
 
+def _catalog_env(tmp_path, monkeypatch):
+    mod = load_session_stats()
+    projects = tmp_path / ".claude" / "projects"
+    monkeypatch.setattr(mod, "PROJECTS", str(projects))
+    monkeypatch.setattr(mod, "CODEX_SESSIONS", str(tmp_path / ".codex" / "sessions"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "cache" / "catalog.sqlite3"))
+    return mod, projects
+
+
+def _claude_session(path, topic, branch="main", cwd="/repo"):
+    write_jsonl(path, [
+        {"timestamp": "2026-06-25T10:00:00Z", "cwd": cwd, "gitBranch": branch,
+         "type": "user", "message": {"content": topic}},
+    ])
+
+
+def test_session_catalog_reparses_only_new_or_changed_files(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    a, b = projects / "anvil" / "a.jsonl", projects / "forge" / "b.jsonl"
+    _claude_session(a, "Fix the anvil parser")
+    _claude_session(b, "Tune the forge", branch="perf")
+    assert {r[2] for r in mod._session_rows()} == {str(a), str(b)}
+
+    parsed = []
+    head = mod._head
+    monkeypatch.setattr(mod, "_head", lambda f, *a, **k: parsed.append(f) or head(f, *a, **k))
+    rows = mod._session_rows()
+    assert parsed == []
+    assert {r[3]["topic"] for r in rows} == {"Fix the anvil parser", "Tune the forge"}
+
+    _claude_session(b, "Tune the forge bellows", branch="perf")
+    os.utime(b, ns=(os.stat(b).st_atime_ns, os.stat(b).st_mtime_ns + 10**9))
+    a.unlink()
+    rows = mod._session_rows()
+    assert parsed == [str(b)]
+    assert [(r[2], r[3]["topic"], r[3]["branch"]) for r in rows] == [
+        (str(b), "Tune the forge bellows", "perf")]
+
+
+def test_session_catalog_filters_by_substring(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    _claude_session(projects / "anvil" / "a.jsonl", "Fix the Parser", cwd="/work/anvil")
+    _claude_session(projects / "forge" / "b.jsonl", "Tune it", branch="feat/pr-93")
+    _claude_session(projects / "forge" / "c.jsonl", "Unrelated")
+
+    def names(sub):
+        return sorted(os.path.basename(r[2]) for r in mod._session_rows(sub))
+
+    assert names("ANVIL") == ["a.jsonl"]        # cwd, case-insensitive
+    assert names("parser") == ["a.jsonl"]       # topic
+    assert names("pr-93") == ["b.jsonl"]        # branch
+    assert names("93") == ["b.jsonl"]           # shorter than a trigram
+    assert names("forge") == ["b.jsonl", "c.jsonl"]  # path
+    assert names("nowhere") == []
+    assert names("") == ["a.jsonl", "b.jsonl", "c.jsonl"]
+
+
+def test_session_rows_fall_back_to_a_scan_without_a_catalog(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    blocker = tmp_path / "cache"
+    blocker.write_text("not a directory")
+    _claude_session(projects / "anvil" / "a.jsonl", "Fix the anvil parser")
+    rows = mod._session_rows("anvil")
+    assert [r[3]["topic"] for r in rows] == ["Fix the anvil parser"]
+
+
+def test_session_catalog_keeps_codex_session_meta(tmp_path, monkeypatch):
+    mod, _ = _catalog_env(tmp_path, monkeypatch)
+    rollout = tmp_path / ".codex" / "sessions" / "2026" / "rollout-child.jsonl"
+    meta = _codex_meta_row("2026-06-25T10:00:00Z", "sess-1", "child", parent="main-thread")
+    meta["payload"]["timestamp"] = "2026-06-25T10:00:00Z"
+    write_jsonl(rollout, [
+        meta,
+        _user_row("2026-06-25T10:00:01Z", "Review the diff"),
+    ])
+    (row,) = mod._session_rows()
+    assert row[3]["runtime"] == "codex"
+    db = mod.sqlite3.connect(mod.CATALOG)
+    assert db.execute("SELECT session_id, parent_thread_id, meta_ts FROM sessions").fetchone() == (
+        "sess-1", "main-thread", "2026-06-25T10:00:00Z")
+    db.close()
+
+
+def test_codex_index_syncs_only_codex_rollouts(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    claude = projects / "anvil" / "a.jsonl"
+    _claude_session(claude, "Fix the anvil parser")
+    assert [r[2] for r in mod._session_rows()] == [str(claude)]
+    rollout = tmp_path / ".codex" / "sessions" / "2026" / "rollout-main.jsonl"
+    write_jsonl(rollout, [_codex_meta_row("2026-06-25T10:00:00Z", "sess-1", "main")])
+    _claude_session(projects / "forge" / "b.jsonl", "Tune the forge")
+
+    parsed = []
+    head = mod._head
+    monkeypatch.setattr(mod, "_head", lambda f, *a, **k: parsed.append(f) or head(f, *a, **k))
+    index = mod._codex_index()
+    assert [f for f, _, _ in index["sess-1"]] == [str(rollout)]
+    assert parsed == [str(rollout)]
+    db = mod.sqlite3.connect(mod.CATALOG)
+    assert str(claude) in {p for (p,) in db.execute("SELECT path FROM sessions")}
+    db.close()
+
+
+def test_find_ranks_indexed_sessions_with_hit_counts_and_snippets(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    write_jsonl(projects / "anvil" / "a.jsonl", [
+        {"cwd": "/work/anvil", "type": "user", "message": {"content": "Review PR #93 please"}},
+        {"type": "assistant", "message": {"content": [
+            {"type": "text", "text": "PR #93 touches the parser; #93 is small."},
+            {"type": "tool_use", "name": "Edit", "input": {"file_path": "/work/anvil/src/parse.py"}},
+        ]}},
+    ])
+    write_jsonl(projects / "forge" / "b.jsonl", [
+        {"cwd": "/work/forge", "type": "user", "message": {"content": "Unrelated, but see #93"}},
+    ])
+    write_jsonl(projects / "forge" / "c.jsonl", [
+        {"cwd": "/work/forge", "type": "user", "message": {"content": "Nothing to see"}},
+    ])
+
+    rows = mod._find_rows("#93")
+    assert [(os.path.basename(r[2]), r[1]) for r in rows] == [("a.jsonl", 3), ("b.jsonl", 1)]
+    assert "[#93]" in rows[0][4]
+    assert [os.path.basename(r[2]) for r in mod._find_rows("parse.py")] == ["a.jsonl"]   # file path
+    assert [os.path.basename(r[2]) for r in mod._find_rows("edit")] == ["a.jsonl"]       # tool name
+    assert [os.path.basename(r[2]) for r in mod._find_rows("#93", "forge")] == ["b.jsonl"]
+    assert mod._find_rows("cwd") == []  # JSON keys are not session text
+
+    monkeypatch.setattr(mod, "FIND_LIMIT", 1)
+    rows = mod._find_rows("#93")
+    assert rows[0][4] and rows[1][4] == ""  # only printed rows get a snippet
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    mod.cmd_find(["#93"])
+    assert "a.jsonl" in out.getvalue() and "b.jsonl" not in out.getvalue()
+    assert "1 more sessions mention '#93'" in out.getvalue()
+
+
+def test_find_index_is_updated_only_for_changed_sessions(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    a, b = projects / "anvil" / "a.jsonl", projects / "forge" / "b.jsonl"
+    _claude_session(a, "Fix the anvil parser")
+    _claude_session(b, "Tune the forge")
+    assert mod._find_rows("bellows") == []
+
+    indexed = []
+    search_text = mod._search_text
+    monkeypatch.setattr(mod, "_search_text", lambda f: indexed.append(f) or search_text(f))
+    _claude_session(b, "Tune the forge bellows")
+    os.utime(b, ns=(os.stat(b).st_atime_ns, os.stat(b).st_mtime_ns + 10**9))
+    assert [r[2] for r in mod._find_rows("bellows")] == [str(b)]
+    assert indexed == [str(b)]
+    b.unlink()
+    assert mod._find_rows("bellows") == []
+
+
+def test_find_streams_when_the_keyword_is_too_short_to_index(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    _claude_session(projects / "anvil" / "a.jsonl", "Bump to v2, then v2.1")
+    _claude_session(projects / "forge" / "b.jsonl", "Nothing here")
+    rows = mod._find_rows("v2")
+    assert [(os.path.basename(r[2]), r[1], r[4]) for r in rows] == [("a.jsonl", 2, "")]
+
+
+def test_count_in_file_counts_keywords_spanning_chunk_boundaries(tmp_path):
+    mod = load_session_stats()
+    text = "xxPR #93yy" * 7 + "aaaa" + "Ünïcode PARSER " * 5
+    path = tmp_path / "log.jsonl"
+    write_jsonl(path, [
+        {"type": "user", "message": {"content": text}},
+        {"type": "assistant", "message": {"content": [{"type": "text", "text": "aa PR #93"}]}},
+    ])
+    body = mod._search_text(str(path)).lower()
+    for kw in ("pr #93", "aa", "parser", "x", "ünïcode p"):
+        expected = body.count(kw)
+        for chunk in range(1, 12):
+            assert mod._count_in_file(str(path), kw, chunk=chunk) == expected, (kw, chunk)
+    assert mod._count_in_file(str(path), "message") == 0  # JSON keys are not session text
+    assert mod._count_in_file(str(tmp_path / "missing.jsonl"), "x") == 0
+
+
+def test_find_fallback_matches_the_index(tmp_path, monkeypatch):
+    mod, projects = _catalog_env(tmp_path, monkeypatch)
+    write_jsonl(projects / "anvil" / "a.jsonl", [
+        {"cwd": "/work/anvil", "type": "user", "message": {"content": "Review PR #93 please"}},
+        {"type": "assistant", "message": {"content": [
+            {"type": "text", "text": "PR #93 touches the parser"},
+            {"type": "tool_use", "name": "Edit", "input": {"file_path": "/work/anvil/src/parse.py"}},
+            {"type": "tool_result", "content": "#93 in tool output is not searched"},
+        ]}},
+    ])
+    write_jsonl(projects / "forge" / "b.jsonl", [
+        {"cwd": "/work/forge", "type": "user", "message": {"content": "Unrelated, but see #93"}},
+    ])
+
+    def found(kw):
+        return [(os.path.basename(r[2]), r[1]) for r in mod._find_rows(kw)]
+
+    indexed = {kw: found(kw) for kw in ("#93", "parse.py", "edit", "cwd", "anvil")}
+    monkeypatch.setattr(mod, "_catalog_open", lambda: None)
+    assert {kw: found(kw) for kw in indexed} == indexed
+    assert found("cw") == []  # short keywords stream, and JSON keys still do not match
+
+
 def test_expand_paths_dedupes_equivalent_path_forms(tmp_path, monkeypatch):
     """Issue #134: the same rollout selected via two path spellings must count once."""
     mod = load_session_stats()
     codex_root = tmp_path / ".codex" / "sessions"
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(codex_root))
     monkeypatch.setattr(mod, "PROJECTS", str(tmp_path / ".claude" / "projects"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
 
     day = codex_root / "2026" / "06" / "25"
     main = day / "rollout-main.jsonl"
@@ -339,6 +545,36 @@ def test_expand_paths_dedupes_equivalent_path_forms(tmp_path, monkeypatch):
     assert os.path.basename(expanded[0]) == "rollout-main.jsonl"
 
 
+def test_expand_paths_reads_each_rollout_meta_once(tmp_path, monkeypatch):
+    mod, _ = _catalog_env(tmp_path, monkeypatch)
+    day = tmp_path / ".codex" / "sessions" / "2026" / "06" / "25"
+    roots = []
+    for n in range(3):
+        sid = f"sid-{n}"
+        roots.append(day / f"rollout-{n}-main.jsonl")
+        write_jsonl(roots[-1], [_codex_meta_row("2026-06-25T10:00:00Z", sid, sid)])
+        for k in range(2):
+            meta = _codex_meta_row(f"2026-06-25T10:0{k + 1}:00Z", sid, f"{sid}-sub{k}", parent=sid)
+            meta["payload"]["timestamp"] = meta["timestamp"]
+            write_jsonl(day / f"rollout-{n}-sub{k}.jsonl", [meta])
+
+    opened = []
+    codex_meta = mod._codex_meta
+    monkeypatch.setattr(mod, "_codex_meta", lambda f: opened.append(f) or codex_meta(f))
+    expected = [str(day / f"rollout-{n}-{part}.jsonl") for n in range(3) for part in ("main", "sub0", "sub1")]
+    assert mod.expand_paths([str(p) for p in roots]) == expected
+    assert len(opened) == 9 + 3  # catalog build + the given paths
+    opened.clear()
+    assert mod.expand_paths([str(p) for p in roots]) == expected
+    assert len(opened) == 3      # warm catalog: only the given paths
+
+    (tmp_path / "blocked").write_text("not a directory")
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "blocked" / "catalog.sqlite3"))
+    opened.clear()
+    assert mod.expand_paths([str(p) for p in roots]) == expected
+    assert len(opened) == 9 + 3  # no catalog: still one pass over the tree
+
+
 def test_forked_sibling_keeps_identity_and_reports_tokens_unavailable(tmp_path, monkeypatch):
     """Issue #134: a replayed session_meta must not erase the fork's identity,
     and replayed parent totals must not be charged again as delegated work."""
@@ -346,6 +582,7 @@ def test_forked_sibling_keeps_identity_and_reports_tokens_unavailable(tmp_path,
     codex_root = tmp_path / ".codex" / "sessions"
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(codex_root))
     monkeypatch.setattr(mod, "PROJECTS", str(tmp_path / ".claude" / "projects"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
 
     day = codex_root / "2026" / "06" / "25"
     root = day / "rollout-root.jsonl"
@@ -419,6 +656,7 @@ def test_encrypted_prompts_fall_back_to_agent_labels(tmp_path, monkeypatch):
     codex_root = tmp_path / ".codex" / "sessions"
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(codex_root))
     monkeypatch.setattr(mod, "PROJECTS", str(tmp_path / ".claude" / "projects"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
 
     day = codex_root / "2026" / "06" / "25"
     root = day / "rollout-root.jsonl"
@@ -456,6 +694,7 @@ def test_fork_residue_of_a_sibling_does_not_duplicate_the_run(tmp_path, monkeypa
     codex_root = tmp_path / ".codex" / "sessions"
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(codex_root))
     monkeypatch.setattr(mod, "PROJECTS", str(tmp_path / ".claude" / "projects"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
 
     day = codex_root / "2026" / "06" / "25"
     write_jsonl(day / "rollout-root.jsonl", [
@@ -494,6 +733,7 @@ def test_replayed_main_rollout_is_not_double_counted(tmp_path, monkeypatch):
     codex_root = tmp_path / ".codex" / "sessions"
     monkeypatch.setattr(mod, "CODEX_SESSIONS", str(codex_root))
     monkeypatch.setattr(mod, "PROJECTS", str(tmp_path / ".claude" / "projects"))
+    monkeypatch.setattr(mod, "CATALOG", str(tmp_path / "catalog.sqlite3"))
 
     day = codex_root / "2026" / "06" / "25"
     write_jsonl(day / "rollout-orig.jsonl", [
@@ -587,3 +827,238 @@ def test_canon_unifies_windows_path_spellings(monkeypatch):
     a = mod._canon(r"C:\Users\Me\rollout.jsonl")
     b = mod._canon("C:/users/me/ROLLOUT.JSONL")
     assert a == b
+
+
+def _parallel_module(monkeypatch):
+    # Worker processes unpickle `_parse_one` by module name, so the script must
+    # be importable as `session_stats` (spawn/forkserver) and be that module (fork).
+    mod = load_session_stats()
+    monkeypatch.syspath_prepend(str(SCRIPT.parent))
+    monkeypatch.setitem(sys.modules, "session_stats", mod)
+    return mod
+
+
+def test_parallel_parse_matches_serial_aggregate(tmp_path, monkeypatch):
+    mod = _parallel_module(monkeypatch)
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"s{n}.jsonl"
+        write_jsonl(path, [
+            {"timestamp": f"2026-06-25T10:0{n}:00Z", "cwd": "/repo", "gitBranch": "main", "type": "assistant",
+             "message": {"usage": {"output_tokens": 10 + n, "input_tokens": 5},
+                         "content": [{"type": "tool_use", "name": ["Read", "Edit", "Bash"][n % 3], "input": {}}]}},
+            {"timestamp": f"2026-06-25T10:0{n}:30Z", "type": "user", "message": {"content": f"turn {n}"}},
+        ])
+        paths.append(str(path))
+
+    serial = mod.aggregate(mod.parse_all(paths))
+    parallel = mod.aggregate(mod.parse_all(paths, jobs=3))
+    assert json.dumps(parallel, sort_keys=True) == json.dumps(serial, sort_keys=True)
+    assert parallel["sessions"] == paths
+
+
+
+def test_parallel_parse_keeps_a_bounded_window_in_flight(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+
+    mod = load_session_stats()
+    submitted = []
+
+    class Pool:
+        # Runs each file at submit time: every result is ready as soon as it is
+        # submitted, as when the first file is the slow one and the rest finish.
+        def __init__(self, jobs):
+            pass
+
+        def submit(self, fn, path):
+            submitted.append(path)
+            fut = Future()
+            fut.set_result(fn(path))
+            return fut
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", Pool)
+    paths = []
+    for n in range(10):
+        path = tmp_path / f"s{n}.jsonl"
+        write_jsonl(path, [{"timestamp": "2026-06-25T10:00:00Z", "type": "assistant",
+                            "message": {"usage": {"output_tokens": n}, "content": []}}])
+        paths.append(str(path))
+
+    seen = []
+    for i, s in enumerate(mod.iter_parsed(paths, jobs=2)):
+        assert len(submitted) - (i + 1) <= 4  # at most 2 * jobs behind this one
+        seen.append(s["path"])
+    assert seen == submitted == paths
+
+def test_malformed_file_is_skipped_not_fatal(tmp_path, monkeypatch, capsys):
+    mod = _parallel_module(monkeypatch)
+    good = tmp_path / "good.jsonl"
+    write_jsonl(good, [
+        {"timestamp": "2026-06-25T10:00:00Z", "cwd": "/repo", "type": "assistant",
+         "message": {"usage": {"output_tokens": 7}, "content": []}},
+    ])
+    bad = tmp_path / "bad.jsonl"
+    bad.mkdir()  # exists, but cannot be read as a file
+
+    rc = mod.main(["session_stats.py", "stats", str(bad), str(good), "--jobs", "2"])
+    out, err = capsys.readouterr()
+    assert rc == 0
+    assert json.loads(out)["sessions"] == [str(good)]
+    assert f"skipped {bad}" in err
+
+    assert mod.main(["session_stats.py", "stats", str(bad)]) == 2
+    assert mod.main(["session_stats.py", "stats", str(good), "--jobs", "many"]) == 2
+
+
+def _compact(path, rows):
+    # Agents write compact JSON; the byte-level prefilter only engages on it.
+    path.write_text("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in rows), encoding="utf-8")
+
+
+def test_record_prefilter_keeps_parse_output_identical(tmp_path):
+    mod = load_session_stats()
+    base = {"parentUuid": None, "isSidechain": False, "cwd": "/repo", "sessionId": "s", "gitBranch": "main"}
+    claude = tmp_path / "claude.jsonl"
+    _compact(claude, [
+        {**base, "type": "user", "message": {"role": "user", "content": [
+            {"tool_use_id": "t0", "type": "tool_result", "content": 'cat "x"\n{"timestamp":"bogus"}'}]},
+         "uuid": "u0", "timestamp": "2026-06-25T09:59:00Z", "toolUseResult": {"type": "text"}},
+        {**base, "type": "assistant", "message": {"role": "assistant", "usage": {"output_tokens": 9}, "content": [
+            {"type": "tool_use", "name": "Task", "input": {"message": {"role": "user", "content": ["x"]}}}]},
+         "uuid": "a1", "timestamp": "2026-06-25T10:00:00Z"},
+        {**base, "type": "user", "message": {"role": "user", "content": [
+            {"type": "text", "text": "<task-notification><summary>review</summary>"
+                                     "<subagent_tokens>30</subagent_tokens></task-notification>"},
+            {"tool_use_id": "t1", "type": "tool_result", "content": "ok"}]},
+         "uuid": "u1", "timestamp": "2026-06-25T10:01:00Z"},
+        {**base, "type": "user", "message": {"role": "user", "content": [
+            {"tool_use_id": "t2", "type": "tool_result", "content": "last"}]},
+         "uuid": "u2", "timestamp": "2026-06-25T10:09:00Z"},
+    ])
+    codex = tmp_path / "codex.jsonl"
+    _compact(codex, [
+        {"timestamp": "2026-06-25T10:00:00Z", "type": "session_meta", "payload": {"session_id": "sid", "cwd": "/r"}},
+        _user_row("2026-06-25T10:00:01Z", "Fix the parser"),
+        {"timestamp": "2026-06-25T10:00:02Z", "type": "response_item",
+         "payload": {"type": "function_call_output", "output": '{"type":"message","role":"user"}'}},
+        {"timestamp": "2026-06-25T10:00:03Z", "type": "response_item",
+         "payload": {"type": "function_call", "name": "shell", "arguments": "{}"}},
+        _token_count_row("2026-06-25T10:00:04Z", 40),
+        {"timestamp": "2026-06-25T10:00:09Z", "type": "event_msg",
+         "payload": {"type": "exec_command_end", "stdout": "x" * 1000}},
+    ])
+
+    stubbed = []
+    for name in ("_claude_stub", "_codex_stub"):
+        stub = getattr(mod, name)
+        setattr(mod, name, lambda line, stub=stub: stubbed.append(stub(line)) or stubbed[-1])
+    fast = [mod.parse(str(p)) for p in (claude, codex)]
+
+    plain = load_session_stats()
+    plain._loads = json.loads
+    plain._claude_stub = plain._codex_stub = lambda line: None
+    slow = [plain.parse(str(p)) for p in (claude, codex)]
+
+    assert json.dumps(mod.aggregate(fast), sort_keys=True) == json.dumps(plain.aggregate(slow), sort_keys=True)
+    assert fast[0]["ts_last"] == "2026-06-25T10:09:00Z" and fast[0]["workflows"]
+    # Tool-result-only user records and ignored rollout payloads were stubbed;
+    # the assistant record with a nested "message" and the text-block record were not.
+    assert sum(d is not None for d in stubbed) == 4
+
+
+def test_jsonl_decodes_invalid_utf8_leniently(tmp_path):
+    mod = load_session_stats()
+    p = tmp_path / "s.jsonl"
+    p.write_bytes(b'{"type":"user","message":{"content":"caf\xe9"}}\n{not json\n\n')
+    assert [d["message"]["content"] for d in mod._jsonl(str(p))] == ["caf�"]
+
+
+def _claude_with_runs(path, n, tokens):
+    rows = [{"timestamp": "2026-06-25T10:00:00Z", "cwd": "/repo", "type": "assistant",
+             "message": {"usage": {"output_tokens": 5}, "content": []}}]
+    for i in range(n):
+        rows.append({"timestamp": f"2026-06-25T10:0{i}:30Z", "type": "user", "message": {"content": f"step {i}"}})
+        rows.append({"timestamp": f"2026-06-25T10:0{i}:40Z", "type": "user", "message": {"content": (
+            f"<task-notification><summary>review {path.stem} {i}</summary><agent_count>1</agent_count>"
+            f"<subagent_tokens>{tokens[i]}</subagent_tokens></task-notification>")}})
+    write_jsonl(path, rows)
+    return str(path)
+
+
+def test_aggregator_keeps_top_runs_and_first_turns_within_limits(tmp_path, monkeypatch):
+    mod = load_session_stats()
+    paths = [_claude_with_runs(tmp_path / "a.jsonl", 3, [10, 50, 20]),
+             _claude_with_runs(tmp_path / "b.jsonl", 3, [50, 5, 40])]
+    full = mod.aggregate(mod.parse_all(paths))
+    monkeypatch.setattr(mod, "WORKFLOW_RUN_LIMIT", 3)
+    monkeypatch.setattr(mod, "USER_TURN_LIMIT", 4)
+
+    acc = mod.Aggregator()
+    for s in mod.iter_parsed(paths):
+        acc.add(s)
+    bounded = acc.result()
+    assert [r["summary"] for r in bounded["workflow_runs"]] == ["review a 1", "review b 0", "review b 2"]
+    assert bounded["workflow_runs"] == full["workflow_runs"][:3]
+    assert bounded["workflow_by_type"] == full["workflow_by_type"]
+    assert bounded["workflow_tokens"] == full["workflow_tokens"] == 175
+    assert bounded["user_turns"] == 6
+    assert bounded["user_turn_text"] == ["step 0", "step 1", "step 2", "step 0"]
+    assert bounded["measurement_notes"] == ["workflow runs list the 3 most expensive of 6",
+                                            "human messages list the first 4 of 6"]
+    assert full["measurement_notes"] == []
+
+
+def test_aggregator_pairs_subagent_added_before_its_main():
+    mod = load_session_stats()
+    main = mod._base_stats("/c/main.jsonl", "codex")
+    main["workflows"] = [dict(summary="Review: the parser", agents=1, tokens=None, tool_uses=None, ms=0,
+                              kind="review", codex_spawn=True, agent_type="worker")]
+    sub = mod._base_stats("/c/sub.jsonl", "codex")
+    sub.update(codex_is_subagent=True, out=23, duration_ms=60000)
+    sub["tools"]["exec_command"] = 2
+
+    acc = mod.Aggregator()
+    acc.add(sub)
+    mid = acc.result()  # not yet paired: reported from the rollout alone
+    assert mid["workflow_runs"][0]["summary"] == "sub.jsonl"
+    acc.add(main)
+    agg = acc.result()
+    assert agg == {**mod.aggregate([main, sub]), "sessions": ["/c/sub.jsonl", "/c/main.jsonl"]}
+    assert agg["workflow_runs"] == [dict(summary="Review: the parser", agents=1, tokens=23,
+                                         tool_uses=2, ms=60000, kind="review")]
+    assert agg["workflow_tokens_available"] is True
+
+
+def test_html_pages_long_lists_behind_lazy_details(tmp_path, monkeypatch):
+    mod = load_session_stats()
+    path = _claude_with_runs(tmp_path / "a.jsonl", 6, [10, 60, 20, 50, 30, 40])
+    agg = mod.aggregate(mod.parse_all([path]))
+    agg["user_turn_text"][0] = "</template><script>alert(1)</script>"
+    monkeypatch.setattr(mod, "HTML_ROWS", 2)
+    monkeypatch.setattr(mod, "HTML_TURNS", 4)
+    monkeypatch.setattr(mod, "HTML_PAGE", 3)
+
+    page = mod.report_html(agg, "<h2>Retro</h2>")
+    sortable, rest = page.split('<table class="sort">', 1)[1].split("</table>", 1)
+    assert sortable.count("<tr>") == 3  # header + HTML_ROWS runs
+    assert "review a 1" in sortable and "review a 3" in sortable
+    assert "<summary>runs 3–5</summary>" in rest and "<summary>runs 6–6</summary>" in rest
+    assert "<summary>turns 5–6</summary>" in page
+    assert "&lt;/template&gt;&lt;script&gt;alert(1)" in page
+    assert page.count("<script>") == 1
+    assert '<div class="narrative"><h2>Retro</h2></div>' in page
+
+
+def test_html_mode_streams_to_stdout(tmp_path, monkeypatch):
+    mod = load_session_stats()
+    path = _claude_with_runs(tmp_path / "a.jsonl", 2, [10, 20])
+    writes = []
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(io.BytesIO(), encoding="utf-8"))
+    monkeypatch.setattr(sys.stdout, "write", writes.append)
+
+    assert mod.main(["session_stats.py", "html", path]) == 0
+    assert len(writes) > 5
+    assert "".join(writes) == mod.report_html(mod.aggregate(mod.parse_all([path])))